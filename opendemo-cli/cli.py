@@ -3,39 +3,94 @@
 OpenDemo CLI 入口
 
 命令行接口主入口，负责注册所有子命令。
+子命令模块在被调用时才导入，`opendemo --version`、`opendemo config get`
+等简单命令不会导入 AI 服务、搜索引擎等重量级模块。
 """
 
+import importlib
 import sys
 from pathlib import Path
 
 import click
 
 # 添加包路径
-sys.path.insert(0, str(Path(__file__).parent))
+if str(Path(__file__).parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent))
 
-from commands.get import get
-from commands.search import search
-from commands.new import new
-from commands.config import config
-from commands.check import check
 from utils.logger import setup_logger
-from utils.formatters import print_error, print_warning
 
 __version__ = "0.3.0"
 
+# 子命令注册表: 命令名 -> (模块, 属性)
+COMMANDS = {
+    "get": ("commands.get", "get"),
+    "search": ("commands.search", "search"),
+    "new": ("commands.new", "new"),
+    "config": ("commands.config", "config"),
+    "check": ("commands.check", "check"),
+    "bundle": ("commands.bundle", "bundle"),
+    "verify": ("commands.verify", "verify"),
+}
 
-@click.group()
+
+class LazyGroup(click.Group):
+    """按需导入子命令的命令组"""
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        """
+        初始化命令组
+
+        Args:
+            lazy_commands: 延迟导入的子命令，命令名 -> (模块, 属性)
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in self.lazy_commands:
+            module_name, attr = self.lazy_commands[cmd_name]
+            command = getattr(importlib.import_module(module_name), attr)
+            # 导入后注册，后续直接复用
+            self.add_command(command, cmd_name)
+        return command
+
+
+def _profile_startup(ctx, param, value):
+    """--profile-startup: 以 -X importtime 重新运行命令并输出导入耗时"""
+    if not value or ctx.resilient_parsing:
+        return
+    from utils.startup_profiler import profile_startup
+
+    args = [arg for arg in sys.argv[1:] if arg != "--profile-startup"]
+    ctx.exit(profile_startup(args))
+
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
 @click.version_option(version=__version__, prog_name="opendemo")
+@click.option(
+    "--profile-startup",
+    is_flag=True,
+    is_eager=True,
+    expose_value=False,
+    callback=_profile_startup,
+    help="输出启动阶段各模块的导入耗时",
+)
 def cli():
     """Open Demo - 智能化的编程学习辅助CLI工具
-    
+
     主要功能:
     - get: 获取已有demo或生成新demo
     - search: 搜索demo
     - new: 创建新demo
     - config: 配置管理
     - check: 运行质量检查
-    
+    - bundle: 打包内置demo库
+    - verify: 验证demo可执行性
+
     示例:
         opendemo get python logging
         opendemo search python
@@ -47,22 +102,18 @@ def cli():
     setup_logger(log_file=str(log_file))
 
 
-# 注册命令
-cli.add_command(get)
-cli.add_command(search)
-cli.add_command(new)
-cli.add_command(config)
-cli.add_command(check)
-
-
 def main():
     """主入口"""
     try:
         cli()
     except KeyboardInterrupt:
+        from utils.formatters import print_warning
+
         print_warning("\n操作已取消")
         sys.exit(0)
     except Exception as e:
+        from utils.formatters import print_error
+
         print_error(f"发生错误: {e}")
         sys.exit(1)
 
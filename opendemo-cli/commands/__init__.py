@@ -4,17 +4,7 @@ OpenDemo CLI Commands Package
 包含所有CLI命令模块和公共函数。
 """
 
-from .base import (
-    scan_output_demos,
-    match_demo_in_output,
-    update_demo_list,
-    display_output_demo,
-    display_demo_result,
-    handle_library_command,
-    update_readme_after_new,
-    update_status_md,
-    verify_demo,
-)
+import importlib
 
 __all__ = [
     'scan_output_demos',
@@ -27,3 +17,13 @@ __all__ = [
     'update_status_md',
     'verify_demo',
 ]
+
+
+# 公共函数在首次访问时才导入 commands.base，
+# 避免只执行 config 等简单命令时导入全部核心模块
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(".base", __name__), name)
+    globals()[name] = value
+    return value
@@ -5,11 +5,10 @@ OpenDemo CLI 公共函数模块
 """
 
 import sys
-import json
 import re
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 # 导入工具函数
 from utils.formatters import (
@@ -23,84 +22,36 @@ from utils.formatters import (
 from utils.logger import get_logger
 from core.readme_updater import ReadmeUpdater
 from core.demo_list_updater import DemoListUpdater
+from core.fuzzy_index import FuzzyIndex
+from core.search_index import tokenize
 
 # 常量定义
 SUPPORTED_LANGUAGES = ["python", "java", "go", "nodejs", "kubernetes", "database", "networking", "kvm", "virtualization", "sre", "security"]
 README_PATH = Path(__file__).parent.parent.parent / "README.md"
 DEMO_LIST_PATH = Path(__file__).parent.parent.parent / "demo-list.md"
 
+# 输出目录的模糊索引缓存: (输出目录, 语言) -> (版本号, 索引, demo列表)
+_fuzzy_index_cache: Dict[
+    Tuple[str, Optional[str]], Tuple[Any, FuzzyIndex, List[Dict[str, Any]]]
+] = {}
 
-def scan_output_demos(output_dir: Path, language: str) -> List[Dict[str, Any]]:
+
+def scan_output_demos(repository, language: str = None) -> List[Dict[str, Any]]:
     """
     扫描输出目录中的demo
 
     Args:
-        output_dir: 输出目录路径
-        language: 语言名称
+        repository: Demo仓库（从目录索引读取，不重复遍历输出目录）
+        language: 语言名称，None表示所有语言
 
     Returns:
         demo信息列表
     """
-    demos = []
-    lang_dir = output_dir / language.lower()
-
-    if not lang_dir.exists():
-        return demos
-
-    for item in lang_dir.iterdir():
-        if item.is_dir():
-            # 尝试读取metadata.json
-            metadata_file = item / "metadata.json"
-            if metadata_file.exists():
-                try:
-                    with open(metadata_file, "r", encoding="utf-8") as f:
-                        metadata = json.load(f)
-                    demos.append(
-                        {
-                            "path": item,
-                            "name": item.name,
-                            "language": metadata.get("language", language),
-                            "keywords": metadata.get("keywords", []),
-                            "description": metadata.get("description", ""),
-                            "difficulty": metadata.get("difficulty", "beginner"),
-                            "verified": metadata.get("verified", False),
-                            "metadata": metadata,
-                        }
-                    )
-                except Exception:
-                    # 即使没有metadata，也列出目录
-                    demos.append(
-                        {
-                            "path": item,
-                            "name": item.name,
-                            "language": language,
-                            "keywords": [],
-                            "description": "",
-                            "difficulty": "unknown",
-                            "verified": False,
-                            "metadata": {},
-                        }
-                    )
-            else:
-                # 目录存在但没有metadata，也列出
-                demos.append(
-                    {
-                        "path": item,
-                        "name": item.name,
-                        "language": language,
-                        "keywords": [],
-                        "description": "",
-                        "difficulty": "unknown",
-                        "verified": False,
-                        "metadata": {},
-                    }
-                )
-
-    return demos
+    return repository.list_output_demos(language)
 
 
 def match_demo_in_output(
-    output_dir: Path, language: str, keywords: List[str]
+    repository, language: str, keywords: List[str]
 ) -> Optional[Dict[str, Any]]:
     """
     在输出目录中匹配demo
@@ -111,14 +62,14 @@ def match_demo_in_output(
     3. 关键字在metadata的keywords中
 
     Args:
-        output_dir: 输出目录路径
+        repository: Demo仓库
         language: 语言名称
         keywords: 搜索关键字
 
     Returns:
         匹配的demo信息，未找到返回None
     """
-    demos = scan_output_demos(output_dir, language)
+    demos = scan_output_demos(repository, language)
     if not demos:
         return None
 
@@ -158,6 +109,66 @@ def match_demo_in_output(
     return None
 
 
+def fuzzy_match_demo_in_output(
+    repository, language: str, keywords: List[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    在输出目录中近似匹配demo（容忍拼写错误）
+
+    模糊索引按输出目录的版本号缓存，输出目录没有变化时不重新扫描和构建。
+
+    Args:
+        repository: Demo仓库
+        language: 语言名称
+        keywords: 搜索关键字
+
+    Returns:
+        最相似的demo信息，未找到返回None
+    """
+    index, demos = _get_output_fuzzy_index(repository, language)
+    if not demos:
+        return None
+
+    matches = index.match(keywords)
+    if matches:
+        return demos[matches[0]["doc_id"]]
+
+    return None
+
+
+def _get_output_fuzzy_index(
+    repository, language: str
+) -> Tuple[FuzzyIndex, List[Dict[str, Any]]]:
+    """
+    获取输出目录的模糊索引
+
+    Args:
+        repository: Demo仓库
+        language: 语言名称
+
+    Returns:
+        (模糊索引, 与索引文档序号一一对应的demo信息列表)
+    """
+    key = (str(repository.storage.get_output_directory()), language.lower() if language else None)
+    generation = repository.output_generation(language)
+    cached = _fuzzy_index_cache.get(key)
+    if generation is not None and cached is not None and cached[0] == generation:
+        return cached[1], cached[2]
+
+    demos = scan_output_demos(repository, language)
+    index = FuzzyIndex()
+    for doc_id, demo in enumerate(demos):
+        index.add(demo["name"], doc_id)
+        for term in list(demo.get("keywords", [])) + tokenize(demo["name"]):
+            index.add(str(term), doc_id)
+
+    if generation is None:
+        _fuzzy_index_cache.pop(key, None)
+    else:
+        _fuzzy_index_cache[key] = (generation, index, demos)
+    return index, demos
+
+
 def update_demo_list(storage, demo_list_path: Path = DEMO_LIST_PATH) -> None:
     """
     更新 demo-list.md 文件
@@ -336,6 +347,12 @@ def handle_library_command(
     # 没有精确匹配，尝试模糊搜索
     search_results = search.search_library_features(language, library_name, feature_keyword)
 
+    # 仍然没有结果，尝试容忍拼写错误的近似匹配
+    if not search_results:
+        search_results = search.fuzzy_search_library_features(
+            language, library_name, feature_keyword
+        )
+
     if search_results:
         # 显示搜索结果
         if len(search_results) == 1:
@@ -0,0 +1,58 @@
+"""
+bundle 命令模块
+
+内置demo库打包的命令实现。
+"""
+
+from pathlib import Path
+
+import click
+
+from core.config_service import ConfigService
+from core.demo_bundle import build_bundle
+from core.storage_service import StorageService
+from utils.formatters import print_error, print_info, print_success
+
+
+@click.group()
+def bundle():
+    """内置demo库打包"""
+    pass
+
+
+@bundle.command("build")
+@click.option(
+    "--source",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="demo库目录，默认为内置库",
+)
+@click.option("--output", "-o", type=click.Path(dir_okay=False, path_type=Path), help="输出文件")
+@click.option("--level", default=6, type=click.IntRange(0, 9), help="zlib压缩级别")
+def build(source, output, level):
+    """打包内置demo库为单个文件
+
+    打包后内置库的元数据和文件列表从打包文件中读取，不再遍历目录树。
+    内置库内容变化后需要重新打包；检测到目录比打包文件新时会改为读取目录并给出警告。
+
+    示例:
+        opendemo bundle build
+        opendemo bundle build --source ./demos -o demos.odb
+    """
+    config = ConfigService()
+    storage = StorageService(config)
+
+    source = source or storage.builtin_library_path
+    output = output or storage.builtin_bundle_path
+
+    if not source.is_dir():
+        print_error(f"demo库目录不存在: {source}")
+        raise SystemExit(1)
+
+    print_info(f"正在打包 {source} ...")
+    stats = build_bundle(source, output, walker=storage.walker, level=level)
+
+    print_success(f"已生成 {output}")
+    print_info(
+        f"demo {stats['demos']} 个, 文件 {stats['files']} 个 (去重后 {stats['blobs']} 个), "
+        f"{stats['raw_bytes'] / 1024 / 1024:.1f} MiB -> {stats['bundle_bytes'] / 1024 / 1024:.1f} MiB"
+    )
@@ -26,6 +26,7 @@ from utils.formatters import (
 from .base import (
     SUPPORTED_LANGUAGES,
     match_demo_in_output,
+    fuzzy_match_demo_in_output,
     display_output_demo,
     display_demo_result,
     handle_library_command,
@@ -98,7 +99,7 @@ def get(language, keywords, verify):
         print_progress(f"搜索 {language} - {topic} 的demo")
 
         # 首先在 opendemo_output/<language>/ 目录中匹配
-        matched_demo = match_demo_in_output(output_dir, language, keywords_list)
+        matched_demo = match_demo_in_output(repository, language, keywords_list)
 
         if matched_demo:
             demo_path = matched_demo["path"]
@@ -125,6 +126,31 @@ def get(language, keywords, verify):
                 sys.exit(1)
             return
 
+        # 容忍拼写错误的近似匹配，避免因拼写错误调用AI生成
+        matched_demo = fuzzy_match_demo_in_output(repository, language, keywords_list)
+
+        if matched_demo:
+            demo_path = matched_demo["path"]
+            print_success(f"在输出目录中找到近似匹配的demo: {matched_demo['name']}")
+
+            display_output_demo(matched_demo, demo_path, language)
+            return
+
+        results = search.fuzzy_search(keywords_list, language=language)
+
+        if results:
+            demo = results[0]
+            print_success(f"在本地库中找到近似匹配的demo: {demo.name}")
+
+            output_path = repository.copy_to_output(demo)
+
+            if output_path:
+                display_demo_result(demo, output_path, repository, verify, verifier, language)
+            else:
+                print_error("复制demo失败")
+                sys.exit(1)
+            return
+
     # 未找到或强制生成,使用AI生成
     if force_new:
         print_info(f"强制重新生成: {topic}")
@@ -154,7 +180,11 @@ def get(language, keywords, verify):
 
     # 生成demo
     result = generator.generate(
-        language, topic, difficulty="beginner", custom_folder_name=custom_name
+        language,
+        topic,
+        difficulty="beginner",
+        custom_folder_name=custom_name,
+        use_cache=not force_new,
     )
 
     if not result:
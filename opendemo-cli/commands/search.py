@@ -16,7 +16,7 @@ from core.storage_service import StorageService
 from core.demo_repository import DemoRepository
 from core.demo_search import DemoSearch
 from utils.formatters import print_info, print_error
-from .base import SUPPORTED_LANGUAGES, scan_output_demos
+from .base import SUPPORTED_LANGUAGES
 
 
 @click.command()
@@ -55,11 +55,11 @@ def search(language, keywords):
             "kubernetes": "Kubernetes部署配置",
         }
 
+        # 一次读取目录索引，统计所有语言的demo数量
+        counts = repository.count_output_demos()
+
         for lang in SUPPORTED_LANGUAGES:
-            # 计算该语言的demo数量
-            output_dir = storage.get_output_directory()
-            demos = scan_output_demos(output_dir, lang)
-            count = len(demos)
+            count = counts.get(lang, 0)
 
             table.add_row(lang, str(count), lang_info.get(lang, ""))
 
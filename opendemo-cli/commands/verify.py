@@ -0,0 +1,111 @@
+"""
+verify 命令模块
+
+验证demo可执行性的命令实现。
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import click
+
+from core.config_service import ConfigService
+from core.demo_repository import DemoRepository
+from core.demo_verifier import DemoVerifier
+from core.storage_service import StorageService
+from utils.formatters import print_error, print_info, print_success, print_warning
+
+
+@click.command()
+@click.argument("demo_path", required=False, type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--all", "verify_all", is_flag=True, help="验证库中的所有demo")
+@click.option("--language", "-l", help="只验证指定语言的demo")
+@click.option(
+    "--library",
+    default="all",
+    type=click.Choice(["builtin", "user", "output", "all"]),
+    help="--all 时验证的demo库",
+)
+@click.option("--jobs", "-j", type=click.IntRange(min=1), help="并行验证数，默认为CPU核数")
+@click.option(
+    "--results",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default="verify_results.jsonl",
+    show_default=True,
+    help="JSON Lines 结果文件，每完成一个demo追加一行",
+)
+@click.option("--no-cache", is_flag=True, help="忽略验证结果缓存，重新验证所有demo")
+def verify(demo_path, verify_all, language, library, jobs, results, no_cache):
+    """验证demo的可执行性
+
+    不受 enable_verification 配置影响。--all 时按语言分组并行验证，
+    单个demo超过 verification_timeout 秒记为超时。内容和工具链都没有变化的demo
+    直接使用上次通过的结果。
+
+    示例:
+        opendemo verify ./opendemo_output/python/logging-demo
+        opendemo verify --all --jobs 8
+        opendemo verify --all -l go -o go_results.jsonl
+    """
+    config = ConfigService()
+    verifier = DemoVerifier(config)
+
+    if demo_path:
+        metadata_file = demo_path / "metadata.json"
+        demo_language = language
+        if not demo_language and metadata_file.exists():
+            demo_language = json.loads(metadata_file.read_text(encoding="utf-8")).get("language")
+        if not demo_language:
+            print_error("无法确定demo语言，请使用 --language 指定")
+            sys.exit(1)
+        demos = [{"path": demo_path, "language": demo_language}]
+    elif verify_all:
+        storage = StorageService(config)
+        repository = DemoRepository(storage, config)
+        demos = [
+            {"path": demo.path, "language": demo.language}
+            for demo in repository.load_all_demos(library, language)
+            if demo.language.lower() in DemoVerifier.LANGUAGES and demo.path.is_dir()
+        ]
+    else:
+        print_error("请指定demo目录或使用 --all")
+        sys.exit(1)
+
+    if not demos:
+        print_warning("没有找到可验证的demo")
+        return
+
+    jobs = jobs or os.cpu_count() or 1
+    print_info(f"验证 {len(demos)} 个demo，并行数 {jobs}，结果写入 {results}")
+
+    done = [0]
+
+    def report(item):
+        done[0] += 1
+        if item["verified"]:
+            status = "通过(缓存)" if item["cached"] else "通过"
+        else:
+            status = "超时" if item["timed_out"] else "失败"
+        click.echo(f"[{done[0]}/{len(demos)}] {status} {item['path']} ({item['elapsed']:.1f}s)")
+        if not item["verified"]:
+            for error in item["errors"][:3]:
+                click.echo(f"    - {error}")
+
+    start = time.monotonic()
+    items = verifier.verify_many(
+        demos, jobs=jobs, results_file=results, on_result=report, use_cache=not no_cache
+    )
+    elapsed = time.monotonic() - start
+
+    failed = [item for item in items if not item["verified"]]
+    cached = sum(1 for item in items if item["cached"])
+    if cached:
+        print_info(f"{cached} 个demo内容未变化，使用缓存的验证结果")
+    if failed:
+        print_warning(f"{len(items) - len(failed)}/{len(items)} 个demo验证通过，耗时 {elapsed:.1f}s")
+        sys.exit(1)
+    print_success(f"全部 {len(items)} 个demo验证通过，耗时 {elapsed:.1f}s")
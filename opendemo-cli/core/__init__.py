@@ -3,18 +3,34 @@
 # 修复导入路径
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.demo_repository import DemoRepository, Demo
-from core.demo_search import DemoSearch
-from core.demo_generator import DemoGenerator
-from core.demo_verifier import DemoVerifier
-from core.readme_updater import ReadmeUpdater
-from core.quality_checker import QualityChecker
+import importlib
 
-# Backward compatibility aliases
-DemoManager = DemoRepository
-SearchEngine = DemoSearch
+# 导出名称 -> (模块, 属性)，首次访问时才导入，
+# 避免 import core.config_service 等轻量模块时连带导入 requests/rich 等重量级依赖
+_EXPORTS = {
+    "DemoRepository": ("core.demo_repository", "DemoRepository"),
+    "Demo": ("core.demo_repository", "Demo"),
+    "DemoSearch": ("core.demo_search", "DemoSearch"),
+    "DemoGenerator": ("core.demo_generator", "DemoGenerator"),
+    "DemoVerifier": ("core.demo_verifier", "DemoVerifier"),
+    "ReadmeUpdater": ("core.readme_updater", "ReadmeUpdater"),
+    "QualityChecker": ("core.quality_checker", "QualityChecker"),
+    # Backward compatibility aliases
+    "DemoManager": ("core.demo_repository", "DemoRepository"),
+    "SearchEngine": ("core.demo_search", "DemoSearch"),
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _EXPORTS[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "DemoRepository",
@@ -6,12 +6,22 @@ AI服务模块
 
 import json
 import time
-import requests
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 # 修复导入路径
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.http_client import (
+    DEFAULT_POOL_SIZE,
+    AsyncHTTPClient,
+    HTTPClient,
+    iter_chat_deltas,
+)
+from core.prompt_templates import SYSTEM_PROMPT, plan_demo_prompt
+from core.response_parser import DemoResponseParser
+from core.response_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, ResponseCache, cache_key
+from core.retry_policy import CircuitOpenError, RetryPolicy
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -31,6 +41,79 @@ class AIService:
         self._api_key = None
         self._api_endpoint = None
         self._model = None
+        self._http = None
+        self._async_http = None
+        self._cache = None
+        self._retry_policy = None
+
+    @property
+    def http(self) -> HTTPClient:
+        """获取复用连接的HTTP客户端"""
+        if self._http is None:
+            self._http = HTTPClient(self.config.get("ai.pool_size", DEFAULT_POOL_SIZE))
+        return self._http
+
+    @property
+    def async_http(self) -> AsyncHTTPClient:
+        """获取复用连接的异步HTTP客户端"""
+        if self._async_http is None:
+            self._async_http = AsyncHTTPClient(
+                self.config.get("ai.pool_size", DEFAULT_POOL_SIZE), sync_client=self.http
+            )
+        return self._async_http
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """获取重试策略，同一服务实例的所有调用共享退避和熔断状态"""
+        if self._retry_policy is None:
+            self._retry_policy = RetryPolicy.from_config(self.config)
+        return self._retry_policy
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """获取响应缓存，未启用 ai.cache 时返回None"""
+        if self._cache is None and self.config.get("ai.cache", False):
+            cache_dir = self.config.get("cache_directory") or Path.home() / ".opendemo" / "cache"
+            self._cache = ResponseCache(
+                Path(cache_dir) / "ai_responses.db",
+                ttl=self.config.get("ai.cache_ttl", DEFAULT_TTL),
+                max_entries=self.config.get("ai.cache_max_entries", DEFAULT_MAX_ENTRIES),
+            )
+        return self._cache
+
+    def _cached_response(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        查找请求的缓存响应
+
+        Args:
+            request: API请求体
+
+        Returns:
+            缓存的响应内容，未启用缓存或未命中返回None
+        """
+        cache = self.cache
+        return cache.get(cache_key(request)) if cache else None
+
+    def _store_response(self, request: Dict[str, Any], response: str) -> None:
+        """缓存解析成功的结果，解析失败的响应不缓存，重试时仍会请求接口"""
+        cache = self.cache
+        if cache:
+            cache.put(cache_key(request), response)
+
+    def close(self) -> None:
+        """关闭HTTP连接池和响应缓存"""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    async def aclose(self) -> None:
+        """关闭异步HTTP连接池"""
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
 
     def _load_config(self):
         """加载AI配置"""
@@ -42,7 +125,7 @@ class AIService:
             self._model = self.config.get("ai.model", "gpt-4")
 
     def generate_demo(
-        self, language: str, topic: str, difficulty: str = "beginner"
+        self, language: str, topic: str, difficulty: str = "beginner", use_cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         生成demo代码
@@ -51,6 +134,8 @@ class AIService:
             language: 编程语言
             topic: 主题
             difficulty: 难度级别
+            use_cache: 是否使用缓存的响应；False时总是请求接口（如强制重新生成），
+                新的响应仍会写入缓存
 
         Returns:
             包含代码和文档的字典,失败返回None
@@ -61,32 +146,102 @@ class AIService:
             logger.error("AI API key is not configured")
             return None
 
-        # 构建prompt
-        prompt = self._build_prompt(language, topic, difficulty)
-
-        # 调用API
-        retry_times = self.config.get("ai.retry_times", 3)
-        retry_interval = self.config.get("ai.retry_interval", 5)
-
-        for attempt in range(retry_times):
+        # 构建prompt，按难度确定输出预算
+        plan = self._plan_prompt(language, topic, difficulty)
+        prompt, max_tokens = plan["prompt"], plan["max_tokens"]
+
+        # 相同请求（模型、温度、prompt）优先使用缓存的响应
+        request = self._build_request(prompt, max_tokens)
+        cached = self._cached_response(request) if use_cache else None
+        if cached:
+            demo_data = self._parse_response(cached, language, topic)
+            if demo_data:
+                logger.info(f"Using cached AI response for {language} - {topic}")
+                return demo_data
+
+        # 调用API，按重试策略退避；响应无法解析时立即重试
+        policy = self.retry_policy
+        attempt = 0
+
+        while True:
+            attempt += 1
+            # 边接收边解析，流式响应中每个文件到达时即解出
+            parser = DemoResponseParser()
             try:
-                response = self._call_api(prompt)
-                if response:
-                    # 解析响应
-                    demo_data = self._parse_response(response, language, topic)
-                    if demo_data:
-                        return demo_data
-
+                policy.before_call()
+                self._call_api(prompt, on_delta=parser.feed, max_tokens=max_tokens)
+            except CircuitOpenError as e:
+                logger.error(f"API call skipped: {e}")
+                return None
             except Exception as e:
-                logger.error(f"API call failed (attempt {attempt + 1}/{retry_times}): {e}")
+                policy.record_failure(e)
+                logger.error(f"API call failed (attempt {attempt}/{policy.max_attempts}): {e}")
+                if not policy.should_retry(attempt, e):
+                    break
+                time.sleep(policy.delay(attempt, e))
+                continue
+
+            policy.record_success()
+            # 响应不完整时保留已完整的文件，只补请求缺失的部分
+            demo_data = self._demo_from_parser(parser, language, topic) or self._salvage(
+                prompt, parser, language, topic, max_tokens
+            )
+            if demo_data:
+                self._store_response(request, json.dumps(demo_data, ensure_ascii=False))
+                return demo_data
 
-                if attempt < retry_times - 1:
-                    time.sleep(retry_interval)
-                    continue
+            if not policy.should_retry(attempt):
+                break
 
         logger.error("Failed to generate demo after all retries")
         return None
 
+    async def agenerate_demo(
+        self, language: str, topic: str, difficulty: str = "beginner", use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        异步生成demo代码（单次请求）
+
+        与 generate_demo 不同，这里不做重试，请求异常直接抛出，
+        由调用方统一调度重试和限流（见 DemoGenerator.generate_many）。
+
+        Args:
+            language: 编程语言
+            topic: 主题
+            difficulty: 难度级别
+            use_cache: 是否使用缓存的响应，见 generate_demo
+
+        Returns:
+            包含代码和文档的字典,未配置密钥或响应无法解析返回None
+
+        Raises:
+            HTTPError: 接口返回错误状态码，429 时带 retry_after
+        """
+        self._load_config()
+
+        if not self._api_key:
+            logger.error("AI API key is not configured")
+            return None
+
+        plan = self._plan_prompt(language, topic, difficulty)
+        prompt, max_tokens = plan["prompt"], plan["max_tokens"]
+        request = self._build_request(prompt, max_tokens)
+        cached = self._cached_response(request) if use_cache else None
+        if cached:
+            demo_data = self._parse_response(cached, language, topic)
+            if demo_data:
+                logger.info(f"Using cached AI response for {language} - {topic}")
+                return demo_data
+
+        parser = DemoResponseParser()
+        await self._acall_api(prompt, on_delta=parser.feed, max_tokens=max_tokens)
+        demo_data = self._demo_from_parser(parser, language, topic)
+        if not demo_data:
+            demo_data = await self._asalvage(prompt, parser, language, topic, max_tokens)
+        if demo_data:
+            self._store_response(request, json.dumps(demo_data, ensure_ascii=False))
+        return demo_data
+
     def _build_prompt(self, language: str, topic: str, difficulty: str) -> str:
         """
         构建生成prompt
@@ -99,118 +254,128 @@ class AIService:
         Returns:
             prompt文本
         """
-        # 根据语言确定规范
-        coding_standard = {"python": "PEP 8", "java": "Google Java Style Guide"}.get(
-            language.lower(), "industry best practices"
-        )
-
-        # 根据语言确定依赖文件
-        dependency_file = {"python": "requirements.txt", "java": "pom.xml or build.gradle"}.get(
-            language.lower(), "dependency file"
-        )
+        return self._plan_prompt(language, topic, difficulty)["prompt"]
 
-        prompt = f"""你是一位经验丰富的{language}编程导师和代码示例生成器。
-
-任务:为"{topic}"主题生成一个完整的、可执行的{language} demo示例。
-
-要求:
-1. 生成1-3个代码文件,每个文件聚焦一个具体场景,展示不同的用法
-2. 代码必须包含详细的中文注释,解释关键逻辑和概念
-3. 严格遵循{language}的{coding_standard}编码规范
-4. 生成完整的README.md实操文档(中文),必须包含:
-   - Demo标题和简介
-   - 学习目标
-   - 环境要求(Python/Java版本等)
-   - 安装依赖的详细步骤
-   - 文件说明
-   - 逐步实操指南(每一步都要有具体命令和预期输出)
-   - 代码解析(解释关键代码段)
-   - 预期输出示例
-   - 常见问题解答
-   - 扩展学习建议
-5. 生成{dependency_file}依赖声明文件
-6. 提供metadata.json元数据,包含:
-   - name: demo名称
-   - language: {language}
-   - keywords: 关键字数组(3-5个)
-   - description: 简短描述(一句话)
-   - difficulty: {difficulty}
-   - dependencies: 依赖信息对象
-
-输出格式:
-请以JSON格式返回,结构如下:
-{{
-  "metadata": {{
-    "name": "demo名称(必须是英文,如: nodejs-callback-functions-demo)",
-    "folder_name": "目录名称(必须是英文,小写,用连字符分隔,如: callback-functions-demo)",
-    "language": "{language}",
-    "keywords": ["关键字1", "关键字2", "关键字3"],
-    "description": "简短描述",
-    "difficulty": "{difficulty}",
-    "dependencies": {{}}
-  }},
-  "files": [
-    {{
-      "path": "README.md",
-      "content": "完整的README内容"
-    }},
-    {{
-      "path": "code/example1.py",
-      "content": "代码文件内容"
-    }},
-    {{
-      "path": "{dependency_file.split()[0]}",
-      "content": "依赖声明内容"
-    }}
-  ]
-}}
+    def _plan_prompt(self, language: str, topic: str, difficulty: str) -> Dict[str, Any]:
+        """
+        构建生成prompt并确定输出预算
 
-约束:
-- 代码总行数控制在50-300行之间
-- 使用稳定版本的库和API
-- 确保Windows/Linux/Mac跨平台兼容
-- 代码必须可以直接运行,不需要额外修改
-- README.md必须包含完整的操作步骤,让初学者也能轻松运行
+        Args:
+            language: 编程语言
+            topic: 主题
+            difficulty: 难度级别
 
-请直接返回JSON,不要包含任何其他文字说明。"""
+        Returns:
+            prompt/prompt_tokens/max_tokens/trimmed，见 plan_demo_prompt
+        """
+        return plan_demo_prompt(
+            language,
+            topic,
+            difficulty,
+            max_tokens=self.config.get("ai.max_tokens", 4000),
+            context_window=self.config.get("ai.context_window"),
+        )
 
-        return prompt
+    def _headers(self) -> Dict[str, str]:
+        """API请求头"""
+        return {"Content-Type": "application/json", "Authorization": f"Bearer {self._api_key}"}
 
-    def _call_api(self, prompt: str) -> Optional[str]:
+    def _build_request(self, prompt: str, max_tokens: int = None) -> Dict[str, Any]:
         """
-        调用LLM API
+        构建生成demo的API请求体
 
         Args:
             prompt: 提示文本
+            max_tokens: 输出token预算，None使用 ai.max_tokens
 
         Returns:
-            API响应内容,失败返回None
+            请求体，启用 ai.stream 时包含 "stream": true
         """
-        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {self._api_key}"}
-
         data = {
             "model": self._model,
             "messages": [
-                {
-                    "role": "system",
-                    "content": "你是一个专业的编程教学助手,擅长生成高质量的代码示例和教程。",
-                },
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
             "temperature": self.config.get("ai.temperature", 0.7),
-            "max_tokens": self.config.get("ai.max_tokens", 4000),
+            "max_tokens": max_tokens or self.config.get("ai.max_tokens", 4000),
         }
+        if self.config.get("ai.stream", False):
+            data["stream"] = True
+        return data
+
+    def _call_api(
+        self, prompt: str, on_delta: Callable[[str], None] = None, max_tokens: int = None
+    ) -> Optional[str]:
+        """
+        调用LLM API
+
+        通过复用连接的会话发送请求；启用 ai.stream 时以 SSE 流式接收，
+        每收到一段文本就调用 on_delta，调用方可以边接收边解析。
+
+        Args:
+            prompt: 提示文本
+            on_delta: 流式接收时每段增量文本的回调
+            max_tokens: 输出token预算，None使用 ai.max_tokens
 
+        Returns:
+            API响应内容,失败返回None
+        """
+        data = self._build_request(prompt, max_tokens)
         timeout = self.config.get("ai.timeout", 60)
 
         logger.info(f"Calling AI API with model {self._model}")
 
-        response = requests.post(self._api_endpoint, headers=headers, json=data, timeout=timeout)
+        if data.get("stream"):
+            chunks = []
+            events = self.http.stream_sse(self._api_endpoint, data, self._headers(), timeout)
+            for text in iter_chat_deltas(events):
+                chunks.append(text)
+                if on_delta:
+                    on_delta(text)
+            return "".join(chunks)
+
+        result = self.http.post_json(self._api_endpoint, data, self._headers(), timeout)
+        content = result["choices"][0]["message"]["content"]
+        if on_delta:
+            on_delta(content)
+
+        return content
+
+    async def _acall_api(
+        self, prompt: str, on_delta: Callable[[str], None] = None, max_tokens: int = None
+    ) -> Optional[str]:
+        """
+        异步调用LLM API，参数与返回值同 _call_api
+
+        Args:
+            prompt: 提示文本
+            on_delta: 流式接收时每段增量文本的回调
+            max_tokens: 输出token预算，None使用 ai.max_tokens
+
+        Returns:
+            API响应内容,失败返回None
+        """
+        data = self._build_request(prompt, max_tokens)
+        timeout = self.config.get("ai.timeout", 60)
 
-        response.raise_for_status()
+        logger.info(f"Calling AI API with model {self._model}")
 
-        result = response.json()
+        if data.get("stream"):
+            chunks = []
+            async for event in self.async_http.stream_sse(
+                self._api_endpoint, data, self._headers(), timeout
+            ):
+                for text in iter_chat_deltas([event]):
+                    chunks.append(text)
+                    if on_delta:
+                        on_delta(text)
+            return "".join(chunks)
+
+        result = await self.async_http.post_json(self._api_endpoint, data, self._headers(), timeout)
         content = result["choices"][0]["message"]["content"]
+        if on_delta:
+            on_delta(content)
 
         return content
 
@@ -226,73 +391,211 @@ class AIService:
         Returns:
             解析后的demo数据,失败返回None
         """
-        try:
-            # 提取JSON内容
-            response = response.strip()
+        parser = DemoResponseParser()
+        parser.feed(response)
+        return self._demo_from_parser(parser, language, topic)
 
-            # 尝试找到JSON部分
-            # 如果直接以 { 开头，就是纯JSON，直接解析
-            if response.startswith("{"):
-                pass  # 直接解析
-            elif "```json" in response:
-                # 找到```json后的内容，使用最后一个```作为结束
-                start = response.find("```json") + 7
-                end = response.rfind("```")
-                if end > start:
-                    response = response[start:end].strip()
-            elif response.startswith("```"):
-                # 响应以```开头但不是```json
-                start = response.find("\n") + 1
-                end = response.rfind("```")
-                if end > start:
-                    response = response[start:end].strip()
+    def _demo_from_parser(
+        self, parser: DemoResponseParser, language: str, topic: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        从解析器中取出完整的demo数据
 
-            # 解析JSON
-            data = json.loads(response)
+        Args:
+            parser: 已输入完整响应的解析器
+            language: 编程语言
+            topic: 主题
 
-            # 验证必需字段
-            if "metadata" not in data or "files" not in data:
-                logger.error("Response missing required fields")
-                return None
+        Returns:
+            demo数据，响应不完整或缺少必需字段返回None
+        """
+        if parser.metadata is None or not parser.files:
+            logger.error("Response missing required fields")
+            return None
+        if not parser.intact:
+            logger.warning(
+                f"Incomplete AI response: {len(parser.files)} files parsed, "
+                f"{len(parser.broken)} malformed, truncated={not parser.complete}"
+            )
+            return None
 
-            # 确保metadata包含必需字段
-            metadata = data["metadata"]
-            if "name" not in metadata:
-                metadata["name"] = f"{language}-{topic}"
-            if "language" not in metadata:
-                metadata["language"] = language
-            if "keywords" not in metadata:
-                metadata["keywords"] = [topic]
-
-            # 如果没有folder_name，从name或topic生成一个英文的folder_name
-            if "folder_name" not in metadata or not metadata["folder_name"]:
-                # 尝试从topic生成
-                folder_name = topic.lower().replace(" ", "-").replace("_", "-")
-                # 只保留ASCII字符
-                folder_name = "".join(
-                    c for c in folder_name if c.isascii() and (c.isalnum() or c == "-")
-                )
-                while "--" in folder_name:
-                    folder_name = folder_name.replace("--", "-")
-                folder_name = folder_name.strip("-")
-                if folder_name:
-                    metadata["folder_name"] = folder_name
-                else:
-                    # 最后回退：使用时间戳
-                    import time
-
-                    metadata["folder_name"] = f"demo-{int(time.time())}"
-
-            logger.info(f"Successfully parsed AI response for {metadata['name']}")
-            return data
+        metadata = self._complete_metadata(parser.metadata, language, topic)
+        logger.info(f"Successfully parsed AI response for {metadata['name']}")
+        return {"metadata": metadata, "files": parser.files}
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
-            logger.debug(f"Response content: {response[:500]}")
+    def _complete_metadata(self, metadata: Dict[str, Any], language: str, topic: str) -> Dict[str, Any]:
+        """
+        补全metadata的必需字段
+
+        Args:
+            metadata: AI返回的metadata
+            language: 编程语言
+            topic: 主题
+
+        Returns:
+            补全后的metadata（原地修改）
+        """
+        if "name" not in metadata:
+            metadata["name"] = f"{language}-{topic}"
+        if "language" not in metadata:
+            metadata["language"] = language
+        if "keywords" not in metadata:
+            metadata["keywords"] = [topic]
+
+        # 如果没有folder_name，从name或topic生成一个英文的folder_name
+        if "folder_name" not in metadata or not metadata["folder_name"]:
+            # 尝试从topic生成
+            folder_name = topic.lower().replace(" ", "-").replace("_", "-")
+            # 只保留ASCII字符
+            folder_name = "".join(
+                c for c in folder_name if c.isascii() and (c.isalnum() or c == "-")
+            )
+            while "--" in folder_name:
+                folder_name = folder_name.replace("--", "-")
+            folder_name = folder_name.strip("-")
+            if folder_name:
+                metadata["folder_name"] = folder_name
+            else:
+                # 最后回退：使用时间戳
+                metadata["folder_name"] = f"demo-{int(time.time())}"
+
+        return metadata
+
+    def _build_repair_prompt(self, prompt: str, parser: DemoResponseParser) -> Optional[str]:
+        """
+        为不完整的响应构建补充请求的prompt
+
+        Args:
+            prompt: 原始prompt
+            parser: 原始响应的解析器
+
+        Returns:
+            只要求缺失文件的prompt；没有可保留的内容（无metadata或无完整文件）时返回None，
+            由调用方整体重试
+        """
+        if parser.intact or parser.metadata is None or not parser.files:
             return None
+
+        received = ", ".join(info["path"] for info in parser.files)
+        missing = parser.missing_paths
+        if missing:
+            request = f"以下文件缺失或内容格式错误,请重新生成: {', '.join(missing)}"
+            if not parser.complete:
+                request += ",以及其后尚未生成的其他文件"
+        else:
+            request = "上次的响应在中途被截断,请生成尚未生成的其余文件"
+
+        return f"""{prompt}
+
+补充说明:
+上次的响应不完整,已完整收到的文件: {received}
+{request}。
+不要重复已收到的文件,也不需要metadata,请只返回如下JSON:
+{{
+  "files": [
+    {{
+      "path": "文件路径",
+      "content": "文件内容"
+    }}
+  ]
+}}"""
+
+    def _merge_repair(
+        self,
+        parser: DemoResponseParser,
+        repair_parser: DemoResponseParser,
+        language: str,
+        topic: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        合并原始响应中完整的文件和补充请求返回的文件
+
+        Args:
+            parser: 原始响应的解析器
+            repair_parser: 补充请求响应的解析器
+            language: 编程语言
+            topic: 主题
+
+        Returns:
+            合并后的demo数据；补充的响应没有覆盖全部缺失文件，或原始响应被截断而补充的
+            响应不完整时返回None（此时无法确定demo是否完整，由调用方整体重试）
+        """
+        files = list(parser.files)
+        received = {info["path"] for info in files}
+        for info in repair_parser.files:
+            if info["path"] not in received:
+                received.add(info["path"])
+                files.append(info)
+
+        missing = [path for path in parser.missing_paths if path not in received]
+        if missing or (not parser.complete and not repair_parser.intact):
+            logger.warning(
+                f"Repair response incomplete, missing: {', '.join(missing) or 'remaining files'}"
+            )
+            return None
+
+        metadata = self._complete_metadata(parser.metadata, language, topic)
+        logger.info(
+            f"Salvaged {len(parser.files)} files for {metadata['name']}, "
+            f"re-requested {len(files) - len(parser.files)}"
+        )
+        return {"metadata": metadata, "files": files}
+
+    def _salvage(
+        self,
+        prompt: str,
+        parser: DemoResponseParser,
+        language: str,
+        topic: str,
+        max_tokens: int = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        补请求不完整响应中缺失的文件
+
+        Args:
+            prompt: 原始prompt
+            parser: 原始响应的解析器
+            language: 编程语言
+            topic: 主题
+            max_tokens: 输出token预算
+
+        Returns:
+            合并后的demo数据，无法补救返回None
+        """
+        repair_prompt = self._build_repair_prompt(prompt, parser)
+        if not repair_prompt:
+            return None
+
+        repair_parser = DemoResponseParser()
+        try:
+            self._call_api(repair_prompt, on_delta=repair_parser.feed, max_tokens=max_tokens)
+        except Exception as e:
+            logger.warning(f"Failed to re-request missing files: {e}")
+            return None
+        return self._merge_repair(parser, repair_parser, language, topic)
+
+    async def _asalvage(
+        self,
+        prompt: str,
+        parser: DemoResponseParser,
+        language: str,
+        topic: str,
+        max_tokens: int = None,
+    ) -> Optional[Dict[str, Any]]:
+        """异步补请求不完整响应中缺失的文件，参数与返回值同 _salvage"""
+        repair_prompt = self._build_repair_prompt(prompt, parser)
+        if not repair_prompt:
+            return None
+
+        repair_parser = DemoResponseParser()
+        try:
+            await self._acall_api(
+                repair_prompt, on_delta=repair_parser.feed, max_tokens=max_tokens
+            )
         except Exception as e:
-            logger.error(f"Failed to parse response: {e}")
+            logger.warning(f"Failed to re-request missing files: {e}")
             return None
+        return self._merge_repair(parser, repair_parser, language, topic)
 
     def validate_api_key(self) -> bool:
         """
@@ -308,20 +611,14 @@ class AIService:
 
         try:
             # 发送一个简单的测试请求
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self._api_key}",
-            }
-
             data = {
                 "model": self._model,
                 "messages": [{"role": "user", "content": "test"}],
                 "max_tokens": 5,
             }
 
-            response = requests.post(self._api_endpoint, headers=headers, json=data, timeout=10)
-
-            return response.status_code == 200
+            self.http.post_json(self._api_endpoint, data, self._headers(), timeout=10)
+            return True
 
         except Exception as e:
             logger.error(f"API key validation failed: {e}")
@@ -377,11 +674,6 @@ class AIService:
 只返回JSON，不要其他文字。"""
 
         try:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self._api_key}",
-            }
-
             data = {
                 "model": self._model,
                 "messages": [
@@ -397,18 +689,21 @@ class AIService:
 
             timeout = self.config.get("ai.timeout", 30)
 
-            logger.info(f"Classifying keyword '{keyword}' for language {language}")
+            cached = self._cached_response(data)
+            if cached:
+                logger.info(f"Using cached classification for keyword '{keyword}'")
+                return self._parse_classify_response(cached, keyword)
 
-            response = requests.post(
-                self._api_endpoint, headers=headers, json=data, timeout=timeout
-            )
+            logger.info(f"Classifying keyword '{keyword}' for language {language}")
 
-            response.raise_for_status()
-            result = response.json()
+            result = self.http.post_json(self._api_endpoint, data, self._headers(), timeout)
             content = result["choices"][0]["message"]["content"].strip()
 
-            # 解析JSON响应
-            return self._parse_classify_response(content, keyword)
+            # 解析JSON响应，解析失败时 confidence 为0，不缓存
+            classification = self._parse_classify_response(content, keyword)
+            if classification["confidence"]:
+                self._store_response(data, content)
+            return classification
 
         except Exception as e:
             logger.warning(f"AI classification failed: {e}, using heuristic detection")
@@ -0,0 +1,309 @@
+"""
+内容寻址存储模块
+
+demo中的文件按内容哈希保存为只读blob，demo本身记录为清单（相对路径 -> 哈希）。
+大量demo共用的样板文件（测试桩、docker-compose.yml、模板README等）只存一份；
+物化时从blob克隆（reflink），不支持克隆时复制；blob被所有demo共享，不会硬链接到
+输出目录或用户库中，修改物化出的文件不会影响blob和其他demo。
+
+目录结构:
+    <root>/objects/ab/cdef...    blob，只读；可执行文件另存为 cdef....x
+    <root>/manifests/<key>.json  源目录的清单，key为源目录绝对路径的哈希
+
+清单中记录了每个文件的大小和修改时间以及每个目录的修改时间。get_manifest 在这些都
+没有变化时直接使用保存的清单（只需 stat，不遍历目录）；有变化时才重新 ingest，
+且只哈希变化了的文件。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 修复导入路径
+import sys
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.materializer import (
+    STRATEGY_AUTO,
+    STRATEGY_COPY,
+    STRATEGY_REFLINK,
+    file_digest,
+    materialize_files,
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_VERSION = 1
+
+_BLOB_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+_EXEC_BITS = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
+
+class BlobStore:
+    """内容寻址的demo文件存储"""
+
+    def __init__(self, root: Path):
+        """
+        初始化存储
+
+        Args:
+            root: 存储根目录
+        """
+        self.root = Path(root)
+        self.objects_path = self.root / "objects"
+        self.manifests_path = self.root / "manifests"
+        # 本进程内已确认或生成的清单，源目录绝对路径 -> 清单
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+
+    def blob_path(self, digest: str, executable: bool = False) -> Path:
+        """
+        获取blob路径
+
+        Args:
+            digest: 内容哈希
+            executable: 是否为可执行文件
+
+        Returns:
+            blob路径
+        """
+        name = digest[2:] + (".x" if executable else "")
+        return self.objects_path / digest[:2] / name
+
+    def has(self, digest: str, executable: bool = False) -> bool:
+        """判断blob是否存在"""
+        return self.blob_path(digest, executable).exists()
+
+    def put_file(self, path: Path, executable: bool = False) -> str:
+        """
+        保存文件内容
+
+        Args:
+            path: 文件路径
+            executable: 是否保存为可执行blob
+
+        Returns:
+            内容哈希
+        """
+        digest = file_digest(path)
+        blob_path = self.blob_path(digest, executable)
+        if not blob_path.exists():
+            self._write_blob(blob_path, lambda tmp: shutil.copyfile(path, tmp), executable)
+        return digest
+
+    def put_bytes(self, data: bytes, executable: bool = False) -> str:
+        """
+        保存字节内容
+
+        Args:
+            data: 内容
+            executable: 是否保存为可执行blob
+
+        Returns:
+            内容哈希
+        """
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        blob_path = self.blob_path(digest, executable)
+        if not blob_path.exists():
+            self._write_blob(blob_path, lambda tmp: Path(tmp).write_bytes(data), executable)
+        return digest
+
+    def read_bytes(self, digest: str) -> Optional[bytes]:
+        """
+        读取blob内容
+
+        Args:
+            digest: 内容哈希
+
+        Returns:
+            内容，blob不存在返回None
+        """
+        for executable in (False, True):
+            try:
+                return self.blob_path(digest, executable).read_bytes()
+            except FileNotFoundError:
+                continue
+        return None
+
+    def ingest(self, source: Path) -> Dict[str, Any]:
+        """
+        把目录收录到存储中并返回清单
+
+        大小和修改时间与上次清单一致的文件直接复用上次的哈希。
+
+        Args:
+            source: 源目录
+
+        Returns:
+            清单: {"version", "source", "dirs": [...], "dir_mtimes": {相对路径: mtime_ns},
+            "files": {相对路径: {digest, size, mtime_ns, mode}}}
+        """
+        source = Path(source).absolute()
+        previous = self._manifests.get(str(source)) or self._load_manifest(source)
+        previous_files = previous["files"] if previous else {}
+
+        files = {}
+        dirs = []
+        # 目录的修改时间在遍历其内容之前记录，遍历期间的改动会在下次检查时发现
+        dir_mtimes = {"": os.stat(source).st_mtime_ns}
+        stack = [("", str(source))]
+        while stack:
+            rel_dir, dir_path = stack.pop()
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if entry.is_dir():
+                        dirs.append(rel_path)
+                        dir_mtimes[rel_path] = entry.stat().st_mtime_ns
+                        stack.append((rel_path, entry.path))
+                        continue
+
+                    st = entry.stat()
+                    mode = stat.S_IMODE(st.st_mode)
+                    executable = bool(mode & _EXEC_BITS)
+                    old = previous_files.get(rel_path)
+                    if (
+                        old
+                        and old["size"] == st.st_size
+                        and old["mtime_ns"] == st.st_mtime_ns
+                        and old["mode"] == mode
+                        and self.has(old["digest"], executable)
+                    ):
+                        digest = old["digest"]
+                    else:
+                        digest = self.put_file(Path(entry.path), executable)
+
+                    files[rel_path] = {
+                        "digest": digest,
+                        "size": st.st_size,
+                        "mtime_ns": st.st_mtime_ns,
+                        "mode": mode,
+                    }
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "source": str(source),
+            "dirs": sorted(dirs),
+            "dir_mtimes": dict(sorted(dir_mtimes.items())),
+            "files": dict(sorted(files.items())),
+        }
+        if manifest != previous:
+            self._save_manifest(source, manifest)
+        self._manifests[str(source)] = manifest
+        return manifest
+
+    def get_manifest(self, source: Path) -> Dict[str, Any]:
+        """
+        获取目录的清单
+
+        保存的清单中所有目录和文件的修改时间（以及文件大小、权限）都没有变化时直接返回，
+        不遍历目录也不检查blob；否则重新 ingest。目录的修改时间反映其中条目的增删和改名，
+        文件的修改时间反映原地修改。
+
+        Args:
+            source: 源目录
+
+        Returns:
+            清单，格式同 ingest
+        """
+        source = Path(source).absolute()
+        manifest = self._manifests.get(str(source)) or self._load_manifest(source)
+        if manifest is not None and self._is_current(source, manifest):
+            self._manifests[str(source)] = manifest
+            return manifest
+        return self.ingest(source)
+
+    @staticmethod
+    def _is_current(source: Path, manifest: Dict[str, Any]) -> bool:
+        """判断清单记录的修改时间是否与源目录一致"""
+        dir_mtimes = manifest.get("dir_mtimes")
+        if dir_mtimes is None:
+            return False
+        try:
+            for rel_dir, mtime_ns in dir_mtimes.items():
+                if os.stat(source / rel_dir).st_mtime_ns != mtime_ns:
+                    return False
+            for rel_path, info in manifest["files"].items():
+                st = os.stat(source / rel_path)
+                if (
+                    st.st_mtime_ns != info["mtime_ns"]
+                    or st.st_size != info["size"]
+                    or stat.S_IMODE(st.st_mode) != info["mode"]
+                ):
+                    return False
+        except OSError:
+            return False
+        return True
+
+    def materialize(
+        self, manifest: Dict[str, Any], target: Path, strategy: str = STRATEGY_AUTO
+    ) -> Dict[str, int]:
+        """
+        按清单在目标路径生成demo目录
+
+        目标是用户可以编辑的输出目录或用户库，而blob被所有demo共享，因此从不硬链接：
+        copy 以外的策略都按 reflink 处理（不支持时复制），生成的文件恢复源文件的权限。
+
+        Args:
+            manifest: ingest 返回的清单
+            target: 目标目录
+            strategy: 物化策略，auto/reflink/hardlink/copy
+
+        Returns:
+            统计信息: cloned/copied/skipped/removed（linked 始终为0）
+        """
+        strategy = STRATEGY_COPY if strategy == STRATEGY_COPY else STRATEGY_REFLINK
+        files = {}
+        for rel_path, info in manifest["files"].items():
+            blob_path = self.blob_path(info["digest"], bool(info["mode"] & _EXEC_BITS))
+            files[rel_path] = (str(blob_path), info["mode"], info["digest"])
+        return materialize_files(files, target, strategy, dirs=manifest["dirs"])
+
+    def _write_blob(self, blob_path: Path, write, executable: bool) -> None:
+        """写入临时文件后重命名为blob，并发写入同一blob时结果相同"""
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob_path.parent / f".{blob_path.name}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            write(tmp)
+            os.chmod(tmp, _BLOB_MODE | (_EXEC_BITS if executable else 0))
+            os.replace(tmp, blob_path)
+        except BaseException:
+            if tmp.exists():
+                tmp.unlink()
+            raise
+
+    def _manifest_path(self, source: Path) -> Path:
+        """获取源目录对应的清单路径"""
+        key = hashlib.blake2b(str(source).encode("utf-8"), digest_size=16).hexdigest()
+        return self.manifests_path / f"{key}.json"
+
+    def _load_manifest(self, source: Path) -> Optional[Dict[str, Any]]:
+        """读取上次的清单，不存在或无效返回None"""
+        try:
+            with open(self._manifest_path(source), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("source") != str(source):
+            return None
+        return manifest
+
+    def _save_manifest(self, source: Path, manifest: Dict[str, Any]) -> None:
+        """原子写入清单"""
+        path = self._manifest_path(source)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.parent / f".{path.name}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            if tmp.exists():
+                tmp.unlink()
+            logger.warning(f"Failed to save manifest for {source}: {e}")
+
@@ -10,7 +10,8 @@ from typing import Dict, Any
 # 修复导入路径
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -27,16 +28,33 @@ class ConfigService:
         "enable_verification": False,
         "verification_method": "venv",
         "verification_timeout": 300,
+        "verification_venv_pool": True,  # Python验证复用按依赖缓存的虚拟环境(~/.opendemo/cache/venvs)
+        "verification_venv_pool_mb": 2048,  # 虚拟环境池的磁盘预算(MB),超出时淘汰最久未用的环境
+        "verification_cache": True,  # 内容和工具链未变化的demo复用上次通过的验证结果(~/.opendemo/cache/verification.db)
+        "verification_go_offline": False,  # Go验证只使用共享缓存中的模块,缺少时不联网下载
+        "verification_npm_registry": None,  # Node.js验证使用的npm仓库地址,None使用npm自身配置
+        "cache_directory": None,  # 将在初始化时设置为 ~/.opendemo/cache
+        "builtin_bundle": None,  # 内置库打包文件路径,None表示内置库目录旁的 builtin_demos.odb
         "ai": {
             "provider": "openai",
             "api_key": "${API_KEY}",
             "api_endpoint": "",
             "model": "gpt-4",
             "temperature": 0.7,
-            "max_tokens": 4000,
+            "max_tokens": 8000,  # 输出token上限，实际按难度和文件数估算预算，不超过此值
+            "context_window": 8192,  # 模型上下文窗口，prompt加输出预算超出时先精简prompt
             "timeout": 60,
             "retry_times": 3,
-            "retry_interval": 5,
+            "retry_interval": 5,  # 首次重试的退避时间(秒)，之后指数增长并加随机抖动
+            "retry_max_interval": 60,  # 退避时间上限(秒)
+            "circuit_failure_threshold": 5,  # 连续失败多少次后熔断，0表示不熔断
+            "circuit_reset_timeout": 30,  # 熔断后多久放行试探请求(秒)
+            "stream": False,  # 以SSE流式接收生成结果
+            "pool_size": 4,  # HTTP连接池大小
+            "requests_per_minute": 20,  # 批量生成时每分钟最多请求数，0表示不限
+            "cache": True,  # 缓存AI响应(~/.opendemo/cache/ai_responses.db)
+            "cache_ttl": 604800,  # 缓存有效期(秒)，0表示不过期
+            "cache_max_entries": 1000,  # 缓存条目上限，超出时淘汰最久未使用的
         },
         "contribution": {
             "auto_prompt": True,
@@ -49,6 +67,16 @@ class ConfigService:
             "page_size": 10,
             "verbose": False,
         },
+        "performance": {
+            "catalog": True,  # 使用持久化目录索引加速demo加载
+            "max_scan_depth": None,  # 扫描demo目录的最大深度,None表示不限制
+            "prune_demo_roots": False,  # 找到demo后不再扫描其子目录
+            "io_workers": 8,  # 并行读取元数据文件的线程数,1表示顺序读取
+            "materialize": "auto",  # 复制demo的方式: auto/reflink/hardlink/copy
+            "fsync_writes": True,  # 保存demo后fsync,保证断电后不出现不完整的demo
+            "blob_store": False,  # 按内容哈希存储demo文件,相同文件只存一份;仅在支持reflink的文件系统(btrfs/XFS等)上启用,否则自动关闭
+            "bundle": True,  # 内置库有打包文件(builtin_demos.odb)时从中读取
+        },
     }
 
     def __init__(self):
@@ -76,6 +104,10 @@ class ConfigService:
         logs_dir = user_dir / "logs"
         logs_dir.mkdir(exist_ok=True)
 
+        # 创建cache目录
+        cache_dir = user_dir / "cache"
+        cache_dir.mkdir(exist_ok=True)
+
     def load(self) -> Dict[str, Any]:
         """
         加载配置,合并全局配置和项目配置
@@ -92,6 +124,8 @@ class ConfigService:
         # 设置user_demo_library默认值
         if config["user_demo_library"] is None:
             config["user_demo_library"] = str(Path.home() / ".opendemo" / "demos")
+        if config["cache_directory"] is None:
+            config["cache_directory"] = str(Path.home() / ".opendemo" / "cache")
 
         # 加载全局配置
         if self.global_config_path.exists():
@@ -236,6 +270,8 @@ class ConfigService:
         # 设置user_demo_library
         if config["user_demo_library"] is None:
             config["user_demo_library"] = str(Path.home() / ".opendemo" / "demos")
+        if config["cache_directory"] is None:
+            config["cache_directory"] = str(Path.home() / ".opendemo" / "cache")
 
         if api_key:
             config["ai"]["api_key"] = api_key
@@ -0,0 +1,423 @@
+"""
+Demo打包模块
+
+把内置demo库打包为单个文件，通过 mmap 读取：打开时只解析固定长度的头部，demo表和文件表
+都是定长记录，查找时直接在映射文件上二分，不解压也不解析整个索引，启动耗时不随库的大小增长。
+
+文件格式（小端）:
+    头部     magic(8) | 版本(u32) | 标志(u32) | demo表偏移(u64) | demo数(u32)
+             | 文件表偏移(u64) | 文件数(u32) | 构建ID(16)
+    数据区   各文件的 zlib 压缩内容（内容相同的文件只存一份），随后是各demo的元数据JSON
+             和常用字段JSON（[名称, 语言, 难度, 关键字, 是否已验证]，均不压缩）
+    路径区   所有相对路径的 UTF-8 文本
+    demo表   每个demo一条记录: 路径偏移(u64) | 路径长度(u32) | 元数据偏移(u64) | 元数据长度(u32)
+             | 常用字段偏移(u64) | 常用字段长度(u32)
+    文件表   每个文件一条记录: 路径偏移(u64) | 路径长度(u32) | 偏移(u64) | 压缩长度(u32)
+             | 原始长度(u64) | 权限(u32) | 内容哈希(16)
+             两个表都按相对路径的 UTF-8 字节序排序，前缀查询用二分查找
+
+相对路径以 / 分隔，相对于打包时的库根目录。
+"""
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+import uuid
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 修复导入路径
+import sys
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.demo_catalog import DemoFields, demo_fields
+from core.demo_walker import METADATA_FILE, DemoWalker
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BUNDLE_MAGIC = b"ODBUNDLE"
+BUNDLE_VERSION = 3
+BUNDLE_SUFFIX = ".odb"
+
+_HEADER = struct.Struct("<8sIIQIQI16s")
+# 两种记录都以 路径偏移 | 路径长度 开头
+_PATH_REF = struct.Struct("<QI")
+_DEMO_RECORD = struct.Struct("<QIQIQI")
+_FILE_RECORD = struct.Struct("<QIQIQI16s")
+
+# 打包时跳过的目录：版本控制、缓存和依赖目录，不属于demo内容
+SKIP_DIRS = frozenset({".git", "__pycache__", ".pytest_cache", ".venv", "venv", "node_modules"})
+
+
+def build_bundle(
+    source: Path, output: Path, walker: DemoWalker = None, level: int = 6
+) -> Dict[str, int]:
+    """
+    把demo库目录打包为单个文件
+
+    先写入同目录的临时文件，完成后重命名，读取中的旧包不受影响。
+
+    Args:
+        source: demo库根目录
+        output: 输出文件路径
+        walker: 查找demo使用的遍历器，与目录索引保持一致
+        level: zlib 压缩级别
+
+    Returns:
+        统计信息: demos/files/blobs/raw_bytes/bundle_bytes
+    """
+    source = Path(source)
+    output = Path(output)
+    walker = walker or DemoWalker()
+
+    demo_rels = sorted(
+        (_relative(source, path) for path in walker.find_demos(source)), key=_sort_key
+    )
+
+    file_rels = []
+    for dir_path, dir_names, file_names in os.walk(source):
+        dir_names[:] = sorted(name for name in dir_names if name not in SKIP_DIRS)
+        for name in file_names:
+            file_path = Path(dir_path) / name
+            # 跳过失效的符号链接等非普通文件
+            if file_path.is_file():
+                file_rels.append(_relative(source, file_path))
+    file_rels.sort(key=_sort_key)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.parent / f".{output.name}.{uuid.uuid4().hex[:8]}.tmp"
+    stats = {"demos": 0, "files": 0, "blobs": 0, "raw_bytes": 0, "bundle_bytes": 0}
+
+    try:
+        with open(tmp, "wb") as f:
+            f.write(b"\0" * _HEADER.size)
+
+            # 文件内容
+            blobs = {}
+            files = []
+            for rel in file_rels:
+                file_path = source / rel
+                try:
+                    data = file_path.read_bytes()
+                    mode = file_path.stat().st_mode & 0o777
+                except OSError as e:
+                    logger.warning(f"Skipping unreadable file {file_path}: {e}")
+                    continue
+
+                digest = hashlib.blake2b(data, digest_size=16).digest()
+                if digest not in blobs:
+                    payload = zlib.compress(data, level)
+                    blobs[digest] = (f.tell(), len(payload))
+                    f.write(payload)
+                offset, clen = blobs[digest]
+                files.append((rel, offset, clen, len(data), mode, digest))
+                stats["raw_bytes"] += len(data)
+
+            # 元数据和常用字段，无效的demo不打包
+            demos = []
+            for rel in demo_rels:
+                metadata = _read_metadata(source / rel / METADATA_FILE)
+                if metadata is None:
+                    continue
+                data = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+                fields = json.dumps(demo_fields(metadata), ensure_ascii=False).encode("utf-8")
+                demos.append((rel, f.tell(), len(data), f.tell() + len(data), len(fields)))
+                f.write(data)
+                f.write(fields)
+
+            # 路径区
+            build_hash = hashlib.blake2b(digest_size=16)
+            paths = {}
+            for rel in [entry[0] for entry in demos] + [entry[0] for entry in files]:
+                if rel not in paths:
+                    data = rel.encode("utf-8")
+                    paths[rel] = (f.tell(), len(data))
+                    f.write(data)
+                    build_hash.update(data)
+
+            # demo表和文件表
+            demo_table_offset = f.tell()
+            for rel, *values in demos:
+                record = _DEMO_RECORD.pack(*paths[rel], *values)
+                f.write(record)
+                build_hash.update(record)
+            file_table_offset = f.tell()
+            for rel, *values in files:
+                record = _FILE_RECORD.pack(*paths[rel], *values)
+                f.write(record)
+                build_hash.update(record)
+
+            f.seek(0)
+            f.write(
+                _HEADER.pack(
+                    BUNDLE_MAGIC,
+                    BUNDLE_VERSION,
+                    0,
+                    demo_table_offset,
+                    len(demos),
+                    file_table_offset,
+                    len(files),
+                    build_hash.digest(),
+                )
+            )
+
+        os.replace(tmp, output)
+    except BaseException:
+        if tmp.exists():
+            tmp.unlink()
+        raise
+
+    stats.update(
+        demos=len(demos),
+        files=len(files),
+        blobs=len(blobs),
+        bundle_bytes=output.stat().st_size,
+    )
+    logger.info(f"Built demo bundle {output}: {stats}")
+    return stats
+
+
+class DemoBundle:
+    """只读的demo包，通过 mmap 访问"""
+
+    def __init__(self, path: Path):
+        """
+        打开demo包
+
+        Args:
+            path: 包文件路径
+
+        Raises:
+            ValueError: 文件不是有效的demo包
+            OSError: 文件无法读取
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (
+                magic,
+                version,
+                _,
+                demo_table_offset,
+                demo_count,
+                file_table_offset,
+                file_count,
+                build_id,
+            ) = _HEADER.unpack_from(self._mm)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ValueError(f"Not a demo bundle (version {BUNDLE_VERSION}): {self.path}")
+            # 只引用映射中的两段记录，不逐条解析
+            self._demos = _RecordTable(self._mm, demo_table_offset, demo_count, _DEMO_RECORD)
+            self._files = _RecordTable(self._mm, file_table_offset, file_count, _FILE_RECORD)
+        except (struct.error, ValueError) as e:
+            self._mm.close()
+            raise ValueError(f"Invalid demo bundle {self.path}: {e}")
+
+        self.build_id = build_id.hex()
+
+    def close(self) -> None:
+        """关闭映射"""
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_demos(self, rel_root: str = "") -> List[Tuple[str, str, DemoFields]]:
+        """
+        获取目录下所有demo的元数据文本和常用字段
+
+        只解码每个demo的常用字段，完整元数据以文本返回，由调用方按需解码。
+
+        Args:
+            rel_root: 相对库根目录的路径，空字符串表示整个库
+
+        Returns:
+            (demo相对路径, 元数据JSON文本, 常用字段) 列表，按路径排序；不含 rel_root 本身
+        """
+        start, end = _prefix_range(self._demos, rel_root)
+        result = []
+        for i in range(start, end):
+            _, _, offset, length, fields_offset, fields_length = self._demos.record(i)
+            name, language, difficulty, keywords, verified = json.loads(
+                self._mm[fields_offset : fields_offset + fields_length]
+            )
+            result.append(
+                (
+                    self._demos[i].decode("utf-8"),
+                    self._mm[offset : offset + length].decode("utf-8"),
+                    (name, language, difficulty, tuple(keywords), verified),
+                )
+            )
+        return result
+
+    def metadata_text(self, rel: str) -> Optional[str]:
+        """
+        获取demo的元数据JSON文本
+
+        Args:
+            rel: demo相对路径
+
+        Returns:
+            元数据JSON文本，不是demo返回None
+        """
+        i = _find(self._demos, rel)
+        if i is None:
+            return None
+        _, _, offset, length, _, _ = self._demos.record(i)
+        return self._mm[offset : offset + length].decode("utf-8")
+
+    def has_dir(self, rel: str) -> bool:
+        """目录下是否有打包的文件"""
+        start, end = _prefix_range(self._files, rel)
+        return end > start
+
+    def has_file(self, rel: str) -> bool:
+        """文件是否已打包"""
+        return _find(self._files, rel) is not None
+
+    def list_files(self, rel_dir: str) -> List[Dict[str, Any]]:
+        """
+        列出目录下的所有文件（含子目录）
+
+        Args:
+            rel_dir: 目录相对路径
+
+        Returns:
+            文件信息列表: path(相对 rel_dir)/size/mode/digest
+        """
+        start, end = _prefix_range(self._files, rel_dir)
+        prefix_length = len(rel_dir.encode("utf-8")) + 1 if rel_dir else 0
+        result = []
+        for i in range(start, end):
+            _, _, _, _, size, mode, digest = self._files.record(i)
+            result.append(
+                {
+                    "path": self._files[i][prefix_length:].decode("utf-8"),
+                    "size": size,
+                    "mode": mode,
+                    "digest": digest.hex(),
+                }
+            )
+        return result
+
+    def read_file(self, rel: str) -> Optional[bytes]:
+        """
+        读取文件内容
+
+        Args:
+            rel: 文件相对路径
+
+        Returns:
+            文件内容，不存在返回None
+        """
+        i = _find(self._files, rel)
+        if i is None:
+            return None
+        _, _, offset, clen, _, _, _ = self._files.record(i)
+        return zlib.decompress(self._mm[offset : offset + clen])
+
+    def extract(self, rel_dir: str, target: Path) -> int:
+        """
+        把目录下的文件解出到目标目录
+
+        Args:
+            rel_dir: 目录相对路径
+            target: 目标目录（应为新建的空目录）
+
+        Returns:
+            解出的文件数
+        """
+        target = Path(target)
+        count = 0
+        for info in self.list_files(rel_dir):
+            file_path = target / info["path"]
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            rel = f"{rel_dir}/{info['path']}" if rel_dir else info["path"]
+            file_path.write_bytes(self.read_file(rel))
+            os.chmod(file_path, info["mode"])
+            count += 1
+        return count
+
+
+class _RecordTable:
+    """
+    映射文件中按路径排序的定长记录表
+
+    下标访问返回记录的路径（UTF-8 字节），可以直接用 bisect 二分查找；
+    记录只在访问时从映射中解析。
+    """
+
+    def __init__(self, mm: mmap.mmap, offset: int, count: int, record: struct.Struct):
+        if offset + count * record.size > len(mm):
+            raise ValueError("Record table is out of range")
+        self._mm = mm
+        self._offset = offset
+        self._count = count
+        self._record = record
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        position = self._offset + i * self._record.size
+        path_offset, path_length = _PATH_REF.unpack_from(self._mm, position)
+        return self._mm[path_offset : path_offset + path_length]
+
+    def record(self, i: int) -> tuple:
+        """解析第 i 条记录"""
+        return self._record.unpack_from(self._mm, self._offset + i * self._record.size)
+
+
+def _relative(root: Path, path: Path) -> str:
+    """相对路径，以 / 分隔"""
+    return path.relative_to(root).as_posix()
+
+
+def _sort_key(rel: str) -> bytes:
+    """打包时的排序键，与读取时二分查找比较的 UTF-8 字节一致"""
+    return rel.encode("utf-8")
+
+
+def _find(sorted_rels: Sequence[bytes], rel: str) -> Optional[int]:
+    """二分查找路径在有序表中的位置，不存在返回None"""
+    key = rel.encode("utf-8")
+    i = bisect.bisect_left(sorted_rels, key)
+    if i == len(sorted_rels) or sorted_rels[i] != key:
+        return None
+    return i
+
+
+def _prefix_range(sorted_rels: Sequence[bytes], rel_dir: str) -> Tuple[int, int]:
+    """二分查找目录下所有条目在有序表中的范围（不含目录本身）"""
+    if not rel_dir:
+        return 0, len(sorted_rels)
+    prefix = rel_dir.encode("utf-8")
+    # "/" 之后的下一个字节是 "0"，前缀相同的条目都落在 [prefix + "/", prefix + "0") 之间
+    return (
+        bisect.bisect_left(sorted_rels, prefix + b"/"),
+        bisect.bisect_left(sorted_rels, prefix + b"0"),
+    )
+
+
+def _read_metadata(file_path: Path) -> Optional[Dict[str, Any]]:
+    """读取元数据JSON，无效返回None"""
+    try:
+        metadata = json.loads(file_path.read_text(encoding="utf-8"))
+        if not isinstance(metadata, dict):
+            raise ValueError("metadata must be a JSON object")
+        return metadata
+    except Exception as e:
+        logger.error(f"Failed to load metadata from {file_path}: {e}")
+        return None
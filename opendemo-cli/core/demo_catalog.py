@@ -0,0 +1,776 @@
+"""
+Demo目录索引模块
+
+将demo库中所有 metadata.json / _library.json 的解析结果持久化到
+~/.opendemo/cache 下的 SQLite 文件，并记录每个目录的 mtime 和 inode。
+刷新时只对记录过的路径执行 stat，仅重新遍历 mtime 发生变化的子树，
+并以 added / removed / modified 事件的形式通知订阅者和写入变更日志。
+"""
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import functools
+import json
+import os
+import sqlite3
+import stat
+import threading
+import time
+from typing import Dict, Any, Optional, List, Tuple, Callable
+from core.parallel_io import imap_ordered
+from core.demo_walker import DemoWalker, METADATA_FILE
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 目录索引结构版本，结构变化时递增以丢弃旧数据
+SCHEMA_VERSION = 5
+
+LIBRARY_FILE = "_library.json"
+
+# demo常用字段: (名称, 语言, 难度, 关键字, 是否已验证)，名称缺失时为None
+DemoFields = Tuple[Optional[str], Any, Any, Tuple[Any, ...], Any]
+
+# 变更事件类型
+EVENT_ADDED = "added"
+EVENT_REMOVED = "removed"
+EVENT_MODIFIED = "modified"
+
+# 变更日志保留的最大条数
+JOURNAL_LIMIT = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (
+    root TEXT PRIMARY KEY,
+    rules TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    scanned_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    root TEXT NOT NULL,
+    rel TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    PRIMARY KEY (root, rel)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    root TEXT NOT NULL,
+    rel TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    metadata TEXT,
+    name TEXT,
+    language TEXT,
+    difficulty TEXT,
+    keywords TEXT,
+    verified INTEGER,
+    PRIMARY KEY (root, rel, kind)
+);
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    root TEXT NOT NULL,
+    rel TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    event TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+);
+"""
+
+
+def _synchronized(method: Callable) -> Callable:
+    """串行执行使用数据库连接的方法，使同一个索引可以在多个线程中使用"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class DemoCatalog:
+    """Demo目录索引类
+
+    以"根目录"为单位缓存扫描结果。每个根目录记录:
+    - 扫描过的所有子目录及其 mtime / inode（用于发现新增/删除的目录）
+    - 每个 demo 的 metadata.json 和每个库的 _library.json 内容及其 mtime
+    - demo的常用字段（名称、语言、难度、关键字、验证状态）单独成列，
+      读取demo列表时不需要解码完整元数据；元数据文本原样保存，只在读入时校验一次
+
+    刷新时:
+    - 目录消失或 inode 变化: 删除整个子树
+    - 目录 mtime 变化: 只重新列出该目录的直接子项，新出现的子目录才会被完整遍历
+    - 元数据文件 mtime 变化: 重新解析该文件
+    """
+
+    def __init__(
+        self, db_path: Path, walker: Optional[DemoWalker] = None, io_workers: Optional[int] = None
+    ):
+        """
+        初始化目录索引
+
+        Args:
+            db_path: SQLite 数据库文件路径
+            walker: 目录遍历器，决定跳过哪些目录，None表示使用默认规则
+            io_workers: 并行读取元数据文件的线程数，None表示使用默认值，1表示顺序读取
+        """
+        self.db_path = Path(db_path)
+        self.walker = walker or DemoWalker()
+        self.io_workers = io_workers
+        self._conn: Optional[sqlite3.Connection] = None
+        # 连接在线程间共享（如批量生成时在线程池中保存demo），由锁串行访问
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+    # ==================== 查询接口 ====================
+
+    def get_demos(self, root: Path) -> List[Tuple[Path, Dict[str, Any]]]:
+        """
+        获取根目录下所有demo及其元数据
+
+        Args:
+            root: 扫描根目录
+
+        Returns:
+            (demo路径, 元数据) 列表，按路径排序；元数据解析失败的demo不包含在内
+        """
+        entries = self._get_entries(root, METADATA_FILE)
+        return [(path, json.loads(text)) for path, text, _ in entries]
+
+    def get_demo_records(self, root: Path) -> List[Tuple[Path, str, DemoFields]]:
+        """
+        获取根目录下所有demo的常用字段和未解码的元数据文本
+
+        常用字段直接取自索引中的列，不解码元数据，由调用方按需解码。
+
+        Args:
+            root: 扫描根目录
+
+        Returns:
+            (demo路径, 元数据JSON文本, 常用字段) 列表，按路径排序
+        """
+        return self._get_entries(root, METADATA_FILE)
+
+    def get_libraries(self, root: Path) -> List[Tuple[Path, Dict[str, Any]]]:
+        """
+        获取根目录下所有包含 _library.json 的库目录
+
+        Args:
+            root: 扫描根目录
+
+        Returns:
+            (库目录路径, 库元数据) 列表，按路径排序
+        """
+        entries = self._get_entries(root, LIBRARY_FILE)
+        return [(path, json.loads(text)) for path, text, _ in entries]
+
+    @_synchronized
+    def get_dirs(self, root: Path, depth: int) -> List[Path]:
+        """
+        获取根目录下指定深度的目录（无论是否包含元数据文件）
+
+        Args:
+            root: 扫描根目录
+            depth: 相对根目录的深度，直接子目录为1
+
+        Returns:
+            目录路径列表，按路径排序
+        """
+        root = Path(root)
+        if not root.is_dir():
+            return []
+
+        root_key = str(root.absolute())
+
+        try:
+            self.refresh(root)
+            rels = [
+                row[0]
+                for row in self._connect().execute(
+                    "SELECT rel FROM dirs WHERE root = ? ORDER BY rel", (root_key,)
+                )
+            ]
+        except sqlite3.Error as e:
+            logger.warning(f"Demo catalog unavailable, scanning {root} directly: {e}")
+            dirs, _ = self._scan(root_key)
+            rels = sorted(rel for rel, _, _ in dirs)
+
+        return [root / rel for rel in rels if _depth(rel) == depth]
+
+    def add_listener(self, listener: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """
+        订阅变更事件
+
+        Args:
+            listener: 回调函数，参数为事件列表，每个事件包含
+                event/kind/path/metadata_text(未解码的JSON文本)/fields(demo常用字段)
+        """
+        self._listeners.append(listener)
+
+    @_synchronized
+    def refresh(self, root: Path) -> List[Dict[str, Any]]:
+        """
+        增量刷新根目录的索引
+
+        Args:
+            root: 扫描根目录
+
+        Returns:
+            本次刷新产生的变更事件列表
+        """
+        root_key = str(Path(root).absolute())
+        conn = self._connect()
+
+        row = conn.execute("SELECT rules FROM roots WHERE root = ?", (root_key,)).fetchone()
+        if row is None or row[0] != self.walker.signature:
+            # 从未扫描过，或遍历规则已变化
+            events = self._initial_scan(conn, root_key)
+        else:
+            with conn:
+                events = self._incremental_scan(conn, root_key)
+                self._record_journal(conn, root_key, events)
+                if events:
+                    conn.execute(
+                        "UPDATE roots SET generation = ? WHERE root = ?",
+                        (time.time_ns(), root_key),
+                    )
+
+        if events:
+            logger.debug(f"Catalog refreshed {root_key}: {len(events)} changes")
+            for listener in self._listeners:
+                listener(events)
+
+        return events
+
+    @_synchronized
+    def generation(self, root: Path) -> Optional[int]:
+        """
+        获取根目录索引的版本号，每次刷新产生变更时更新
+
+        派生数据（如搜索索引）可以用它判断自身是否过期。
+
+        Args:
+            root: 扫描根目录
+
+        Returns:
+            版本号，尚未扫描返回None
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT generation FROM roots WHERE root = ?", (str(Path(root).absolute()),)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    @_synchronized
+    def changes_since(self, seq: int = 0, root: Path = None) -> List[Dict[str, Any]]:
+        """
+        读取变更日志
+
+        Args:
+            seq: 只返回序号大于该值的记录
+            root: 只返回该根目录的记录，None表示全部
+
+        Returns:
+            变更记录列表，每项包含 seq/event/kind/path/recorded_at
+        """
+        query = "SELECT seq, root, rel, kind, event, recorded_at FROM journal WHERE seq > ?"
+        params: List[Any] = [seq]
+        if root is not None:
+            query += " AND root = ?"
+            params.append(str(Path(root).absolute()))
+        query += " ORDER BY seq"
+
+        try:
+            rows = self._connect().execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read catalog journal: {e}")
+            return []
+
+        return [
+            {
+                "seq": row_seq,
+                "event": event,
+                "kind": kind,
+                "path": Path(root_key) / rel,
+                "recorded_at": recorded_at,
+            }
+            for row_seq, root_key, rel, kind, event, recorded_at in rows
+        ]
+
+    @_synchronized
+    def invalidate(self, path: Path) -> None:
+        """
+        将路径标记为已修改，下次刷新时强制重新检查
+
+        用于文件系统 mtime 精度不足以区分紧邻的两次写入的情况。
+
+        Args:
+            path: 发生变化的路径（demo目录或其中的文件）
+        """
+        target = str(Path(path).absolute())
+        try:
+            conn = self._connect()
+            with conn:
+                for (root_key,) in conn.execute("SELECT root FROM roots").fetchall():
+                    if target != root_key and not target.startswith(root_key + os.sep):
+                        continue
+                    rel = os.path.relpath(target, root_key)
+                    # 标记该路径下的元数据文件
+                    conn.execute(
+                        "UPDATE entries SET mtime_ns = -1 WHERE root = ? AND (rel = ? OR "
+                        "substr(rel, 1, ?) = ?)",
+                        (root_key, rel, len(rel) + 1, rel + os.sep),
+                    )
+                    # 标记最近的已记录祖先目录，使其子项被重新列出
+                    while True:
+                        cursor = conn.execute(
+                            "UPDATE dirs SET mtime_ns = -1 WHERE root = ? AND rel = ?",
+                            (root_key, rel),
+                        )
+                        if cursor.rowcount or rel == ".":
+                            break
+                        rel = os.path.dirname(rel) or "."
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to invalidate catalog for {path}: {e}")
+
+    @_synchronized
+    def clear(self) -> None:
+        """清空目录索引"""
+        try:
+            conn = self._connect()
+            with conn:
+                for table in ("roots", "dirs", "entries", "journal"):
+                    conn.execute(f"DELETE FROM {table}")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to clear catalog: {e}")
+
+    @_synchronized
+    def close(self) -> None:
+        """关闭数据库连接"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ==================== 内部辅助方法 ====================
+
+    @_synchronized
+    def _get_entries(self, root: Path, kind: str) -> List[Tuple[Path, str, Optional[DemoFields]]]:
+        """
+        刷新根目录后读取指定类型的条目
+
+        Args:
+            root: 扫描根目录
+            kind: 条目类型（METADATA_FILE 或 LIBRARY_FILE）
+
+        Returns:
+            (路径, 元数据JSON文本, 常用字段) 列表，元数据无效的条目不包含在内
+        """
+        root = Path(root)
+        if not root.is_dir():
+            return []
+
+        root_key = str(root.absolute())
+
+        try:
+            self.refresh(root)
+            rows = [
+                (rel, text, _fields_from_row(columns))
+                for rel, text, *columns in self._connect().execute(
+                    "SELECT rel, metadata, name, language, difficulty, keywords, verified "
+                    "FROM entries WHERE root = ? AND kind = ? ORDER BY rel",
+                    (root_key, kind),
+                )
+            ]
+        except sqlite3.Error as e:
+            # 索引不可用时直接扫描，保证功能不受影响
+            logger.warning(f"Demo catalog unavailable, scanning {root} directly: {e}")
+            _, entries = self._scan(root_key)
+            rows = sorted(
+                (rel, text, fields) for rel, k, _, text, fields in entries if k == kind
+            )
+
+        return [(root / rel, text, fields) for rel, text, fields in rows if text is not None]
+
+    def _connect(self) -> sqlite3.Connection:
+        """打开（必要时创建）数据库连接"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.executescript(
+                    "DROP TABLE IF EXISTS roots;"
+                    "DROP TABLE IF EXISTS dirs;"
+                    "DROP TABLE IF EXISTS entries;"
+                    "DROP TABLE IF EXISTS journal;"
+                )
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _initial_scan(self, conn: sqlite3.Connection, root_key: str) -> List[Dict[str, Any]]:
+        """首次完整扫描根目录，不写入变更日志"""
+        with conn:
+            self._drop_subtree(conn, root_key, ".")
+            events = self._add_subtree(conn, root_key, ".")
+            conn.execute(
+                "INSERT OR REPLACE INTO roots (root, rules, generation, scanned_at) "
+                "VALUES (?, ?, ?, ?)",
+                (root_key, self.walker.signature, time.time_ns(), time.time()),
+            )
+        logger.debug(f"Catalog scanned {root_key}: {len(events)} entries")
+        return events
+
+    def _incremental_scan(self, conn: sqlite3.Connection, root_key: str) -> List[Dict[str, Any]]:
+        """
+        根据记录的 mtime / inode 增量刷新根目录
+
+        Returns:
+            变更事件列表
+        """
+        events = []
+        removed: List[str] = []
+
+        # 父目录排在子目录之前，根目录最先处理
+        recorded = conn.execute(
+            "SELECT rel, mtime_ns, ino FROM dirs WHERE root = ?", (root_key,)
+        ).fetchall()
+        recorded.sort(key=lambda row: (row[0] != ".", row[0]))
+
+        for rel, mtime_ns, ino in recorded:
+            if any(_is_under(rel, prefix) for prefix in removed):
+                continue
+
+            st = _stat(os.path.join(root_key, rel))
+            if st is None or not stat.S_ISDIR(st.st_mode) or st.st_ino != ino:
+                # 目录被删除或被替换
+                events.extend(self._drop_subtree(conn, root_key, rel))
+                removed.append(rel)
+                if st is not None and stat.S_ISDIR(st.st_mode):
+                    events.extend(self._add_subtree(conn, root_key, rel))
+                continue
+
+            if st.st_mtime_ns != mtime_ns:
+                events.extend(self._sync_dir(conn, root_key, rel, st))
+
+        # 检查内容被原地修改的元数据文件
+        modified = []
+        for rel, kind, mtime_ns in conn.execute(
+            "SELECT rel, kind, mtime_ns FROM entries WHERE root = ?", (root_key,)
+        ).fetchall():
+            st = _stat(os.path.join(root_key, rel, kind))
+            if st is not None and st.st_mtime_ns != mtime_ns:
+                modified.append((rel, kind))
+
+        contents = self._read_entries(
+            [os.path.join(root_key, rel, kind) for rel, kind in modified]
+        )
+        for (rel, kind), (file_mtime_ns, text, fields) in zip(modified, contents):
+            conn.execute(
+                "UPDATE entries SET mtime_ns = ?, metadata = ?, name = ?, language = ?, "
+                "difficulty = ?, keywords = ?, verified = ? WHERE root = ? AND rel = ? "
+                "AND kind = ?",
+                (file_mtime_ns, text, *_fields_to_row(fields), root_key, rel, kind),
+            )
+            events.append(_event(EVENT_MODIFIED, root_key, rel, kind, text, fields))
+
+        conn.execute("UPDATE roots SET scanned_at = ? WHERE root = ?", (time.time(), root_key))
+        return events
+
+    def _sync_dir(
+        self, conn: sqlite3.Connection, root_key: str, rel: str, st: os.stat_result
+    ) -> List[Dict[str, Any]]:
+        """
+        重新列出 mtime 变化的目录的直接子项
+
+        新出现的子目录会被完整遍历；消失的子目录由其自身的 stat 检查处理。
+        """
+        events = []
+        full_path = os.path.join(root_key, rel)
+        child_dirs, file_names = self.walker.list_dir(full_path)
+
+        for name in child_dirs:
+            child_rel = name if rel == "." else os.path.join(rel, name)
+            known = conn.execute(
+                "SELECT 1 FROM dirs WHERE root = ? AND rel = ?", (root_key, child_rel)
+            ).fetchone()
+            if not self.walker.should_descend(_depth(rel), file_names):
+                # 目录变成了不再向下遍历的demo目录，丢弃其子树记录
+                if known is not None:
+                    events.extend(self._drop_subtree(conn, root_key, child_rel))
+            elif known is None:
+                # 新增的子目录
+                events.extend(self._add_subtree(conn, root_key, child_rel))
+
+        # 本目录中出现或消失的元数据文件
+        for kind in (METADATA_FILE, LIBRARY_FILE):
+            if kind == METADATA_FILE and rel == ".":
+                continue
+            exists = kind in file_names
+            row = conn.execute(
+                "SELECT 1 FROM entries WHERE root = ? AND rel = ? AND kind = ?",
+                (root_key, rel, kind),
+            ).fetchone()
+            if exists and row is None:
+                file_path = os.path.join(full_path, kind)
+                file_mtime_ns, text, fields = self._read_entries([file_path])[0]
+                conn.execute(
+                    "INSERT INTO entries (root, rel, kind, mtime_ns, metadata, name, language, "
+                    "difficulty, keywords, verified) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (root_key, rel, kind, file_mtime_ns, text, *_fields_to_row(fields)),
+                )
+                events.append(_event(EVENT_ADDED, root_key, rel, kind, text, fields))
+            elif not exists and row is not None:
+                conn.execute(
+                    "DELETE FROM entries WHERE root = ? AND rel = ? AND kind = ?",
+                    (root_key, rel, kind),
+                )
+                events.append(_event(EVENT_REMOVED, root_key, rel, kind, None, None))
+
+        conn.execute(
+            "UPDATE dirs SET mtime_ns = ?, ino = ? WHERE root = ? AND rel = ?",
+            (st.st_mtime_ns, st.st_ino, root_key, rel),
+        )
+        return events
+
+    def _add_subtree(self, conn: sqlite3.Connection, root_key: str, rel: str) -> List[Dict[str, Any]]:
+        """遍历并写入一个新子树，返回 added 事件"""
+        dirs, entries = self._scan(root_key, rel)
+        conn.executemany(
+            "INSERT OR REPLACE INTO dirs (root, rel, mtime_ns, ino) VALUES (?, ?, ?, ?)",
+            [(root_key, d_rel, mtime_ns, ino) for d_rel, mtime_ns, ino in dirs],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO entries (root, rel, kind, mtime_ns, metadata, name, language, "
+            "difficulty, keywords, verified) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (root_key, e_rel, kind, mtime_ns, text, *_fields_to_row(fields))
+                for e_rel, kind, mtime_ns, text, fields in entries
+            ],
+        )
+        return [
+            _event(EVENT_ADDED, root_key, e_rel, kind, text, fields)
+            for e_rel, kind, _, text, fields in entries
+        ]
+
+    def _drop_subtree(self, conn: sqlite3.Connection, root_key: str, rel: str) -> List[Dict[str, Any]]:
+        """删除一个子树的全部记录，返回 removed 事件"""
+        if rel == ".":
+            where, params = "root = ?", (root_key,)
+        else:
+            where = "root = ? AND (rel = ? OR substr(rel, 1, ?) = ?)"
+            params = (root_key, rel, len(rel) + 1, rel + os.sep)
+
+        events = [
+            _event(EVENT_REMOVED, root_key, e_rel, kind, None, None)
+            for e_rel, kind in conn.execute(f"SELECT rel, kind FROM entries WHERE {where}", params)
+        ]
+        conn.execute(f"DELETE FROM entries WHERE {where}", params)
+        conn.execute(f"DELETE FROM dirs WHERE {where}", params)
+        return events
+
+    def _record_journal(
+        self, conn: sqlite3.Connection, root_key: str, events: List[Dict[str, Any]]
+    ) -> None:
+        """将变更事件写入变更日志，并裁剪旧记录"""
+        if not events:
+            return
+        now = time.time()
+        conn.executemany(
+            "INSERT INTO journal (root, rel, kind, event, recorded_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                (root_key, os.path.relpath(str(e["path"]), root_key), e["kind"], e["event"], now)
+                for e in events
+            ],
+        )
+        conn.execute(
+            "DELETE FROM journal WHERE seq <= (SELECT MAX(seq) FROM journal) - ?",
+            (JOURNAL_LIMIT,),
+        )
+
+    def _scan(
+        self, root_key: str, start_rel: str = "."
+    ) -> Tuple[
+        List[Tuple[str, int, int]], List[Tuple[str, str, int, Optional[str], Optional[DemoFields]]]
+    ]:
+        """
+        遍历子树，收集目录 mtime / inode 和元数据文件
+
+        Args:
+            root_key: 根目录绝对路径
+            start_rel: 起始子目录（相对根目录）
+
+        Returns:
+            (目录列表[(相对路径, mtime, inode)],
+             条目列表[(相对路径, 类型, mtime, JSON文本, 常用字段)])
+        """
+        dirs = []
+        pending = []
+        start_path = os.path.normpath(os.path.join(root_key, start_rel))
+
+        for dirpath, _, file_names in self.walker.walk(start_path, _depth(start_rel)):
+            rel = os.path.relpath(dirpath, root_key)
+            st = _stat(dirpath)
+            if st is None:
+                continue
+            dirs.append((rel, st.st_mtime_ns, st.st_ino))
+
+            for kind in (METADATA_FILE, LIBRARY_FILE):
+                # 与原 rglob 行为一致：根目录本身不算作demo
+                if kind not in file_names or (kind == METADATA_FILE and rel == "."):
+                    continue
+                pending.append((rel, kind))
+
+        # 遍历完成后统一并行读取元数据文件
+        contents = self._read_entries(
+            [os.path.join(root_key, rel, kind) for rel, kind in pending]
+        )
+        entries = [
+            (rel, kind, mtime_ns, text, fields)
+            for (rel, kind), (mtime_ns, text, fields) in zip(pending, contents)
+        ]
+
+        return dirs, entries
+
+    def _read_entries(
+        self, file_paths: List[str]
+    ) -> List[Tuple[int, Optional[str], Optional[DemoFields]]]:
+        """
+        读取元数据文件：线程池并行读取原始内容，本线程按顺序校验
+
+        Args:
+            file_paths: 文件路径列表
+
+        Returns:
+            [(mtime, JSON文本, demo常用字段)]，顺序与输入一致
+        """
+        return [
+            (mtime_ns, *_decode_json_text(file_path, data))
+            for file_path, (mtime_ns, data) in zip(
+                file_paths, imap_ordered(_read_raw, file_paths, self.io_workers)
+            )
+        ]
+
+
+def demo_fields(metadata: Dict[str, Any]) -> DemoFields:
+    """
+    提取demo常用字段
+
+    Args:
+        metadata: demo元数据
+
+    Returns:
+        (名称, 语言, 难度, 关键字, 是否已验证)，名称缺失时为None
+    """
+    keywords = metadata.get("keywords", ())
+    if isinstance(keywords, str):
+        keywords = (keywords,)
+    return (
+        metadata.get("name"),
+        metadata.get("language", "unknown"),
+        metadata.get("difficulty", "beginner"),
+        tuple(keywords),
+        metadata.get("verified", False),
+    )
+
+
+def _fields_to_row(fields: Optional[DemoFields]) -> Tuple[Any, ...]:
+    """常用字段转换为 entries 表的列值"""
+    if fields is None:
+        return (None,) * 5
+    name, language, difficulty, keywords, verified = fields
+    return name, language, difficulty, json.dumps(list(keywords), ensure_ascii=False), verified
+
+
+def _fields_from_row(columns: List[Any]) -> Optional[DemoFields]:
+    """从 entries 表的列值还原常用字段"""
+    name, language, difficulty, keywords, verified = columns
+    if keywords is None:
+        return None
+    return name, language, difficulty, tuple(json.loads(keywords)), bool(verified)
+
+
+def _event(
+    event: str,
+    root_key: str,
+    rel: str,
+    kind: str,
+    text: Optional[str],
+    fields: Optional[DemoFields],
+) -> Dict[str, Any]:
+    """构建变更事件"""
+    return {
+        "event": event,
+        "kind": kind,
+        "path": Path(root_key) / rel,
+        "metadata_text": text,
+        "fields": fields,
+    }
+
+
+def _depth(rel: str) -> int:
+    """相对路径的深度，根目录为0"""
+    return 0 if rel == "." else rel.count(os.sep) + 1
+
+
+def _is_under(rel: str, prefix: str) -> bool:
+    """判断相对路径是否位于前缀目录之下（含自身）"""
+    return prefix == "." or rel == prefix or rel.startswith(prefix + os.sep)
+
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    """stat路径，不存在返回None"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """获取路径的 mtime（纳秒），不存在返回None"""
+    st = _stat(path)
+    return st.st_mtime_ns if st is not None else None
+
+
+def _read_raw(file_path: str) -> Tuple[int, Optional[bytes]]:
+    """读取文件的 mtime 和原始内容，读取失败内容为None"""
+    # 先取 mtime 再读内容：读取期间文件被修改时，下次刷新会因 mtime 不同而重新读取
+    mtime_ns = _mtime_ns(file_path) or 0
+    try:
+        with open(file_path, "rb") as f:
+            return mtime_ns, f.read()
+    except OSError as e:
+        logger.error(f"Failed to load metadata from {file_path}: {e}")
+        return mtime_ns, None
+
+
+def _decode_json_text(
+    file_path: str, data: Optional[bytes]
+) -> Tuple[Optional[str], Optional[DemoFields]]:
+    """
+    校验JSON内容（只解码这一次），文本原样返回，不重新序列化
+
+    Returns:
+        (JSON文本, demo常用字段)；不是 metadata.json 时常用字段为None，
+        内容无效时两者都为None
+    """
+    if data is None:
+        return None, None
+    try:
+        text = data.decode("utf-8")
+        metadata = json.loads(text)
+        if not isinstance(metadata, dict):
+            raise ValueError("metadata must be a JSON object")
+    except Exception as e:
+        logger.error(f"Failed to load metadata from {file_path}: {e}")
+        return None, None
+    if os.path.basename(file_path) != METADATA_FILE:
+        return text, None
+    return text, demo_fields(metadata)
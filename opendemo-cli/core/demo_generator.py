@@ -3,18 +3,34 @@
 协调AI服务生成demo，补充元数据。
 """
 
+import asyncio
+import time
+
 # 修复导入路径
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from datetime import datetime
-from typing import Dict, Any, Optional
-from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from core.http_client import HTTPError
+from core.rate_limit import TokenBucket
+from core.retry_policy import CircuitOpenError
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# generate_many 中每项生成参数允许的键，与 generate 的参数相同
+SPEC_KEYS = (
+    "language",
+    "topic",
+    "difficulty",
+    "save_to_user_library",
+    "custom_folder_name",
+    "library_name",
+)
+
 
 class DemoGenerator:
     """Demo生成器类"""
@@ -40,6 +56,7 @@ class DemoGenerator:
         save_to_user_library: bool = False,
         custom_folder_name: str = None,
         library_name: str = None,
+        use_cache: bool = True,
     ) -> Optional[Dict[str, Any]]:
         """
         生成demo
@@ -51,6 +68,7 @@ class DemoGenerator:
             save_to_user_library: 是否保存到用户库
             custom_folder_name: 自定义文件夹名称
             library_name: 库名称，如"numpy"，用于库demo生成
+            use_cache: 是否使用缓存的AI响应，强制重新生成时为False
 
         Returns:
             生成结果字典,包含demo路径和信息
@@ -58,12 +76,42 @@ class DemoGenerator:
         logger.info(f"Generating demo for {language} - {topic}")
 
         # 调用AI生成
-        demo_data = self.ai_service.generate_demo(language, topic, difficulty)
+        demo_data = self.ai_service.generate_demo(language, topic, difficulty, use_cache=use_cache)
 
         if not demo_data:
             logger.error("Failed to generate demo from AI")
             return None
 
+        return self._save_demo(
+            demo_data,
+            language,
+            topic,
+            difficulty,
+            save_to_user_library,
+            custom_folder_name,
+            library_name,
+        )
+
+    def _save_demo(
+        self,
+        demo_data: Dict[str, Any],
+        language: str,
+        topic: str,
+        difficulty: str = "beginner",
+        save_to_user_library: bool = False,
+        custom_folder_name: str = None,
+        library_name: str = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        补充元数据并保存AI生成的demo
+
+        Args:
+            demo_data: AI返回的demo数据
+            其余参数同 generate
+
+        Returns:
+            生成结果字典,保存失败返回None
+        """
         # 提取元数据和文件
         metadata = demo_data.get("metadata", {})
         files = demo_data.get("files", [])
@@ -117,6 +165,196 @@ class DemoGenerator:
         logger.info(f"Successfully generated demo at {demo.path}")
         return result
 
+    def generate_many(
+        self,
+        specs: List[Dict[str, Any]],
+        concurrency: int = 4,
+        requests_per_minute: float = None,
+        on_result: Callable[[Dict[str, Any]], None] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        并发批量生成demo
+
+        在事件循环中同时发起最多 concurrency 个AI请求，用令牌桶限制请求速率；
+        重试遵循 AI 服务共享的重试策略（ai_service.retry_policy），遇到 429 时
+        按 Retry-After（没有则指数退避）暂停所有请求后重试，熔断期间直接失败。
+        某一项失败不影响其他项。
+
+        内部用 asyncio.run 启动事件循环，不能在已运行的事件循环中调用，
+        异步代码中请直接 await agenerate_many。
+
+        Args:
+            specs: 生成参数列表，每项的键与 generate 的参数相同（language 和 topic 必填）；
+                缺少必填键或包含其他键的项不发起请求，直接记为失败
+            concurrency: 最大并发请求数
+            requests_per_minute: 每分钟最多请求数，None使用 ai.requests_per_minute，0表示不限
+            on_result: 每项完成时的回调，参数为该项的结果
+
+        Returns:
+            每项的结果，顺序与 specs 一致:
+            spec/success/result(同 generate 的返回值)/error/attempts/elapsed
+
+        Raises:
+            RuntimeError: 在已运行的事件循环中调用
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "generate_many cannot be called from a running event loop, "
+                "use await agenerate_many instead"
+            )
+        return asyncio.run(
+            self.agenerate_many(specs, concurrency, requests_per_minute, on_result)
+        )
+
+    async def agenerate_many(
+        self,
+        specs: List[Dict[str, Any]],
+        concurrency: int = 4,
+        requests_per_minute: float = None,
+        on_result: Callable[[Dict[str, Any]], None] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        并发批量生成demo的异步版本，参数与返回值同 generate_many
+        """
+        concurrency = max(1, concurrency)
+        if requests_per_minute is None:
+            requests_per_minute = self.config.get("ai.requests_per_minute", 0)
+        bucket = TokenBucket.per_minute(requests_per_minute, capacity=concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        results = [None] * len(specs)
+
+        async def run(index: int, spec: Dict[str, Any]) -> None:
+            error = self._spec_error(spec)
+            if error:
+                results[index] = self._new_item(spec, error)
+            else:
+                async with semaphore:
+                    results[index] = await self._generate_one(spec, bucket)
+            if on_result:
+                on_result(results[index])
+
+        logger.info(f"Generating {len(specs)} demos with concurrency {concurrency}")
+        try:
+            await asyncio.gather(*(run(i, spec) for i, spec in enumerate(specs)))
+        finally:
+            await self.ai_service.aclose()
+
+        return results
+
+    @staticmethod
+    def _spec_error(spec: Dict[str, Any]) -> Optional[str]:
+        """
+        检查生成参数
+
+        Args:
+            spec: 生成参数
+
+        Returns:
+            错误信息，参数有效时返回None
+        """
+        missing = [key for key in ("language", "topic") if not spec.get(key)]
+        if missing:
+            return f"Invalid spec: missing {', '.join(missing)}"
+        unknown = sorted(set(spec) - set(SPEC_KEYS))
+        if unknown:
+            return f"Invalid spec: unknown keys {', '.join(unknown)}"
+        return None
+
+    @staticmethod
+    def _new_item(spec: Dict[str, Any], error: str = None) -> Dict[str, Any]:
+        """批量生成中单项的初始结果"""
+        return {
+            "spec": spec,
+            "success": False,
+            "result": None,
+            "error": error,
+            "attempts": 0,
+            "elapsed": 0.0,
+        }
+
+    async def _generate_one(self, spec: Dict[str, Any], bucket: TokenBucket) -> Dict[str, Any]:
+        """
+        生成并保存单个demo，按重试策略重试
+
+        Args:
+            spec: 生成参数
+            bucket: 共享的令牌桶
+
+        Returns:
+            该项的结果
+        """
+        policy = self.ai_service.retry_policy
+        language = spec["language"]
+        topic = spec["topic"]
+        difficulty = spec.get("difficulty", "beginner")
+
+        item = self._new_item(spec)
+        start = time.monotonic()
+        demo_data = None
+
+        while True:
+            item["attempts"] += 1
+            attempt = item["attempts"]
+            await bucket.acquire()
+
+            try:
+                policy.before_call()
+                demo_data = await self.ai_service.agenerate_demo(language, topic, difficulty)
+            except CircuitOpenError as e:
+                # 熔断期间直接失败
+                item["error"] = str(e)
+                break
+            except Exception as e:
+                policy.record_failure(e)
+                item["error"] = str(e)
+                logger.error(
+                    f"Generating {language} - {topic} failed "
+                    f"(attempt {attempt}/{policy.max_attempts}): {e}"
+                )
+                if not policy.should_retry(attempt, e):
+                    break
+                delay = policy.delay(attempt, e)
+                if isinstance(e, HTTPError) and e.status_code == 429:
+                    # 限流：所有请求一起暂停，重试时取令牌会等到暂停结束
+                    bucket.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+                continue
+
+            policy.record_success()
+            if demo_data:
+                break
+            item["error"] = "Failed to generate demo from AI"
+            if not policy.should_retry(attempt):
+                break
+
+        if demo_data:
+            # 保存会同步写盘，放到线程池执行，避免阻塞其他请求
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                None,
+                lambda: self._save_demo(
+                    demo_data,
+                    language,
+                    topic,
+                    difficulty,
+                    spec.get("save_to_user_library", False),
+                    spec.get("custom_folder_name"),
+                    spec.get("library_name"),
+                ),
+            )
+            if result:
+                item.update(success=True, result=result, error=None)
+            else:
+                item["error"] = "Failed to save demo"
+
+        item["elapsed"] = time.monotonic() - start
+        return item
+
     def regenerate(self, demo_path: Path, difficulty: str = None) -> Optional[Dict[str, Any]]:
         """
         重新生成已存在的demo
@@ -142,5 +380,5 @@ class DemoGenerator:
         # 删除旧demo
         self.repository.storage.delete_demo(demo_path)
 
-        # 生成新demo
-        return self.generate(language, topic, difficulty)
+        # 生成新demo，不使用缓存的响应，否则会得到与旧demo相同的内容
+        return self.generate(language, topic, difficulty, use_cache=False)
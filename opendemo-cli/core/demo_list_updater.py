@@ -7,7 +7,8 @@ Demo List 自动更新模块
 # 修复导入路径
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import json
 from pathlib import Path
@@ -8,60 +8,98 @@ Demo仓库管理模块
 # 修复导入路径
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import hashlib
 import json
+import os
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
+from core.demo_catalog import DemoCatalog, DemoFields, METADATA_FILE, EVENT_REMOVED, demo_fields
+from core.search_index import SearchIndex
+from core.parallel_io import read_files
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
 class Demo:
-    """Demo类,表示一个demo"""
+    """Demo类,表示一个demo
 
-    def __init__(self, path: Path, metadata: Dict[str, Any]):
+    只常驻名称、语言、难度、关键字、验证状态和路径这些常用字段；从目录索引或打包文件
+    构建时常用字段直接取自索引列或打包记录，完整元数据保留为JSON文本，
+    首次访问 metadata 时才解码，大量demo驻留在缓存中时可以显著减少内存占用和GC压力。
+    """
+
+    __slots__ = (
+        "path",
+        "name",
+        "language",
+        "difficulty",
+        "keywords",
+        "verified",
+        "_metadata",
+        "_metadata_text",
+    )
+
+    def __init__(
+        self,
+        path: Path,
+        metadata: Dict[str, Any] = None,
+        metadata_text: str = None,
+        fields: DemoFields = None,
+    ):
         """
         初始化Demo
 
         Args:
             path: demo所在路径
             metadata: demo元数据
+            metadata_text: 未解码的元数据JSON文本（如目录缓存中的原始文本），metadata 为None时使用
+            fields: 与 metadata_text 对应的常用字段（见 demo_fields），提供时不解码文本；
+                未提供时解码一次，解码结果即为完整元数据
         """
         self.path = path
-        self.metadata = metadata
+        if metadata is None and metadata_text is not None:
+            if fields is not None:
+                self._metadata = None
+                self._metadata_text = metadata_text
+                self._set_slots(fields)
+                return
+            metadata = json.loads(metadata_text)
+        self.metadata = metadata if metadata is not None else {}
 
     @property
-    def name(self) -> str:
-        """demo名称"""
-        return self.metadata.get("name", self.path.name)
+    def metadata(self) -> Dict[str, Any]:
+        """完整元数据（首次访问时解码）"""
+        if self._metadata is None:
+            self._metadata = json.loads(self._metadata_text)
+            self._metadata_text = None
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Dict[str, Any]) -> None:
+        self._metadata = metadata
+        self._metadata_text = None
+        self._set_slots(demo_fields(metadata))
 
     @property
-    def language(self) -> str:
-        """编程语言"""
-        return self.metadata.get("language", "unknown")
-
-    @property
-    def keywords(self) -> List[str]:
-        """关键字列表"""
-        return self.metadata.get("keywords", [])
+    def title(self) -> str:
+        """标题"""
+        return self.metadata.get("title", "")
 
     @property
     def description(self) -> str:
         """描述"""
         return self.metadata.get("description", "")
 
-    @property
-    def difficulty(self) -> str:
-        """难度级别"""
-        return self.metadata.get("difficulty", "beginner")
-
-    @property
-    def verified(self) -> bool:
-        """是否已验证"""
-        return self.metadata.get("verified", False)
+    def _set_slots(self, fields: DemoFields) -> None:
+        """设置常用字段，名称缺失时使用目录名"""
+        name, self.language, self.difficulty, self.keywords, self.verified = fields
+        self.name = self.path.name if name is None else name
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -69,7 +107,7 @@ class Demo:
             "path": str(self.path),
             "name": self.name,
             "language": self.language,
-            "keywords": self.keywords,
+            "keywords": list(self.keywords),
             "description": self.description,
             "difficulty": self.difficulty,
             "verified": self.verified,
@@ -83,7 +121,7 @@ class DemoRepository:
     整合了Demo管理、库管理、库检测和贡献管理功能
     """
 
-    def __init__(self, storage_service, config_service=None, ai_service=None):
+    def __init__(self, storage_service, config_service=None, ai_service=None, catalog=None):
         """
         初始化Demo仓库
 
@@ -91,10 +129,12 @@ class DemoRepository:
             storage_service: 存储服务实例
             config_service: 配置服务实例（可选）
             ai_service: AI服务实例（可选，用于智能库名检测）
+            catalog: Demo目录索引（可选，默认根据 performance.catalog 配置创建）
         """
         self.storage = storage_service
         self.config = config_service
         self.ai_service = ai_service
+        self._catalog = catalog
 
         # 缓存
         self._demo_cache: Dict[str, Demo] = {}
@@ -102,6 +142,26 @@ class DemoRepository:
         self._library_features_cache: Dict[str, List[Dict[str, Any]]] = {}
         self._supported_libraries_cache: Dict[str, List[str]] = {}
 
+        if self._catalog:
+            self._catalog.add_listener(self._apply_catalog_events)
+
+    @property
+    def catalog(self) -> Optional[DemoCatalog]:
+        """获取Demo目录索引，未启用时返回None"""
+        if self._catalog is None and self.config and self.config.get("performance.catalog", True):
+            try:
+                db_path = self.storage.get_cache_directory() / "catalog.db"
+                self._catalog = DemoCatalog(
+                    db_path,
+                    walker=self.storage.walker,
+                    io_workers=self.config.get("performance.io_workers"),
+                )
+                self._catalog.add_listener(self._apply_catalog_events)
+            except Exception as e:
+                logger.warning(f"Failed to initialize demo catalog: {e}")
+                self._catalog = False
+        return self._catalog or None
+
     # ==================== Demo基础管理 ====================
 
     def load_demo(self, demo_path: Path) -> Optional[Demo]:
@@ -133,22 +193,170 @@ class DemoRepository:
         加载所有demo
 
         Args:
-            library: 'builtin', 'user' 或 'all'
+            library: 'builtin', 'user', 'output' 或 'all'
             language: 过滤特定语言
 
         Returns:
             Demo对象列表
         """
-        demo_paths = self.storage.list_demos(library, language)
+        roots = self.storage.get_search_roots(library, language)
+
+        if not self.catalog:
+            demo_paths = []
+            for root in roots:
+                bundled = self.storage.get_bundled_demos(root)
+                if bundled is not None:
+                    self._cache_bundled_demos(bundled)
+                    demo_paths.extend(path for path, _, _ in bundled)
+                else:
+                    demo_paths.extend(self.storage.list_demos_in_root(root))
+
+            # 未缓存的demo并行读取元数据，本线程按顺序解析
+            uncached = [
+                path for path in demo_paths if str(path.absolute()) not in self._demo_cache
+            ]
+            io_workers = self.config.get("performance.io_workers") if self.config else None
+            contents = read_files([str(path / METADATA_FILE) for path in uncached], io_workers)
+            for path, data in zip(uncached, contents):
+                metadata = self._decode_metadata(path, data)
+                if metadata is not None:
+                    self._demo_cache[str(path.absolute())] = Demo(path, metadata)
+
+            demos = []
+            for path in demo_paths:
+                demo = self._demo_cache.get(str(path.absolute()))
+                if demo:
+                    demos.append(demo)
+
+            return demos
+
+        # 从目录索引加载，避免遍历目录树和解析metadata.json
+        # 索引刷新产生的变更事件会同步到 _demo_cache，缓存中的demo始终是最新的
+        # 内置库有打包文件时直接从打包文件读取
         demos = []
+        for root in roots:
+            bundled = self.storage.get_bundled_demos(root)
+            if bundled is not None:
+                demos.extend(self._cache_bundled_demos(bundled))
+                continue
 
-        for path in demo_paths:
-            demo = self.load_demo(path)
-            if demo:
+            for path, metadata_text, fields in self.catalog.get_demo_records(root):
+                cache_key = str(path.absolute())
+                demo = self._demo_cache.get(cache_key)
+                if demo is None:
+                    demo = Demo(path, metadata_text=metadata_text, fields=fields)
+                    self._demo_cache[cache_key] = demo
                 demos.append(demo)
 
         return demos
 
+    def _cache_bundled_demos(self, bundled: List[Tuple[Path, str, DemoFields]]) -> List[Demo]:
+        """
+        把打包文件中的demo加入缓存
+
+        Args:
+            bundled: (demo路径, 元数据JSON文本, 常用字段) 列表
+
+        Returns:
+            Demo对象列表
+        """
+        demos = []
+        for path, metadata_text, fields in bundled:
+            cache_key = str(path.absolute())
+            demo = self._demo_cache.get(cache_key)
+            if demo is None:
+                demo = Demo(path, metadata_text=metadata_text, fields=fields)
+                self._demo_cache[cache_key] = demo
+            demos.append(demo)
+        return demos
+
+    def get_search_index(
+        self, library: str = "all", language: str = None
+    ) -> Tuple[SearchIndex, List[Demo]]:
+        """
+        获取demo搜索索引
+
+        启用目录索引时，搜索索引持久化在缓存目录中，并以各根目录的索引版本号判断是否过期。
+
+        Args:
+            library: 'builtin', 'user', 'output' 或 'all'
+            language: 过滤特定语言
+
+        Returns:
+            (搜索索引, 与索引文档序号一一对应的Demo列表)
+        """
+        demos = self.load_all_demos(library, language)
+        demos_by_key = {str(demo.path.absolute()): demo for demo in demos}
+
+        generation = None
+        index_path = None
+        if self.catalog:
+            roots = [str(root.absolute()) for root in self.storage.get_search_roots(library, language)]
+            generation = tuple((root, self._root_generation(Path(root))) for root in roots)
+            digest = hashlib.sha1("\n".join(roots).encode("utf-8")).hexdigest()[:16]
+            index_path = self.storage.get_cache_directory() / "index" / f"demos-{digest}.pickle"
+
+            index = SearchIndex.load(index_path)
+            if index is not None and index.generation == generation:
+                indexed = [demos_by_key.get(key) for key in index.keys]
+                if len(indexed) == len(demos_by_key) and all(indexed):
+                    return index, indexed
+
+        index = SearchIndex.build(
+            (
+                {
+                    "key": key,
+                    "name": demo.name,
+                    "title": demo.title,
+                    "keywords": demo.keywords,
+                    "description": demo.description,
+                    "difficulty": demo.difficulty,
+                    "aliases": [demo.path.name],
+                }
+                for key, demo in demos_by_key.items()
+            ),
+            generation=generation,
+        )
+
+        if index_path is not None:
+            try:
+                index.save(index_path)
+            except Exception as e:
+                logger.warning(f"Failed to save search index to {index_path}: {e}")
+
+        return index, list(demos_by_key.values())
+
+    def _root_generation(self, root: Path) -> Any:
+        """根目录的版本号：打包文件的构建ID或目录索引的版本号"""
+        if self.storage.bundle_rel(root) is not None:
+            return self.storage.builtin_bundle.build_id
+        return self.catalog.generation(root)
+
+    def _apply_catalog_events(self, events: List[Dict[str, Any]]) -> None:
+        """
+        将目录索引的变更事件应用到缓存
+
+        Args:
+            events: 变更事件列表
+        """
+        for event in events:
+            if event["kind"] != METADATA_FILE:
+                # _library.json 变化
+                self._library_metadata_cache.clear()
+                continue
+
+            cache_key = str(event["path"].absolute())
+            if event["event"] == EVENT_REMOVED or event["metadata_text"] is None:
+                self._demo_cache.pop(cache_key, None)
+            else:
+                self._demo_cache[cache_key] = Demo(
+                    event["path"], metadata_text=event["metadata_text"], fields=event["fields"]
+                )
+
+        # 功能列表和库列表由索引派生，任何变化都需要重新生成
+        self._library_features_cache.clear()
+        self._supported_libraries_cache.clear()
+
     def create_demo(
         self,
         name: str,
@@ -180,6 +388,67 @@ class DemoRepository:
         Returns:
             创建的Demo对象,失败返回None
         """
+        return self.create_demos(
+            [
+                {
+                    "name": name,
+                    "language": language,
+                    "keywords": keywords,
+                    "description": description,
+                    "files": files,
+                    "difficulty": difficulty,
+                    "author": author,
+                    "save_to_user_library": save_to_user_library,
+                    "custom_folder_name": custom_folder_name,
+                    "library_name": library_name,
+                }
+            ]
+        )[0]
+
+    def create_demos(self, specs: List[Dict[str, Any]]) -> List[Optional[Demo]]:
+        """
+        批量创建demo
+
+        所有demo通过 StorageService.save_demos 一次写入，摊薄目录创建和fsync的开销。
+
+        Args:
+            specs: demo参数列表，每项的键与 create_demo 的参数相同
+
+        Returns:
+            创建的Demo对象列表,失败的项为None，顺序与输入一致
+        """
+        entries = [self._prepare_demo(**spec) for spec in specs]
+        results = self.storage.save_demos(entries)
+
+        demos = []
+        for (_, demo_path), saved in zip(entries, results):
+            if not saved:
+                demos.append(None)
+                continue
+            if self.catalog:
+                self.catalog.invalidate(demo_path)
+            demos.append(self.load_demo(demo_path))
+        return demos
+
+    def _prepare_demo(
+        self,
+        name: str,
+        language: str,
+        keywords: List[str],
+        description: str,
+        files: List[Dict[str, str]],
+        difficulty: str = "beginner",
+        author: str = "",
+        save_to_user_library: bool = False,
+        custom_folder_name: str = None,
+        library_name: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], Path]:
+        """
+        计算demo的保存路径并组织demo数据
+
+        Returns:
+            (demo数据, 保存路径)
+        """
         # 生成demo目录名
         if custom_folder_name:
             demo_dir_name = custom_folder_name
@@ -224,13 +493,7 @@ class DemoRepository:
         }
 
         # 组织demo数据
-        demo_data = {"metadata": metadata, "files": files}
-
-        # 保存demo
-        if self.storage.save_demo(demo_data, demo_path):
-            return self.load_demo(demo_path)
-
-        return None
+        return {"metadata": metadata, "files": files}, demo_path
 
     def update_metadata(self, demo: Demo, updates: Dict[str, Any]) -> bool:
         """
@@ -245,18 +508,24 @@ class DemoRepository:
         """
         try:
             # 更新元数据
-            demo.metadata.update(updates)
-            demo.metadata["updated_at"] = datetime.now().isoformat()
+            metadata = dict(demo.metadata)
+            metadata.update(updates)
+            metadata["updated_at"] = datetime.now().isoformat()
 
             # 保存到文件
             metadata_file = demo.path / "metadata.json"
             with open(metadata_file, "w", encoding="utf-8") as f:
-                json.dump(demo.metadata, f, ensure_ascii=False, indent=2)
+                json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+            # 同步常用字段
+            demo.metadata = metadata
 
             # 清除缓存
             cache_key = str(demo.path.absolute())
             if cache_key in self._demo_cache:
                 del self._demo_cache[cache_key]
+            if self.catalog:
+                self.catalog.invalidate(demo.path)
 
             logger.info(f"Updated metadata for demo {demo.name}")
             return True
@@ -282,14 +551,140 @@ class DemoRepository:
         target_path = output_dir / demo.language.lower() / target_name
 
         if self.storage.copy_demo(demo.path, target_path):
+            if self.catalog:
+                self.catalog.invalidate(target_path)
             return target_path
 
         return None
 
+    # ==================== 输出目录 ====================
+
+    def list_output_demos(self, language: str = None) -> List[Dict[str, Any]]:
+        """
+        列出输出目录中的demo
+
+        输出目录中 <语言>/ 下的每个子目录都视为一个demo，没有有效 metadata.json 的目录
+        也会列出（难度为 unknown）。启用目录索引时直接读取索引，不遍历目录。
+
+        Args:
+            language: 语言名称，None表示所有语言
+
+        Returns:
+            demo信息列表，每项包含 path/name/language/keywords/description/difficulty/verified/metadata
+        """
+        output_dir = self.storage.get_output_directory()
+        root = output_dir / language.lower() if language else output_dir
+        # 语言目录的直接子目录
+        depth = 1 if language else 2
+
+        if self.catalog:
+            metadata_by_path = dict(self.catalog.get_demos(root))
+            demo_dirs = self.catalog.get_dirs(root, depth)
+        else:
+            metadata_by_path = {}
+            demo_dirs = []
+            lang_dirs = [root] if language else self._list_subdirs(root)
+            for lang_dir in lang_dirs:
+                for item in self._list_subdirs(lang_dir):
+                    demo_dirs.append(item)
+                    metadata = self._read_metadata_file(item / METADATA_FILE)
+                    if metadata is not None:
+                        metadata_by_path[item] = metadata
+
+        demos = []
+        for path in demo_dirs:
+            lang = language.lower() if language else path.parent.name
+            metadata = metadata_by_path.get(path)
+            if metadata is None:
+                # 目录存在但没有有效的metadata，也列出
+                demos.append(
+                    {
+                        "path": path,
+                        "name": path.name,
+                        "language": lang,
+                        "keywords": [],
+                        "description": "",
+                        "difficulty": "unknown",
+                        "verified": False,
+                        "metadata": {},
+                    }
+                )
+            else:
+                demos.append(
+                    {
+                        "path": path,
+                        "name": path.name,
+                        "language": metadata.get("language", lang),
+                        "keywords": metadata.get("keywords", []),
+                        "description": metadata.get("description", ""),
+                        "difficulty": metadata.get("difficulty", "beginner"),
+                        "verified": metadata.get("verified", False),
+                        "metadata": metadata,
+                    }
+                )
+
+        return demos
+
+    def output_generation(self, language: str = None) -> Any:
+        """
+        获取输出目录的版本号，用于判断由 list_output_demos 派生的数据是否过期
+
+        版本号包含输出目录和语言目录的修改时间（demo目录的增删和改名），启用目录索引时
+        再加上刷新后的索引版本号，否则加上各demo的 metadata.json 的修改时间。
+
+        Args:
+            language: 语言名称，None表示所有语言
+
+        Returns:
+            可比较的版本号，无法确定（目录不存在或索引不可用）时为None
+        """
+        output_dir = self.storage.get_output_directory()
+        root = output_dir / language.lower() if language else output_dir
+        lang_dirs = [root] if language else self._list_subdirs(root)
+
+        try:
+            dir_mtimes = tuple(os.stat(path).st_mtime_ns for path in [output_dir] + lang_dirs)
+        except OSError:
+            return None
+
+        if self.catalog:
+            try:
+                self.catalog.refresh(root)
+            except sqlite3.Error as e:
+                logger.warning(f"Demo catalog unavailable for {root}: {e}")
+                return None
+            generation = self.catalog.generation(root)
+            return None if generation is None else (generation, dir_mtimes)
+
+        metadata_mtimes = []
+        for lang_dir in lang_dirs:
+            for item in self._list_subdirs(lang_dir):
+                try:
+                    metadata_mtimes.append(os.stat(item / METADATA_FILE).st_mtime_ns)
+                except OSError:
+                    metadata_mtimes.append(None)
+        return dir_mtimes, tuple(metadata_mtimes)
+
+    def count_output_demos(self) -> Dict[str, int]:
+        """
+        统计输出目录中每种语言的demo数量
+
+        Returns:
+            {语言目录名: demo数量}
+        """
+        counts: Dict[str, int] = {}
+        for demo in self.list_output_demos():
+            lang = demo["path"].parent.name
+            counts[lang] = counts.get(lang, 0) + 1
+        return counts
+
     def get_demo_files(self, demo: Demo) -> List[Dict[str, Any]]:
         """
         获取demo的所有文件信息
 
+        启用内容寻址存储时，文件列表取自demo的清单，并带上内容哈希(digest)，
+        可通过 read_demo_file 从存储读取内容。
+
         Args:
             demo: Demo对象
 
@@ -298,6 +693,49 @@ class DemoRepository:
         """
         files = []
 
+        # 内置库有打包文件时直接从打包文件列出
+        rel = self.storage.bundle_rel(demo.path)
+        if rel is not None:
+            for info in self.storage.builtin_bundle.list_files(rel):
+                rel_path = Path(info["path"])
+                if rel_path.name.startswith(".") or "__pycache__" in rel_path.parts:
+                    continue
+                file_path = demo.path / rel_path
+                files.append(
+                    {
+                        "name": rel_path.name,
+                        "path": str(rel_path),
+                        "full_path": str(file_path),
+                        "description": self._get_file_description(file_path),
+                        "digest": info["digest"],
+                    }
+                )
+            return files
+
+        store = self.storage.blob_store
+
+        if store is not None:
+            try:
+                manifest = store.get_manifest(demo.path)
+            except OSError as e:
+                logger.warning(f"Failed to ingest {demo.path} into blob store: {e}")
+            else:
+                for rel_path, info in manifest["files"].items():
+                    rel = Path(rel_path)
+                    if rel.name.startswith(".") or "__pycache__" in rel.parts:
+                        continue
+                    file_path = demo.path / rel
+                    files.append(
+                        {
+                            "name": rel.name,
+                            "path": str(rel),
+                            "full_path": str(file_path),
+                            "description": self._get_file_description(file_path),
+                            "digest": info["digest"],
+                        }
+                    )
+                return files
+
         # 遍历demo目录下的所有文件
         for file_path in demo.path.rglob("*"):
             if file_path.is_file():
@@ -318,6 +756,29 @@ class DemoRepository:
 
         return files
 
+    def read_demo_file(self, file_info: Dict[str, Any]) -> Optional[str]:
+        """
+        读取demo文件内容
+
+        Args:
+            file_info: get_demo_files 返回的文件信息
+
+        Returns:
+            文件内容,失败返回None
+        """
+        rel = self.storage.bundle_rel(Path(file_info["full_path"]))
+        if rel is not None:
+            data = self.storage.builtin_bundle.read_file(rel)
+            if data is not None:
+                return data.decode("utf-8", errors="replace")
+
+        store = self.storage.blob_store
+        if store is not None and file_info.get("digest"):
+            data = store.read_bytes(file_info["digest"])
+            if data is not None:
+                return data.decode("utf-8", errors="replace")
+        return self.storage.read_file(Path(file_info["full_path"]))
+
     # ==================== 库管理功能 ====================
 
     def detect_library_command(
@@ -428,7 +889,19 @@ class DemoRepository:
         if language.lower() == "kubernetes":
             # 从输出目录扫描 kubernetes 工具
             output_k8s_path = self.storage.get_output_directory() / "kubernetes"
-            if output_k8s_path.exists():
+            if self.catalog:
+                for demo_path, _ in self.catalog.get_demos(output_k8s_path):
+                    # 工具目录为 kubernetes/<tool>/<demo> 中的 <tool>
+                    tool_dir = demo_path.parent
+                    if tool_dir.parent != output_k8s_path:
+                        continue
+                    if (
+                        not tool_dir.name.startswith("_")
+                        and not tool_dir.name.startswith(".")
+                        and tool_dir.name not in libraries
+                    ):
+                        libraries.append(tool_dir.name)
+            elif output_k8s_path.exists():
                 for item in output_k8s_path.iterdir():
                     if (
                         item.is_dir()
@@ -450,22 +923,11 @@ class DemoRepository:
             return libraries
 
         # 其他语言使用标准 libraries 目录结构
-        # 从内置库目录扫描
-        builtin_library_path = self.storage.builtin_library_path / language.lower() / "libraries"
-        if builtin_library_path.exists():
-            for item in builtin_library_path.iterdir():
-                if item.is_dir() and not item.name.startswith("_"):
-                    # 检查是否有 _library.json 文件
-                    if (item / "_library.json").exists():
-                        libraries.append(item.name)
-
-        # 从用户库目录扫描
-        user_library_path = self.storage.user_library_path / language.lower() / "libraries"
-        if user_library_path.exists():
-            for item in user_library_path.iterdir():
-                if item.is_dir() and not item.name.startswith("_"):
-                    if (item / "_library.json").exists() and item.name not in libraries:
-                        libraries.append(item.name)
+        # 依次从内置库目录和用户库目录扫描
+        for base_path in (self.storage.builtin_library_path, self.storage.user_library_path):
+            for name in self._scan_library_names(base_path / language.lower()):
+                if name not in libraries:
+                    libraries.append(name)
 
         # 缓存结果
         self._supported_libraries_cache[language] = libraries
@@ -535,7 +997,7 @@ class DemoRepository:
             builtin_library_dir = (
                 self.storage.builtin_library_path / language.lower() / "libraries" / library
             )
-            if builtin_library_dir.exists():
+            if self.storage.exists(builtin_library_dir):
                 features.extend(self._scan_library_features(builtin_library_dir))
 
             # 从用户库扫描
@@ -612,7 +1074,7 @@ class DemoRepository:
         builtin_demo_path = (
             self.storage.builtin_library_path / language.lower() / "libraries" / library / feature
         )
-        if builtin_demo_path.exists():
+        if self.storage.exists(builtin_demo_path):
             demo = self.load_demo(builtin_demo_path)
             if demo:
                 return demo
@@ -646,6 +1108,8 @@ class DemoRepository:
             target_path = output_dir / language.lower() / "libraries" / library / feature
 
         if self.storage.copy_demo(demo.path, target_path):
+            if self.catalog:
+                self.catalog.invalidate(target_path)
             return target_path
 
         return None
@@ -898,43 +1362,41 @@ class DemoRepository:
         if cache_key in self._library_metadata_cache:
             return self._library_metadata_cache[cache_key]
 
-        # 优先从用户库加载
-        user_metadata_path = (
-            self.storage.user_library_path
-            / language.lower()
-            / "libraries"
-            / library
-            / "_library.json"
-        )
+        # 优先从用户库加载，其次内置库（有打包文件时从打包文件读取）
+        for base_path in (self.storage.user_library_path, self.storage.builtin_library_path):
+            library_dir = base_path / language.lower() / "libraries" / library
+            metadata = self.storage.load_library_metadata(library_dir)
+            if metadata is not None:
+                self._library_metadata_cache[cache_key] = metadata
+                return metadata
 
-        if user_metadata_path.exists():
-            try:
-                with open(user_metadata_path, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
-                    self._library_metadata_cache[cache_key] = metadata
-                    return metadata
-            except Exception as e:
-                logger.error(f"Failed to load user library metadata: {e}")
-
-        # 从内置库加载
-        builtin_metadata_path = (
-            self.storage.builtin_library_path
-            / language.lower()
-            / "libraries"
-            / library
-            / "_library.json"
-        )
+        return None
 
-        if builtin_metadata_path.exists():
-            try:
-                with open(builtin_metadata_path, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
-                    self._library_metadata_cache[cache_key] = metadata
-                    return metadata
-            except Exception as e:
-                logger.error(f"Failed to load builtin library metadata: {e}")
+    def _decode_metadata(self, demo_path: Path, data: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """解析读取到的metadata.json内容，失败返回None"""
+        if data is None:
+            logger.warning(f"Metadata file not found: {demo_path / METADATA_FILE}")
+            return None
+        try:
+            return json.loads(data.decode("utf-8"))
+        except Exception as e:
+            logger.error(f"Failed to load metadata from {demo_path / METADATA_FILE}: {e}")
+            return None
 
-        return None
+    def _list_subdirs(self, path: Path) -> List[Path]:
+        """列出目录的直接子目录（遵循遍历器的忽略规则），目录不存在返回空列表"""
+        subdirs, _ = self.storage.walker.list_dir(str(path))
+        return [path / name for name in subdirs]
+
+    def _read_metadata_file(self, metadata_file: Path) -> Optional[Dict[str, Any]]:
+        """读取metadata.json，不存在或解析失败返回None"""
+        if not metadata_file.exists():
+            return None
+        try:
+            with open(metadata_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
 
     def _scan_library_features(self, library_dir: Path) -> List[Dict[str, Any]]:
         """
@@ -948,6 +1410,22 @@ class DemoRepository:
         """
         features = []
 
+        bundled = self.storage.get_bundled_demos(library_dir)
+        if bundled is not None:
+            for item, metadata_text, _ in bundled:
+                if item.parent != library_dir or item.name.startswith(("_", ".")):
+                    continue
+                features.append(self._build_feature(item, json.loads(metadata_text)))
+            return features
+
+        if self.catalog:
+            for item, metadata in self.catalog.get_demos(library_dir):
+                # 只取库目录的直接子目录，跳过特殊目录
+                if item.parent != library_dir or item.name.startswith(("_", ".")):
+                    continue
+                features.append(self._build_feature(item, metadata))
+            return features
+
         for item in library_dir.iterdir():
             # 跳过非目录和特殊文件
             if not item.is_dir() or item.name.startswith("_") or item.name.startswith("."):
@@ -960,24 +1438,71 @@ class DemoRepository:
                     with open(metadata_file, "r", encoding="utf-8") as f:
                         metadata = json.load(f)
 
-                    features.append(
-                        {
-                            "name": item.name,
-                            "path": str(item),
-                            "title": metadata.get("title", item.name),
-                            "description": metadata.get("description", ""),
-                            "difficulty": metadata.get("difficulty", "beginner"),
-                            "keywords": metadata.get("keywords", []),
-                            "category": metadata.get("category", "未分类"),
-                            "library": metadata.get("library", ""),
-                            "metadata": metadata,
-                        }
-                    )
+                    features.append(self._build_feature(item, metadata))
                 except Exception as e:
                     logger.error(f"Failed to load feature metadata from {metadata_file}: {e}")
 
         return features
 
+    def _build_feature(self, item: Path, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        根据功能目录和元数据构建功能模块信息
+
+        Args:
+            item: 功能demo目录
+            metadata: 功能demo元数据
+
+        Returns:
+            功能模块字典
+        """
+        return {
+            "name": item.name,
+            "path": str(item),
+            "title": metadata.get("title", item.name),
+            "description": metadata.get("description", ""),
+            "difficulty": metadata.get("difficulty", "beginner"),
+            "keywords": metadata.get("keywords", []),
+            "category": metadata.get("category", "未分类"),
+            "library": metadata.get("library", ""),
+        }
+
+    def _scan_library_names(self, language_dir: Path) -> List[str]:
+        """
+        扫描语言目录下 libraries/ 中注册了 _library.json 的库
+
+        Args:
+            language_dir: 语言目录路径
+
+        Returns:
+            库名列表
+        """
+        libraries_dir = language_dir / "libraries"
+        bundled = self.storage.get_bundled_libraries(libraries_dir)
+        if bundled is not None:
+            return [
+                item.name
+                for item, _ in bundled
+                if item.parent == libraries_dir and not item.name.startswith("_")
+            ]
+
+        if not libraries_dir.exists():
+            return []
+
+        if self.catalog:
+            return [
+                item.name
+                for item, _ in self.catalog.get_libraries(libraries_dir)
+                if item.parent == libraries_dir and not item.name.startswith("_")
+            ]
+
+        names = []
+        for item in libraries_dir.iterdir():
+            if item.is_dir() and not item.name.startswith("_"):
+                # 检查是否有 _library.json 文件
+                if (item / "_library.json").exists():
+                    names.append(item.name)
+        return names
+
     def _looks_like_library_name(self, keyword: str) -> bool:
         """
         判断关键字是否看起来像库名
@@ -8,26 +8,17 @@ Demo搜索引擎模块
 # 修复导入路径
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from typing import List, Dict, Any, Optional, Tuple
 from core.demo_repository import Demo
+from core.search_index import SearchIndex, iter_bits
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-# 匹配权重配置
-MATCH_WEIGHTS = {
-    "exact_name": 10.0,  # 精确匹配名称
-    "prefix_name": 8.0,  # 前缀匹配
-    "contain_name": 6.0,  # 包含匹配
-    "keyword_match": 5.0,  # 关键字匹配
-    "title_match": 4.0,  # 标题匹配
-    "description_match": 3.0,  # 描述匹配
-}
-
-
 class DemoSearch:
     """Demo搜索引擎类
 
@@ -42,6 +33,7 @@ class DemoSearch:
             demo_repository: Demo仓库实例
         """
         self.repository = demo_repository
+        self._feature_indexes: Dict[str, Tuple[List[Dict[str, Any]], SearchIndex]] = {}
 
     # ==================== 普通Demo搜索 ====================
 
@@ -59,13 +51,13 @@ class DemoSearch:
             language: 编程语言过滤
             keywords: 关键字列表
             difficulty: 难度级别过滤
-            library: 'builtin', 'user' 或 'all'
+            library: 'builtin', 'user', 'output' 或 'all'
 
         Returns:
             匹配的Demo列表
         """
-        # 加载所有demo
-        all_demos = self.repository.load_all_demos(library, language)
+        # 加载所有demo及其搜索索引
+        index, all_demos = self.repository.get_search_index(library, language)
 
         if not all_demos:
             return []
@@ -74,17 +66,13 @@ class DemoSearch:
         if not keywords and not difficulty:
             return self._sort_demos(all_demos)
 
-        # 过滤demo
-        matched_demos = []
-        for demo in all_demos:
-            score = self._calculate_demo_match_score(demo, keywords, difficulty)
-            if score > 0:
-                matched_demos.append((demo, score))
+        # 只对索引命中的demo计算分数
+        scores = self._calculate_demo_match_scores(index, keywords, difficulty)
 
-        # 按分数排序
-        matched_demos.sort(key=lambda x: x[1], reverse=True)
+        # 按BM25F分数排序，同分时保持加载顺序
+        matched = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
 
-        return [demo for demo, score in matched_demos]
+        return [all_demos[doc_id] for doc_id, score in matched]
 
     def find_exact(self, name: str, language: str = None) -> Optional[Demo]:
         """
@@ -97,14 +85,36 @@ class DemoSearch:
         Returns:
             找到的Demo对象,未找到返回None
         """
-        all_demos = self.repository.load_all_demos("all", language)
+        index, all_demos = self.repository.get_search_index("all", language)
 
-        for demo in all_demos:
-            if demo.name.lower() == name.lower():
-                return demo
+        doc_ids = index.find_name(name)
+        if doc_ids:
+            return all_demos[doc_ids[0]]
 
         return None
 
+    def fuzzy_search(
+        self, keywords: List[str], language: str = None, library: str = "all"
+    ) -> List[Demo]:
+        """
+        容忍拼写错误的demo查找（如 "loging" -> "logging"）
+
+        在名称、目录名和关键字上做近似匹配，用于精确搜索没有结果时的兜底。
+
+        Args:
+            keywords: 关键字列表
+            language: 编程语言过滤
+            library: 'builtin', 'user', 'output' 或 'all'
+
+        Returns:
+            按相似度排序的Demo列表
+        """
+        if not keywords:
+            return []
+
+        index, all_demos = self.repository.get_search_index(library, language)
+        return [all_demos[match["doc_id"]] for match in index.fuzzy_match(keywords)]
+
     def get_all_languages(self) -> List[str]:
         """
         获取所有支持的语言
@@ -194,13 +204,12 @@ class DemoSearch:
         if not all_features:
             return []
 
+        index = self._get_feature_index(language, library, all_features)
         keyword_lower = keyword.lower()
         scored_features = []
 
-        for feature in all_features:
-            score = self._calculate_feature_match_score(feature, keyword_lower)
-            if score > 0:
-                scored_features.append((feature, score))
+        for doc_id, score in self._match_documents(index, keyword_lower).items():
+            scored_features.append((all_features[doc_id], score))
 
         # 按分数降序、难度升序、名称升序排序
         scored_features.sort(
@@ -213,128 +222,110 @@ class DemoSearch:
 
         return scored_features
 
+    def fuzzy_search_library_features(
+        self, language: str, library: str, keyword: str
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        容忍拼写错误的库功能查找
+
+        Args:
+            language: 编程语言
+            library: 库名称
+            keyword: 搜索关键字
+
+        Returns:
+            匹配的功能列表，每项包含 (feature_dict, score)，score = 1 / (1 + 编辑距离)
+        """
+        all_features = self.repository.list_library_features(language, library)
+
+        if not all_features:
+            return []
+
+        index = self._get_feature_index(language, library, all_features)
+        return [
+            (all_features[match["doc_id"]], 1.0 / (1 + match["distance"]))
+            for match in index.fuzzy_match([keyword])
+        ]
+
     # ==================== 内部辅助方法 ====================
 
-    def _calculate_demo_match_score(
-        self, demo: Demo, keywords: List[str] = None, difficulty: str = None
-    ) -> float:
+    def _calculate_demo_match_scores(
+        self, index: SearchIndex, keywords: List[str] = None, difficulty: str = None
+    ) -> Dict[int, float]:
         """
-        计算demo的匹配分数
+        计算命中demo的匹配分数
 
         Args:
-            demo: Demo对象
+            index: 搜索索引
             keywords: 关键字列表
             difficulty: 难度级别
 
         Returns:
-            匹配分数,0表示不匹配
+            {文档序号: 匹配分数}，不包含不匹配的demo
         """
-        score = 0.0
-
-        # 难度匹配(精确匹配)
-        if difficulty:
-            if demo.difficulty.lower() == difficulty.lower():
-                score += 10.0
-            else:
-                return 0.0  # 难度不匹配则不返回
-
-        # 关键字匹配
-        if keywords:
-            demo_text = self._get_demo_text(demo).lower()
-            matched_keywords = 0
-
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
-
-                # 在名称中匹配(权重最高)
-                if keyword_lower in demo.name.lower():
-                    score += 10.0
-                    matched_keywords += 1
-
-                # 在关键字列表中匹配
-                elif any(keyword_lower in kw.lower() for kw in demo.keywords):
-                    score += 8.0
-                    matched_keywords += 1
-
-                # 在描述中匹配
-                elif keyword_lower in demo.description.lower():
-                    score += 5.0
-                    matched_keywords += 1
-
-                # 在整体文本中匹配
-                elif keyword_lower in demo_text:
-                    score += 2.0
-                    matched_keywords += 1
-
-            # 如果没有任何关键字匹配,返回0
-            if matched_keywords == 0:
-                return 0.0
-
-            # 根据匹配关键字的比例调整分数
-            match_ratio = matched_keywords / len(keywords)
-            score *= match_ratio
-
-        return score
-
-    def _calculate_feature_match_score(self, feature: Dict[str, Any], keyword: str) -> float:
+        # 难度匹配(精确匹配)，难度不匹配的demo不返回
+        allowed = index.with_difficulty(difficulty) if difficulty else None
+
+        if not keywords:
+            return {doc_id: 0.0 for doc_id in iter_bits(allowed)}
+
+        scores = self._match_documents(index, *keywords)
+        if allowed is not None:
+            scores = {doc_id: score for doc_id, score in scores.items() if (allowed >> doc_id) & 1}
+        return scores
+
+    def _match_documents(self, index: SearchIndex, *keywords: str) -> Dict[int, float]:
         """
-        计算功能模块的匹配分数
+        匹配文档并计算BM25F分数
+
+        命中任一词项的文档按BM25F打分；只是包含关键字子串（如 "async" 之于 "asyncio"）
+        而没有命中完整词项的文档也会返回，分数为0，排在有分数的文档之后。
 
         Args:
-            feature: 功能模块字典
-            keyword: 搜索关键字（小写）
+            index: 搜索索引
+            keywords: 关键字
 
         Returns:
-            匹配分数
+            {文档序号: 分数}
         """
-        score = 0.0
-        feature_name = feature["name"].lower()
-
-        # 精确匹配：功能名完全等于关键字
-        if feature_name == keyword:
-            score += MATCH_WEIGHTS["exact_name"]
-        # 前缀匹配：功能名以关键字开头
-        elif feature_name.startswith(keyword):
-            score += MATCH_WEIGHTS["prefix_name"]
-        # 包含匹配：功能名包含关键字
-        elif keyword in feature_name:
-            score += MATCH_WEIGHTS["contain_name"]
-
-        # 关键字匹配：metadata.keywords 中包含关键字
-        keywords = feature.get("keywords", [])
-        for kw in keywords:
-            if keyword in kw.lower():
-                score += MATCH_WEIGHTS["keyword_match"]
-                break
-
-        # 标题匹配：title 中包含关键字
-        title = feature.get("title", "").lower()
-        if keyword in title:
-            score += MATCH_WEIGHTS["title_match"]
-
-        # 描述匹配：description 中包含关键字
-        description = feature.get("description", "").lower()
-        if keyword in description:
-            score += MATCH_WEIGHTS["description_match"]
-
-        return score
-
-    def _get_demo_text(self, demo: Demo) -> str:
+        scores = index.score(" ".join(keywords))
+        for keyword in keywords:
+            for doc_id in index.lookup(keyword):
+                scores.setdefault(doc_id, 0.0)
+        return scores
+
+    def _get_feature_index(
+        self, language: str, library: str, features: List[Dict[str, Any]]
+    ) -> SearchIndex:
         """
-        获取demo的所有文本内容(用于搜索)
+        获取库功能列表的搜索索引（功能列表变化时重建）
 
         Args:
-            demo: Demo对象
+            language: 编程语言
+            library: 库名称
+            features: 功能模块列表
 
         Returns:
-            合并的文本
+            搜索索引，文档序号与功能列表下标一致
         """
-        parts = [
-            demo.name,
-            demo.description,
-            " ".join(demo.keywords),
-        ]
-        return " ".join(parts)
+        cache_key = f"{language}:{library}"
+        cached = self._feature_indexes.get(cache_key)
+        if cached is not None and cached[0] is features:
+            return cached[1]
+
+        index = SearchIndex.build(
+            {
+                "key": feature.get("path", feature["name"]),
+                "name": feature["name"],
+                "title": feature.get("title", ""),
+                "keywords": feature.get("keywords", []),
+                "description": feature.get("description", ""),
+                "difficulty": feature.get("difficulty", "beginner"),
+            }
+            for feature in features
+        )
+        self._feature_indexes[cache_key] = (features, index)
+        return index
 
     def _sort_demos(self, demos: List[Demo]) -> List[Demo]:
         """
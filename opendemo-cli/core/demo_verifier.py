@@ -7,15 +7,25 @@
 # 修复导入路径
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import json
+import os
 import sys
 import subprocess
 import tempfile
+import time
 import shutil
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List
 from core.java_verifier import JavaVerifier
+from core.node_modules_store import NodeModulesStore
+from core.venv_pool import VenvPool
+from core.verification_cache import VerificationCache
+from core.verification_deadline import deadline, step_timeout
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -24,6 +34,9 @@ logger = get_logger(__name__)
 class DemoVerifier:
     """Demo验证器类"""
 
+    # 支持验证的语言
+    LANGUAGES = ("python", "java", "go", "nodejs", "kubernetes")
+
     def __init__(self, config_service):
         """
         初始化验证器
@@ -32,23 +45,73 @@ class DemoVerifier:
             config_service: 配置服务实例
         """
         self.config = config_service
-
-    def verify(self, demo_path: Path, language: str) -> Dict[str, Any]:
+        self._venv_pool = None
+        self._result_cache = None
+        self._node_modules_store = None
+
+    @property
+    def venv_pool(self):
+        """Python验证复用的虚拟环境池，未启用时为None"""
+        if self._venv_pool is None and self.config.get("verification_venv_pool", True):
+            self._venv_pool = VenvPool.from_config(self.config)
+        return self._venv_pool
+
+    @property
+    def result_cache(self):
+        """验证结果缓存，未启用时为None"""
+        if self._result_cache is None and self.config.get("verification_cache", True):
+            self._result_cache = VerificationCache.from_config(self.config)
+        return self._result_cache
+
+    @property
+    def node_modules_store(self):
+        """Node.js验证共享的npm缓存和node_modules存储"""
+        if self._node_modules_store is None:
+            self._node_modules_store = NodeModulesStore.from_config(self.config)
+        return self._node_modules_store
+
+    def verify(
+        self, demo_path: Path, language: str, force: bool = False, use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
         验证demo
 
+        内容和工具链都没有变化的demo直接返回上次通过的结果（带 cached 标记）。
+
         Args:
             demo_path: demo路径
             language: 编程语言
+            force: 忽略 enable_verification 配置，始终验证
+            use_cache: 是否使用验证结果缓存
 
         Returns:
-            验证结果字典
+            验证结果字典，包含耗时 duration（秒）
         """
-        if not self.config.get("enable_verification", False):
+        if not force and not self.config.get("enable_verification", False):
             return {"verified": False, "skipped": True, "message": "Verification is disabled"}
 
         verification_method = self.config.get("verification_method", "venv")
 
+        cache = self.result_cache if use_cache else None
+        key = None
+        if cache is not None and language.lower() in self.LANGUAGES:
+            key = cache.key(Path(demo_path), language, verification_method)
+            cached = cache.get(key)
+            if cached is not None:
+                cached["cached"] = True
+                return cached
+
+        start = time.monotonic()
+        result = self._verify_language(demo_path, language, verification_method)
+        result["duration"] = round(time.monotonic() - start, 3)
+        if key is not None:
+            cache.put(key, result)
+        return result
+
+    def _verify_language(
+        self, demo_path: Path, language: str, verification_method: str
+    ) -> Dict[str, Any]:
+        """按语言分派验证"""
         if language.lower() == "python":
             return self._verify_python(demo_path, verification_method)
         elif language.lower() == "java":
@@ -62,6 +125,131 @@ class DemoVerifier:
         else:
             return {"verified": False, "error": f"Verification not supported for {language}"}
 
+    def verify_many(
+        self,
+        demos: List[Dict[str, Any]],
+        jobs: int = None,
+        results_file: Path = None,
+        on_result: Callable[[Dict[str, Any]], None] = None,
+        use_cache: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        并行验证多个demo
+
+        验证的开销主要在子进程（venv/pip、go、npm、javac）中，用线程并行即可占满多核，
+        各线程共享虚拟环境池。任务按语言分组提交（demo多的语言在前），同一时间运行的验证
+        尽量使用同一工具链，模块缓存和包缓存保持热。每个demo的总耗时不超过
+        verification_timeout：剩余时间作为各步骤子进程的超时（见 verification_deadline），
+        超时的demo记为超时，其子进程被终止，工作线程随即空出。
+
+        Args:
+            demos: 待验证的demo，每项包含 path、language
+            jobs: 并行数，默认为CPU核数
+            results_file: JSON Lines 结果文件，每完成一个demo追加一行
+            on_result: 每完成一个demo时的回调，参数为该项结果
+            use_cache: 是否使用验证结果缓存
+
+        Returns:
+            与 demos 顺序一致的结果列表，每项包含 path/language/verified/partial/
+            skipped/cached/timed_out/errors/warnings/steps/elapsed
+        """
+        jobs = max(1, jobs or os.cpu_count() or 1)
+        timeout = self.config.get("verification_timeout", 300)
+        items: List[Dict[str, Any]] = [None] * len(demos)
+
+        counts = Counter(demo["language"].lower() for demo in demos)
+        order = sorted(
+            range(len(demos)),
+            key=lambda i: (-counts[demos[i]["language"].lower()], demos[i]["language"].lower()),
+        )
+        # 在工作线程启动前创建，避免并发初始化
+        if counts.get("python"):
+            _ = self.venv_pool
+        if counts.get("nodejs"):
+            _ = self.node_modules_store
+        if use_cache:
+            _ = self.result_cache
+
+        started: Dict[int, float] = {}
+
+        def run(index: int) -> Dict[str, Any]:
+            started[index] = time.monotonic()
+            demo = demos[index]
+            with deadline(timeout):
+                return self.verify(
+                    Path(demo["path"]), demo["language"], force=True, use_cache=use_cache
+                )
+
+        output = open(results_file, "w", encoding="utf-8") if results_file else None
+        executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="verify")
+        try:
+            pending = {executor.submit(run, index): index for index in order}
+            poll = min(1.0, timeout / 10) if timeout else None
+            while pending:
+                done, _ = wait(pending, timeout=poll, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                finished = []
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Verification failed: {e}")
+                        result = {"verified": False, "errors": [str(e)]}
+                    # 子进程因预算用完被终止后，验证线程带着失败结果返回
+                    timed_out = (
+                        bool(timeout)
+                        and not result.get("verified")
+                        and now - started.get(index, now) >= timeout
+                    )
+                    if timed_out:
+                        errors = [f"Verification timed out after {timeout}s"]
+                        result = dict(result, errors=errors + list(result.get("errors") or []))
+                    finished.append((index, result, timed_out))
+
+                if timeout:
+                    for future, index in list(pending.items()):
+                        if index in started and now - started[index] > timeout:
+                            del pending[future]
+                            error = f"Verification timed out after {timeout}s"
+                            finished.append((index, {"verified": False, "errors": [error]}, True))
+
+                for index, result, timed_out in finished:
+                    elapsed = now - started.get(index, now)
+                    item = self._result_item(demos[index], result, timed_out, elapsed)
+                    items[index] = item
+                    if output:
+                        output.write(json.dumps(item, ensure_ascii=False) + "\n")
+                        output.flush()
+                    if on_result:
+                        on_result(item)
+        finally:
+            # 超时的验证线程在其子进程被终止后很快结束，不必等待
+            executor.shutdown(wait=False)
+            if output:
+                output.close()
+
+        return items
+
+    @staticmethod
+    def _result_item(
+        demo: Dict[str, Any], result: Dict[str, Any], timed_out: bool, elapsed: float
+    ) -> Dict[str, Any]:
+        """批量验证中单个demo的结果，不含命令输出"""
+        return {
+            "path": str(demo["path"]),
+            "language": demo["language"],
+            "verified": bool(result.get("verified")),
+            "partial": bool(result.get("partial")),
+            "skipped": bool(result.get("skipped")),
+            "cached": bool(result.get("cached")),
+            "timed_out": timed_out,
+            "errors": result.get("errors", []) or ([result["error"]] if result.get("error") else []),
+            "warnings": result.get("warnings", []),
+            "steps": result.get("steps", []),
+            "elapsed": round(elapsed, 3),
+        }
+
     def _verify_python(self, demo_path: Path, method: str = "venv") -> Dict[str, Any]:
         """
         验证Python demo
@@ -85,13 +273,29 @@ class DemoVerifier:
                 shutil.copytree(demo_path, demo_copy)
                 result["steps"].append("Copied demo to temp directory")
 
+                requirements_file = demo_copy / "requirements.txt"
+                if self.venv_pool is not None:
+                    # 从环境池租用装好同一组依赖的虚拟环境
+                    with self.venv_pool.lease(requirements_file) as (venv_path, output, reused):
+                        if reused:
+                            result["steps"].append("Reused pooled virtual environment")
+                        else:
+                            result["steps"].append("Created virtual environment")
+                            if requirements_file.exists():
+                                result["steps"].append("Installed dependencies")
+                                result["outputs"].append(output)
+                        if venv_path is None:
+                            result["errors"].append("Failed to install dependencies")
+                            return result
+                        self._run_python_files(venv_path, demo_copy, result)
+                    return result
+
                 # 创建虚拟环境
                 venv_path = temp_path / "venv"
                 self._create_venv(venv_path)
                 result["steps"].append("Created virtual environment")
 
                 # 安装依赖
-                requirements_file = demo_copy / "requirements.txt"
                 if requirements_file.exists():
                     success, output = self._install_dependencies(venv_path, requirements_file)
                     result["steps"].append("Installed dependencies")
@@ -101,23 +305,7 @@ class DemoVerifier:
                         result["errors"].append("Failed to install dependencies")
                         return result
 
-                # 执行代码文件
-                code_dir = demo_copy / "code"
-                if code_dir.exists():
-                    for py_file in code_dir.glob("*.py"):
-                        success, output, error = self._run_python_file(venv_path, py_file)
-                        result["steps"].append(f"Executed {py_file.name}")
-
-                        if output:
-                            result["outputs"].append(f"=== {py_file.name} ===\n{output}")
-
-                        if not success:
-                            result["errors"].append(f"Execution failed for {py_file.name}: {error}")
-                            return result
-
-                # 如果所有步骤成功
-                result["verified"] = True
-                result["message"] = "All verification steps passed"
+                self._run_python_files(venv_path, demo_copy, result)
 
             except Exception as e:
                 result["errors"].append(str(e))
@@ -125,6 +313,32 @@ class DemoVerifier:
 
         return result
 
+    def _run_python_files(self, venv_path: Path, demo_copy: Path, result: Dict[str, Any]) -> None:
+        """
+        依次执行demo的代码文件，全部成功时标记验证通过
+
+        Args:
+            venv_path: 虚拟环境路径
+            demo_copy: demo副本路径
+            result: 验证结果，原地更新
+        """
+        code_dir = demo_copy / "code"
+        if code_dir.exists():
+            for py_file in code_dir.glob("*.py"):
+                success, output, error = self._run_python_file(venv_path, py_file)
+                result["steps"].append(f"Executed {py_file.name}")
+
+                if output:
+                    result["outputs"].append(f"=== {py_file.name} ===\n{output}")
+
+                if not success:
+                    result["errors"].append(f"Execution failed for {py_file.name}: {error}")
+                    return
+
+        # 如果所有步骤成功
+        result["verified"] = True
+        result["message"] = "All verification steps passed"
+
     def _create_venv(self, venv_path: Path) -> bool:
         """创建Python虚拟环境"""
         try:
@@ -132,7 +346,7 @@ class DemoVerifier:
                 [sys.executable, "-m", "venv", str(venv_path)],
                 check=True,
                 capture_output=True,
-                timeout=60,
+                timeout=step_timeout(60),
             )
             return True
         except Exception as e:
@@ -157,7 +371,7 @@ class DemoVerifier:
                 [str(pip_path), "install", "-r", str(requirements_file)],
                 capture_output=True,
                 text=True,
-                timeout=300,
+                timeout=step_timeout(300),
             )
 
             return result.returncode == 0, result.stdout
@@ -186,7 +400,7 @@ class DemoVerifier:
                 [str(python_path), str(py_file)],
                 capture_output=True,
                 text=True,
-                timeout=timeout,
+                timeout=step_timeout(timeout),
                 cwd=py_file.parent,
             )
 
@@ -216,6 +430,10 @@ class DemoVerifier:
         """
         验证Go demo
 
+        所有demo共享 ~/.opendemo/cache/go 下的构建缓存和模块缓存，先离线（GOPROXY=off）
+        解析依赖，缓存中缺少模块时才联网下载一次。编译检查时同时输出可执行文件，
+        直接运行编译好的程序，不再 go run 重新编译。
+
         Args:
             demo_path: demo路径
 
@@ -231,7 +449,7 @@ class DemoVerifier:
             try:
                 # 检查Go环境
                 go_check = subprocess.run(
-                    ["go", "version"], capture_output=True, text=True, timeout=10
+                    ["go", "version"], capture_output=True, text=True, timeout=step_timeout(10)
                 )
                 if go_check.returncode != 0:
                     result["errors"].append("Go is not installed or not in PATH")
@@ -243,6 +461,8 @@ class DemoVerifier:
                 shutil.copytree(demo_path, demo_copy)
                 result["steps"].append("Copied demo to temp directory")
 
+                env = self._go_env(offline=True)
+
                 # 检查是否有go.mod，如果没有则初始化
                 go_mod_file = demo_copy / "go.mod"
                 if not go_mod_file.exists():
@@ -251,7 +471,8 @@ class DemoVerifier:
                         cwd=demo_copy,
                         capture_output=True,
                         text=True,
-                        timeout=30,
+                        timeout=step_timeout(30),
+                        env=env,
                     )
                     if init_result.returncode == 0:
                         result["steps"].append("Initialized go.mod")
@@ -261,27 +482,45 @@ class DemoVerifier:
                         )
                         return result
 
-                # 安装依赖
+                # 安装依赖：先只用共享缓存中的模块
                 tidy_result = subprocess.run(
                     ["go", "mod", "tidy"],
                     cwd=demo_copy,
                     capture_output=True,
                     text=True,
-                    timeout=120,
+                    timeout=step_timeout(120),
+                    env=env,
                 )
+                if tidy_result.returncode != 0 and not self.config.get(
+                    "verification_go_offline", False
+                ):
+                    # 缓存中缺少模块，联网下载到共享缓存
+                    tidy_result = subprocess.run(
+                        ["go", "mod", "tidy"],
+                        cwd=demo_copy,
+                        capture_output=True,
+                        text=True,
+                        timeout=step_timeout(120),
+                        env=self._go_env(offline=False),
+                    )
+                    if tidy_result.returncode == 0:
+                        result["steps"].append("Downloaded modules into shared cache")
                 if tidy_result.returncode == 0:
                     result["steps"].append("Installed dependencies (go mod tidy)")
                 else:
                     result["errors"].append(f"Failed to run go mod tidy: {tidy_result.stderr}")
                     return result
 
-                # 编译检查
+                # 编译检查，同时输出 main 包的可执行文件
+                bin_dir = temp_path / "bin"
+                bin_dir.mkdir()
                 build_result = subprocess.run(
-                    ["go", "build", "./..."],
+                    ["go", "build", "-o", str(bin_dir) + os.sep, "./..."],
                     cwd=demo_copy,
                     capture_output=True,
                     text=True,
-                    timeout=120,
+                    timeout=step_timeout(120),
+                    env=env,
                 )
                 if build_result.returncode == 0:
                     result["steps"].append("Build check passed")
@@ -289,28 +528,27 @@ class DemoVerifier:
                     result["errors"].append(f"Build failed: {build_result.stderr}")
                     return result
 
-                # 运行代码
+                # 运行代码：优先运行 code 目录下的 go 文件，否则运行整个项目
                 code_dir = demo_copy / "code"
                 timeout = self.config.get("verification_timeout", 300)
-
+                run_dir = demo_copy
                 if code_dir.exists() and list(code_dir.glob("*.go")):
-                    # 尝试运行 code 目录下的 go 文件
-                    run_result = subprocess.run(
-                        ["go", "run", "."],
-                        cwd=code_dir,
-                        capture_output=True,
-                        text=True,
-                        timeout=timeout,
-                    )
+                    run_dir = code_dir
+
+                binary = bin_dir / self._go_binary_name(demo_copy, run_dir)
+                if binary.exists():
+                    command = [str(binary)]
                 else:
-                    # 尝试运行整个项目
-                    run_result = subprocess.run(
-                        ["go", "run", "."],
-                        cwd=demo_copy,
-                        capture_output=True,
-                        text=True,
-                        timeout=timeout,
-                    )
+                    # 不是 main 包等情况，交给 go run 报告原因
+                    command = ["go", "run", "."]
+                run_result = subprocess.run(
+                    command,
+                    cwd=run_dir,
+                    capture_output=True,
+                    text=True,
+                    timeout=step_timeout(timeout),
+                    env=env,
+                )
 
                 result["steps"].append("Executed Go code")
                 if run_result.stdout:
@@ -331,10 +569,61 @@ class DemoVerifier:
 
         return result
 
+    def _go_env(self, offline: bool) -> Dict[str, str]:
+        """
+        Go命令的环境变量，构建缓存和模块缓存固定在 ~/.opendemo/cache/go
+
+        Args:
+            offline: 是否只使用缓存中的模块
+
+        Returns:
+            环境变量字典
+        """
+        cache_dir = self.config.get("cache_directory") or str(Path.home() / ".opendemo" / "cache")
+        go_cache = Path(cache_dir) / "go"
+        env = dict(os.environ)
+        env["GOCACHE"] = str(go_cache / "build")
+        env["GOMODCACHE"] = str(go_cache / "mod")
+        # -trimpath 使编译结果与临时目录路径无关，同一demo再次验证时命中构建缓存
+        env["GOFLAGS"] = "-mod=mod -trimpath"
+        if offline:
+            env["GOPROXY"] = "off"
+            # 缓存中的模块下载时已校验过，离线时不再访问校验和数据库
+            env["GOSUMDB"] = "off"
+        return env
+
+    @staticmethod
+    def _go_binary_name(module_dir: Path, package_dir: Path) -> str:
+        """
+        go build -o <目录> 为 main 包输出的可执行文件名，即包导入路径的最后一段
+
+        Args:
+            module_dir: go.mod 所在目录
+            package_dir: main 包目录
+
+        Returns:
+            可执行文件名
+        """
+        if package_dir != module_dir:
+            name = package_dir.name
+        else:
+            name = "demo"
+            for line in (module_dir / "go.mod").read_text(encoding="utf-8").splitlines():
+                if line.startswith("module "):
+                    parts = line.split()[1].strip('"').split("/")
+                    # 主版本后缀（如 /v2）不作为文件名
+                    if len(parts) > 1 and parts[-1][:1] == "v" and parts[-1][1:].isdigit():
+                        parts.pop()
+                    name = parts[-1]
+                    break
+        return name + (".exe" if sys.platform == "win32" else "")
+
     def _verify_nodejs(self, demo_path: Path) -> Dict[str, Any]:
         """
         验证Node.js demo
 
+        依赖相同的demo共享同一份 node_modules，没有声明依赖的demo跳过安装。
+
         Args:
             demo_path: demo路径
 
@@ -350,7 +639,7 @@ class DemoVerifier:
             try:
                 # 检查Node环境
                 node_check = subprocess.run(
-                    ["node", "--version"], capture_output=True, text=True, timeout=10
+                    ["node", "--version"], capture_output=True, text=True, timeout=step_timeout(10)
                 )
                 if node_check.returncode != 0:
                     result["errors"].append("Node.js is not installed or not in PATH")
@@ -365,19 +654,11 @@ class DemoVerifier:
                 # 安装依赖（如果有package.json）
                 package_json = demo_copy / "package.json"
                 if package_json.exists():
-                    npm_install = subprocess.run(
-                        ["npm", "install"],
-                        cwd=demo_copy,
-                        capture_output=True,
-                        text=True,
-                        timeout=300,
-                    )
-                    if npm_install.returncode == 0:
-                        result["steps"].append("Installed dependencies (npm install)")
+                    success, message = self.node_modules_store.install(demo_copy)
+                    if success:
+                        result["steps"].append(message)
                     else:
-                        result["errors"].append(
-                            f"Failed to install dependencies: {npm_install.stderr}"
-                        )
+                        result["errors"].append(message)
                         return result
 
                 # 运行代码
@@ -404,7 +685,7 @@ class DemoVerifier:
                         cwd=code_dir,
                         capture_output=True,
                         text=True,
-                        timeout=timeout,
+                        timeout=step_timeout(timeout),
                     )
                     result["steps"].append(f"Executed {main_file.name}")
                 elif package_json.exists():
@@ -414,7 +695,7 @@ class DemoVerifier:
                         cwd=demo_copy,
                         capture_output=True,
                         text=True,
-                        timeout=timeout,
+                        timeout=step_timeout(timeout),
                     )
                     result["steps"].append("Executed npm start")
                 else:
@@ -499,7 +780,7 @@ class DemoVerifier:
                     ["kubectl", "version", "--client"],
                     capture_output=True,
                     text=True,
-                    timeout=self.config.get("kubernetes.kubectl_timeout", 30),
+                    timeout=step_timeout(self.config.get("kubernetes.kubectl_timeout", 30)),
                 )
                 if kubectl_result.returncode == 0:
                     result["steps"].append("kubectl is available")
@@ -520,7 +801,7 @@ class DemoVerifier:
                     ["helm", "version"],
                     capture_output=True,
                     text=True,
-                    timeout=self.config.get("kubernetes.helm_timeout", 60),
+                    timeout=step_timeout(self.config.get("kubernetes.helm_timeout", 60)),
                 )
                 if helm_result.returncode == 0:
                     result["steps"].append("helm is available")
@@ -550,7 +831,7 @@ class DemoVerifier:
                             ["kubectl", "apply", "--dry-run=client", "-f", str(yaml_file)],
                             capture_output=True,
                             text=True,
-                            timeout=30,
+                            timeout=step_timeout(30),
                         )
                         if dry_run_result.returncode == 0:
                             result["steps"].append(f"Dry-run validation passed: {yaml_file.name}")
@@ -0,0 +1,152 @@
+"""
+Demo目录遍历模块
+
+基于 os.scandir 的目录遍历器，复用 DirEntry 自带的类型信息判断子目录，
+跳过 code/、node_modules/、.git/ 等不可能包含demo的目录，
+一次 scandir 即可得到目录下的文件名，无需为每个子目录额外 stat。
+"""
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+METADATA_FILE = "metadata.json"
+
+# 不可能包含demo的目录，遍历时直接跳过
+IGNORE_DIRS = frozenset(
+    {
+        ".git",
+        ".github",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        "code",
+        "src",
+        "target",
+    }
+)
+
+
+class DemoWalker:
+    """Demo目录遍历器
+
+    - 跳过 IGNORE_DIRS 中的目录和隐藏目录
+    - 可选: 找到 metadata.json 后不再进入该demo的子目录（prune_demo_roots）
+    - 可选: 限制遍历深度（max_depth，根目录深度为0）
+    """
+
+    def __init__(
+        self,
+        ignore_dirs: Optional[Iterable[str]] = None,
+        max_depth: Optional[int] = None,
+        prune_demo_roots: bool = False,
+    ):
+        """
+        初始化遍历器
+
+        Args:
+            ignore_dirs: 需要跳过的目录名集合，None表示使用 IGNORE_DIRS
+            max_depth: 最大遍历深度，None表示不限制
+            prune_demo_roots: 是否在demo目录处停止向下遍历。
+                仓库中存在 kubernetes/agent/<vendor> 这类嵌套demo，默认关闭
+        """
+        self.ignore_dirs = frozenset(ignore_dirs) if ignore_dirs is not None else IGNORE_DIRS
+        self.max_depth = max_depth
+        self.prune_demo_roots = prune_demo_roots
+
+    @property
+    def signature(self) -> str:
+        """遍历规则签名，规则变化时用于使已有的扫描结果失效"""
+        return (
+            f"ignore={','.join(sorted(self.ignore_dirs))};"
+            f"max_depth={self.max_depth};prune={int(self.prune_demo_roots)}"
+        )
+
+    def is_ignored(self, name: str) -> bool:
+        """判断目录名是否应跳过"""
+        return name in self.ignore_dirs or name.startswith(".")
+
+    def should_descend(self, depth: int, file_names: Set[str]) -> bool:
+        """
+        判断是否进入目录的子目录
+
+        Args:
+            depth: 当前目录深度
+            file_names: 当前目录下的文件名集合
+        """
+        if self.max_depth is not None and depth >= self.max_depth:
+            return False
+        if self.prune_demo_roots and depth > 0 and METADATA_FILE in file_names:
+            return False
+        return True
+
+    def list_dir(self, path: str) -> Tuple[List[str], Set[str]]:
+        """
+        列出目录的直接子项
+
+        Args:
+            path: 目录路径
+
+        Returns:
+            (未被忽略的子目录名列表(已排序), 文件名集合)；目录不可读时返回空结果
+        """
+        subdirs = []
+        file_names = set()
+
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        # DirEntry.is_dir 使用 scandir 返回的类型信息，不需要额外 stat
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.is_ignored(entry.name):
+                                subdirs.append(entry.name)
+                        else:
+                            file_names.add(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return [], set()
+
+        subdirs.sort()
+        return subdirs, file_names
+
+    def walk(self, root: Path, depth: int = 0) -> Iterator[Tuple[str, int, Set[str]]]:
+        """
+        深度优先遍历目录树
+
+        Args:
+            root: 起始目录
+            depth: 起始目录的深度
+
+        Yields:
+            (目录路径, 深度, 文件名集合)，按路径顺序
+        """
+        stack = [(str(root), depth)]
+
+        while stack:
+            path, current_depth = stack.pop()
+            subdirs, file_names = self.list_dir(path)
+            yield path, current_depth, file_names
+
+            if self.should_descend(current_depth, file_names):
+                stack.extend(
+                    (os.path.join(path, name), current_depth + 1) for name in reversed(subdirs)
+                )
+
+    def find_demos(self, root: Path) -> List[Path]:
+        """
+        查找根目录下所有包含 metadata.json 的demo目录（不含根目录本身）
+
+        Args:
+            root: 搜索根目录
+
+        Returns:
+            demo目录列表
+        """
+        return [
+            Path(path)
+            for path, depth, file_names in self.walk(root)
+            if depth > 0 and METADATA_FILE in file_names
+        ]
@@ -0,0 +1,221 @@
+"""
+模糊匹配索引模块
+
+基于字符三元组（trigram）的近似匹配索引，用于容忍拼写错误的查找
+（如 "loging" -> "logging"）。
+
+查询时先用 q-gram 计数过滤：编辑距离为 k 的两个串，
+查询串的三元组中最多有 3k 个不出现在目标串中；再加上长度过滤，
+只对极少数候选词计算有上限的 Levenshtein 距离。
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# 三元组长度
+GRAM_SIZE = 3
+
+# 填充字符，使词首词尾也能形成完整的三元组
+_PAD = "\x00"
+
+
+class FuzzyIndex:
+    """模糊匹配索引类
+
+    索引的基本单元是词（term），每个词关联一个或多个文档序号。
+    """
+
+    def __init__(self):
+        """初始化空索引"""
+        self.terms: List[str] = []
+        self.term_docs: List[Set[int]] = []
+        self.grams: Dict[str, List[int]] = {}
+        self._term_ids: Dict[str, int] = {}
+
+    @classmethod
+    def build(cls, items: Iterable[Tuple[str, int]]) -> "FuzzyIndex":
+        """
+        从 (词, 文档序号) 构建索引
+
+        Args:
+            items: (词, 文档序号) 序列
+
+        Returns:
+            索引对象
+        """
+        index = cls()
+        for term, doc_id in items:
+            index.add(term, doc_id)
+        return index
+
+    def add(self, term: str, doc_id: int) -> None:
+        """
+        添加一个词
+
+        Args:
+            term: 词（不区分大小写）
+            doc_id: 关联的文档序号
+        """
+        term = term.strip().lower()
+        if not term:
+            return
+
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self._term_ids[term] = term_id
+            self.terms.append(term)
+            self.term_docs.append(set())
+            for gram in _grams(term):
+                self.grams.setdefault(gram, []).append(term_id)
+
+        self.term_docs[term_id].add(doc_id)
+
+    def search(
+        self, query: str, max_distance: Optional[int] = None, limit: Optional[int] = 10
+    ) -> List[Tuple[str, int, Set[int]]]:
+        """
+        查找与查询串近似的词
+
+        Args:
+            query: 查询串（不区分大小写）
+            max_distance: 最大编辑距离，None表示按查询串长度自动确定
+            limit: 最多返回的词数量，None表示不限制
+
+        Returns:
+            [(词, 编辑距离, 文档序号集合)]，按编辑距离、词排序
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+
+        query_grams = _grams(query)
+        # q-gram 计数过滤：每次编辑最多破坏 GRAM_SIZE 个三元组
+        min_shared = len(query_grams) - GRAM_SIZE * max_distance
+
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for term_id in self.grams.get(gram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+
+        matches = []
+        for term_id, count in shared.items():
+            if count < min_shared:
+                continue
+            term = self.terms[term_id]
+            if abs(len(term) - len(query)) > max_distance:
+                continue
+            distance = levenshtein(query, term, max_distance)
+            if distance <= max_distance:
+                matches.append((term, distance, self.term_docs[term_id]))
+
+        matches.sort(key=lambda m: (m[1], m[0]))
+        return matches[:limit]
+
+    def match(self, keywords: List[str]) -> List[Dict[str, Any]]:
+        """
+        按多个关键字查找近似匹配的文档
+
+        每个关键字取文档上最接近的词；多个关键字时，连字符拼接后的整体
+        （如 "python-loging"）也参与匹配，命中时视为匹配了全部关键字。
+
+        Args:
+            keywords: 关键字列表
+
+        Returns:
+            [{"doc_id", "matched", "distance", "terms"}]，按匹配关键字数降序、
+            总编辑距离升序排序
+        """
+        queries = [(kw, 1) for kw in keywords if kw.strip()]
+        if len(queries) > 1:
+            queries.append(("-".join(kw.strip() for kw, _ in queries), len(queries)))
+
+        results: Dict[int, Dict[str, Any]] = {}
+        for query, weight in queries:
+            best: Dict[int, Tuple[int, str]] = {}
+            for term, distance, doc_ids in self.search(query, limit=None):
+                for doc_id in doc_ids:
+                    if doc_id not in best or distance < best[doc_id][0]:
+                        best[doc_id] = (distance, term)
+
+            for doc_id, (distance, term) in best.items():
+                result = results.setdefault(
+                    doc_id, {"doc_id": doc_id, "matched": 0, "distance": 0, "terms": []}
+                )
+                result["matched"] += weight
+                result["distance"] += distance
+                result["terms"].append(term)
+
+        return sorted(
+            results.values(), key=lambda r: (-r["matched"], r["distance"], r["doc_id"])
+        )
+
+    def __getstate__(self):
+        return {"terms": self.terms, "term_docs": self.term_docs, "grams": self.grams}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+
+
+def default_max_distance(query: str) -> int:
+    """
+    按查询串长度确定允许的编辑距离
+
+    过短的词容错会匹配到大量无关结果，因此不做模糊匹配。
+    """
+    length = len(query)
+    if length <= 3:
+        return 0
+    if length <= 6:
+        return 1
+    if length <= 10:
+        return 2
+    return 3
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    计算编辑距离
+
+    Args:
+        a: 字符串a
+        b: 字符串b
+        max_distance: 距离上限，超过后提前结束并返回 max_distance + 1
+
+    Returns:
+        编辑距离
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    limit = max_distance if max_distance is not None else len(a)
+    if not b:
+        return min(len(a), limit + 1)
+
+    previous = list(range(len(b) + 1))
+
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+
+    return min(previous[-1], limit + 1)
+
+
+def _grams(term: str) -> Set[str]:
+    """词的三元组集合（含首尾填充）"""
+    padded = _PAD * (GRAM_SIZE - 1) + term + _PAD * (GRAM_SIZE - 1)
+    return {padded[i : i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1)}
@@ -0,0 +1,402 @@
+"""
+HTTP客户端模块
+
+为AI服务提供连接复用的HTTP客户端：
+
+- HTTPClient: 基于持久化 requests.Session 的同步客户端，连接池 + keep-alive，
+  多次请求只做一次TCP/TLS握手
+- AsyncHTTPClient: 基于 httpx.AsyncClient 的异步客户端；未安装 httpx 时
+  在线程池中使用 HTTPClient，接口不变
+- 两者都支持 server-sent events (SSE) 流式响应，逐个产出事件的 data 字段
+
+requests 和 httpx 都在首次请求时才导入，不影响CLI启动。
+"""
+
+import asyncio
+import email.utils
+import json
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 默认连接池大小（每个主机保持的空闲连接数）
+DEFAULT_POOL_SIZE = 4
+
+# SSE 流结束标记（OpenAI 兼容接口）
+SSE_DONE = "[DONE]"
+
+
+class HTTPError(Exception):
+    """HTTP请求返回错误状态码"""
+
+    def __init__(self, status_code: int, message: str = "", retry_after: float = None):
+        super().__init__(f"HTTP {status_code}: {message[:200]}")
+        self.status_code = status_code
+        # 服务端通过 Retry-After 要求的等待时间（秒），未提供为None
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+
+    Args:
+        value: 响应头的值，秒数或HTTP日期
+
+    Returns:
+        需要等待的秒数，无法解析返回None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _status_error(status_code: int, headers, body: str) -> HTTPError:
+    """根据错误响应构造 HTTPError"""
+    return HTTPError(status_code, body, parse_retry_after(headers.get("Retry-After")))
+
+
+class SSEParser:
+    """逐行解析 server-sent events 流"""
+
+    def __init__(self):
+        self._data_lines = []
+        self.done = False
+
+    def feed(self, line: str) -> Optional[str]:
+        """
+        输入一行（不含换行符）
+
+        Args:
+            line: 响应中的一行
+
+        Returns:
+            一个事件结束时返回其 data 字段（多行 data 以换行连接），否则返回None；
+            收到 [DONE] 后 done 为True，之后的输入被忽略
+        """
+        if self.done:
+            return None
+
+        if not line:
+            # 空行表示一个事件结束
+            return self.flush()
+
+        if line.startswith(":"):
+            # 注释行（常用作心跳）
+            return None
+
+        field, _, value = line.partition(":")
+        if field == "data":
+            self._data_lines.append(value[1:] if value.startswith(" ") else value)
+        return None
+
+    def flush(self) -> Optional[str]:
+        """结束当前事件，返回其 data 字段"""
+        if not self._data_lines:
+            return None
+        data = "\n".join(self._data_lines)
+        self._data_lines = []
+        if data == SSE_DONE:
+            self.done = True
+            return None
+        return data
+
+
+def parse_sse(lines: Iterable[str]) -> Iterator[str]:
+    """
+    解析 server-sent events 流
+
+    Args:
+        lines: 按行切分的响应文本（不含换行符）
+
+    Yields:
+        每个事件的 data 字段；遇到 [DONE] 时结束
+    """
+    parser = SSEParser()
+    for line in lines:
+        data = parser.feed(line)
+        if data is not None:
+            yield data
+        if parser.done:
+            return
+    data = parser.flush()
+    if data is not None:
+        yield data
+
+
+class HTTPClient:
+    """连接复用的同步HTTP客户端"""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        """
+        初始化客户端
+
+        Args:
+            pool_size: 每个主机的连接池大小
+        """
+        self.pool_size = pool_size
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """获取持久化的 requests.Session，首次访问时创建"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests  # 延迟导入，避免拖慢不调用AI的命令的启动
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_size, pool_maxsize=self.pool_size
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def post_json(
+        self, url: str, payload: Dict[str, Any], headers: Dict[str, str] = None, timeout: float = 60
+    ) -> Dict[str, Any]:
+        """
+        发送JSON请求并解析JSON响应
+
+        Args:
+            url: 请求地址
+            payload: 请求体
+            headers: 请求头
+            timeout: 超时时间（秒）
+
+        Returns:
+            响应JSON
+
+        Raises:
+            HTTPError: 响应状态码不是2xx
+        """
+        response = self.session.post(url, json=payload, headers=headers, timeout=timeout)
+        if not 200 <= response.status_code < 300:
+            raise _status_error(response.status_code, response.headers, response.text)
+        return response.json()
+
+    def stream_sse(
+        self, url: str, payload: Dict[str, Any], headers: Dict[str, str] = None, timeout: float = 60
+    ) -> Iterator[str]:
+        """
+        发送请求并逐个产出 SSE 事件
+
+        Args:
+            url: 请求地址
+            payload: 请求体
+            headers: 请求头
+            timeout: 连接和两次读取之间的超时时间（秒）
+
+        Yields:
+            事件的 data 字段
+
+        Raises:
+            HTTPError: 响应状态码不是2xx
+        """
+        headers = dict(headers or {}, Accept="text/event-stream")
+        with self.session.post(
+            url, json=payload, headers=headers, timeout=timeout, stream=True
+        ) as response:
+            if not 200 <= response.status_code < 300:
+                raise _status_error(response.status_code, response.headers, response.text)
+            response.encoding = response.encoding or "utf-8"
+            yield from parse_sse(response.iter_lines(decode_unicode=True))
+
+    def close(self) -> None:
+        """关闭连接池"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+class AsyncHTTPClient:
+    """连接复用的异步HTTP客户端"""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, sync_client: HTTPClient = None):
+        """
+        初始化客户端
+
+        Args:
+            pool_size: 连接池大小
+            sync_client: 未安装 httpx 时使用的同步客户端
+        """
+        self.pool_size = pool_size
+        self._sync_client = sync_client
+        self._client = None
+        self._httpx_checked = False
+
+    def _get_client(self):
+        """获取 httpx.AsyncClient，未安装 httpx 时返回None"""
+        if not self._httpx_checked:
+            self._httpx_checked = True
+            try:
+                import httpx
+            except ImportError:
+                logger.info("httpx not installed, using requests in a thread pool")
+            else:
+                self._client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                    )
+                )
+        return self._client
+
+    @property
+    def sync_client(self) -> HTTPClient:
+        """回退使用的同步客户端"""
+        if self._sync_client is None:
+            self._sync_client = HTTPClient(self.pool_size)
+        return self._sync_client
+
+    async def post_json(
+        self, url: str, payload: Dict[str, Any], headers: Dict[str, str] = None, timeout: float = 60
+    ) -> Dict[str, Any]:
+        """
+        发送JSON请求并解析JSON响应
+
+        Args:
+            url: 请求地址
+            payload: 请求体
+            headers: 请求头
+            timeout: 超时时间（秒）
+
+        Returns:
+            响应JSON
+
+        Raises:
+            HTTPError: 响应状态码不是2xx
+        """
+        client = self._get_client()
+        if client is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, lambda: self.sync_client.post_json(url, payload, headers, timeout)
+            )
+
+        response = await client.post(url, json=payload, headers=headers, timeout=timeout)
+        if not 200 <= response.status_code < 300:
+            raise _status_error(response.status_code, response.headers, response.text)
+        return response.json()
+
+    async def stream_sse(
+        self, url: str, payload: Dict[str, Any], headers: Dict[str, str] = None, timeout: float = 60
+    ) -> AsyncIterator[str]:
+        """
+        发送请求并逐个产出 SSE 事件
+
+        Args:
+            url: 请求地址
+            payload: 请求体
+            headers: 请求头
+            timeout: 超时时间（秒）
+
+        Yields:
+            事件的 data 字段
+
+        Raises:
+            HTTPError: 响应状态码不是2xx
+        """
+        client = self._get_client()
+        if client is None:
+            # 在线程中读取同步流，通过队列逐个交给事件循环
+            loop = asyncio.get_running_loop()
+            queue = asyncio.Queue()
+            done = object()
+
+            def produce():
+                try:
+                    for data in self.sync_client.stream_sse(url, payload, headers, timeout):
+                        loop.call_soon_threadsafe(queue.put_nowait, data)
+                except BaseException as e:
+                    loop.call_soon_threadsafe(queue.put_nowait, e)
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+            producer = loop.run_in_executor(None, produce)
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+            await producer
+            return
+
+        headers = dict(headers or {}, Accept="text/event-stream")
+        async with client.stream(
+            "POST", url, json=payload, headers=headers, timeout=timeout
+        ) as response:
+            if not 200 <= response.status_code < 300:
+                body = await response.aread()
+                raise _status_error(
+                    response.status_code, response.headers, body.decode("utf-8", errors="replace")
+                )
+
+            parser = SSEParser()
+            async for line in response.aiter_lines():
+                data = parser.feed(line.rstrip("\r\n"))
+                if data is not None:
+                    yield data
+                if parser.done:
+                    return
+            data = parser.flush()
+            if data is not None:
+                yield data
+
+    async def aclose(self) -> None:
+        """关闭连接池"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._httpx_checked = False
+
+
+def iter_chat_deltas(events: Iterable[str]) -> Iterator[str]:
+    """
+    从 OpenAI 兼容的流式响应事件中提取增量文本
+
+    Args:
+        events: SSE 事件的 data 字段
+
+    Yields:
+        choices[0].delta.content 中的文本片段
+    """
+    for data in events:
+        text = _chat_delta(data)
+        if text:
+            yield text
+
+
+def _chat_delta(data: str) -> Optional[str]:
+    """解析单个流式事件中的增量文本"""
+    try:
+        choice = json.loads(data)["choices"][0]
+    except (ValueError, KeyError, IndexError, TypeError):
+        logger.debug(f"Ignoring malformed stream event: {data[:200]}")
+        return None
+    return (choice.get("delta") or {}).get("content")
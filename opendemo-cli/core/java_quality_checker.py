@@ -9,7 +9,8 @@ from pathlib import Path
 from typing import Dict, List, Any
 # 修复导入路径
 import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
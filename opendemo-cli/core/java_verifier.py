@@ -11,7 +11,9 @@ import shutil
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 # 修复导入路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.verification_deadline import step_timeout
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -127,7 +129,7 @@ class JavaVerifier:
                 ["java", "-version"],
                 capture_output=True,
                 text=True,
-                timeout=10
+                timeout=step_timeout(10)
             )
             
             if result.returncode == 0:
@@ -223,7 +225,7 @@ class JavaVerifier:
                 cwd=str(compile_dir.parent if compile_dir.name == "java" else compile_dir),
                 capture_output=True,
                 text=True,
-                timeout=self.timeout
+                timeout=step_timeout(self.timeout)
             )
             
             success = result.returncode == 0
@@ -331,7 +333,7 @@ class JavaVerifier:
                 ["java", "-cp", str(class_dir), class_name],
                 capture_output=True,
                 text=True,
-                timeout=self.timeout,
+                timeout=step_timeout(self.timeout),
                 cwd=str(class_dir)
             )
             
@@ -0,0 +1,348 @@
+"""
+Demo目录物化模块
+
+把demo目录同步到目标路径（输出目录、用户库），代替 rmtree + copytree：
+
+- 目标中内容未变的文件直接跳过（先比较大小，再比较内容哈希），重复 get 几乎不做IO
+- reflink: 通过 FICLONE 做写时复制克隆（btrfs、XFS 等），不占额外磁盘空间
+- hardlink: 只读源文件直接硬链接，用户无法原地修改，不会改坏库中的文件
+- copy: 普通复制，作为兜底
+
+materialize_tree 以目录为源，materialize_files 以文件清单为源（如内容寻址存储中的blob）。
+
+所有写入都先写到同目录的临时文件再 os.replace，即使目标文件是源文件的硬链接，
+替换时也不会修改源文件。
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+import stat
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# 物化策略
+STRATEGY_AUTO = "auto"
+STRATEGY_REFLINK = "reflink"
+STRATEGY_HARDLINK = "hardlink"
+STRATEGY_COPY = "copy"
+STRATEGIES = (STRATEGY_AUTO, STRATEGY_REFLINK, STRATEGY_HARDLINK, STRATEGY_COPY)
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# 这些错误表示文件系统或平台不支持克隆/链接，应回退到下一种方式
+_UNSUPPORTED_ERRNOS = frozenset(
+    code
+    for code in (
+        getattr(errno, "EOPNOTSUPP", None),
+        getattr(errno, "ENOTSUP", None),
+        getattr(errno, "ENOTTY", None),
+        getattr(errno, "EINVAL", None),
+        getattr(errno, "EXDEV", None),
+        getattr(errno, "EPERM", None),
+        getattr(errno, "EMLINK", None),
+        getattr(errno, "ENOSYS", None),
+    )
+    if code is not None
+)
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+# 已确认不支持 reflink / hardlink 的 (源设备, 目标设备)，避免每个文件都重试一次
+_reflink_unsupported: Set[Tuple[int, int]] = set()
+_hardlink_unsupported: Set[Tuple[int, int]] = set()
+
+
+def file_digest(path: Path) -> str:
+    """
+    计算文件内容哈希
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        blake2b 十六进制摘要
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def reflink_supported(directory: Path) -> bool:
+    """
+    在目录中克隆一个临时文件，检测所在文件系统是否支持 reflink
+
+    Args:
+        directory: 待检测的目录（不存在时创建）
+
+    Returns:
+        是否支持 reflink
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    src = directory / f".reflink-probe.{os.getpid()}.src"
+    dst = directory / f".reflink-probe.{os.getpid()}.dst"
+    try:
+        src.write_bytes(b"reflink probe\n")
+        _reflink(str(src), str(dst))
+        return True
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_ERRNOS:
+            raise
+        return False
+    finally:
+        for path in (src, dst):
+            if path.exists():
+                path.unlink()
+
+
+def materialize_tree(source: Path, target: Path, strategy: str = STRATEGY_AUTO) -> Dict[str, int]:
+    """
+    把源目录同步到目标目录
+
+    结果与 rmtree(target) + copytree(source, target) 相同：目标中多出的文件和目录会被删除。
+
+    Args:
+        source: 源目录
+        target: 目标目录
+        strategy: 物化策略，auto/reflink/hardlink/copy
+
+    Returns:
+        统计信息: cloned/linked/copied/skipped/removed
+
+    Raises:
+        ValueError: 未知的策略
+        OSError: 读写失败
+    """
+    source = Path(source)
+    if not source.is_dir():
+        raise NotADirectoryError(f"Source is not a directory: {source}")
+
+    files = {}
+    dirs = {"": str(source)}
+    stack = [("", str(source))]
+    while stack:
+        rel_dir, dir_path = stack.pop()
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir():
+                    dirs[rel_path] = entry.path
+                    stack.append((rel_path, entry.path))
+                else:
+                    files[rel_path] = (entry.path, None, None)
+
+    return _materialize(files, dirs, Path(target), strategy)
+
+
+def materialize_files(
+    files: Dict[str, Tuple[str, Optional[int], Optional[str]]],
+    target: Path,
+    strategy: str = STRATEGY_AUTO,
+    dirs: Iterable[str] = (),
+) -> Dict[str, int]:
+    """
+    按文件清单同步目标目录
+
+    Args:
+        files: 相对路径(以/分隔) -> (源文件路径, 权限, 内容哈希)；
+            权限为None时沿用源文件的权限，否则用于克隆/复制出的文件
+            （硬链接与源文件共享权限）；内容哈希已知时可省去对源文件的哈希计算
+        target: 目标目录
+        strategy: 物化策略，auto/reflink/hardlink/copy
+        dirs: 需要保留的目录（包括空目录），文件的上级目录会自动创建
+
+    Returns:
+        统计信息: cloned/linked/copied/skipped/removed
+
+    Raises:
+        ValueError: 未知的策略
+        OSError: 读写失败
+    """
+    dirs = set(dirs)
+    all_dirs = {"": None}
+    for rel_path in list(dirs) + list(files):
+        parts = rel_path.split("/")
+        for depth in range(1, len(parts) + (rel_path in dirs)):
+            all_dirs.setdefault("/".join(parts[:depth]), None)
+    return _materialize(files, all_dirs, Path(target), strategy)
+
+
+def _materialize(
+    files: Dict[str, Tuple[str, Optional[int], Optional[str]]],
+    dirs: Dict[str, Optional[str]],
+    target: Path,
+    strategy: str,
+) -> Dict[str, int]:
+    """
+    同步目标目录，使其恰好包含给定的文件和目录
+
+    Args:
+        files: 相对路径 -> (源文件路径, 权限, 内容哈希)
+        dirs: 相对路径 -> 源目录路径（用于复制目录属性，None表示不复制）
+        target: 目标目录
+        strategy: 物化策略
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown materialize strategy: {strategy}")
+
+    stats = {"cloned": 0, "linked": 0, "copied": 0, "skipped": 0, "removed": 0}
+
+    if target.is_symlink() or (target.exists() and not target.is_dir()):
+        target.unlink()
+        stats["removed"] += 1
+    os.makedirs(target, exist_ok=True)
+
+    # 删除目标中多余或类型不一致的条目
+    for dir_path, dir_names, file_names in os.walk(target):
+        rel_dir = os.path.relpath(dir_path, target).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir
+        for name in list(dir_names):
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            full_path = os.path.join(dir_path, name)
+            if rel_path in dirs and not os.path.islink(full_path):
+                continue
+            if os.path.islink(full_path):
+                os.unlink(full_path)
+            else:
+                shutil.rmtree(full_path)
+            dir_names.remove(name)
+            stats["removed"] += 1
+        for name in file_names:
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if rel_path not in files:
+                os.unlink(os.path.join(dir_path, name))
+                stats["removed"] += 1
+
+    for rel_dir in sorted(dirs):
+        os.makedirs(os.path.join(target, rel_dir), exist_ok=True)
+
+    for rel_path, (src, mode, digest) in files.items():
+        dst = os.path.join(target, rel_path)
+        _sync_file(src, os.stat(src), mode, digest, dst, strategy, stats)
+
+    # 子目录的属性先于父目录复制，避免写入子目录时改动父目录的修改时间
+    for rel_dir in sorted(dirs, key=lambda d: d.count("/") + bool(d), reverse=True):
+        if dirs[rel_dir] is not None:
+            shutil.copystat(dirs[rel_dir], os.path.join(target, rel_dir))
+
+    return stats
+
+
+def _sync_file(
+    src: str,
+    src_stat: os.stat_result,
+    mode: Optional[int],
+    digest: Optional[str],
+    dst: str,
+    strategy: str,
+    stats: Dict[str, int],
+) -> None:
+    """同步单个文件，内容未变时跳过"""
+    dst_stat = _lstat(dst)
+    if dst_stat is not None and _same_content(src, src_stat, mode, digest, dst, dst_stat):
+        stats["skipped"] += 1
+        return
+
+    dst_dir = os.path.dirname(dst)
+    tmp = os.path.join(dst_dir, f".{os.path.basename(dst)}.{os.getpid()}.tmp")
+    try:
+        kind = _place_file(src, src_stat, tmp, dst_dir, strategy)
+        if kind != "linked" and mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+        raise
+    stats[kind] += 1
+
+
+def _place_file(src: str, src_stat: os.stat_result, tmp: str, dst_dir: str, strategy: str) -> str:
+    """
+    按策略在临时路径生成文件
+
+    Returns:
+        实际使用的方式对应的统计键: cloned/linked/copied
+    """
+    devices = (src_stat.st_dev, os.stat(dst_dir).st_dev)
+
+    if strategy in (STRATEGY_AUTO, STRATEGY_REFLINK) and devices not in _reflink_unsupported:
+        try:
+            _reflink(src, tmp)
+            shutil.copystat(src, tmp)
+            return "cloned"
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _reflink_unsupported.add(devices)
+
+    if (
+        strategy in (STRATEGY_AUTO, STRATEGY_HARDLINK)
+        and _is_read_only(src_stat)
+        and devices not in _hardlink_unsupported
+    ):
+        try:
+            os.link(src, tmp)
+            return "linked"
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _hardlink_unsupported.add(devices)
+
+    shutil.copy2(src, tmp)
+    return "copied"
+
+
+def _reflink(src: str, dst: str) -> None:
+    """用 FICLONE 克隆文件，平台不支持时抛出 errno 为 EOPNOTSUPP 的 OSError"""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "reflink is not supported on this platform")
+
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.unlink(dst)
+            raise
+
+
+def _is_read_only(st: os.stat_result) -> bool:
+    """文件对所有用户都不可写时才允许硬链接，避免修改输出文件时改到源文件"""
+    return not st.st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _same_content(
+    src: str,
+    src_stat: os.stat_result,
+    mode: Optional[int],
+    digest: Optional[str],
+    dst: str,
+    dst_stat: os.stat_result,
+) -> bool:
+    """判断目标文件内容是否与源文件相同"""
+    if not stat.S_ISREG(dst_stat.st_mode):
+        return False
+    expected_mode = stat.S_IMODE(src_stat.st_mode) if mode is None else mode
+    if stat.S_IMODE(dst_stat.st_mode) != expected_mode:
+        return False
+    if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+        return True
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    return (digest or file_digest(src)) == file_digest(dst)
+
+
+def _lstat(path: str) -> Optional[os.stat_result]:
+    """获取文件状态，不存在返回None"""
+    try:
+        return os.lstat(path)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,246 @@
+"""
+node_modules 共享存储模块
+
+验证Node.js demo时不再为每个demo完整执行 npm install：
+- 依赖声明（dependencies/devDependencies/optionalDependencies 及 package-lock.json）
+  与 Node/npm 版本的哈希作为键，同一组依赖只安装一次，安装结果保存在
+  ~/.opendemo/cache/npm/modules/<键>/node_modules，之后以符号链接接入各demo
+- 所有安装共享 ~/.opendemo/cache/npm/cache 作为 npm 缓存，
+  并使用 --prefer-offline --no-audit --no-fund
+- package.json 没有声明依赖的demo直接跳过安装
+
+安装在只包含依赖声明的临时目录中进行（不运行demo自己的 scripts），完成后整体改名为
+目标目录，其他进程看到的要么是完整的安装结果，要么不存在。
+"""
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from core.verification_cache import toolchain_version
+from core.verification_deadline import step_timeout
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 参与计算键的依赖字段
+DEPENDENCY_FIELDS = ("dependencies", "devDependencies", "optionalDependencies")
+
+# npm install 的公共参数
+INSTALL_FLAGS = ["--prefer-offline", "--no-audit", "--no-fund"]
+
+# 指向demo目录内容的依赖，无法共享安装结果；"~1.2.3" 是普通的版本范围，不在其中
+_LOCAL_PREFIXES = ("file:", "link:", "workspace:", "./", "../", "/", "~/")
+
+LOCK_FILE = "package-lock.json"
+
+# 安装超时（秒）
+INSTALL_TIMEOUT = 300
+
+
+def dependency_spec(package: Dict[str, Any]) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    提取 package.json 中的依赖声明
+
+    Args:
+        package: package.json 内容
+
+    Returns:
+        非空的依赖字段；引用本地路径或使用 workspaces 时返回None
+    """
+    if package.get("workspaces"):
+        return None
+    spec = {}
+    for field in DEPENDENCY_FIELDS:
+        deps = package.get(field) or {}
+        if not isinstance(deps, dict):
+            return None
+        for version in deps.values():
+            if (
+                not isinstance(version, str)
+                or version.startswith(_LOCAL_PREFIXES)
+                or version in (".", "..")
+            ):
+                return None
+        if deps:
+            spec[field] = deps
+    return spec
+
+
+class NodeModulesStore:
+    """node_modules 共享存储类"""
+
+    def __init__(self, root: Path, registry: Optional[str] = None):
+        """
+        初始化存储
+
+        Args:
+            root: 存储目录，其下 cache/ 为 npm 缓存，modules/ 为安装结果
+            registry: npm 仓库地址，None使用 npm 自身的配置
+        """
+        self.root = Path(root)
+        self.cache_dir = self.root / "cache"
+        self.modules_dir = self.root / "modules"
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    @classmethod
+    def from_config(cls, config_service) -> "NodeModulesStore":
+        """
+        按配置创建存储
+
+        Args:
+            config_service: 配置服务实例
+
+        Returns:
+            存储实例
+        """
+        cache_dir = config_service.get("cache_directory") or str(Path.home() / ".opendemo" / "cache")
+        return cls(Path(cache_dir) / "npm", config_service.get("verification_npm_registry"))
+
+    def npm_install_command(self) -> List[str]:
+        """npm install 命令，使用共享缓存"""
+        command = ["npm", "install"] + INSTALL_FLAGS + ["--cache", str(self.cache_dir)]
+        if self.registry:
+            command += ["--registry", self.registry]
+        return command
+
+    def key(self, spec: Dict[str, Dict[str, str]], lock_text: str = "") -> str:
+        """
+        计算依赖集合的键
+
+        Args:
+            spec: 依赖声明
+            lock_text: package-lock.json 内容
+
+        Returns:
+            依赖声明、锁文件和 Node/npm 版本的哈希
+        """
+        text = "\n".join(
+            [
+                json.dumps(spec, sort_keys=True, separators=(",", ":")),
+                lock_text,
+                toolchain_version("nodejs"),
+                sys.platform,
+            ]
+        )
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def install(self, demo_dir: Path) -> Tuple[bool, str]:
+        """
+        为demo准备 node_modules
+
+        Args:
+            demo_dir: demo目录（验证用的副本）
+
+        Returns:
+            (成功, 步骤说明或错误信息)
+        """
+        package_json = demo_dir / "package.json"
+        try:
+            package = json.loads(package_json.read_text(encoding="utf-8"))
+            spec = dependency_spec(package) if isinstance(package, dict) else None
+        except (OSError, ValueError):
+            spec = None
+
+        if spec == {}:
+            return True, "No dependencies declared, skipped npm install"
+        if spec is None or (demo_dir / "node_modules").exists():
+            # 无法共享，在demo目录中安装（仍使用共享的npm缓存）
+            return self._run_install(demo_dir, "Installed dependencies (npm install)")
+
+        lock_file = demo_dir / LOCK_FILE
+        lock_text = lock_file.read_text(encoding="utf-8") if lock_file.exists() else ""
+        key = self.key(spec, lock_text)
+        target = self.modules_dir / key
+
+        with self._key_lock(key):
+            if (target / "node_modules").is_dir():
+                step = "Linked shared node_modules"
+            else:
+                success, message = self._populate(target, spec, lock_text)
+                if not success:
+                    return False, message
+                step = "Installed dependencies into shared node_modules store"
+
+        self._link(target / "node_modules", demo_dir / "node_modules")
+        return True, step
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        """同一组依赖在进程内只安装一次"""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _populate(
+        self, target: Path, spec: Dict[str, Dict[str, str]], lock_text: str
+    ) -> Tuple[bool, str]:
+        """
+        在临时目录中安装依赖，完成后改名为目标目录
+
+        Args:
+            target: 目标目录
+            spec: 依赖声明
+            lock_text: package-lock.json 内容
+
+        Returns:
+            (成功, 说明或错误信息)
+        """
+        staging = self.modules_dir / f"{target.name}.tmp-{os.getpid()}-{time.monotonic_ns()}"
+        try:
+            staging.mkdir(parents=True)
+            package = dict(spec, name="opendemo-deps", version="1.0.0", private=True)
+            (staging / "package.json").write_text(json.dumps(package, indent=2), encoding="utf-8")
+            if lock_text:
+                (staging / LOCK_FILE).write_text(lock_text, encoding="utf-8")
+
+            success, message = self._run_install(staging, "")
+            if not success:
+                return False, message
+            if not (staging / "node_modules").is_dir():
+                (staging / "node_modules").mkdir()
+
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # 其他进程已完成同一组依赖的安装
+                if not (target / "node_modules").is_dir():
+                    raise
+            return True, ""
+        except Exception as e:
+            logger.error(f"Failed to populate node_modules store: {e}")
+            return False, str(e)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _run_install(self, cwd: Path, step: str) -> Tuple[bool, str]:
+        """执行 npm install"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        result = subprocess.run(
+            self.npm_install_command(),
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=step_timeout(INSTALL_TIMEOUT),
+        )
+        if result.returncode != 0:
+            return False, f"Failed to install dependencies: {result.stderr}"
+        return True, step
+
+    @staticmethod
+    def _link(source: Path, link: Path) -> None:
+        """把共享的 node_modules 接入demo，不支持符号链接时复制"""
+        try:
+            os.symlink(source, link, target_is_directory=True)
+        except OSError:
+            shutil.copytree(source, link, symlinks=True)
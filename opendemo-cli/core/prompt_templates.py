@@ -0,0 +1,333 @@
+"""
+Prompt模板模块
+
+生成demo的prompt按语言预编译：语言相关的部分（编码规范、依赖文件）在首次使用时
+填入并缓存，之后每次请求只需拼接主题和难度。模板同时预先估算好固定部分的token数，
+用于在请求前:
+- 按难度和预期文件数确定输出的 max_tokens 预算
+- prompt 与输出预算超出模型上下文窗口时，先去掉可省略的段落、截短主题，
+  而不是让请求在服务端被截断后再重试
+
+token数用本地近似估算（中日韩字符按字计，其他字符约4个一个token），不依赖分词器。
+"""
+
+import math
+import re
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SYSTEM_PROMPT = "你是一个专业的编程教学助手,擅长生成高质量的代码示例和教程。"
+
+# 各语言的编码规范和依赖文件
+CODING_STANDARDS = {"python": "PEP 8", "java": "Google Java Style Guide"}
+DEPENDENCY_FILES = {"python": "requirements.txt", "java": "pom.xml or build.gradle"}
+
+# 输出预算（token）：README、metadata、依赖文件，以及各难度的代码文件数和单个文件的预算
+README_TOKENS = 1800
+METADATA_TOKENS = 150
+DEPENDENCY_TOKENS = 100
+CODE_FILE_BUDGETS = {
+    "beginner": (2, 600),
+    "intermediate": (3, 700),
+    "advanced": (3, 1000),
+}
+# 文件内容作为JSON字符串输出时转义带来的额外开销
+JSON_OVERHEAD = 1.1
+
+# 输出预算的下限，上下文窗口再紧也至少留出这么多
+MIN_OUTPUT_TOKENS = 1024
+# 每条消息的格式开销
+MESSAGE_OVERHEAD = 4
+# 上下文窗口中预留的比例，抵消token估算的误差
+CONTEXT_MARGIN = 0.05
+# 主题的最大token数，超出部分截掉
+MAX_TOPIC_TOKENS = 100
+
+_CJK = re.compile(r"[⺀-鿿가-힯豈-﫿＀-￯]")
+
+# 可变字段的占位符
+_PLACEHOLDER = re.compile(r"\$(topic|difficulty)")
+
+# 生成demo的prompt，每段为 (文本, 是否可省略)；$topic/$difficulty 每次请求填入，
+# 其余字段在预编译时按语言填入
+_DEMO_SECTIONS = [
+    (
+        """你是一位经验丰富的${language}编程导师和代码示例生成器。
+
+任务:为"$topic"主题生成一个完整的、可执行的${language} demo示例。
+
+要求:
+1. 生成1-3个代码文件,每个文件聚焦一个具体场景,展示不同的用法
+2. 代码必须包含详细的中文注释,解释关键逻辑和概念
+3. 严格遵循${language}的${coding_standard}编码规范
+4. 生成完整的README.md实操文档(中文)""",
+        False,
+    ),
+    (
+        """,必须包含:
+   - Demo标题和简介
+   - 学习目标
+   - 环境要求(Python/Java版本等)
+   - 安装依赖的详细步骤
+   - 文件说明
+   - 逐步实操指南(每一步都要有具体命令和预期输出)
+   - 代码解析(解释关键代码段)
+   - 预期输出示例
+   - 常见问题解答
+   - 扩展学习建议""",
+        True,
+    ),
+    (
+        """
+5. 生成${dependency_file}依赖声明文件
+6. 提供metadata.json元数据,包含:
+   - name: demo名称
+   - language: ${language}
+   - keywords: 关键字数组(3-5个)
+   - description: 简短描述(一句话)
+   - difficulty: $difficulty
+   - dependencies: 依赖信息对象
+
+输出格式:
+请以JSON格式返回,结构如下:
+{
+  "metadata": {
+    "name": "demo名称(必须是英文,如: nodejs-callback-functions-demo)",
+    "folder_name": "目录名称(必须是英文,小写,用连字符分隔,如: callback-functions-demo)",
+    "language": "${language}",
+    "keywords": ["关键字1", "关键字2", "关键字3"],
+    "description": "简短描述",
+    "difficulty": "$difficulty",
+    "dependencies": {}
+  },
+  "files": [
+    {
+      "path": "README.md",
+      "content": "完整的README内容"
+    },
+    {
+      "path": "code/example1.py",
+      "content": "代码文件内容"
+    },
+    {
+      "path": "${dependency_path}",
+      "content": "依赖声明内容"
+    }
+  ]
+}
+""",
+        False,
+    ),
+    (
+        """
+约束:
+- 代码总行数控制在50-300行之间
+- 使用稳定版本的库和API
+- 确保Windows/Linux/Mac跨平台兼容
+- 代码必须可以直接运行,不需要额外修改
+- README.md必须包含完整的操作步骤,让初学者也能轻松运行
+""",
+        True,
+    ),
+    (
+        """
+请直接返回JSON,不要包含任何其他文字说明。""",
+        False,
+    ),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本的token数
+
+    Args:
+        text: 文本
+
+    Returns:
+        近似token数：中日韩字符约1.3个token一个字，其他字符约4个字符一个token
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK.findall(text))
+    return math.ceil(cjk * 1.3 + (len(text) - cjk) / 4)
+
+
+class PromptTemplate:
+    """预编译的prompt模板"""
+
+    def __init__(self, sections: List[Tuple[str, bool]], fields: Dict[str, str]):
+        """
+        编译模板
+
+        Args:
+            sections: (文本, 是否可省略) 列表
+            fields: 编译时填入的固定字段
+        """
+        self._sections = []
+        for text, optional in sections:
+            # re.split 带捕获组：偶数位是固定文本，奇数位是占位符名
+            parts = _PLACEHOLDER.split(Template(text).safe_substitute(fields))
+            static_tokens = sum(estimate_tokens(part) for part in parts[::2])
+            self._sections.append((parts, optional, static_tokens))
+
+    def render(self, optional: bool = True, **values: str) -> str:
+        """
+        渲染prompt
+
+        Args:
+            optional: 是否包含可省略的段落
+            values: 占位符的值
+
+        Returns:
+            prompt文本
+        """
+        chunks = []
+        for parts, is_optional, _ in self._sections:
+            if is_optional and not optional:
+                continue
+            for i, part in enumerate(parts):
+                chunks.append(values[part] if i % 2 else part)
+        return "".join(chunks)
+
+    def estimate(self, optional: bool = True, **values: str) -> int:
+        """
+        估算渲染结果的token数，不实际拼接
+
+        Args:
+            optional: 是否包含可省略的段落
+            values: 占位符的值
+
+        Returns:
+            近似token数
+        """
+        value_tokens = {name: estimate_tokens(value) for name, value in values.items()}
+        total = 0
+        for parts, is_optional, static_tokens in self._sections:
+            if is_optional and not optional:
+                continue
+            total += static_tokens + sum(value_tokens[name] for name in parts[1::2])
+        return total
+
+
+@lru_cache(maxsize=None)
+def get_demo_template(language: str) -> PromptTemplate:
+    """
+    获取语言的demo生成模板，同一语言只编译一次
+
+    Args:
+        language: 编程语言
+
+    Returns:
+        预编译的模板
+    """
+    key = language.lower()
+    dependency_file = DEPENDENCY_FILES.get(key, "dependency file")
+    return PromptTemplate(
+        _DEMO_SECTIONS,
+        {
+            "language": language,
+            "coding_standard": CODING_STANDARDS.get(key, "industry best practices"),
+            "dependency_file": dependency_file,
+            "dependency_path": dependency_file.split()[0],
+        },
+    )
+
+
+def output_budget(difficulty: str, code_files: Optional[int] = None) -> int:
+    """
+    按难度和预期文件数估算输出需要的token数
+
+    Args:
+        difficulty: 难度级别
+        code_files: 预期的代码文件数，None按难度取默认值
+
+    Returns:
+        输出token预算
+    """
+    default_files, per_file = CODE_FILE_BUDGETS.get(difficulty, CODE_FILE_BUDGETS["intermediate"])
+    if code_files is None:
+        code_files = default_files
+    total = README_TOKENS + METADATA_TOKENS + DEPENDENCY_TOKENS + code_files * per_file
+    return math.ceil(total * JSON_OVERHEAD)
+
+
+def plan_demo_prompt(
+    language: str,
+    topic: str,
+    difficulty: str,
+    max_tokens: Optional[int] = None,
+    context_window: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    构建demo生成prompt并确定输出预算
+
+    Args:
+        language: 编程语言
+        topic: 主题
+        difficulty: 难度级别
+        max_tokens: 输出token上限（ai.max_tokens），None表示不限
+        context_window: 模型上下文窗口（ai.context_window），None表示不检查
+
+    Returns:
+        prompt/prompt_tokens/max_tokens/trimmed，trimmed 表示为了放进上下文窗口
+        省略了可选段落或截短了主题
+    """
+    template = get_demo_template(language)
+    trimmed = False
+
+    short_topic = _truncate(topic, MAX_TOPIC_TOKENS)
+    if short_topic != topic:
+        logger.warning(f"Topic too long, truncated to {MAX_TOPIC_TOKENS} tokens")
+        topic = short_topic
+        trimmed = True
+
+    budget = output_budget(difficulty)
+    if max_tokens:
+        budget = min(budget, max_tokens)
+
+    overhead = estimate_tokens(SYSTEM_PROMPT) + 2 * MESSAGE_OVERHEAD
+    optional = True
+    prompt_tokens = template.estimate(optional, topic=topic, difficulty=difficulty) + overhead
+
+    if context_window:
+        usable = int(context_window * (1 - CONTEXT_MARGIN))
+        if prompt_tokens + budget > usable:
+            optional = False
+            trimmed = True
+            prompt_tokens = template.estimate(optional, topic=topic, difficulty=difficulty) + overhead
+        budget = max(MIN_OUTPUT_TOKENS, min(budget, usable - prompt_tokens))
+
+    if trimmed:
+        logger.info(f"Prompt trimmed to {prompt_tokens} tokens, output budget {budget}")
+
+    return {
+        "prompt": template.render(optional, topic=topic, difficulty=difficulty),
+        "prompt_tokens": prompt_tokens,
+        "max_tokens": budget,
+        "trimmed": trimmed,
+    }
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """截短文本使其不超过指定token数"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
@@ -0,0 +1,91 @@
+"""
+限流模块
+
+为批量调用AI接口提供令牌桶限流器。
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    异步令牌桶
+
+    以固定速率补充令牌，最多积累 capacity 个；每次请求前取一个令牌，没有令牌时等待。
+    服务端返回 429 时调用 pause，所有等待者一起暂停到指定时间，避免继续撞上限流。
+
+    只在单个事件循环中使用：取令牌的检查和扣减之间没有 await，不需要加锁。
+    """
+
+    def __init__(self, rate: Optional[float], capacity: float = 1):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数，None或0表示不限流
+            capacity: 桶容量，即允许的突发请求数
+        """
+        self.rate = rate or 0
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: Optional[float], capacity: float = 1) -> "TokenBucket":
+        """按每分钟请求数创建令牌桶"""
+        return cls((requests_per_minute or 0) / 60.0, capacity)
+
+    def _refill(self, now: float) -> None:
+        """按流逝的时间补充令牌"""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    async def acquire(self) -> None:
+        """取一个令牌，必要时等待"""
+        await self._wait_pause()
+        if not self.rate:
+            return
+
+        self._refill(time.monotonic())
+        # 先扣减再等待：令牌为负表示已预约的未来令牌，后来者排在后面
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+            await self._wait_pause()
+
+    async def _wait_pause(self) -> None:
+        """等待暂停结束"""
+        while True:
+            remaining = self._paused_until - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(remaining)
+
+    def pause(self, seconds: float) -> None:
+        """
+        暂停发放令牌
+
+        Args:
+            seconds: 暂停时长（秒），与已有的暂停取较晚者
+        """
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            logger.info(f"Rate limited, pausing requests for {seconds:.1f}s")
+            self._paused_until = until
+            # 暂停期间不积累令牌，恢复后不会一次性放出突发请求
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = until
@@ -0,0 +1,184 @@
+"""
+AI响应缓存模块
+
+将AI接口的响应持久化到 ~/.opendemo/cache 下的 SQLite 文件，
+以请求体（模型、温度、消息等）的哈希为键。条目超过有效期后失效，
+条目数超过上限时按最近访问时间淘汰最旧的条目（LRU）。
+"""
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 缓存结构版本，结构变化时递增以丢弃旧数据
+SCHEMA_VERSION = 1
+
+# 默认有效期（秒）和条目上限
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1000
+
+# 访问时间的精度（秒）：距上次记录不足该时长的命中不写库，命中时只有一次查询
+ACCESS_RESOLUTION = 60
+
+# 不影响响应内容的请求字段，不参与计算键
+_VOLATILE_FIELDS = ("stream",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+
+def cache_key(payload: Dict[str, Any]) -> str:
+    """
+    计算请求的缓存键
+
+    Args:
+        payload: API请求体
+
+    Returns:
+        请求体规范化JSON的哈希
+    """
+    stable = {k: v for k, v in payload.items() if k not in _VOLATILE_FIELDS}
+    text = json.dumps(stable, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class ResponseCache:
+    """AI响应缓存类"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        初始化缓存
+
+        Args:
+            db_path: SQLite 数据库文件路径
+            ttl: 有效期（秒），None或0表示不过期
+            max_entries: 最多保留的条目数，None或0表示不限
+        """
+        self.db_path = Path(db_path)
+        self.ttl = ttl or None
+        self.max_entries = max_entries or None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        读取缓存的响应
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            响应内容，未命中或已过期返回None
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, created_at, accessed_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                value, created_at, accessed_at = row
+                if self.ttl is not None and now - created_at > self.ttl:
+                    with conn:
+                        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                if now - accessed_at >= ACCESS_RESOLUTION:
+                    with conn:
+                        conn.execute(
+                            "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+
+        logger.debug(f"Response cache hit {key}")
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """
+        写入响应，必要时淘汰最久未访问的条目
+
+        Args:
+            key: 缓存键
+            value: 响应内容
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, value, now, now),
+                    )
+                    if self.max_entries is not None:
+                        conn.execute(
+                            "DELETE FROM responses WHERE key IN ("
+                            "SELECT key FROM responses ORDER BY accessed_at DESC "
+                            "LIMIT -1 OFFSET ?)",
+                            (self.max_entries,),
+                        )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write response cache: {e}")
+
+    def clear(self) -> None:
+        """清空缓存"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute("DELETE FROM responses")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to clear response cache: {e}")
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """打开（必要时创建）数据库连接，调用方需持有锁"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            # 异步批量生成时可能在线程池中访问，由 _lock 保证串行
+            conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS responses")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(_SCHEMA)
+            # 缓存丢失只会多请求一次接口，不需要每次提交都落盘
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn = conn
+        return self._conn
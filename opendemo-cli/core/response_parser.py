@@ -0,0 +1,219 @@
+"""
+AI响应增量解析模块
+
+逐段输入AI返回的文本（可以直接接在流式响应的 on_delta 上），
+在 metadata 和 files 中的每个文件完整到达时立即解出，而不是等整个响应结束后
+一次性 json.loads：
+- 某个文件内容格式错误只丢弃该文件，其他文件照常使用
+- 响应被截断时保留已完整的文件，并给出缺失文件的路径，调用方只需补请求这些文件
+
+响应前后的说明文字和代码块标记（```json）会被忽略：解析从第一个 "{" 开始，
+到与之匹配的 "}" 结束。
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 完整的字符串（从开头的引号到结尾的引号），字符串内需要处理的字符，以及字符串外的结构字符
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURAL = re.compile(r'[{}\[\]",:]')
+
+# 从不完整或格式错误的文件条目中找出文件路径
+_PATH_PATTERN = re.compile(r'"path"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+class DemoResponseParser:
+    """
+    demo响应的增量解析器
+
+    只跟踪JSON的结构（括号深度和字符串边界），顶层 metadata 对象和 files 数组中的
+    每个元素闭合时，才对这一段文本调用 json 解析。
+    """
+
+    def __init__(self):
+        self.metadata: Optional[Dict[str, Any]] = None
+        self.files: List[Dict[str, Any]] = []
+        # 格式错误的文件条目，元素为能识别出的路径（识别不出为None）
+        self.broken: List[Optional[str]] = []
+        # 顶层对象是否已闭合
+        self.complete = False
+
+        self._text = ""
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key = None
+        self._value_start = None
+        self._item_start = None
+
+    def feed(self, chunk: str) -> None:
+        """
+        输入一段响应文本
+
+        Args:
+            chunk: 新到达的文本
+        """
+        if self.complete:
+            return
+        self._text += chunk
+        self._scan()
+
+    @property
+    def missing_paths(self) -> List[str]:
+        """
+        需要重新请求的文件路径
+
+        包括格式错误的文件和被截断的最后一个文件（路径已到达时）。
+        """
+        paths = [path for path in self.broken if path]
+        if self._item_start is not None:
+            path = _find_path(self._text[self._item_start :])
+            if path:
+                paths.append(path)
+        return paths
+
+    @property
+    def intact(self) -> bool:
+        """响应完整且没有格式错误的文件"""
+        return self.complete and not self.broken
+
+    def _scan(self) -> None:
+        """从上次停下的位置继续扫描"""
+        text = self._text
+        stack = self._stack
+        i = self._pos
+        end = len(text)
+
+        while i < end:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                # 跨越输入边界的字符串：跳到下一个引号或反斜杠
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    i = end
+                    break
+                i = match.start()
+                if text[i] == "\\":
+                    self._escape = True
+                else:
+                    self._end_string(i)
+                i += 1
+                continue
+
+            if not stack:
+                # 跳过顶层对象之前的说明文字和代码块标记
+                i = text.find("{", i)
+                if i < 0:
+                    i = end
+                    break
+                stack.append("{")
+                self._expect_key = True
+                i += 1
+                continue
+
+            match = _STRUCTURAL.search(text, i)
+            if match is None:
+                i = end
+                break
+            i = match.start()
+            c = text[i]
+
+            if c == '"':
+                self._string_start = i
+                match = _STRING.match(text, i)
+                if match is None:
+                    # 字符串还没有完整到达
+                    self._in_string = True
+                else:
+                    i = match.end() - 1
+                    self._end_string(i)
+            elif c == "{" or c == "[":
+                depth = len(stack)
+                if depth == 1 and c == "{" and self._key == "metadata":
+                    self._value_start = i
+                elif depth == 2 and c == "{" and self._key == "files" and stack[1] == "[":
+                    self._item_start = i
+                stack.append(c)
+            elif c == "}" or c == "]":
+                stack.pop()
+                depth = len(stack)
+                if depth == 1 and self._value_start is not None:
+                    self._set_metadata(text[self._value_start : i + 1])
+                    self._value_start = None
+                elif depth == 2 and self._item_start is not None:
+                    self._add_file(text[self._item_start : i + 1])
+                    self._item_start = None
+                elif depth == 0:
+                    self.complete = True
+                    i += 1
+                    break
+            elif len(stack) == 1:
+                if c == ",":
+                    self._expect_key = True
+                elif c == ":":
+                    self._expect_key = False
+            i += 1
+
+        self._pos = i
+
+    def _end_string(self, i: int) -> None:
+        """字符串在位置 i 结束，顶层对象的键记录下来"""
+        self._in_string = False
+        if len(self._stack) == 1 and self._expect_key:
+            self._key = _loads(self._text[self._string_start : i + 1])
+
+    def _set_metadata(self, text: str) -> None:
+        """解出 metadata"""
+        value = _loads(text)
+        if isinstance(value, dict):
+            self.metadata = value
+        else:
+            logger.warning("Malformed metadata in AI response")
+
+    def _add_file(self, text: str) -> None:
+        """解出 files 中的一个文件，格式错误时记录其路径"""
+        value = _loads(text)
+        if (
+            isinstance(value, dict)
+            and isinstance(value.get("path"), str)
+            and isinstance(value.get("content"), str)
+        ):
+            self.files.append(value)
+            return
+
+        path = _find_path(text)
+        logger.warning(f"Malformed file entry in AI response: {path or text[:100]}")
+        self.broken.append(path)
+
+
+def _loads(text: str) -> Any:
+    """解析JSON片段，允许字符串中出现未转义的换行等控制字符，失败返回None"""
+    try:
+        return json.loads(text, strict=False)
+    except ValueError:
+        return None
+
+
+def _find_path(text: str) -> Optional[str]:
+    """从文件条目的文本中找出路径"""
+    match = _PATH_PATTERN.search(text)
+    if not match:
+        return None
+    return _loads(f'"{match.group(1)}"')
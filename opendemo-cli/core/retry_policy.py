@@ -0,0 +1,257 @@
+"""
+重试策略模块
+
+AI接口调用共用的重试策略：
+- 指数退避加随机抖动，服务端给出 Retry-After 时以其为准；要求等待超过退避上限
+  （max_delay）时不再重试，直接失败
+- 只重试可恢复的错误（网络异常、408/429/5xx），其他客户端错误立即放弃
+- 熔断：连续失败达到阈值后一段时间内直接拒绝请求，之后放行一次试探请求
+- 统计计数，批量工具可据此调整并发数
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.http_client import HTTPError
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 熔断器状态
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# 可重试的HTTP状态码（5xx 之外）
+RETRYABLE_STATUS = frozenset({408, 429})
+
+
+class CircuitOpenError(Exception):
+    """熔断器打开，请求被直接拒绝"""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"Circuit breaker open, retry in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    判断错误是否值得重试
+
+    Args:
+        error: 调用抛出的异常
+
+    Returns:
+        网络异常和 408/429/5xx 返回True，其他HTTP错误返回False
+    """
+    if isinstance(error, HTTPError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return True
+
+
+class RetryPolicy:
+    """重试策略和熔断器，可在多个调用方（含并发任务）之间共享"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        """
+        初始化重试策略
+
+        Args:
+            max_attempts: 每次调用最多尝试的次数
+            base_delay: 首次重试的退避时间（秒），之后每次翻倍
+            max_delay: 退避时间上限（秒）
+            failure_threshold: 连续失败多少次后熔断，0表示不熔断
+            reset_timeout: 熔断后多久放行试探请求（秒）
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._counters = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "rejected": 0,
+            "circuit_opened": 0,
+        }
+
+    @classmethod
+    def from_config(cls, config) -> "RetryPolicy":
+        """
+        按配置创建重试策略
+
+        Args:
+            config: 配置服务实例，读取 ai.retry_* 和 ai.circuit_* 配置
+
+        Returns:
+            重试策略实例
+        """
+        return cls(
+            max_attempts=config.get("ai.retry_times", 3),
+            base_delay=config.get("ai.retry_interval", 5),
+            max_delay=config.get("ai.retry_max_interval", 60),
+            failure_threshold=config.get("ai.circuit_failure_threshold", 5),
+            reset_timeout=config.get("ai.circuit_reset_timeout", 30),
+        )
+
+    @property
+    def state(self) -> str:
+        """熔断器当前状态"""
+        with self._lock:
+            if self._state == STATE_OPEN and self._open_remaining() <= 0:
+                return STATE_HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """
+        发起请求前调用
+
+        Raises:
+            CircuitOpenError: 熔断器打开且未到试探时间
+        """
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                # 试探请求尚未返回，其他请求继续拒绝
+                self._counters["rejected"] += 1
+                raise CircuitOpenError(0.0)
+            if self._state == STATE_OPEN:
+                remaining = self._open_remaining()
+                if remaining > 0:
+                    self._counters["rejected"] += 1
+                    raise CircuitOpenError(remaining)
+                # 到达试探时间：放行这一次请求，结果决定关闭还是重新打开
+                self._state = STATE_HALF_OPEN
+            self._counters["calls"] += 1
+
+    def record_success(self) -> None:
+        """请求成功（服务端正常响应）后调用"""
+        with self._lock:
+            self._counters["successes"] += 1
+            self._consecutive_failures = 0
+            if self._state != STATE_CLOSED:
+                logger.info("Circuit breaker closed")
+                self._state = STATE_CLOSED
+
+    def record_failure(self, error: BaseException) -> None:
+        """
+        请求失败后调用
+
+        只有可重试的错误计入熔断：401/400 等说明请求本身有问题，不代表服务不可用。
+
+        Args:
+            error: 调用抛出的异常
+        """
+        with self._lock:
+            self._counters["failures"] += 1
+            if isinstance(error, HTTPError) and error.status_code == 429:
+                self._counters["rate_limited"] += 1
+            if not is_retryable(error):
+                # 服务端能正常给出客户端错误，说明服务可用
+                if self._state == STATE_HALF_OPEN:
+                    self._state = STATE_CLOSED
+                return
+
+            self._consecutive_failures += 1
+            if self._state == STATE_HALF_OPEN or (
+                self._state == STATE_CLOSED
+                and self.failure_threshold
+                and self._consecutive_failures >= self.failure_threshold
+            ):
+                logger.warning(
+                    f"Circuit breaker opened after {self._consecutive_failures} "
+                    f"consecutive failures, pausing for {self.reset_timeout}s"
+                )
+                self._state = STATE_OPEN
+                self._opened_at = time.monotonic()
+                self._counters["circuit_opened"] += 1
+
+    def should_retry(self, attempt: int, error: Optional[BaseException] = None) -> bool:
+        """
+        判断是否继续重试
+
+        Args:
+            attempt: 已尝试的次数（从1开始）
+            error: 本次的异常，None表示响应无法解析
+
+        Returns:
+            是否重试
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if error is not None and (isinstance(error, CircuitOpenError) or not is_retryable(error)):
+            return False
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None and retry_after > self.max_delay:
+            logger.warning(
+                f"Server asked to retry after {retry_after:.0f}s, "
+                f"exceeding the {self.max_delay:.0f}s limit; giving up"
+            )
+            return False
+        with self._lock:
+            self._counters["retries"] += 1
+        return True
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        计算下次重试前的等待时间
+
+        Args:
+            attempt: 已尝试的次数（从1开始）
+            error: 本次的异常，None表示响应无法解析
+
+        Returns:
+            等待时间（秒），不超过 max_delay
+        """
+        if error is None:
+            # 响应无法解析不是服务端过载，立即重试
+            return 0.0
+
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        # 指数退避，一半固定一半随机，避免并发请求同时重试
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取统计计数
+
+        Returns:
+            calls/successes/failures/retries/rate_limited/rejected/circuit_opened
+            以及 state 和 consecutive_failures
+        """
+        state = self.state
+        with self._lock:
+            return dict(
+                self._counters,
+                state=state,
+                consecutive_failures=self._consecutive_failures,
+            )
+
+    def _open_remaining(self) -> float:
+        """熔断剩余时间，调用方需持有锁"""
+        return self._opened_at + self.reset_timeout - time.monotonic()
@@ -0,0 +1,375 @@
+"""
+Demo搜索索引模块
+
+包含两部分：
+- 字符 n-gram（1~3 gram）倒排索引。每个 n-gram 的倒排表是一个以文档序号为位的整数，
+  查询时对关键字的 n-gram 倒排表求交集得到候选文档，再只对候选文档做子串校验，
+  用于保留原有"包含匹配"的语义。位集合求交和遍历的开销与文档总数成正比（约 N/64 次字运算），
+  与命中数无关；demo库在数千量级，整数位运算仍比维护有序倒排表更快。
+- BM25F 词项索引。名称/标题/关键字/描述按字段加权，ASCII 按单词切分，中日韩文字按
+  相邻两字（bigram）切分。文档字段长度、IDF 以及每个词项在每个文档上的饱和权重在构建时
+  预先计算，查询打分只是稀疏向量点积。
+- 名称、目录名、关键字上的模糊匹配索引（见 fuzzy_index），用于容忍拼写错误。
+"""
+
+import math
+import pickle
+import re
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from core.fuzzy_index import FuzzyIndex
+
+# 索引格式版本，结构变化时递增
+INDEX_VERSION = 3
+
+# 字段位掩码
+FIELD_NAME = 1
+FIELD_KEYWORDS = 2
+FIELD_DESCRIPTION = 4
+FIELD_TITLE = 8
+FIELD_TEXT = 16  # 名称 + 描述 + 关键字 的合并文本
+
+# 最长 n-gram 长度
+MAX_GRAM = 3
+
+# BM25F 参与打分的字段及其权重
+FIELD_BOOSTS = {
+    "name": 3.0,
+    "title": 2.5,
+    "keywords": 2.0,
+    "description": 1.0,
+}
+
+# BM25F 各字段的长度归一化系数 b
+FIELD_B = {
+    "name": 0.5,
+    "title": 0.5,
+    "keywords": 0.5,
+    "description": 0.75,
+}
+
+# BM25 词频饱和参数
+BM25_K1 = 1.2
+
+# 中日韩文字（按 bigram 切分）
+_CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_CJK_PATTERN = re.compile(f"[{_CJK_CHARS}]")
+_TOKEN_PATTERN = re.compile(f"[{_CJK_CHARS}]+|[^\\W_{_CJK_CHARS}]+")
+
+# 关键字列表拼接时使用的分隔符，查询中不会出现，保证匹配不跨越两个关键字
+_KEYWORD_SEPARATOR = "\n"
+
+
+class SearchIndex:
+    """Demo搜索倒排索引类"""
+
+    def __init__(self):
+        """初始化空索引"""
+        self.keys: List[str] = []
+        self.docs: List[Dict[str, str]] = []
+        self.postings: Dict[str, int] = {}
+        self.names: Dict[str, int] = {}
+        self.difficulties: Dict[str, int] = {}
+        self.generation: Any = None
+        # BM25F: 文档各字段的词项数、字段平均长度、词项IDF、词项在文档上的权重
+        self.lengths: List[Dict[str, int]] = []
+        self.avg_lengths: Dict[str, float] = {}
+        self.idf: Dict[str, float] = {}
+        self.weights: Dict[str, Dict[int, float]] = {}
+        # 模糊匹配: 名称、别名(目录名)、关键字及名称中的单词
+        self.fuzzy = FuzzyIndex()
+
+    # ==================== 构建与持久化 ====================
+
+    @classmethod
+    def build(cls, records: Iterable[Dict[str, Any]], generation: Any = None) -> "SearchIndex":
+        """
+        从记录构建索引
+
+        Args:
+            records: 记录列表，每项包含 key/name/title/keywords/description/difficulty，
+                可选 aliases（如目录名）用于模糊匹配
+            generation: 数据版本号（可比较相等的任意值，如各根目录版本号组成的元组），
+                用于判断持久化的索引是否过期
+
+        Returns:
+            索引对象
+        """
+        index = cls()
+        index.generation = generation
+        # 词项 -> {文档序号: {字段: 词频}}
+        term_freqs: Dict[str, Dict[int, Dict[str, int]]] = {}
+
+        for doc_id, record in enumerate(records):
+            bit = 1 << doc_id
+            doc = _normalize(record)
+            index.keys.append(str(record["key"]))
+            index.docs.append(doc)
+
+            index.names[doc["name"]] = index.names.get(doc["name"], 0) | bit
+            difficulty = doc["difficulty"]
+            index.difficulties[difficulty] = index.difficulties.get(difficulty, 0) | bit
+
+            for gram in _grams_of(doc["text"] + _KEYWORD_SEPARATOR + doc["title"]):
+                index.postings[gram] = index.postings.get(gram, 0) | bit
+
+            lengths = {}
+            for field in FIELD_BOOSTS:
+                tokens = tokenize(doc[field])
+                lengths[field] = len(tokens)
+                for token in tokens:
+                    field_freqs = term_freqs.setdefault(token, {}).setdefault(doc_id, {})
+                    field_freqs[field] = field_freqs.get(field, 0) + 1
+            index.lengths.append(lengths)
+
+            index._add_fuzzy_terms(doc_id, record)
+
+        index._compute_bm25f(term_freqs)
+        return index
+
+    def _add_fuzzy_terms(self, doc_id: int, record: Dict[str, Any]) -> None:
+        """添加文档的模糊匹配词"""
+        terms = [record.get("name") or ""]
+        terms.extend(record.get("aliases") or [])
+        terms.extend(record.get("keywords") or [])
+        terms.extend(tokenize(str(record.get("name") or "")))
+
+        for term in terms:
+            self.fuzzy.add(str(term), doc_id)
+
+    def _compute_bm25f(self, term_freqs: Dict[str, Dict[int, Dict[str, int]]]) -> None:
+        """预先计算字段平均长度、IDF 和词项权重"""
+        doc_count = len(self.keys)
+        if not doc_count:
+            return
+
+        self.avg_lengths = {
+            field: sum(lengths[field] for lengths in self.lengths) / doc_count
+            for field in FIELD_BOOSTS
+        }
+
+        for term, docs in term_freqs.items():
+            doc_freq = len(docs)
+            self.idf[term] = math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+            weights = {}
+            for doc_id, field_freqs in docs.items():
+                # 按字段长度归一化后加权求和，再做一次饱和
+                tf = 0.0
+                for field, freq in field_freqs.items():
+                    avg_length = self.avg_lengths[field] or 1.0
+                    b = FIELD_B[field]
+                    norm = 1 - b + b * self.lengths[doc_id][field] / avg_length
+                    tf += FIELD_BOOSTS[field] * freq / norm
+                weights[doc_id] = tf * (BM25_K1 + 1) / (tf + BM25_K1)
+            self.weights[term] = weights
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SearchIndex"]:
+        """
+        从文件加载索引
+
+        Args:
+            path: 索引文件路径
+
+        Returns:
+            索引对象，文件不存在或格式不兼容返回None
+        """
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            return None
+
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+
+        index = cls()
+        index.__dict__.update(data["state"])
+        return index
+
+    def save(self, path: Path) -> None:
+        """
+        保存索引到文件（先写临时文件再替换，避免并发读到半个文件）
+
+        Args:
+            path: 索引文件路径
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {"version": INDEX_VERSION, "state": self.__dict__},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        tmp_path.replace(path)
+
+    # ==================== 查询接口 ====================
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, query: str) -> Dict[int, int]:
+        """
+        查找字段中包含查询串的文档
+
+        Args:
+            query: 查询串（不区分大小写）
+
+        Returns:
+            {文档序号: 包含查询串的字段位掩码}
+        """
+        query = query.lower()
+        results = {}
+
+        for doc_id in iter_bits(self._candidate_bits(query)):
+            mask = _field_mask(self.docs[doc_id], query)
+            if mask:
+                results[doc_id] = mask
+
+        return results
+
+    def score(self, query: str) -> Dict[int, float]:
+        """
+        计算查询的 BM25F 分数
+
+        Args:
+            query: 查询文本（可包含多个词，中文按 bigram 切分）
+
+        Returns:
+            {文档序号: 分数}，只包含至少命中一个词项的文档
+        """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, weight in self.weights[term].items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+        return scores
+
+    def fuzzy_match(self, keywords: List[str]) -> List[Dict[str, Any]]:
+        """
+        容忍拼写错误的查找
+
+        Args:
+            keywords: 关键字列表
+
+        Returns:
+            按相似度排序的匹配列表，见 FuzzyIndex.match
+        """
+        return self.fuzzy.match(keywords)
+
+    def find_name(self, name: str) -> List[int]:
+        """
+        按名称精确查找（不区分大小写）
+
+        Returns:
+            文档序号列表
+        """
+        return list(iter_bits(self.names.get(name.lower(), 0)))
+
+    def with_difficulty(self, difficulty: str) -> int:
+        """获取指定难度的文档位集合"""
+        return self.difficulties.get(difficulty.lower(), 0)
+
+    def doc(self, doc_id: int) -> Dict[str, str]:
+        """获取文档的规范化（小写）字段"""
+        return self.docs[doc_id]
+
+    # ==================== 内部辅助方法 ====================
+
+    def _candidate_bits(self, query: str) -> int:
+        """根据 n-gram 倒排表求候选文档位集合，每次求交的开销与文档总数成正比"""
+        all_bits = (1 << len(self.keys)) - 1
+        if not query:
+            return all_bits
+
+        bits = all_bits
+        for gram in _query_grams(query):
+            bits &= self.postings.get(gram, 0)
+            if not bits:
+                break
+        return bits
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    切分检索词项
+
+    ASCII 等按单词切分（连字符、下划线视为分隔），中日韩文字连续片段切为相邻两字的 bigram，
+    单个汉字保留为一个词项。
+
+    Args:
+        text: 文本
+
+    Returns:
+        小写词项列表（保留重复，用于统计词频）
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group()
+        if len(token) > 1 and _CJK_PATTERN.match(token):
+            tokens.extend(token[i : i + 2] for i in range(len(token) - 1))
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def _normalize(record: Dict[str, Any]) -> Dict[str, str]:
+    """将记录转换为小写字段，供匹配使用"""
+    name = str(record.get("name") or "").lower()
+    description = str(record.get("description") or "").lower()
+    keywords = [str(kw).lower() for kw in record.get("keywords") or []]
+    return {
+        "name": name,
+        "title": str(record.get("title") or "").lower(),
+        "keywords": _KEYWORD_SEPARATOR.join(keywords),
+        "description": description,
+        "difficulty": str(record.get("difficulty") or "").lower(),
+        # 与原 _get_demo_text 一致的合并文本
+        "text": " ".join([name, description, " ".join(keywords)]),
+    }
+
+
+def _field_mask(doc: Dict[str, str], query: str) -> int:
+    """计算包含查询串的字段位掩码"""
+    mask = 0
+    if query in doc["name"]:
+        mask |= FIELD_NAME
+    if query in doc["keywords"]:
+        mask |= FIELD_KEYWORDS
+    if query in doc["description"]:
+        mask |= FIELD_DESCRIPTION
+    if query in doc["title"]:
+        mask |= FIELD_TITLE
+    if query in doc["text"]:
+        mask |= FIELD_TEXT
+    return mask
+
+
+def _grams_of(text: str) -> set:
+    """文本中所有长度为 1~MAX_GRAM 的 n-gram"""
+    grams = set()
+    length = len(text)
+    for n in range(1, MAX_GRAM + 1):
+        for i in range(length - n + 1):
+            grams.add(text[i : i + n])
+    return grams
+
+
+def _query_grams(query: str) -> set:
+    """查询串用于求交集的 n-gram"""
+    if len(query) <= MAX_GRAM:
+        return {query}
+    return {query[i : i + MAX_GRAM] for i in range(len(query) - MAX_GRAM + 1)}
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """按从小到大的顺序遍历位集合中的文档序号"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
@@ -4,18 +4,42 @@
 负责文件系统操作和demo库管理。
 """
 
+import ctypes
+import errno
 import json
+import os
 import shutil
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 # 修复导入路径
 import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.blob_store import BlobStore
+from core.demo_bundle import BUNDLE_SUFFIX, DemoBundle
+from core.demo_catalog import LIBRARY_FILE, DemoFields
+from core.demo_walker import DemoWalker
+from core.materializer import STRATEGY_AUTO, materialize_tree, reflink_supported
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 替换已有demo目录时的日志目录（位于缓存目录下），记录两步重命名中被移走的旧目录
+REPLACE_JOURNAL_DIR = "replace-journal"
+
+# renameat2 的参数（linux/fcntl.h、linux/fs.h）
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+# None 表示尚未探测，False 表示不可用
+_renameat2 = None
+
+# 查询进程状态用的 Windows API 常量
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_ERROR_ACCESS_DENIED = 5
+_STILL_ACTIVE = 259
+
 
 class StorageService:
     """存储服务类"""
@@ -30,6 +54,11 @@ class StorageService:
         self.config = config_service
         self._builtin_library_path = None
         self._user_library_path = None
+        self._walker = None
+        self._blob_store = None
+        self._builtin_bundle = None
+        self._builtin_bundle_checked = False
+        self._recover_replaced_dirs()
 
     @property
     def builtin_library_path(self) -> Path:
@@ -51,12 +80,200 @@ class StorageService:
             self._user_library_path.mkdir(parents=True, exist_ok=True)
         return self._user_library_path
 
+    @property
+    def walker(self) -> DemoWalker:
+        """获取demo目录遍历器"""
+        if self._walker is None:
+            self._walker = DemoWalker(
+                max_depth=self.config.get("performance.max_scan_depth"),
+                prune_demo_roots=self.config.get("performance.prune_demo_roots", False),
+            )
+        return self._walker
+
+    @property
+    def blob_store(self) -> Optional[BlobStore]:
+        """
+        获取内容寻址存储
+
+        物化时blob只能克隆（reflink）或复制，不支持 reflink 的文件系统上每个文件会多占
+        一份空间，因此打开时检测一次，不支持时不启用存储，直接从源目录物化。
+
+        Returns:
+            BlobStore，未启用（performance.blob_store）或文件系统不支持 reflink 时为None
+        """
+        if self._blob_store is None and self.config.get("performance.blob_store", False):
+            root = self.get_cache_directory() / "blobs"
+            try:
+                supported = reflink_supported(root)
+            except OSError as e:
+                logger.warning(f"Failed to probe reflink support in {root}: {e}")
+                supported = False
+            if supported:
+                self._blob_store = BlobStore(root)
+            else:
+                logger.info(
+                    f"Reflink is not supported in {root}, blob store deduplication is disabled"
+                )
+                self._blob_store = False
+        return self._blob_store or None
+
+    @property
+    def builtin_bundle_path(self) -> Path:
+        """获取内置demo库打包文件路径，默认为内置库目录旁的 builtin_demos.odb"""
+        path = self.config.get("builtin_bundle")
+        if path:
+            return Path(path)
+        return self.builtin_library_path.with_suffix(BUNDLE_SUFFIX)
+
+    @property
+    def builtin_bundle(self) -> Optional[DemoBundle]:
+        """
+        获取内置demo库打包文件
+
+        打包文件存在且启用（performance.bundle）时，内置库的元数据和文件列表从中读取。
+        内置库目录同时存在且比打包文件新时（见 _bundle_is_stale）不使用打包文件，
+        直接读取目录。
+
+        Returns:
+            DemoBundle，不存在、无效或已过期时为None
+        """
+        if not self._builtin_bundle_checked:
+            self._builtin_bundle_checked = True
+            if self.config.get("performance.bundle", True):
+                try:
+                    bundle_path = self.builtin_bundle_path
+                    if bundle_path.is_file():
+                        if self._bundle_is_stale(bundle_path):
+                            logger.warning(
+                                f"Demo bundle {bundle_path} is older than "
+                                f"{self.builtin_library_path}, reading the directory instead; "
+                                "run 'opendemo bundle build' to rebuild it"
+                            )
+                        else:
+                            self._builtin_bundle = DemoBundle(bundle_path)
+                except (ImportError, OSError, ValueError) as e:
+                    logger.warning(f"Failed to open demo bundle: {e}")
+        return self._builtin_bundle
+
+    def _bundle_is_stale(self, bundle_path: Path) -> bool:
+        """
+        判断打包文件是否比内置库目录旧
+
+        只比较库根目录、语言目录及其直接子目录（demo目录、libraries目录）的修改时间，
+        能发现demo的增删、改名和 metadata.json 的替换；只有打包文件没有目录时总是有效。
+
+        Args:
+            bundle_path: 打包文件路径
+
+        Returns:
+            目录中有比打包文件新的条目时为True
+        """
+        root = self.builtin_library_path
+        if not root.is_dir():
+            return False
+        built_at = bundle_path.stat().st_mtime_ns
+        if root.stat().st_mtime_ns > built_at:
+            return True
+        subdirs, _ = self.walker.list_dir(str(root))
+        for name in subdirs:
+            language_dir = root / name
+            if language_dir.stat().st_mtime_ns > built_at:
+                return True
+            with os.scandir(language_dir) as it:
+                for entry in it:
+                    if entry.is_dir() and entry.stat().st_mtime_ns > built_at:
+                        return True
+        return False
+
+    def bundle_rel(self, path: Path) -> Optional[str]:
+        """
+        获取路径在内置库打包文件中的相对路径
+
+        Args:
+            path: 内置库中的路径
+
+        Returns:
+            以 / 分隔的相对路径（内置库根目录为空字符串），不在打包文件中时返回None
+        """
+        if self.builtin_bundle is None:
+            return None
+        try:
+            rel = Path(path).absolute().relative_to(self.builtin_library_path.absolute())
+        except ValueError:
+            return None
+        return "" if rel == Path(".") else rel.as_posix()
+
+    def get_bundled_demos(self, root: Path) -> Optional[List[Tuple[Path, str, DemoFields]]]:
+        """
+        从内置库打包文件获取根目录下的demo
+
+        Args:
+            root: 搜索根目录
+
+        Returns:
+            (demo路径, 元数据JSON文本, 常用字段) 列表，根目录不在打包文件中时返回None
+        """
+        rel_root = self.bundle_rel(root)
+        if rel_root is None:
+            return None
+        return [
+            (self.builtin_library_path / rel, text, fields)
+            for rel, text, fields in self.builtin_bundle.get_demos(rel_root)
+        ]
+
+    def get_bundled_libraries(self, root: Path) -> Optional[List[Tuple[Path, Dict[str, Any]]]]:
+        """
+        从内置库打包文件获取根目录下所有包含 _library.json 的库目录
+
+        Args:
+            root: 搜索根目录
+
+        Returns:
+            (库目录路径, 库元数据) 列表，按路径排序；根目录不在打包文件中时返回None
+        """
+        rel_root = self.bundle_rel(root)
+        if rel_root is None:
+            return None
+        libraries = []
+        for info in self.builtin_bundle.list_files(rel_root):
+            if info["path"].rsplit("/", 1)[-1] != LIBRARY_FILE:
+                continue
+            library_dir = (Path(root) / info["path"]).parent
+            metadata = self.load_library_metadata(library_dir)
+            if metadata is not None:
+                libraries.append((library_dir, metadata))
+        return libraries
+
+    def load_library_metadata(self, library_dir: Path) -> Optional[Dict[str, Any]]:
+        """
+        加载库目录的 _library.json，内置库有打包文件时从打包文件读取
+
+        Args:
+            library_dir: 库目录路径
+
+        Returns:
+            库元数据，不存在或解析失败返回None
+        """
+        metadata_file = Path(library_dir) / LIBRARY_FILE
+        rel = self.bundle_rel(metadata_file)
+        try:
+            if rel is not None:
+                data = self.builtin_bundle.read_file(rel)
+                return json.loads(data.decode("utf-8")) if data is not None else None
+            if not metadata_file.exists():
+                return None
+            with open(metadata_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load library metadata from {metadata_file}: {e}")
+            return None
+
     def list_demos(self, library: str = "all", language: str = None) -> List[Path]:
         """
         列出demo库中的所有demo
 
         Args:
-            library: 'builtin', 'user' 或 'all'
+            library: 'builtin', 'user', 'output' 或 'all'
             language: 过滤特定语言,None表示所有语言
 
         Returns:
@@ -64,27 +281,79 @@ class StorageService:
         """
         demo_paths = []
 
+        for search_path in self.get_search_roots(library, language):
+            demo_paths.extend(self._find_demos_in_path(search_path))
+
+        return demo_paths
+
+    def list_demos_in_root(self, root: Path) -> List[Path]:
+        """
+        列出搜索根目录下的所有demo
+
+        Args:
+            root: get_search_roots 返回的根目录
+
+        Returns:
+            demo目录路径列表
+        """
+        return self._find_demos_in_path(root)
+
+    def get_search_roots(self, library: str = "all", language: str = None) -> List[Path]:
+        """
+        获取demo库的搜索根目录
+
+        'all' 只包含内置库和用户库，不包含输出目录：
+        输出目录中的demo是从库中复制出来的，否则会在搜索结果中重复，
+        也会导致 copy_to_output 把demo复制到自身。
+
+        Args:
+            library: 'builtin', 'user', 'output' 或 'all'
+            language: 过滤特定语言,None表示所有语言
+
+        Returns:
+            存在的搜索根目录列表
+        """
         # 根据library参数确定搜索路径
         search_paths = []
         if library in ("all", "user"):
             search_paths.append(self.user_library_path)
         if library in ("all", "builtin"):
             search_paths.append(self.builtin_library_path)
+        if library == "output":
+            search_paths.append(self.get_output_directory())
 
+        roots = []
         for base_path in search_paths:
-            if not base_path.exists():
+            if not self.exists(base_path):
                 continue
 
             # 如果指定了语言,只搜索该语言目录
             if language:
                 lang_path = base_path / language.lower()
-                if lang_path.exists():
-                    demo_paths.extend(self._find_demos_in_path(lang_path))
+                if self.exists(lang_path):
+                    roots.append(lang_path)
             else:
                 # 搜索所有语言目录
-                demo_paths.extend(self._find_demos_in_path(base_path))
+                roots.append(base_path)
 
-        return demo_paths
+        return roots
+
+    def exists(self, path: Path) -> bool:
+        """
+        判断路径是否存在于磁盘或内置库打包文件中
+
+        Args:
+            path: 文件或目录路径
+
+        Returns:
+            是否存在
+        """
+        if path.exists():
+            return True
+        rel = self.bundle_rel(path)
+        return rel is not None and (
+            rel == "" or self.builtin_bundle.has_dir(rel) or self.builtin_bundle.has_file(rel)
+        )
 
     def _find_demos_in_path(self, path: Path) -> List[Path]:
         """
@@ -96,17 +365,15 @@ class StorageService:
         Returns:
             demo目录列表
         """
-        demos = []
+        bundled = self.get_bundled_demos(path)
+        if bundled is not None:
+            return [demo_path for demo_path, _, _ in bundled]
 
         if not path.exists():
-            return demos
-
-        # 遍历目录,查找包含metadata.json的目录
-        for item in path.rglob("*"):
-            if item.is_dir() and (item / "metadata.json").exists():
-                demos.append(item)
+            return []
 
-        return demos
+        # 遍历目录,查找包含metadata.json的目录(跳过code/、node_modules/等目录)
+        return self.walker.find_demos(path)
 
     def load_demo_metadata(self, demo_path: Path) -> Optional[Dict[str, Any]]:
         """
@@ -118,6 +385,12 @@ class StorageService:
         Returns:
             元数据字典,加载失败返回None
         """
+        rel = self.bundle_rel(demo_path)
+        if rel is not None:
+            text = self.builtin_bundle.metadata_text(rel)
+            if text is not None:
+                return json.loads(text)
+
         metadata_file = demo_path / "metadata.json"
 
         if not metadata_file.exists():
@@ -136,6 +409,9 @@ class StorageService:
         """
         保存demo到指定路径
 
+        先写入同级的隐藏临时目录，全部写完（并fsync）后再整体重命名到目标路径，
+        中途失败或被中断不会留下写了一半的demo。目标已存在时整体替换。
+
         Args:
             demo_data: demo数据,包含metadata和files
             target_path: 目标路径
@@ -143,36 +419,98 @@ class StorageService:
         Returns:
             保存是否成功
         """
-        try:
-            # 创建目标目录
-            target_path.mkdir(parents=True, exist_ok=True)
+        return self.save_demos([(demo_data, target_path)])[0]
+
+    def save_demos(self, demos: List[Tuple[Dict[str, Any], Path]]) -> List[bool]:
+        """
+        批量保存demo
+
+        与逐个调用 save_demo 相比，目录只创建一次，所有文件写完后再统一fsync，
+        父目录的fsync也合并为每个目录一次。
 
+        Args:
+            demos: (demo数据, 目标路径) 列表
+
+        Returns:
+            每个demo是否保存成功，顺序与输入一致
+        """
+        durable = self.config.get("performance.fsync_writes", True)
+        results = [False] * len(demos)
+        created_dirs = set()
+        staged = []
+
+        for index, (demo_data, target_path) in enumerate(demos):
+            target_path = Path(target_path)
+            try:
+                staging_path = self._stage_demo(demo_data, target_path, created_dirs)
+                staged.append((index, staging_path, target_path))
+            except Exception as e:
+                logger.error(f"Failed to save demo to {target_path}: {e}")
+
+        # 所有写入发出后再统一fsync，内核可以合并回写
+        parents = set()
+        for index, staging_path, target_path in staged:
+            try:
+                if durable:
+                    _fsync_tree(staging_path)
+                self._replace_dir(staging_path, target_path)
+                parents.add(target_path.parent)
+                results[index] = True
+                logger.info(f"Successfully saved demo to {target_path}")
+            except Exception as e:
+                shutil.rmtree(staging_path, ignore_errors=True)
+                logger.error(f"Failed to save demo to {target_path}: {e}")
+
+        if durable:
+            for parent in parents:
+                _fsync_dir(parent)
+
+        return results
+
+    def _stage_demo(self, demo_data: Dict[str, Any], target_path: Path, created_dirs: set) -> Path:
+        """
+        把demo写入目标路径旁的临时目录
+
+        临时目录以 . 开头，扫描demo时会被跳过。
+
+        Args:
+            demo_data: demo数据,包含metadata和files
+            target_path: 目标路径
+            created_dirs: 已创建的目录，批量保存时复用
+
+        Returns:
+            临时目录路径
+        """
+        _ensure_dir(target_path.parent, created_dirs)
+        staging_path = target_path.parent / f".{target_path.name}.{uuid.uuid4().hex[:8]}.staging"
+        staging_path.mkdir()
+
+        try:
             # 保存元数据
             metadata = demo_data.get("metadata", {})
-            metadata_file = target_path / "metadata.json"
-            with open(metadata_file, "w", encoding="utf-8") as f:
+            with open(staging_path / "metadata.json", "w", encoding="utf-8") as f:
                 json.dump(metadata, f, ensure_ascii=False, indent=2)
 
             # 保存文件
-            files = demo_data.get("files", [])
-            for file_info in files:
-                file_path = target_path / file_info["path"]
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-
+            for file_info in demo_data.get("files", []):
+                file_path = _safe_join(staging_path, file_info["path"])
+                _ensure_dir(file_path.parent, created_dirs)
                 with open(file_path, "w", encoding="utf-8") as f:
                     f.write(file_info["content"])
+        except BaseException:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            raise
 
-            logger.info(f"Successfully saved demo to {target_path}")
-            return True
-
-        except Exception as e:
-            logger.error(f"Failed to save demo to {target_path}: {e}")
-            return False
+        return staging_path
 
     def copy_demo(self, source_path: Path, target_path: Path) -> bool:
         """
         复制demo到目标路径
 
+        按 performance.materialize 配置的策略同步目录，目标中内容未变的文件会被跳过。
+        启用内容寻址存储时，先把源目录收录为清单，再从blob物化目标目录。
+        源目录只存在于内置库打包文件中时，从打包文件解出。
+
         Args:
             source_path: 源demo路径
             target_path: 目标路径
@@ -181,17 +519,125 @@ class StorageService:
             复制是否成功
         """
         try:
-            if target_path.exists():
-                shutil.rmtree(target_path)
-
-            shutil.copytree(source_path, target_path)
-            logger.info(f"Successfully copied demo from {source_path} to {target_path}")
+            strategy = self.config.get("performance.materialize", STRATEGY_AUTO)
+            strategy = strategy or STRATEGY_AUTO
+            rel = self.bundle_rel(source_path) if not source_path.is_dir() else None
+            if rel is not None:
+                self._extract_bundled_demo(rel, target_path)
+                logger.info(f"Successfully extracted demo {rel} from bundle to {target_path}")
+                return True
+            if self.blob_store is not None:
+                manifest = self.blob_store.get_manifest(source_path)
+                stats = self.blob_store.materialize(manifest, target_path, strategy)
+            else:
+                stats = materialize_tree(source_path, target_path, strategy)
+            logger.info(
+                f"Successfully copied demo from {source_path} to {target_path} "
+                f"(cloned={stats['cloned']}, linked={stats['linked']}, copied={stats['copied']}, "
+                f"skipped={stats['skipped']}, removed={stats['removed']})"
+            )
             return True
 
         except Exception as e:
             logger.error(f"Failed to copy demo: {e}")
             return False
 
+    @property
+    def replace_journal_path(self) -> Path:
+        """替换目录的日志目录（不自动创建）"""
+        cache_dir = self.config.get("cache_directory") or Path.home() / ".opendemo" / "cache"
+        return Path(cache_dir) / REPLACE_JOURNAL_DIR
+
+    def _recover_replaced_dirs(self) -> None:
+        """
+        恢复上次运行中断的目录替换
+
+        日志中的旧目录仍在而目标路径不存在，说明在两次重命名之间中断，把旧目录移回；
+        两者都在说明替换已完成，只是没来得及删除旧目录。
+        只处理所属进程已退出的记录：进程仍在运行时可能正处于两次重命名之间，不能动它的旧目录。
+        """
+        try:
+            names = os.listdir(self.replace_journal_path)
+        except OSError:
+            return
+        for name in names:
+            entry_path = self.replace_journal_path / name
+            try:
+                with open(entry_path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                target_path, backup_path = Path(entry["target"]), Path(entry["backup"])
+                pid = entry.get("pid")
+                if pid is not None and _process_alive(pid):
+                    continue
+                if backup_path.exists():
+                    if target_path.exists():
+                        _remove_path(backup_path)
+                    else:
+                        os.rename(backup_path, target_path)
+                        logger.warning(f"Restored {target_path} after an interrupted replace")
+                entry_path.unlink()
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Failed to recover interrupted replace {name}: {e}")
+
+    def _replace_dir(self, staging_path: Path, target_path: Path) -> None:
+        """
+        把临时目录重命名为目标路径，目标已存在时整体替换
+
+        Linux 上用 renameat2(RENAME_EXCHANGE) 原子交换两个目录，任何时刻目标路径上都有
+        完整的demo。不支持时（其他平台或文件系统不支持）分两步：目标改名为备份，临时目录
+        改名为目标；两步之间目标路径不存在，为此先在日志中记录备份位置，中断后下次启动时
+        由 _recover_replaced_dirs 移回。
+        """
+        if not target_path.exists():
+            os.rename(staging_path, target_path)
+            return
+
+        if _exchange_dirs(staging_path, target_path):
+            # 交换后临时目录中是旧的demo
+            _remove_path(staging_path)
+            return
+
+        backup_path = target_path.parent / f".{target_path.name}.{uuid.uuid4().hex[:8]}.old"
+        journal_path = self.replace_journal_path
+        journal_path.mkdir(parents=True, exist_ok=True)
+        entry_path = journal_path / f"{uuid.uuid4().hex}.json"
+        with open(entry_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"target": str(target_path), "backup": str(backup_path), "pid": os.getpid()}, f
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.rename(target_path, backup_path)
+        try:
+            os.rename(staging_path, target_path)
+        except BaseException:
+            os.rename(backup_path, target_path)
+            entry_path.unlink()
+            raise
+        _remove_path(backup_path)
+        entry_path.unlink()
+
+    def _extract_bundled_demo(self, rel: str, target_path: Path) -> None:
+        """
+        从内置库打包文件解出demo，先解到临时目录再整体替换目标
+
+        Raises:
+            FileNotFoundError: 打包文件中没有该demo
+        """
+        if not self.builtin_bundle.has_dir(rel):
+            raise FileNotFoundError(f"Demo not found in bundle: {rel}")
+
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        staging_path = target_path.parent / f".{target_path.name}.{uuid.uuid4().hex[:8]}.staging"
+        staging_path.mkdir()
+        try:
+            self.builtin_bundle.extract(rel, staging_path)
+            self._replace_dir(staging_path, target_path)
+        except BaseException:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            raise
+
     def delete_demo(self, demo_path: Path) -> bool:
         """
         删除demo
@@ -226,6 +672,18 @@ class StorageService:
         output_dir.mkdir(parents=True, exist_ok=True)
         return output_dir
 
+    def get_cache_directory(self) -> Path:
+        """
+        获取缓存目录
+
+        Returns:
+            缓存目录路径,默认为 ~/.opendemo/cache
+        """
+        cache_dir = self.config.get("cache_directory") or Path.home() / ".opendemo" / "cache"
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir
+
     def read_file(self, file_path: Path) -> Optional[str]:
         """
         读取文件内容
@@ -306,62 +764,51 @@ class StorageService:
         migrated_libraries = []
 
         try:
-            # 扫描所有语言的libraries目录
-            for language_dir in self.builtin_library_path.iterdir():
-                if not language_dir.is_dir():
-                    continue
-
-                language = language_dir.name
-                libraries_dir = language_dir / "libraries"
-
-                if not libraries_dir.exists():
+            # 内置库中 <语言>/libraries/<库>/<功能> 结构的demo，有打包文件时从打包文件读取
+            features: Dict[Tuple[str, str], List[Path]] = {}
+            for feature_dir in sorted(self._find_demos_in_path(self.builtin_library_path)):
+                parts = feature_dir.relative_to(self.builtin_library_path).parts
+                if (
+                    len(parts) != 4
+                    or parts[1] != "libraries"
+                    or parts[2].startswith("_")
+                    or parts[3].startswith("_")
+                ):
                     continue
-
-                # 遍历每个库
-                for library_dir in libraries_dir.iterdir():
-                    if not library_dir.is_dir() or library_dir.name.startswith("_"):
-                        continue
-
-                    library_name = library_dir.name
-                    feature_count = 0
-
-                    # 遍历库中的每个功能demo
-                    for feature_dir in library_dir.iterdir():
-                        if not feature_dir.is_dir() or feature_dir.name.startswith("_"):
-                            continue
-
-                        # 检查是否有metadata.json
-                        if not (feature_dir / "metadata.json").exists():
-                            continue
-
-                        feature_name = feature_dir.name
-
-                        # 构建目标路径
-                        target_path = (
-                            self.get_output_directory()
-                            / language
-                            / "libraries"
-                            / library_name
-                            / feature_name
+                features.setdefault((parts[0], parts[2]), []).append(feature_dir)
+
+            for (language, library_name), feature_dirs in features.items():
+                feature_count = 0
+
+                for feature_dir in feature_dirs:
+                    feature_name = feature_dir.name
+
+                    # 构建目标路径
+                    target_path = (
+                        self.get_output_directory()
+                        / language
+                        / "libraries"
+                        / library_name
+                        / feature_name
+                    )
+
+                    # 复制demo
+                    if self.copy_demo(feature_dir, target_path):
+                        feature_count += 1
+                        logger.info(f"Migrated {language}/{library_name}/{feature_name}")
+                    else:
+                        logger.warning(
+                            f"Failed to migrate {language}/{library_name}/{feature_name}"
                         )
 
-                        # 复制demo
-                        if self.copy_demo(feature_dir, target_path):
-                            feature_count += 1
-                            logger.info(f"Migrated {language}/{library_name}/{feature_name}")
-                        else:
-                            logger.warning(
-                                f"Failed to migrate {language}/{library_name}/{feature_name}"
-                            )
-
-                    if feature_count > 0:
-                        migrated_libraries.append(
-                            {
-                                "language": language,
-                                "library": library_name,
-                                "feature_count": feature_count,
-                            }
-                        )
+                if feature_count > 0:
+                    migrated_libraries.append(
+                        {
+                            "language": language,
+                            "library": library_name,
+                            "feature_count": feature_count,
+                        }
+                    )
 
             # 创建迁移标记文件
             migration_data = {
@@ -380,3 +827,124 @@ class StorageService:
         except Exception as e:
             logger.error(f"Failed to migrate builtin libraries: {e}")
             return False
+
+
+def _ensure_dir(path: Path, created_dirs: set) -> None:
+    """创建目录，已创建过的直接跳过"""
+    if path not in created_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        created_dirs.add(path)
+
+
+def _safe_join(base: Path, relative_path: str) -> Path:
+    """
+    拼接demo内的文件路径
+
+    Raises:
+        ValueError: 路径为绝对路径或跳出了demo目录
+    """
+    path = (base / relative_path).resolve()
+    if path != base.resolve() and base.resolve() not in path.parents:
+        raise ValueError(f"File path escapes demo directory: {relative_path}")
+    return path
+
+
+def _exchange_dirs(first: Path, second: Path) -> bool:
+    """
+    用 renameat2(RENAME_EXCHANGE) 原子交换两个路径
+
+    Returns:
+        是否已交换；平台、C库或文件系统不支持时返回False
+
+    Raises:
+        OSError: 交换失败（不支持以外的原因）
+    """
+    global _renameat2
+    if _renameat2 is None:
+        _renameat2 = False
+        if sys.platform.startswith("linux"):
+            try:
+                _renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+            except (OSError, AttributeError):
+                pass
+    if not _renameat2:
+        return False
+
+    result = _renameat2(
+        _AT_FDCWD, os.fsencode(first), _AT_FDCWD, os.fsencode(second), _RENAME_EXCHANGE
+    )
+    if result == 0:
+        return True
+    code = ctypes.get_errno()
+    if code in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+        return False
+    raise OSError(code, os.strerror(code), str(second))
+
+
+def _process_alive(pid: int) -> bool:
+    """
+    判断进程是否仍在运行
+
+    Args:
+        pid: 进程ID
+
+    Returns:
+        进程是否存在；无权访问的进程视为存在
+    """
+    if sys.platform == "win32":
+        # Windows 上 os.kill(pid, 0) 会发送 CTRL_C_EVENT，改用 OpenProcess 查询
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return kernel32.GetLastError() == _ERROR_ACCESS_DENIED
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == _STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _remove_path(path: Path) -> None:
+    """删除目录或文件"""
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink()
+
+
+def _fsync_tree(root: Path) -> None:
+    """fsync 目录下的所有文件和目录"""
+    for dir_path, _, file_names in os.walk(root, topdown=False):
+        for file_name in file_names:
+            fd = os.open(os.path.join(dir_path, file_name), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        _fsync_dir(Path(dir_path))
+
+
+def _fsync_dir(path: Path) -> None:
+    """fsync 目录项，平台不支持时忽略（如Windows）"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
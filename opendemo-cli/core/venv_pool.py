@@ -0,0 +1,457 @@
+"""
+虚拟环境池模块
+
+验证Python demo时复用虚拟环境，而不是每次新建并从头 pip install：
+- 以规范化后的依赖集合和解释器版本的哈希为键，同一组依赖只构建一次
+- 每次验证租用一个空闲的环境，同一组依赖同时被多个验证使用时再构建一份
+- 归还时检查 site-packages 是否被demo改动，被改动的环境直接丢弃，保证下次租用时是干净的
+- 总占用超过磁盘预算时，按最近使用时间淘汰空闲的环境（LRU）
+
+环境保存在 ~/.opendemo/cache/venvs 下，每个环境目录中的 .opendemo-venv.json
+记录依赖、大小和最近使用时间；没有该文件的目录视为构建未完成，启动时清理。
+多个进程（如同时运行的 opendemo verify 和验证脚本）共用同一目录：租用期间持有环境对应的
+<环境目录名>.lock 文件锁（flock），被其他进程锁定的环境不会被租用、淘汰或清理。
+不支持 fcntl 的平台（Windows）上只在进程内跟踪租用状态。
+"""
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from core.verification_deadline import step_timeout
+from utils.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = get_logger(__name__)
+
+# 环境目录中的元数据文件，最后写入，存在即表示构建完成
+MARKER_FILE = ".opendemo-venv.json"
+
+# 默认磁盘预算（MB）
+DEFAULT_BUDGET_MB = 2048
+
+# 没有元数据文件的目录超过该时长（秒）才视为残留清理，避免删掉其他进程正在构建的环境
+STALE_BUILD_SECONDS = 3600
+
+# 依赖名中等价的分隔符（PEP 503）
+_NAME_SEPARATORS = re.compile(r"[-_.]+")
+_REQUIREMENT_NAME = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(.*)$")
+
+
+def normalize_requirements(text: str) -> Optional[List[str]]:
+    """
+    规范化 requirements.txt 内容
+
+    去掉注释和空行，包名按 PEP 503 规范化为小写连字符形式，去重并排序，
+    使写法不同但等价的依赖声明得到相同的键。
+
+    Args:
+        text: requirements.txt 内容
+
+    Returns:
+        规范化后的依赖列表；包含 -r/-e、本地路径或URL等依赖于demo目录的内容时返回None
+    """
+    requirements = set()
+    for line in text.splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("-") or "/" in line or "\\" in line:
+            return None
+        match = _REQUIREMENT_NAME.match(line)
+        if not match:
+            return None
+        name = _NAME_SEPARATORS.sub("-", match.group(1)).lower()
+        requirements.add(name + re.sub(r"\s+", "", match.group(2)))
+    return sorted(requirements)
+
+
+def interpreter_tag() -> str:
+    """当前解释器的标识：实现、完整版本、平台和可执行文件路径"""
+    return "|".join(
+        [
+            platform.python_implementation(),
+            platform.python_version(),
+            sys.platform,
+            platform.machine(),
+            sys.executable,
+        ]
+    )
+
+
+def pool_key(requirements: List[str]) -> str:
+    """
+    计算环境的键
+
+    Args:
+        requirements: 规范化后的依赖列表
+
+    Returns:
+        依赖集合和解释器标识的哈希
+    """
+    text = "\n".join([interpreter_tag()] + requirements)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def venv_python(venv_path: Path) -> Path:
+    """虚拟环境中的python路径"""
+    if sys.platform == "win32":
+        return venv_path / "Scripts" / "python.exe"
+    return venv_path / "bin" / "python"
+
+
+def _site_packages(venv_path: Path) -> Optional[Path]:
+    """虚拟环境的 site-packages 目录"""
+    if sys.platform == "win32":
+        path = venv_path / "Lib" / "site-packages"
+        return path if path.is_dir() else None
+    return next((venv_path / "lib").glob("python*/site-packages"), None)
+
+
+def _snapshot(venv_path: Path) -> List[str]:
+    """site-packages 顶层条目，用于判断环境是否被改动"""
+    site_packages = _site_packages(venv_path)
+    if site_packages is None:
+        return []
+    return sorted(name for name in os.listdir(site_packages) if name != "__pycache__")
+
+
+def _disk_usage(path: Path) -> int:
+    """目录占用的字节数"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class VenvPool:
+    """虚拟环境池类"""
+
+    def __init__(self, root: Path, budget_mb: Optional[float] = DEFAULT_BUDGET_MB):
+        """
+        初始化环境池
+
+        Args:
+            root: 环境保存目录
+            budget_mb: 磁盘预算（MB），None或0表示不限
+        """
+        self.root = Path(root)
+        self.budget = int(budget_mb * 1024 * 1024) if budget_mb else None
+        self._lock = threading.Lock()
+        # 环境目录名 -> 元数据
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._leased = set()
+        # 环境目录名 -> 持有的锁文件描述符
+        self._lock_fds: Dict[str, int] = {}
+        self._stats = {"hits": 0, "builds": 0, "discarded": 0, "evicted": 0}
+        self._load()
+
+    @classmethod
+    def from_config(cls, config_service) -> "VenvPool":
+        """
+        按配置创建环境池
+
+        Args:
+            config_service: 配置服务实例
+
+        Returns:
+            环境池实例
+        """
+        cache_dir = config_service.get("cache_directory") or str(Path.home() / ".opendemo" / "cache")
+        return cls(
+            Path(cache_dir) / "venvs",
+            config_service.get("verification_venv_pool_mb", DEFAULT_BUDGET_MB),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取环境池统计
+
+        Returns:
+            复用次数、构建次数、丢弃和淘汰数、环境数和总占用字节数
+        """
+        with self._lock:
+            return dict(
+                self._stats,
+                environments=len(self._entries),
+                size=sum(entry["size"] for entry in self._entries.values()),
+            )
+
+    @contextmanager
+    def lease(
+        self, requirements_file: Optional[Path]
+    ) -> Iterator[Tuple[Optional[Path], str, bool]]:
+        """
+        租用一个装好依赖的虚拟环境，退出时归还
+
+        Args:
+            requirements_file: requirements.txt 路径，None或不存在表示没有依赖
+
+        Yields:
+            (环境路径, pip输出, 是否复用)；构建失败时路径为None
+        """
+        text = ""
+        if requirements_file and Path(requirements_file).exists():
+            text = Path(requirements_file).read_text(encoding="utf-8", errors="replace")
+        requirements = normalize_requirements(text)
+
+        if requirements is None:
+            # 依赖于demo目录的声明无法共享，只为本次验证构建
+            name, output = self._build(None, requirements_file)
+            try:
+                yield (self.root / name if name else None), output, False
+            finally:
+                if name:
+                    shutil.rmtree(self.root / name, ignore_errors=True)
+                    self._unlock(name, remove=True)
+            return
+
+        key = pool_key(requirements)
+        name = self._checkout(key)
+        reused = name is not None
+        output = ""
+        if not reused:
+            name, output = self._build(key, requirements_file, requirements)
+        if name is None:
+            yield None, output, False
+            return
+
+        try:
+            yield self.root / name, output, reused
+        finally:
+            self._checkin(name)
+
+    def _load(self) -> None:
+        """读取已有环境，清理构建未完成的目录"""
+        if not self.root.is_dir():
+            return
+        for path in self.root.iterdir():
+            if not path.is_dir():
+                continue
+            marker = path / MARKER_FILE
+            try:
+                if not marker.exists():
+                    if time.time() - path.stat().st_mtime > STALE_BUILD_SECONDS:
+                        self._remove_unlocked(path.name)
+                    continue
+                entry = json.loads(marker.read_text(encoding="utf-8"))
+                # 其他解释器构建的环境不复用也不删除
+                if entry.get("interpreter") == interpreter_tag():
+                    self._entries[path.name] = entry
+            except (OSError, ValueError):
+                self._remove_unlocked(path.name)
+
+    def _remove_unlocked(self, name: str) -> None:
+        """删除没有被其他进程使用的残留目录"""
+        if self._try_lock(name):
+            shutil.rmtree(self.root / name, ignore_errors=True)
+            self._unlock(name, remove=True)
+
+    def _try_lock(self, name: str) -> bool:
+        """
+        对环境加进程间的排他锁（非阻塞）
+
+        Args:
+            name: 环境目录名
+
+        Returns:
+            是否加锁成功，已被其他进程（或本进程的其他租用）锁定时返回False
+        """
+        if fcntl is None:
+            return True
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.root / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            logger.warning(f"Failed to open venv lock for {name}: {e}")
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fds[name] = fd
+        return True
+
+    def _unlock(self, name: str, remove: bool = False) -> None:
+        """
+        释放环境的锁
+
+        Args:
+            name: 环境目录名
+            remove: 环境已删除时同时删除锁文件（其他进程拿到旧锁后会发现环境已不存在）
+        """
+        fd = self._lock_fds.pop(name, None)
+        if remove:
+            try:
+                os.unlink(self.root / f"{name}.lock")
+            except OSError:
+                pass
+        if fd is not None:
+            os.close(fd)
+
+    def _checkout(self, key: str) -> Optional[str]:
+        """取出一个空闲的同键环境"""
+        with self._lock:
+            for name, entry in list(self._entries.items()):
+                if entry["key"] != key or name in self._leased:
+                    continue
+                if not self._try_lock(name):
+                    # 正被其他进程使用
+                    continue
+                if not venv_python(self.root / name).exists():
+                    # 被外部删除
+                    del self._entries[name]
+                    self._unlock(name)
+                    continue
+                self._leased.add(name)
+                self._stats["hits"] += 1
+                return name
+        return None
+
+    def _checkin(self, name: str) -> None:
+        """归还环境：被改动的丢弃，否则记录使用时间"""
+        entry = self._entries[name]
+        path = self.root / name
+        clean = _snapshot(path) == entry["packages"]
+
+        with self._lock:
+            self._leased.discard(name)
+            if not clean:
+                del self._entries[name]
+                self._stats["discarded"] += 1
+            else:
+                entry["last_used"] = time.time()
+
+        if not clean:
+            logger.info(f"Discarding modified venv {name}")
+            shutil.rmtree(path, ignore_errors=True)
+            self._unlock(name, remove=True)
+            return
+        self._write_marker(path, entry)
+        self._unlock(name)
+
+    def _build(
+        self,
+        key: Optional[str],
+        requirements_file: Optional[Path],
+        requirements: Optional[List[str]] = None,
+    ) -> Tuple[Optional[str], str]:
+        """
+        构建环境并安装依赖
+
+        Args:
+            key: 环境的键，None表示不放入池中
+            requirements_file: requirements.txt 路径
+            requirements: 规范化后的依赖列表
+
+        Returns:
+            (环境目录名, pip输出)，失败时目录名为None
+        """
+        name = f"{key or 'private'}-{os.getpid()}-{time.monotonic_ns()}"
+        path = self.root / name
+        output = ""
+        # 新目录名只有本进程知道，加锁总会成功；锁一直持有到归还
+        self._try_lock(name)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            subprocess.run(
+                [sys.executable, "-m", "venv", str(path)],
+                check=True,
+                capture_output=True,
+                timeout=step_timeout(60),
+            )
+            if requirements_file and Path(requirements_file).exists():
+                result = subprocess.run(
+                    [str(venv_python(path)), "-m", "pip", "install", "-r", str(requirements_file)],
+                    capture_output=True,
+                    text=True,
+                    timeout=step_timeout(300),
+                )
+                output = result.stdout
+                if result.returncode != 0:
+                    shutil.rmtree(path, ignore_errors=True)
+                    self._unlock(name, remove=True)
+                    return None, output + result.stderr
+        except Exception as e:
+            logger.error(f"Failed to build venv: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            self._unlock(name, remove=True)
+            return None, str(e)
+
+        if key is None:
+            return name, output
+
+        entry = {
+            "key": key,
+            "interpreter": interpreter_tag(),
+            "requirements": requirements,
+            "packages": _snapshot(path),
+            "size": _disk_usage(path),
+            "created": time.time(),
+            "last_used": time.time(),
+        }
+        self._write_marker(path, entry)
+        with self._lock:
+            self._entries[name] = entry
+            self._leased.add(name)
+            self._stats["builds"] += 1
+        self._evict()
+        return name, output
+
+    def _evict(self) -> None:
+        """总占用超过预算时按最近使用时间淘汰空闲环境，跳过正被其他进程使用的环境"""
+        if not self.budget:
+            return
+        removed = []
+        with self._lock:
+            total = sum(entry["size"] for entry in self._entries.values())
+            idle = sorted(
+                (name for name in self._entries if name not in self._leased),
+                key=lambda name: self._entries[name]["last_used"],
+            )
+            for name in idle:
+                if total <= self.budget:
+                    break
+                if not self._try_lock(name):
+                    continue
+                total -= self._entries.pop(name)["size"]
+                self._stats["evicted"] += 1
+                removed.append(name)
+
+        for name in removed:
+            logger.info(f"Evicting venv {name}")
+            shutil.rmtree(self.root / name, ignore_errors=True)
+            self._unlock(name, remove=True)
+
+    @staticmethod
+    def _write_marker(path: Path, entry: Dict[str, Any]) -> None:
+        """写入环境元数据"""
+        try:
+            marker = path / MARKER_FILE
+            temp = marker.with_suffix(".tmp")
+            temp.write_text(json.dumps(entry), encoding="utf-8")
+            os.replace(temp, marker)
+        except OSError as e:
+            logger.warning(f"Failed to write venv marker: {e}")
@@ -0,0 +1,217 @@
+"""
+验证结果缓存模块
+
+以demo目录内容的哈希、语言工具链版本和验证方式为键保存完整的验证结果
+（步骤、输出、错误、耗时），内容和工具链都没有变化的demo再次验证时直接返回缓存的结果，
+不再重复 venv/go build/npm install。验证通过后写回的 verified/updated_at 不计入内容哈希。
+
+只缓存验证通过的结果：失败可能来自网络等临时原因，再次验证时总是重新执行。
+结果保存在 ~/.opendemo/cache/verification.db，存储复用 ResponseCache。
+"""
+
+# 修复导入路径
+import sys
+from pathlib import Path
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import hashlib
+import json
+import os
+import subprocess
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from core.response_cache import ResponseCache
+from core.venv_pool import interpreter_tag
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 验证逻辑变化时递增，使已有的缓存结果失效
+VERIFIER_VERSION = 2
+
+# 默认保留的结果数
+DEFAULT_MAX_ENTRIES = 20000
+
+# 不影响验证结果的目录：构建产物、依赖目录和隐藏目录
+SKIP_DIRS = frozenset({"__pycache__", "node_modules", "target", "venv", "build", "dist"})
+
+# 验证后由 update_metadata 写回 metadata.json 的字段，不影响构建和运行，不参与内容哈希
+VOLATILE_METADATA_FIELDS = frozenset({"verified", "updated_at"})
+
+# 各语言工具链的版本命令
+TOOLCHAIN_COMMANDS = {
+    "java": [["java", "-version"], ["javac", "-version"]],
+    "go": [["go", "version"]],
+    "nodejs": [["node", "--version"], ["npm", "--version"]],
+    "kubernetes": [["kubectl", "version", "--client"], ["helm", "version", "--short"]],
+}
+
+
+def tree_digest(demo_path: Path) -> str:
+    """
+    计算demo目录内容的哈希
+
+    按相对路径排序遍历文件，路径、可执行位和内容都参与计算；跳过 SKIP_DIRS 和隐藏目录。
+    demo根目录的 metadata.json 去掉 VOLATILE_METADATA_FIELDS 后按规范化的JSON参与计算，
+    验证通过后写回验证状态不会使缓存失效。
+
+    Args:
+        demo_path: demo路径
+
+    Returns:
+        目录内容的哈希
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    root = str(demo_path)
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        rel_dir = os.path.relpath(current, root).replace(os.sep, "/")
+        for name in sorted(files):
+            path = os.path.join(current, name)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                executable = os.access(path, os.X_OK)
+            except OSError:
+                continue
+            if rel_dir == "." and name == "metadata.json":
+                data = _stable_metadata(data)
+            digest.update(f"{rel_dir}/{name}\0{int(executable)}\0{len(data)}\0".encode("utf-8"))
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def _stable_metadata(data: bytes) -> bytes:
+    """去掉验证时会被改写的字段并规范化元数据JSON，无法解析时原样返回"""
+    try:
+        metadata = json.loads(data.decode("utf-8"))
+    except ValueError:
+        return data
+    if not isinstance(metadata, dict):
+        return data
+    stable = {key: value for key, value in metadata.items() if key not in VOLATILE_METADATA_FIELDS}
+    return json.dumps(stable, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def toolchain_version(language: str) -> str:
+    """
+    获取语言工具链的版本信息，每个进程只查询一次
+
+    Args:
+        language: 编程语言
+
+    Returns:
+        版本信息，命令不可用时对应部分为 missing
+    """
+    language = language.lower()
+    if language == "python":
+        return interpreter_tag()
+
+    versions = []
+    for command in TOOLCHAIN_COMMANDS.get(language, []):
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=30)
+            # java -version 输出到stderr
+            output = (result.stdout + result.stderr).strip()
+            versions.append(output if result.returncode == 0 else "missing")
+        except Exception:
+            versions.append("missing")
+    if language == "kubernetes":
+        try:
+            import yaml
+
+            versions.append(f"pyyaml {yaml.__version__}")
+        except ImportError:
+            versions.append("pyyaml missing")
+    return "|".join(versions)
+
+
+class VerificationCache:
+    """验证结果缓存类"""
+
+    def __init__(self, db_path: Path, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES):
+        """
+        初始化缓存
+
+        Args:
+            db_path: SQLite 数据库文件路径
+            max_entries: 最多保留的结果数，None或0表示不限
+        """
+        self._store = ResponseCache(db_path, ttl=None, max_entries=max_entries)
+
+    @classmethod
+    def from_config(cls, config_service) -> "VerificationCache":
+        """
+        按配置创建缓存
+
+        Args:
+            config_service: 配置服务实例
+
+        Returns:
+            缓存实例
+        """
+        cache_dir = config_service.get("cache_directory") or str(Path.home() / ".opendemo" / "cache")
+        return cls(Path(cache_dir) / "verification.db")
+
+    @staticmethod
+    def key(demo_path: Path, language: str, method: str = "") -> str:
+        """
+        计算demo的缓存键
+
+        Args:
+            demo_path: demo路径
+            language: 编程语言
+            method: 验证方式
+
+        Returns:
+            内容哈希、工具链版本和验证方式的组合哈希
+        """
+        text = "\n".join(
+            [
+                str(VERIFIER_VERSION),
+                language.lower(),
+                method,
+                toolchain_version(language),
+                tree_digest(demo_path),
+            ]
+        )
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存的验证结果
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            验证结果字典，未命中返回None
+        """
+        value = self._store.get(key)
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        保存验证结果，未通过的结果不保存
+
+        Args:
+            key: 缓存键
+            result: 验证结果字典
+        """
+        if result.get("verified"):
+            self._store.put(key, json.dumps(result, ensure_ascii=False, default=str))
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._store.clear()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self._store.close()
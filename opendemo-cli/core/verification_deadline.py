@@ -0,0 +1,55 @@
+"""
+验证时间预算模块
+
+批量验证时每个demo有总的时间预算（verification_timeout）。验证在线程中运行，线程本身
+无法从外部终止，因此预算落实到子进程上：验证过程中的每个 subprocess.run 都用
+step_timeout 计算超时，不超过当前线程剩余的预算。预算用完后正在运行的子进程被终止，
+后续步骤立即超时，验证线程随之结束并释放工作线程。
+
+没有设置预算的线程（如单独验证一个demo）中 step_timeout 原样返回各步骤自身的超时。
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# 预算用完后子进程的超时（秒），子进程启动后立即被终止
+_EXHAUSTED_TIMEOUT = 0.01
+
+_local = threading.local()
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    为当前线程设置时间预算
+
+    Args:
+        seconds: 预算（秒），None或0表示不限
+    """
+    previous = getattr(_local, "deadline", None)
+    if seconds:
+        end = time.monotonic() + seconds
+        _local.deadline = end if previous is None else min(previous, end)
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def step_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    计算子进程的超时
+
+    Args:
+        timeout: 步骤自身的超时（秒），None表示不限
+
+    Returns:
+        步骤超时与当前线程剩余预算中较小的一个
+    """
+    end = getattr(_local, "deadline", None)
+    if end is None:
+        return timeout
+    remaining = max(end - time.monotonic(), _EXHAUSTED_TIMEOUT)
+    return remaining if timeout is None else min(timeout, remaining)
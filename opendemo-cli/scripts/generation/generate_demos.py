@@ -2,15 +2,29 @@
 """
 批量生成 Demo 脚本
 
-用于批量生成 Go 和 Node.js 的核心概念 Demo
+用于批量生成 Go 和 Node.js 的核心概念 Demo。
+在进程内调用 DemoGenerator.generate_many 并发生成，由令牌桶控制请求速率，
+不再为每个 Demo 启动一次 CLI。
 """
 
-import subprocess
-import time
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 
+# 使用 opendemo-cli 中的服务
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from commands.base import update_demo_list, update_readme_after_new
+from core.ai_service import AIService
+from core.config_service import ConfigService
+from core.demo_generator import DemoGenerator as CoreDemoGenerator
+from core.demo_repository import DemoRepository
+from core.storage_service import StorageService
+
+# 并发请求数，速率上限见配置 ai.requests_per_minute
+CONCURRENCY = 4
+
 # Go 语言核心概念清单
 GO_DEMOS = [
     # 批次1：基础语法类
@@ -88,64 +102,20 @@ NODEJS_DEMOS = [
 class DemoGenerator:
     """批量 Demo 生成器"""
 
-    def __init__(self, log_dir="logs"):
+    def __init__(self, log_dir="logs", concurrency=CONCURRENCY):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self.concurrency = concurrency
         self.results = {
             "go": {"success": [], "failed": []},
             "nodejs": {"success": [], "failed": []},
         }
 
-    def generate_demo(self, language, topic, difficulty, retry=2, delay=3):
-        """
-        生成单个 Demo
-
-        Args:
-            language: 语言
-            topic: 主题
-            difficulty: 难度
-            retry: 重试次数
-            delay: 请求间隔(秒)
-
-        Returns:
-            bool: 是否成功
-        """
-        cmd = ["python3", "cli.py", "new", language, topic, "--difficulty", difficulty]
-
-        for attempt in range(retry + 1):
-            try:
-                print(f"\n{'='*60}")
-                print(f"正在生成: {language} - {topic} (难度: {difficulty})")
-                print(f"尝试: {attempt + 1}/{retry + 1}")
-                print(f"{'='*60}")
-
-                result = subprocess.run(
-                    cmd, capture_output=True, text=True, timeout=600  # 10分钟超时
-                )
-
-                if result.returncode == 0:
-                    print(f"✓ 成功生成: {language} - {topic}")
-                    return True
-                else:
-                    print(f"✗ 生成失败: {language} - {topic}")
-                    print(f"错误输出: {result.stderr}")
-
-                    if attempt < retry:
-                        print(f"等待 {delay} 秒后重试...")
-                        time.sleep(delay)
-
-            except subprocess.TimeoutExpired:
-                print(f"✗ 超时: {language} - {topic}")
-                if attempt < retry:
-                    print(f"等待 {delay} 秒后重试...")
-                    time.sleep(delay)
-            except Exception as e:
-                print(f"✗ 异常: {language} - {topic} - {str(e)}")
-                if attempt < retry:
-                    print(f"等待 {delay} 秒后重试...")
-                    time.sleep(delay)
-
-        return False
+        config = ConfigService()
+        self.storage = StorageService(config)
+        self.generator = CoreDemoGenerator(
+            AIService(config), DemoRepository(self.storage, config), config
+        )
 
     def generate_batch(self, language, demos, batch_name=""):
         """
@@ -158,26 +128,49 @@ class DemoGenerator:
         """
         print(f"\n{'#'*60}")
         print(f"开始生成 {batch_name} - {language}")
-        print(f"总数: {len(demos)}")
+        print(f"总数: {len(demos)}, 并发: {self.concurrency}")
         print(f"{'#'*60}\n")
 
-        for i, demo in enumerate(demos, 1):
-            print(f"\n进度: {i}/{len(demos)}")
-
-            success = self.generate_demo(
-                language=language, topic=demo["topic"], difficulty=demo["difficulty"]
-            )
-
-            if success:
+        specs = [
+            {"language": language, "topic": demo["topic"], "difficulty": demo["difficulty"]}
+            for demo in demos
+        ]
+        done = []
+
+        def report(item):
+            done.append(item)
+            topic = item["spec"]["topic"]
+            if item["success"]:
+                print(f"[{len(done)}/{len(demos)}] ✓ 成功生成: {language} - {topic}")
+            else:
+                print(f"[{len(done)}/{len(demos)}] ✗ 生成失败: {language} - {topic}")
+                print(f"    错误: {item['error']} (尝试 {item['attempts']} 次)")
+
+        policy = self.generator.ai_service.retry_policy
+        rate_limited = policy.stats()["rate_limited"]
+        items = self.generator.generate_many(specs, self.concurrency, on_result=report)
+
+        # 本批次被限流时，后续批次降低并发
+        stats = policy.stats()
+        print(
+            f"\n请求 {stats['calls']} 次, 重试 {stats['retries']} 次, "
+            f"限流 {stats['rate_limited']} 次, 熔断器状态: {stats['state']}"
+        )
+        if stats["rate_limited"] > rate_limited and self.concurrency > 1:
+            self.concurrency = max(1, self.concurrency // 2)
+            print(f"检测到限流，并发数降为 {self.concurrency}")
+
+        for demo, item in zip(demos, items):
+            if item["success"]:
                 self.results[language]["success"].append(demo)
             else:
-                self.results[language]["failed"].append(demo)
+                self.results[language]["failed"].append(dict(demo, error=item["error"]))
 
-            # 请求间隔，避免 API 限流
-            if i < len(demos):
-                delay = 3
-                print(f"\n等待 {delay} 秒后继续...")
-                time.sleep(delay)
+        # 与 new 命令相同，更新 README.md 和 demo-list.md（每批一次即可，两者都扫描整个输出目录）
+        generated = [item["result"]["demo"] for item in items if item["success"]]
+        if generated:
+            update_readme_after_new(self.storage, language, generated[-1].name)
+            update_demo_list(self.storage)
 
     def save_report(self):
         """保存生成报告"""
@@ -58,8 +58,20 @@ def verify_demo(verifier: DemoVerifier, demo_path: Path) -> Dict[str, Any]:
     """
     logger.info(f"Verifying demo: {demo_path.name}")
 
-    result = verifier.verify(demo_path, "kubernetes")
+    return add_file_structure(verifier.verify(demo_path, "kubernetes"), demo_path)
 
+
+def add_file_structure(result: Dict[str, Any], demo_path: Path) -> Dict[str, Any]:
+    """
+    为验证结果补充 Demo 的文件结构信息
+
+    Args:
+        result: 验证结果字典
+        demo_path: Demo 路径
+
+    Returns:
+        补充后的验证结果字典
+    """
     result["demo_name"] = demo_path.name
     result["demo_path"] = str(demo_path)
 
@@ -252,25 +264,26 @@ def main():
     logger.info(f"Starting verification of {len(kserve_demos)} demos...")
     logger.info("")
 
-    results = []
-    for idx, demo_path in enumerate(kserve_demos, 1):
-        logger.info(f"[{idx}/{len(kserve_demos)}] Verifying: {demo_path.name}")
-
-        result = verify_demo(verifier, demo_path)
-        results.append(result)
-
-        status = "通过" if result.get("verified") else "失败"
-        logger.info(f"  Result: {status}")
-
-        if result.get("errors"):
-            for error in result["errors"]:
-                logger.error(f"    Error: {error}")
-
-        if result.get("warnings"):
-            for warning in result["warnings"][:3]:
-                logger.warning(f"    Warning: {warning}")
-
-        logger.info("")
+    done = [0]
+
+    def report(item: Dict[str, Any]) -> None:
+        done[0] += 1
+        status = "通过" if item["verified"] else "失败"
+        logger.info(f"[{done[0]}/{len(kserve_demos)}] {Path(item['path']).name}: {status}")
+        for error in item["errors"]:
+            logger.error(f"    Error: {error}")
+        for warning in item["warnings"][:3]:
+            logger.warning(f"    Warning: {warning}")
+
+    # 并行验证，单个 Demo 超过 verification_timeout 记为超时
+    items = verifier.verify_many(
+        [{"path": demo_path, "language": "kubernetes"} for demo_path in kserve_demos],
+        on_result=report,
+    )
+    results = [
+        add_file_structure(dict(item), demo_path) for item, demo_path in zip(items, kserve_demos)
+    ]
+    logger.info("")
 
     summary = generate_summary(results)
 
@@ -0,0 +1,160 @@
+"""
+内容寻址存储测试
+"""
+
+import os
+import stat
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+from core import blob_store as blob_store_module
+from core.blob_store import BlobStore
+from core.config_service import ConfigService
+from core.demo_repository import Demo, DemoRepository
+from core.storage_service import StorageService
+
+
+def _make_demo(root: Path, name: str, readme: str) -> Path:
+    """创建带公共测试桩的demo目录"""
+    demo = root / name
+    (demo / "code").mkdir(parents=True)
+    (demo / "metadata.json").write_text(f'{{"name": "{name}"}}', encoding="utf-8")
+    (demo / "README.md").write_text(readme, encoding="utf-8")
+    (demo / "code" / "test_demo.py").write_text("def test_demo():\n    pass\n", encoding="utf-8")
+    return demo
+
+
+def _blob_count(store: BlobStore) -> int:
+    return sum(1 for path in store.objects_path.rglob("*") if path.is_file())
+
+
+class TestBlobStore:
+    """内容寻址存储测试类"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return BlobStore(tmp_path / "blobs")
+
+    def test_ingest_dedupes_files(self, store, tmp_path):
+        """测试相同内容的文件只存一份"""
+        first = store.ingest(_make_demo(tmp_path, "a", "# a"))
+        second = store.ingest(_make_demo(tmp_path, "b", "# b"))
+
+        assert first["files"]["code/test_demo.py"]["digest"] == second["files"]["code/test_demo.py"]["digest"]
+        assert first["dirs"] == ["code"]
+        # 两个metadata、两个README、一个共用的测试桩
+        assert _blob_count(store) == 5
+        assert store.read_bytes(first["files"]["README.md"]["digest"]) == b"# a"
+
+    def test_ingest_reuses_unchanged_digests(self, store, tmp_path):
+        """测试源目录未变时不再读取文件内容"""
+        demo = _make_demo(tmp_path, "a", "# a")
+        manifest = store.ingest(demo)
+
+        with patch.object(blob_store_module, "file_digest", side_effect=AssertionError):
+            assert store.ingest(demo) == manifest
+
+        (demo / "README.md").write_text("# changed", encoding="utf-8")
+        assert store.ingest(demo)["files"]["README.md"]["digest"] != manifest["files"]["README.md"]["digest"]
+
+    def test_materialize(self, store, tmp_path):
+        """测试按清单物化并保留可执行权限"""
+        demo = _make_demo(tmp_path, "a", "# a")
+        script = demo / "run.sh"
+        script.write_text("echo hi\n", encoding="utf-8")
+        script.chmod(0o755)
+        target = tmp_path / "target"
+
+        stats = store.materialize(store.ingest(demo), target, "copy")
+
+        assert stats["copied"] == 4
+        assert (target / "code" / "test_demo.py").read_text(encoding="utf-8").startswith("def test_demo")
+        assert stat.S_IMODE(os.stat(target / "run.sh").st_mode) == 0o755
+        assert store.materialize(store.ingest(demo), target, "copy")["skipped"] == 4
+
+    def test_materialize_never_links_blobs(self, store, tmp_path):
+        """测试物化出的文件不与共享的blob硬链接，修改一份不影响blob和其他目标"""
+        manifest = store.ingest(_make_demo(tmp_path, "a", "# a"))
+        digest = manifest["files"]["README.md"]["digest"]
+        # 旧版本硬链接到blob的目标也会被替换
+        (tmp_path / "out_b").mkdir()
+        os.link(store.blob_path(digest), tmp_path / "out_b" / "README.md")
+
+        for name in ("out_a", "out_b"):
+            stats = store.materialize(manifest, tmp_path / name, "hardlink")
+            assert stats["linked"] == 0
+            assert not os.path.samefile(tmp_path / name / "README.md", store.blob_path(digest))
+
+        (tmp_path / "out_a" / "README.md").write_text("# edited", encoding="utf-8")
+        assert (tmp_path / "out_b" / "README.md").read_text(encoding="utf-8") == "# a"
+        assert store.read_bytes(digest) == b"# a"
+
+    def test_get_manifest_skips_unchanged(self, store, tmp_path):
+        """测试修改时间未变时直接使用保存的清单，增删或修改文件后重新收录"""
+        demo = _make_demo(tmp_path, "a", "# a")
+        manifest = store.ingest(demo)
+
+        fresh = BlobStore(store.root)
+        with patch.object(fresh, "ingest", side_effect=AssertionError):
+            assert fresh.get_manifest(demo) == manifest
+
+        (demo / "code" / "extra.py").write_text("x = 1\n", encoding="utf-8")
+        assert "code/extra.py" in store.get_manifest(demo)["files"]
+
+        (demo / "README.md").write_text("# changed", encoding="utf-8")
+        os.utime(demo / "README.md", ns=(0, 0))
+        assert store.get_manifest(demo)["files"]["README.md"]["digest"] != manifest["files"]["README.md"]["digest"]
+
+
+class TestStorageServiceBlobStore:
+    """存储服务使用内容寻址存储的测试类"""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "cache_directory": str(tmp_path / "cache"),
+            "performance.blob_store": True,
+            "performance.catalog": False,
+        }.get(key, default)
+        return config
+
+    @pytest.fixture(autouse=True)
+    def reflink(self):
+        """测试环境的文件系统不一定支持 reflink，默认按支持处理"""
+        with patch("core.storage_service.reflink_supported", return_value=True) as probe:
+            yield probe
+
+    def test_store_disabled_without_reflink(self, config, tmp_path, reflink):
+        """测试文件系统不支持 reflink 时不启用存储，直接从源目录复制"""
+        reflink.return_value = False
+        storage = StorageService(config)
+        source = _make_demo(tmp_path, "a", "# a")
+        target = tmp_path / "output" / "a"
+
+        assert storage.blob_store is None
+        assert storage.copy_demo(source, target) is True
+        assert (target / "README.md").read_text(encoding="utf-8") == "# a"
+        assert not (tmp_path / "cache" / "blobs" / "objects").exists()
+        assert reflink.call_count == 1
+
+    def test_copy_demo_through_store(self, config, tmp_path):
+        """测试启用存储后 copy_demo 从blob物化"""
+        storage = StorageService(config)
+        source = _make_demo(tmp_path, "a", "# a")
+        target = tmp_path / "output" / "a"
+
+        assert storage.copy_demo(source, target) is True
+
+        assert (target / "README.md").read_text(encoding="utf-8") == "# a"
+        assert _blob_count(storage.blob_store) == 3
+
+    def test_get_demo_files_from_manifest(self, config, tmp_path):
+        """测试文件列表取自清单并可从存储读取内容"""
+        repository = DemoRepository(StorageService(config), config)
+        demo = Demo(_make_demo(tmp_path, "a", "# a"), {"name": "a"})
+
+        files = {info["path"]: info for info in repository.get_demo_files(demo)}
+
+        assert sorted(files) == ["README.md", "code/test_demo.py", "metadata.json"]
+        assert repository.read_demo_file(files["README.md"]) == "# a"
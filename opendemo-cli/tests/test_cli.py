@@ -217,3 +217,54 @@ class TestCLI:
         result = self.runner.invoke(cli, ['check'])
         assert result.exit_code == 0
         assert '质量检查通过!' in result.output
+
+
+class TestLazyCommands:
+    """子命令延迟导入测试类"""
+
+    def test_version_does_not_import_commands(self):
+        """测试 --version 不导入子命令和核心模块"""
+        import subprocess
+
+        code = (
+            "import sys; sys.argv = ['opendemo', '--version']; import cli\n"
+            "try:\n    cli.cli()\nexcept SystemExit:\n    pass\n"
+            "print(sorted(m for m in sys.modules if m.startswith(('commands', 'core', 'requests'))))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=str(Path(__file__).parent.parent),
+        )
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+    def test_lazy_command_resolution(self):
+        """测试子命令按需解析"""
+        from cli import COMMANDS
+
+        ctx = cli.make_context("opendemo", ["config"], resilient_parsing=True)
+        assert cli.list_commands(ctx) == sorted(COMMANDS)
+        assert cli.get_command(ctx, "config").name == "config"
+        assert cli.get_command(ctx, "missing") is None
+
+    def test_parse_importtime(self):
+        """测试解析 -X importtime 输出"""
+        from utils.startup_profiler import parse_importtime, format_report
+
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |     yaml.error\n"
+            "import time:       500 |        600 |   yaml\n"
+            "import time:       200 |        800 | core.config_service\n"
+            "something else\n"
+        )
+        records = parse_importtime(output)
+
+        assert [(r["module"], r["depth"]) for r in records] == [
+            ("yaml.error", 2),
+            ("yaml", 1),
+            ("core.config_service", 0),
+        ]
+        report = format_report(records, wall_ms=12.0)
+        assert "模块导入 0.8 ms" in report
@@ -0,0 +1,207 @@
+"""
+Demo打包测试
+"""
+
+import json
+import os
+import shutil
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+from click.testing import CliRunner
+from core.config_service import ConfigService
+from core.demo_bundle import DemoBundle, build_bundle
+from core.demo_repository import DemoRepository
+from core.storage_service import StorageService
+
+
+def _write_demo(path: Path, **metadata):
+    """创建一个带metadata.json的demo目录"""
+    (path / "code").mkdir(parents=True, exist_ok=True)
+    (path / "metadata.json").write_text(json.dumps(metadata, ensure_ascii=False), encoding="utf-8")
+    (path / "code" / "main.py").write_text(f"print({metadata['name']!r})\n", encoding="utf-8")
+
+
+@pytest.fixture
+def library(tmp_path):
+    """内置库目录"""
+    root = tmp_path / "builtin_demos"
+    _write_demo(root / "python" / "python-basics", name="python-basics", language="python")
+    _write_demo(root / "python" / "python-basics-advanced", name="python-basics-advanced", language="python")
+    _write_demo(root / "go" / "go-channels", name="go-channels", language="go")
+    (root / "python" / "broken").mkdir()
+    (root / "python" / "broken" / "metadata.json").write_text("{", encoding="utf-8")
+    (root / "python" / "__pycache__").mkdir()
+    (root / "python" / "__pycache__" / "x.pyc").write_bytes(b"\0")
+    return root
+
+
+class TestDemoBundle:
+    """Demo打包测试类"""
+
+    def test_build_and_read(self, library, tmp_path):
+        """测试打包后读取元数据和文件"""
+        stats = build_bundle(library, tmp_path / "demos.odb")
+
+        assert stats["demos"] == 3
+        # 两个demo的 main.py 内容不同，broken/metadata.json 也会被打包
+        assert stats["files"] == 7
+
+        with DemoBundle(tmp_path / "demos.odb") as bundle:
+            demos = {rel: (text, fields) for rel, text, fields in bundle.get_demos("python")}
+            assert sorted(demos) == ["python/python-basics", "python/python-basics-advanced"]
+            assert json.loads(demos["python/python-basics"][0])["name"] == "python-basics"
+            assert demos["python/python-basics"][1] == (
+                "python-basics", "python", "beginner", (), False
+            )
+            assert bundle.metadata_text("go/go-channels") is not None
+            assert bundle.metadata_text("go") is None
+
+            # 前缀 python-basics 不应包含 python-basics-advanced 的文件
+            files = [info["path"] for info in bundle.list_files("python/python-basics")]
+            assert files == ["code/main.py", "metadata.json"]
+            assert bundle.read_file("python/python-basics/code/main.py") == b"print('python-basics')\n"
+            assert bundle.has_dir("go") and not bundle.has_dir("java")
+
+    def test_open_does_not_decode_index(self, library, tmp_path, monkeypatch):
+        """测试打开和查找只读取定长记录，不解压或解析整个索引"""
+        import core.demo_bundle as demo_bundle
+
+        _write_demo(library / "中文" / "示例", name="示例", language="python")
+        build_bundle(library, tmp_path / "demos.odb")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("index should not be decoded")
+
+        # 打开和文件查找不解析JSON，只有 get_demos 解码各demo的常用字段
+        with monkeypatch.context() as patched:
+            patched.setattr(demo_bundle.json, "loads", fail)
+            bundle = DemoBundle(tmp_path / "demos.odb")
+            assert [info["path"] for info in bundle.list_files("中文/示例")] == [
+                "code/main.py",
+                "metadata.json",
+            ]
+            assert bundle.read_file("中文/示例/code/main.py") == "print('示例')\n".encode("utf-8")
+            assert bundle.read_file("中文/示例/missing.py") is None
+
+        with bundle:
+            assert [rel for rel, _, _ in bundle.get_demos()] == [
+                "go/go-channels",
+                "python/python-basics",
+                "python/python-basics-advanced",
+                "中文/示例",
+            ]
+
+    def test_invalid_bundle(self, tmp_path):
+        """测试无效文件"""
+        path = tmp_path / "bad.odb"
+        path.write_bytes(b"not a bundle" * 10)
+        with pytest.raises(ValueError):
+            DemoBundle(path)
+
+
+class TestBundledLibrary:
+    """从打包文件读取内置库的测试类"""
+
+    @pytest.fixture
+    def repository(self, library, tmp_path, request):
+        build_bundle(library, library.with_suffix(".odb"))
+        # 只保留打包文件
+        shutil.rmtree(library)
+
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "user_demo_library": str(tmp_path / "user"),
+            "cache_directory": str(tmp_path / "cache"),
+            "output_directory": str(tmp_path / "output"),
+            "performance.catalog": request.param,
+        }.get(key, default)
+        storage = StorageService(config)
+        storage._builtin_library_path = library
+        return DemoRepository(storage, config)
+
+    @pytest.mark.parametrize("repository", [True, False], indirect=True, ids=["catalog", "direct"])
+    def test_load_and_copy(self, repository, library):
+        """测试加载、列出文件和复制打包文件中的demo"""
+        demos = repository.load_all_demos(library="builtin", language="python")
+        assert sorted(demo.name for demo in demos) == ["python-basics", "python-basics-advanced"]
+
+        demo = repository.load_demo(library / "go" / "go-channels")
+        assert demo.name == "go-channels"
+
+        files = {info["path"]: info for info in repository.get_demo_files(demo)}
+        assert sorted(files) == ["code/main.py", "metadata.json"]
+        assert repository.read_demo_file(files["code/main.py"]) == "print('go-channels')\n"
+
+        output_path = repository.copy_to_output(demo)
+        assert (output_path / "code" / "main.py").read_text(encoding="utf-8") == "print('go-channels')\n"
+
+
+class TestBundledLibraries:
+    """从打包文件读取库功能demo的测试类"""
+
+    @pytest.fixture
+    def storage(self, library, tmp_path, request):
+        libraries = library / "python" / "libraries"
+        (libraries / "requests").mkdir(parents=True)
+        (libraries / "requests" / "_library.json").write_text(
+            json.dumps({"name": "requests", "display_name": "Requests"}), encoding="utf-8"
+        )
+        _write_demo(libraries / "requests" / "sessions", name="sessions", category="core")
+
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "user_demo_library": str(tmp_path / "user"),
+            "cache_directory": str(tmp_path / "cache"),
+            "output_directory": str(tmp_path / "output"),
+            "performance.catalog": getattr(request, "param", True),
+        }.get(key, default)
+        storage = StorageService(config)
+        storage._builtin_library_path = library
+        return storage
+
+    @pytest.mark.parametrize("storage", [True, False], indirect=True, ids=["catalog", "direct"])
+    def test_bundle_only_libraries(self, storage, library):
+        """测试只有打包文件时库列表、功能、库demo和迁移都可用"""
+        build_bundle(library, library.with_suffix(".odb"))
+        shutil.rmtree(library)
+        repository = DemoRepository(storage, storage.config)
+
+        assert repository.get_supported_libraries("python") == ["requests"]
+        assert repository.get_library_info("python", "requests")["metadata"]["name"] == "requests"
+        features = repository.list_library_features("python", "requests")
+        assert [(f["name"], f["category"]) for f in features] == [("sessions", "core")]
+        assert repository.get_library_demo("python", "requests", "sessions").name == "sessions"
+
+        assert storage.migrate_builtin_libraries()
+        output = storage.get_output_directory() / "python" / "libraries" / "requests" / "sessions"
+        assert (output / "code" / "main.py").read_text(encoding="utf-8") == "print('sessions')\n"
+
+    def test_stale_bundle_ignored(self, storage, library):
+        """测试目录比打包文件新时改为读取目录"""
+        bundle_path = library.with_suffix(".odb")
+        build_bundle(library, bundle_path)
+        old = bundle_path.stat().st_mtime_ns - 10**9
+        os.utime(bundle_path, ns=(old, old))
+
+        assert storage.builtin_bundle is None
+        names = [path.name for path in storage.list_demos("builtin", "python")]
+        assert "python-basics" in names
+
+
+class TestBundleCommand:
+    """bundle 命令测试类"""
+
+    def test_build_command(self, library, tmp_path, monkeypatch):
+        """测试 opendemo bundle build"""
+        from cli import cli
+
+        monkeypatch.setenv("HOME", str(tmp_path))
+        output = tmp_path / "out.odb"
+        result = CliRunner().invoke(
+            cli, ["bundle", "build", "--source", str(library), "--output", str(output)]
+        )
+
+        assert result.exit_code == 0, result.output
+        with DemoBundle(output) as bundle:
+            assert len(bundle.get_demos()) == 3
@@ -0,0 +1,204 @@
+"""
+Demo目录索引测试
+"""
+
+import json
+import os
+import shutil
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from core.demo_catalog import DemoCatalog
+
+
+def _write_demo(path: Path, **metadata):
+    """创建一个带metadata.json的demo目录"""
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+
+
+def _touch_later(path: Path):
+    """把mtime推后，避免粗粒度时间戳导致变化未被发现"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestDemoCatalog:
+    """Demo目录索引测试类"""
+
+    def setup_method(self):
+        """设置测试环境"""
+        self.scans = 0
+
+    @pytest.fixture
+    def library(self, tmp_path):
+        """构建一个小型demo库"""
+        root = tmp_path / "python"
+        _write_demo(root / "python-logging", name="logging", keywords=["日志"])
+        _write_demo(root / "libraries" / "numpy" / "array-basics", name="array-basics")
+        (root / "libraries" / "numpy" / "_library.json").write_text(
+            json.dumps({"name": "numpy"}), encoding="utf-8"
+        )
+        return root
+
+    @pytest.fixture
+    def catalog(self, tmp_path):
+        """创建目录索引，并统计遍历次数"""
+        catalog = DemoCatalog(tmp_path / "cache" / "catalog.db")
+        original_scan = catalog._scan
+
+        def counting_scan(root_key, start_rel="."):
+            self.scans += 1
+            return original_scan(root_key, start_rel)
+
+        catalog._scan = counting_scan
+        yield catalog
+        catalog.close()
+
+    def test_get_demos(self, catalog, library):
+        """测试获取demo列表"""
+        demos = catalog.get_demos(library)
+        names = [path.name for path, _ in demos]
+        assert names == ["array-basics", "python-logging"]
+        assert demos[1][1]["keywords"] == ["日志"]
+
+    def test_get_libraries(self, catalog, library):
+        """测试获取库列表"""
+        libraries = catalog.get_libraries(library)
+        assert [path.name for path, _ in libraries] == ["numpy"]
+
+    def test_warm_read_does_not_rescan(self, catalog, library):
+        """测试未变化时不重新扫描"""
+        catalog.get_demos(library)
+        catalog.get_demos(library)
+        assert self.scans == 1
+
+    def test_persisted_across_instances(self, catalog, library, tmp_path):
+        """测试索引持久化"""
+        catalog.get_demos(library)
+        other = DemoCatalog(tmp_path / "cache" / "catalog.db")
+        other._scan = lambda *args: pytest.fail("should not rescan")
+        assert len(other.get_demos(library)) == 2
+        other.close()
+
+    def test_new_demo_only_walks_new_subtree(self, catalog, library):
+        """测试新增demo只遍历新增的子树"""
+        catalog.get_demos(library)
+        _write_demo(library / "python-threading", name="threading")
+        _touch_later(library)
+
+        events = catalog.refresh(library)
+
+        assert [(e["event"], e["path"].name) for e in events] == [("added", "python-threading")]
+        assert len(catalog.get_demos(library)) == 3
+        assert self.scans == 2
+
+    def test_removed_demo(self, catalog, library):
+        """测试删除demo产生removed事件"""
+        catalog.get_demos(library)
+        shutil.rmtree(library / "python-logging")
+        _touch_later(library)
+
+        events = catalog.refresh(library)
+
+        assert [(e["event"], e["path"].name) for e in events] == [("removed", "python-logging")]
+        assert [path.name for path, _ in catalog.get_demos(library)] == ["array-basics"]
+
+    def test_metadata_change_emits_modified(self, catalog, library):
+        """测试修改metadata产生modified事件"""
+        catalog.get_demos(library)
+        metadata_file = library / "python-logging" / "metadata.json"
+        metadata_file.write_text(json.dumps({"name": "logging-v2"}), encoding="utf-8")
+        _touch_later(metadata_file)
+
+        events = catalog.refresh(library)
+
+        assert [e["event"] for e in events] == ["modified"]
+        assert json.loads(events[0]["metadata_text"]) == {"name": "logging-v2"}
+        assert events[0]["fields"][0] == "logging-v2"
+        assert self.scans == 1
+
+    def test_listener_and_journal(self, catalog, library):
+        """测试事件订阅和变更日志"""
+        received = []
+        catalog.add_listener(received.extend)
+        catalog.get_demos(library)
+        assert len(received) == 3  # 首次扫描: 2个demo + 1个库
+        assert catalog.changes_since(0) == []  # 首次扫描不记入变更日志
+
+        _write_demo(library / "python-threading", name="threading")
+        _touch_later(library)
+        catalog.refresh(library)
+
+        changes = catalog.changes_since(0, root=library)
+        assert [(c["event"], c["path"].name) for c in changes] == [("added", "python-threading")]
+        assert catalog.changes_since(changes[-1]["seq"]) == []
+
+    def test_invalid_metadata_skipped(self, catalog, library):
+        """测试无效metadata被跳过"""
+        broken = library / "broken"
+        broken.mkdir()
+        (broken / "metadata.json").write_text("{not json", encoding="utf-8")
+        names = [path.name for path, _ in catalog.get_demos(library)]
+        assert "broken" not in names
+
+    def test_invalidate(self, catalog, library):
+        """测试手动标记失效后重新读取元数据"""
+        catalog.get_demos(library)
+        metadata_file = library / "python-logging" / "metadata.json"
+        st = os.stat(metadata_file)
+        metadata_file.write_text(json.dumps({"name": "logging-v3"}), encoding="utf-8")
+        # 模拟mtime精度不足：写入后mtime不变
+        os.utime(metadata_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        catalog.invalidate(library / "python-logging")
+        events = catalog.refresh(library)
+
+        assert [e["event"] for e in events] == ["modified"]
+        assert self.scans == 1
+
+    def test_used_from_other_threads(self, catalog, library):
+        """测试在其他线程中使用同一个索引"""
+        catalog.get_demos(library)
+        for i in range(8):
+            _write_demo(library / f"demo-{i}", name=f"demo-{i}")
+
+        def save(i):
+            catalog.invalidate(library / f"demo-{i}")
+            return catalog.refresh(library)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            events = [e for batch in pool.map(save, range(8)) for e in batch]
+        assert {e["path"].name for e in events} == {f"demo-{i}" for i in range(8)}
+        assert len(catalog.get_demos(library)) == 10
+
+    def test_missing_root(self, catalog, tmp_path):
+        """测试根目录不存在"""
+        assert catalog.get_demos(tmp_path / "missing") == []
+
+    def test_get_dirs(self, catalog, library):
+        """测试按深度列出目录，并随目录变化更新"""
+        assert [p.name for p in catalog.get_dirs(library, 1)] == ["libraries", "python-logging"]
+
+        (library / "scratch").mkdir()
+        _touch_later(library)
+
+        assert [p.name for p in catalog.get_dirs(library, 1)] == [
+            "libraries",
+            "python-logging",
+            "scratch",
+        ]
+        assert [p.name for p in catalog.get_dirs(library, 2)] == ["numpy"]
+
+    def test_parallel_read_matches_sequential(self, library, tmp_path):
+        """测试并行读取与顺序读取结果一致"""
+        for i in range(40):
+            _write_demo(library / f"demo-{i:02d}", name=f"demo-{i}")
+
+        sequential = DemoCatalog(tmp_path / "seq.db", io_workers=1)
+        parallel = DemoCatalog(tmp_path / "par.db", io_workers=4)
+
+        assert parallel.get_demos(library) == sequential.get_demos(library)
+        assert len(parallel.get_demos(library)) == 42
+        sequential.close()
+        parallel.close()
@@ -0,0 +1,207 @@
+"""
+Demo生成器测试
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from core.config_service import ConfigService
+from core.demo_generator import DemoGenerator
+from core.demo_repository import Demo
+from core.http_client import HTTPError
+from core.rate_limit import TokenBucket
+from core.retry_policy import RetryPolicy
+
+
+class _StubAIService:
+    """按主题返回预设结果的AI服务桩，记录并发数"""
+
+    def __init__(self, failures=None, delay=0.02):
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.closed = False
+        self.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+
+    async def agenerate_demo(self, language, topic, difficulty="beginner"):
+        self.calls.append(topic)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+
+        pending = self.failures.get(topic)
+        if pending:
+            raise pending.pop(0)
+        return {"metadata": {"name": f"{language}-{topic}"}, "files": []}
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def config():
+    config = Mock(spec=ConfigService)
+    config.get.side_effect = lambda key, default=None: {
+        "ai.retry_times": 3,
+        "ai.retry_interval": 0.01,
+        "ai.requests_per_minute": 0,
+    }.get(key, default)
+    return config
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = Mock()
+    repository.create_demo.side_effect = lambda **kwargs: Demo(
+        tmp_path / kwargs["name"], {"name": kwargs["name"]}
+    )
+    repository.get_demo_files.return_value = []
+    return repository
+
+
+def _specs(*topics):
+    return [{"language": "python", "topic": topic} for topic in topics]
+
+
+class TestGenerateMany:
+    """并发批量生成测试类"""
+
+    def test_results_in_order(self, config, repository):
+        """测试并发上限和结果顺序"""
+        ai = _StubAIService()
+        generator = DemoGenerator(ai, repository, config)
+        finished = []
+
+        results = generator.generate_many(
+            _specs("a", "b", "c", "d", "e"), concurrency=2, on_result=finished.append
+        )
+
+        assert [item["spec"]["topic"] for item in results] == ["a", "b", "c", "d", "e"]
+        assert all(item["success"] and item["attempts"] == 1 for item in results)
+        assert results[0]["result"]["metadata"]["name"] == "python-a"
+        assert ai.max_active == 2
+        assert len(finished) == 5
+        assert ai.closed
+
+    def test_rate_limited_retry(self, config, repository):
+        """测试429后按 Retry-After 暂停并重试"""
+        ai = _StubAIService(failures={"b": [HTTPError(429, "slow down", retry_after=0.2)]})
+        generator = DemoGenerator(ai, repository, config)
+
+        start = time.monotonic()
+        results = generator.generate_many(_specs("a", "b"), concurrency=2)
+
+        assert results[1]["success"] and results[1]["attempts"] == 2
+        assert time.monotonic() - start >= 0.2
+
+    def test_failures_are_per_item(self, config, repository):
+        """测试客户端错误不重试且不影响其他项"""
+        ai = _StubAIService(
+            failures={
+                "a": [HTTPError(401, "bad key")],
+                "b": [HTTPError(500, "boom")] * 3,
+            }
+        )
+        generator = DemoGenerator(ai, repository, config)
+
+        results = generator.generate_many(_specs("a", "b", "c"))
+
+        assert [item["success"] for item in results] == [False, False, True]
+        assert results[0]["attempts"] == 1 and "401" in results[0]["error"]
+        assert results[1]["attempts"] == 3 and "500" in results[1]["error"]
+        assert repository.create_demo.call_count == 1
+        assert ai.retry_policy.stats()["retries"] == 2
+
+    def test_circuit_open_fails_fast(self, config, repository):
+        """测试熔断后不再请求接口"""
+        ai = _StubAIService(failures={"a": [HTTPError(503, "down")]})
+        ai.retry_policy = RetryPolicy(max_attempts=3, failure_threshold=1, reset_timeout=60)
+        generator = DemoGenerator(ai, repository, config)
+
+        results = generator.generate_many(_specs("a", "b"), concurrency=1)
+
+        assert not results[0]["success"] and not results[1]["success"]
+        assert "Circuit breaker open" in results[1]["error"]
+        assert ai.calls == ["a"]
+
+    def test_invalid_specs_rejected_before_request(self, config, repository):
+        """测试无效的生成参数不发起请求，有效项传入保存参数"""
+        ai = _StubAIService()
+        generator = DemoGenerator(ai, repository, config)
+        specs = [
+            {"language": "python", "topic": "a", "id": 1},
+            {"language": "python"},
+            {"language": "python", "topic": "b", "library_name": "numpy"},
+        ]
+
+        results = generator.generate_many(specs)
+
+        assert [item["success"] for item in results] == [False, False, True]
+        assert "unknown keys id" in results[0]["error"] and results[0]["attempts"] == 0
+        assert "missing topic" in results[1]["error"]
+        assert ai.calls == ["b"]
+        assert repository.create_demo.call_args.kwargs["library_name"] == "numpy"
+
+    def test_save_runs_off_event_loop(self, config, repository):
+        """测试保存demo不在事件循环线程中执行"""
+        ai = _StubAIService()
+        generator = DemoGenerator(ai, repository, config)
+        threads = []
+        create_demo = repository.create_demo.side_effect
+
+        def record_thread(**kwargs):
+            threads.append(threading.get_ident())
+            return create_demo(**kwargs)
+
+        repository.create_demo.side_effect = record_thread
+
+        results = generator.generate_many(_specs("a"))
+
+        assert results[0]["success"]
+        assert threads and threads[0] != threading.get_ident()
+
+    def test_running_loop_rejected(self, config, repository):
+        """测试在运行中的事件循环里调用同步接口时提示使用 agenerate_many"""
+        generator = DemoGenerator(_StubAIService(), repository, config)
+
+        async def call():
+            generator.generate_many(_specs("a"))
+
+        with pytest.raises(RuntimeError, match="agenerate_many"):
+            asyncio.run(call())
+
+
+class TestTokenBucket:
+    """令牌桶测试类"""
+
+    def test_rate(self):
+        """测试突发容量用完后按速率发放"""
+
+        async def run():
+            bucket = TokenBucket(rate=20, capacity=2)
+            start = time.monotonic()
+            for _ in range(4):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        # 前2个立即发放，后2个各等 1/20 秒
+        assert 0.09 <= asyncio.run(run()) < 0.5
+
+    def test_unlimited(self):
+        """测试不限流时不等待"""
+
+        async def run():
+            bucket = TokenBucket.per_minute(0)
+            start = time.monotonic()
+            for _ in range(100):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) < 0.05
@@ -0,0 +1,141 @@
+"""
+Demo仓库测试
+"""
+
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+from core.config_service import ConfigService
+from core.storage_service import StorageService
+from core.demo_repository import Demo, DemoRepository
+
+
+def _write_demo(path: Path, **metadata):
+    """创建一个带metadata.json的demo目录"""
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+
+
+class TestDemo:
+    """Demo记录测试类"""
+
+    def test_hot_fields(self, tmp_path):
+        """测试常用字段和默认值"""
+        demo = Demo(tmp_path / "python-logging", {"keywords": ["日志"], "verified": True})
+        assert demo.name == "python-logging"
+        assert demo.language == "unknown"
+        assert demo.difficulty == "beginner"
+        assert demo.keywords == ("日志",)
+        assert demo.verified is True
+        assert not hasattr(demo, "__dict__")
+
+    def test_metadata_text(self, tmp_path):
+        """测试从JSON文本构建时只解码一次"""
+        text = json.dumps({"name": "logging", "description": "日志", "title": "Logging"})
+        with patch("core.demo_repository.json.loads", wraps=json.loads) as loads:
+            demo = Demo(tmp_path / "python-logging", metadata_text=text)
+            assert demo.name == "logging"
+            assert demo.metadata["title"] == "Logging"
+        assert loads.call_count == 1
+        assert demo.description == "日志"
+        assert demo.title == "Logging"
+        assert demo.to_dict()["metadata"]["name"] == "logging"
+
+    def test_lazy_metadata(self, tmp_path):
+        """测试提供常用字段时不解码元数据，首次访问 metadata 时才解码"""
+        text = json.dumps({"name": "logging", "title": "Logging", "keywords": ["日志"]})
+        fields = ("logging", "python", "beginner", ("日志",), False)
+        with patch("core.demo_repository.json.loads", wraps=json.loads) as loads:
+            demo = Demo(tmp_path / "python-logging", metadata_text=text, fields=fields)
+            assert demo.name == "logging"
+            assert demo.keywords == ("日志",)
+            assert loads.call_count == 0
+            assert demo.title == "Logging"
+            assert demo.description == ""
+        assert loads.call_count == 1
+
+    def test_metadata_setter_refreshes_fields(self, tmp_path):
+        """测试替换元数据后常用字段同步"""
+        demo = Demo(tmp_path / "demo", {"difficulty": "beginner"})
+        demo.metadata = {"difficulty": "advanced", "keywords": "single"}
+        assert demo.difficulty == "advanced"
+        assert demo.keywords == ("single",)
+
+
+class TestOutputDemos:
+    """输出目录demo列表测试类"""
+
+    @pytest.fixture(params=[True, False], ids=["catalog", "direct"])
+    def repository(self, request, tmp_path):
+        """分别在启用和禁用目录索引时构建仓库"""
+        output = tmp_path / "output"
+        _write_demo(output / "python" / "python-logging", keywords=["日志"], difficulty="beginner")
+        (output / "python" / "scratch").mkdir()
+        broken = output / "python" / "broken"
+        broken.mkdir()
+        (broken / "metadata.json").write_text("{not json", encoding="utf-8")
+        _write_demo(output / "go" / "go-channels", language="go")
+
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "output_directory": str(output),
+            "user_demo_library": str(tmp_path / "user"),
+            "cache_directory": str(tmp_path / "cache"),
+            "performance.catalog": request.param,
+        }.get(key, default)
+        storage = StorageService(config)
+        storage._builtin_library_path = tmp_path / "builtin"
+        return DemoRepository(storage, config)
+
+    def test_list_output_demos(self, repository):
+        """测试列出语言目录下的demo（包括没有有效metadata的目录）"""
+        demos = {demo["name"]: demo for demo in repository.list_output_demos("python")}
+
+        assert sorted(demos) == ["broken", "python-logging", "scratch"]
+        assert demos["python-logging"]["keywords"] == ["日志"]
+        assert demos["python-logging"]["language"] == "python"
+        assert demos["scratch"]["difficulty"] == "unknown"
+        assert demos["broken"]["metadata"] == {}
+
+    def test_count_output_demos(self, repository):
+        """测试一次统计所有语言"""
+        assert repository.count_output_demos() == {"go": 1, "python": 3}
+
+    def test_missing_language(self, repository):
+        """测试语言目录不存在"""
+        assert repository.list_output_demos("java") == []
+
+    def test_output_library_source(self, repository):
+        """测试输出目录作为独立的库来源，且不包含在 all 中"""
+        names = sorted(demo.name for demo in repository.load_all_demos("output"))
+        assert names == ["go-channels", "python-logging"]
+        assert repository.load_all_demos("all") == []
+
+    def test_fuzzy_match_cached(self, repository, tmp_path):
+        """测试输出目录的模糊索引在目录未变化时复用，变化后重建"""
+        from commands.base import fuzzy_match_demo_in_output
+
+        def match(*keywords):
+            return fuzzy_match_demo_in_output(repository, "python", list(keywords))["name"]
+
+        assert match("loging") == "python-logging"
+
+        with patch.object(
+            repository, "list_output_demos", wraps=repository.list_output_demos
+        ) as list_output_demos:
+            assert match("loging") == "python-logging"
+            assert not list_output_demos.called
+
+            _write_demo(tmp_path / "output" / "python" / "python-asyncio", keywords=["asyncio"])
+            assert match("asyncoi") == "python-asyncio"
+            assert list_output_demos.called
+
+    def test_catalog_demos_decode_lazily(self, repository):
+        """测试从目录索引加载的demo只带常用字段，元数据按需解码"""
+        demos = {demo.name: demo for demo in repository.load_all_demos("output")}
+        demo = demos["python-logging"]
+        assert demo.keywords == ("日志",)
+        if repository.catalog:
+            assert demo._metadata is None
+        assert demo.metadata["difficulty"] == "beginner"
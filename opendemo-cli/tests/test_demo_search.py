@@ -0,0 +1,90 @@
+"""
+Demo搜索引擎测试
+"""
+
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+from core.config_service import ConfigService
+from core.storage_service import StorageService
+from core.demo_repository import DemoRepository
+from core.demo_search import DemoSearch
+
+
+def _write_demo(path: Path, **metadata):
+    """创建一个带metadata.json的demo目录"""
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "metadata.json").write_text(json.dumps(metadata, ensure_ascii=False), encoding="utf-8")
+
+
+class TestDemoSearch:
+    """Demo搜索引擎测试类"""
+
+    @pytest.fixture
+    def search(self, tmp_path):
+        """构建带内置库的搜索引擎"""
+        builtin = tmp_path / "builtin"
+        _write_demo(
+            builtin / "python" / "python-list-ops",
+            name="python-list-ops",
+            language="python",
+            keywords=["列表", "list"],
+            description="列表的增删改查操作",
+            difficulty="beginner",
+        )
+        _write_demo(
+            builtin / "python" / "python-dict",
+            name="python-dict",
+            language="python",
+            keywords=["字典"],
+            description="字典操作与列表推导式",
+            difficulty="intermediate",
+        )
+        _write_demo(
+            builtin / "python" / "python-asyncio",
+            name="python-asyncio",
+            language="python",
+            keywords=["协程"],
+            description="asyncio basics",
+            difficulty="intermediate",
+        )
+
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "user_demo_library": str(tmp_path / "user"),
+            "cache_directory": str(tmp_path / "cache"),
+        }.get(key, default)
+        storage = StorageService(config)
+        storage._builtin_library_path = builtin
+        return DemoSearch(DemoRepository(storage, config))
+
+    def test_cjk_query_ranking(self, search):
+        """测试中文多关键字查询按相关度排序"""
+        results = search.search_demos(language="python", keywords=["列表", "操作"])
+        assert [demo.name for demo in results] == ["python-list-ops", "python-dict"]
+
+    def test_substring_match_kept(self, search):
+        """测试子串匹配仍然返回"""
+        results = search.search_demos(keywords=["async"])
+        assert [demo.name for demo in results] == ["python-asyncio"]
+
+    def test_difficulty_filter(self, search):
+        """测试难度过滤"""
+        results = search.search_demos(keywords=["操作"], difficulty="intermediate")
+        assert [demo.name for demo in results] == ["python-dict"]
+
+        results = search.search_demos(difficulty="intermediate")
+        assert sorted(demo.name for demo in results) == ["python-asyncio", "python-dict"]
+
+    def test_find_exact(self, search):
+        """测试精确查找"""
+        assert search.find_exact("Python-Dict").name == "python-dict"
+        assert search.find_exact("python") is None
+
+    def test_fuzzy_search(self, search):
+        """测试容忍拼写错误的查找"""
+        assert search.search_demos(keywords=["asyncoi"]) == []
+        results = search.fuzzy_search(["asyncoi"], language="python")
+        assert [demo.name for demo in results] == ["python-asyncio"]
+        assert search.fuzzy_search(["kubernetes"]) == []
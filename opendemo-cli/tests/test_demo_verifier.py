@@ -0,0 +1,265 @@
+"""
+Demo验证器测试
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+from pathlib import Path
+from core import demo_verifier as demo_verifier_module
+from core import verification_cache as verification_cache_module
+from core.config_service import ConfigService
+from core.demo_repository import Demo, DemoRepository
+from core.demo_verifier import DemoVerifier
+from core.verification_cache import VerificationCache
+
+
+@pytest.fixture
+def verifier():
+    config = Mock(spec=ConfigService)
+    config.get.side_effect = lambda key, default=None: {
+        "verification_timeout": 0.5,
+        "verification_venv_pool": False,
+        "verification_cache": False,
+    }.get(key, default)
+    return DemoVerifier(config)
+
+
+def _demos(*languages):
+    return [{"path": f"/demos/{i}", "language": language} for i, language in enumerate(languages)]
+
+
+class TestVerifyMany:
+    """并行批量验证测试类"""
+
+    def test_parallel_results(self, verifier, tmp_path):
+        """测试并行执行、结果顺序和结果文件"""
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def fake_verify(demo_path, language, force=False, use_cache=True):
+            assert force
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            if str(demo_path).endswith("2"):
+                return {"verified": False, "errors": ["boom"], "steps": ["Executed a.go"]}
+            return {"verified": True, "steps": []}
+
+        verifier.verify = fake_verify
+        results_file = tmp_path / "results.jsonl"
+        finished = []
+
+        start = time.monotonic()
+        items = verifier.verify_many(
+            _demos("python", "go", "go", "python"),
+            jobs=4,
+            results_file=results_file,
+            on_result=finished.append,
+        )
+
+        assert time.monotonic() - start < 0.15
+        assert active[1] == 4
+        assert [item["verified"] for item in items] == [True, True, False, True]
+        assert items[2]["errors"] == ["boom"] and items[2]["language"] == "go"
+        lines = [json.loads(line) for line in results_file.read_text().splitlines()]
+        assert sorted(line["path"] for line in lines) == [f"/demos/{i}" for i in range(4)]
+        assert len(finished) == 4
+
+    def test_grouped_by_language(self, verifier):
+        """测试按语言分组执行，demo多的语言在前"""
+        order = []
+
+        def fake_verify(demo_path, language, force=False, use_cache=True):
+            order.append(language)
+            return {"verified": True}
+
+        verifier.verify = fake_verify
+        verifier.verify_many(_demos("go", "python", "nodejs", "python", "go", "python"), jobs=1)
+
+        assert order == ["python"] * 3 + ["go"] * 2 + ["nodejs"]
+
+    def test_timeout(self, verifier):
+        """测试超过 verification_timeout 的demo记为超时且不阻塞其他demo"""
+
+        def fake_verify(demo_path, language, force=False, use_cache=True):
+            time.sleep(2 if str(demo_path).endswith("0") else 0)
+            return {"verified": True}
+
+        verifier.verify = fake_verify
+        start = time.monotonic()
+        items = verifier.verify_many(_demos("python", "python"), jobs=2)
+
+        assert time.monotonic() - start < 1.5
+        assert items[0]["timed_out"] and not items[0]["verified"]
+        assert "timed out" in items[0]["errors"][0]
+        assert items[1]["verified"]
+
+    def test_timeout_kills_subprocess(self, verifier):
+        """测试超时的demo的子进程被终止，工作线程空出给后面的demo"""
+        from core.verification_deadline import step_timeout
+
+        workers = []
+
+        def fake_verify(demo_path, language, force=False, use_cache=True):
+            workers.append(threading.current_thread())
+            seconds = 30 if str(demo_path).endswith("0") else 0
+            try:
+                subprocess.run(
+                    [sys.executable, "-c", f"import time; time.sleep({seconds})"],
+                    timeout=step_timeout(300),
+                )
+            except subprocess.TimeoutExpired:
+                return {"verified": False, "errors": ["Execution timeout"]}
+            return {"verified": True}
+
+        verifier.verify = fake_verify
+        start = time.monotonic()
+        items = verifier.verify_many(_demos("python", "python"), jobs=1)
+
+        assert time.monotonic() - start < 5
+        assert items[0]["timed_out"] and items[1]["verified"]
+        workers[0].join(timeout=1)
+        assert not workers[0].is_alive()
+
+    def test_verify_respects_config(self, verifier):
+        """测试未启用验证时跳过，force 时不受配置影响"""
+        assert verifier.verify("/demos/x", "python")["skipped"]
+        assert "not supported" in verifier.verify("/demos/x", "rust", force=True)["error"]
+
+
+class TestVerificationCache:
+    """验证结果缓存测试类"""
+
+    @pytest.fixture
+    def cached_verifier(self, tmp_path):
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "cache_directory": str(tmp_path / "cache"),
+        }.get(key, default)
+        verifier = DemoVerifier(config)
+        verifier._verify_language = Mock(
+            side_effect=lambda path, language, method: {
+                "verified": path.name != "bad",
+                "steps": ["ran"],
+            }
+        )
+        return verifier
+
+    @pytest.fixture
+    def demo(self, tmp_path):
+        demo = tmp_path / "demo"
+        (demo / "code").mkdir(parents=True)
+        (demo / "code" / "a.py").write_text("print(1)\n")
+        return demo
+
+    def test_hit_until_content_changes(self, cached_verifier, demo):
+        """测试内容不变时命中缓存，内容变化后重新验证"""
+        first = cached_verifier.verify(demo, "python", force=True)
+        second = cached_verifier.verify(demo, "python", force=True)
+        assert not first.get("cached") and "duration" in first
+        assert second["cached"] and second["steps"] == ["ran"]
+        assert cached_verifier._verify_language.call_count == 1
+
+        # 构建产物和缓存目录不影响内容哈希
+        (demo / "code" / "__pycache__").mkdir()
+        (demo / "code" / "__pycache__" / "a.pyc").write_bytes(b"x")
+        assert cached_verifier.verify(demo, "python", force=True)["cached"]
+
+        (demo / "code" / "a.py").write_text("print(2)\n")
+        assert not cached_verifier.verify(demo, "python", force=True).get("cached")
+        assert cached_verifier._verify_language.call_count == 2
+
+    def test_failures_and_no_cache(self, cached_verifier, tmp_path, demo):
+        """测试失败的结果不缓存，use_cache=False 时总是重新验证"""
+        bad = tmp_path / "bad"
+        bad.mkdir()
+        cached_verifier.verify(bad, "python", force=True)
+        assert not cached_verifier.verify(bad, "python", force=True).get("cached")
+
+        cached_verifier.verify(demo, "python", force=True)
+        assert not cached_verifier.verify(demo, "python", force=True, use_cache=False).get("cached")
+        assert cached_verifier._verify_language.call_count == 4
+
+    def test_hit_after_update_metadata(self, cached_verifier, demo):
+        """测试验证通过后写回验证状态不使缓存失效，其他元数据变化仍会失效"""
+        metadata = {"name": "demo", "language": "python", "verified": False}
+        (demo / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: default
+        repository = DemoRepository(Mock(), config)
+
+        assert cached_verifier.verify(demo, "python", force=True)["verified"]
+        assert repository.update_metadata(Demo(demo, metadata), {"verified": True})
+        assert cached_verifier.verify(demo, "python", force=True)["cached"]
+        assert cached_verifier._verify_language.call_count == 1
+
+        repository.update_metadata(Demo(demo, dict(metadata)), {"description": "changed"})
+        assert not cached_verifier.verify(demo, "python", force=True).get("cached")
+        assert cached_verifier._verify_language.call_count == 2
+
+    def test_key_includes_toolchain(self, demo):
+        """测试工具链版本变化时缓存键变化"""
+        key = VerificationCache.key(demo, "python", "venv")
+        with patch.object(verification_cache_module, "toolchain_version", return_value="other"):
+            assert VerificationCache.key(demo, "python", "venv") != key
+        assert VerificationCache.key(demo, "python", "docker") != key
+
+
+class TestVerifyGo:
+    """Go验证测试类"""
+
+    @pytest.fixture
+    def go_verifier(self, tmp_path):
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "cache_directory": str(tmp_path / "cache"),
+        }.get(key, default)
+        return DemoVerifier(config)
+
+    @pytest.fixture
+    def go_demo(self, tmp_path):
+        demo = tmp_path / "go-demo"
+        (demo / "code").mkdir(parents=True)
+        (demo / "code" / "main.go").write_text("package main\n\nfunc main() {}\n")
+        return demo
+
+    def test_shared_cache_and_prebuilt_binary(self, go_verifier, go_demo, tmp_path):
+        """测试使用共享缓存离线解析依赖，缺少模块时联网一次，并直接运行编译好的程序"""
+        calls = []
+
+        def fake_run(command, cwd=None, env=None, **kwargs):
+            calls.append((command, env))
+            if command[1:3] == ["mod", "tidy"] and env.get("GOPROXY") == "off":
+                return Mock(returncode=1, stdout="", stderr="module lookup disabled")
+            if command[1:2] == ["build"]:
+                (Path(command[3]) / "code").write_text("")
+            stdout = "go version go1.21" if command[1:2] == ["version"] else "ok"
+            return Mock(returncode=0, stdout=stdout, stderr="")
+
+        with patch.object(demo_verifier_module.subprocess, "run", side_effect=fake_run):
+            result = go_verifier._verify_go(go_demo)
+
+        assert result["verified"], result
+        assert "Downloaded modules into shared cache" in result["steps"]
+        tidy_envs = [env for command, env in calls if command[1:3] == ["mod", "tidy"]]
+        assert [env.get("GOPROXY") for env in tidy_envs] == ["off", os.environ.get("GOPROXY")]
+        assert tidy_envs[0]["GOMODCACHE"] == str(tmp_path / "cache" / "go" / "mod")
+        assert tidy_envs[0]["GOCACHE"] == str(tmp_path / "cache" / "go" / "build")
+        # 运行的是编译好的程序，没有 go run
+        assert calls[-1][0][0].endswith(os.sep + "code")
+        assert not any(command[:2] == ["go", "run"] for command, _ in calls)
+
+    def test_binary_name(self, tmp_path):
+        """测试 main 包可执行文件名的推断"""
+        (tmp_path / "go.mod").write_text("module github.com/acme/tool/v2\n\ngo 1.21\n")
+        assert DemoVerifier._go_binary_name(tmp_path, tmp_path).startswith("tool")
+        assert DemoVerifier._go_binary_name(tmp_path, tmp_path / "code").startswith("code")
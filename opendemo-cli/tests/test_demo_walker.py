@@ -0,0 +1,56 @@
+"""
+Demo目录遍历器测试
+"""
+
+import pytest
+from pathlib import Path
+from core.demo_walker import DemoWalker
+
+
+def _make_demo(path: Path):
+    """创建带metadata.json的demo目录"""
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "metadata.json").write_text("{}", encoding="utf-8")
+
+
+class TestDemoWalker:
+    """Demo目录遍历器测试类"""
+
+    @pytest.fixture
+    def tree(self, tmp_path):
+        """构建测试目录树"""
+        _make_demo(tmp_path / "agent")
+        _make_demo(tmp_path / "agent" / "openai")
+        _make_demo(tmp_path / "agent" / "code" / "not-a-demo")
+        _make_demo(tmp_path / "web" / "node_modules" / "pkg")
+        _make_demo(tmp_path / ".git" / "hooks")
+        _make_demo(tmp_path / "libraries" / "numpy" / "array-basics")
+        return tmp_path
+
+    def test_find_demos_skips_ignored_dirs(self, tree):
+        """测试跳过忽略目录和隐藏目录"""
+        names = [p.relative_to(tree).as_posix() for p in DemoWalker().find_demos(tree)]
+        assert names == ["agent", "agent/openai", "libraries/numpy/array-basics"]
+
+    def test_prune_demo_roots(self, tree):
+        """测试在demo目录处停止向下遍历"""
+        walker = DemoWalker(prune_demo_roots=True)
+        names = [p.relative_to(tree).as_posix() for p in walker.find_demos(tree)]
+        assert names == ["agent", "libraries/numpy/array-basics"]
+
+    def test_max_depth(self, tree):
+        """测试深度限制"""
+        walker = DemoWalker(max_depth=1)
+        names = [p.relative_to(tree).as_posix() for p in walker.find_demos(tree)]
+        assert names == ["agent"]
+
+    def test_root_is_not_a_demo(self, tree):
+        """测试根目录本身不算作demo"""
+        walker = DemoWalker(prune_demo_roots=True)
+        names = [p.name for p in walker.find_demos(tree / "agent")]
+        assert names == ["openai"]
+
+    def test_signature_changes_with_rules(self):
+        """测试遍历规则签名"""
+        assert DemoWalker().signature != DemoWalker(max_depth=3).signature
+        assert DemoWalker().signature == DemoWalker().signature
@@ -0,0 +1,74 @@
+"""
+模糊匹配索引测试
+"""
+
+import pickle
+import pytest
+from core.fuzzy_index import FuzzyIndex, levenshtein, default_max_distance
+
+
+class TestLevenshtein:
+    """编辑距离测试类"""
+
+    def test_distance(self):
+        """测试编辑距离"""
+        assert levenshtein("kitten", "sitting") == 3
+        assert levenshtein("loging", "logging") == 1
+        assert levenshtein("", "abc") == 3
+        assert levenshtein("列表", "列表") == 0
+
+    def test_bounded(self):
+        """测试超过上限提前结束"""
+        assert levenshtein("abcdef", "uvwxyz", max_distance=2) == 3
+        assert levenshtein("", "abcdef", max_distance=2) == 3
+
+    def test_default_max_distance(self):
+        """测试短词不做模糊匹配"""
+        assert default_max_distance("log") == 0
+        assert default_max_distance("loging") == 1
+        assert default_max_distance("kubernetes") == 2
+
+
+class TestFuzzyIndex:
+    """模糊匹配索引测试类"""
+
+    @pytest.fixture
+    def index(self):
+        """构建测试索引"""
+        return FuzzyIndex.build(
+            [
+                ("python-logging", 0),
+                ("logging", 0),
+                ("threading", 1),
+                ("python-threading", 1),
+                ("log", 2),
+            ]
+        )
+
+    def test_search_typo(self, index):
+        """测试拼写错误查找"""
+        assert index.search("loging") == [("logging", 1, {0})]
+        assert index.search("Threding")[0][:2] == ("threading", 1)
+
+    def test_search_respects_distance(self, index):
+        """测试距离限制"""
+        assert index.search("lgo") == []
+        assert index.search("xyzlogging", max_distance=1) == []
+
+    def test_match_multiple_keywords(self, index):
+        """测试多关键字匹配及连字符拼接"""
+        matches = index.match(["python", "threding"])
+        assert matches[0]["doc_id"] == 1
+        assert "python-threading" in matches[0]["terms"]
+
+    def test_match_no_result(self, index):
+        """测试无匹配"""
+        assert index.match(["kubernetes"]) == []
+        assert index.match([]) == []
+
+    def test_pickle_roundtrip(self, index):
+        """测试序列化后仍可增量添加"""
+        restored = pickle.loads(pickle.dumps(index))
+        restored.add("logging", 3)
+        assert restored.search("loging") == [("logging", 1, {0, 3})]
+        assert len(restored.terms) == len(index.terms)
@@ -0,0 +1,199 @@
+"""
+HTTP客户端测试（使用本地桩服务器）
+"""
+
+import asyncio
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+from core.ai_service import AIService
+from core.config_service import ConfigService
+from core.http_client import (
+    AsyncHTTPClient,
+    HTTPClient,
+    HTTPError,
+    iter_chat_deltas,
+    parse_retry_after,
+    parse_sse,
+)
+
+CHUNKS = ['{"metadata": ', '{"name": "demo"}, ', '"files": []}']
+
+
+def _sse_body(chunks):
+    """构造 OpenAI 兼容的流式响应"""
+    events = [": keep-alive\n\n"]
+    for chunk in chunks:
+        payload = {"choices": [{"delta": {"content": chunk}}]}
+        events.append(f"data: {json.dumps(payload)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return "".join(events).encode("utf-8")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """桩服务器：/chat 返回完整响应或流式响应，/error 返回500"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(request)
+
+        if self.path == "/error":
+            self._send(500, "text/plain", b"boom")
+        elif self.path == "/limited":
+            self._send(429, "text/plain", b"slow down", {"Retry-After": "7"})
+        elif request.get("stream"):
+            self._send(200, "text/event-stream", _sse_body(CHUNKS))
+        else:
+            body = {"choices": [{"message": {"content": "".join(CHUNKS)}}]}
+            self._send(200, "application/json", json.dumps(body).encode("utf-8"))
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """本地桩服务器"""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    httpd.connections = 0
+    httpd.requests = []
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path="/chat"):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+class TestParseSSE:
+    """SSE解析测试类"""
+
+    def test_parse_events(self):
+        """测试多行data、注释和结束标记"""
+        lines = [": ping", "data: a", "data: b", "", "event: x", "data:c", ""]
+        lines += ["data: [DONE]", "", "data: d"]
+        assert list(parse_sse(lines)) == ["a\nb", "c"]
+
+
+class TestHTTPClient:
+    """同步HTTP客户端测试类"""
+
+    def test_keep_alive(self, server):
+        """测试多次请求复用同一连接"""
+        client = HTTPClient()
+        for _ in range(3):
+            result = client.post_json(_url(server), {"model": "m"})
+            assert result["choices"][0]["message"]["content"] == "".join(CHUNKS)
+        client.close()
+
+        assert server.connections == 1
+
+    def test_stream(self, server):
+        """测试流式响应"""
+        client = HTTPClient()
+        events = client.stream_sse(_url(server), {"stream": True})
+        assert list(iter_chat_deltas(events)) == CHUNKS
+        client.close()
+
+    def test_error_status(self, server):
+        """测试错误状态码"""
+        with pytest.raises(HTTPError) as exc_info:
+            HTTPClient().post_json(_url(server, "/error"), {})
+        assert exc_info.value.status_code == 500
+        assert exc_info.value.retry_after is None
+
+    def test_retry_after(self, server):
+        """测试429响应携带 Retry-After"""
+        with pytest.raises(HTTPError) as exc_info:
+            HTTPClient().post_json(_url(server, "/limited"), {})
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after == 7
+
+    def test_parse_retry_after(self):
+        """测试秒数和HTTP日期两种格式"""
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestAsyncHTTPClient:
+    """异步HTTP客户端测试类"""
+
+    def test_post_and_stream(self, server):
+        """测试异步请求和流式响应"""
+
+        async def run():
+            client = AsyncHTTPClient()
+            result = await client.post_json(_url(server), {})
+            events = [event async for event in client.stream_sse(_url(server), {"stream": True})]
+            await client.aclose()
+            return result, events
+
+        result, events = asyncio.run(run())
+        assert result["choices"][0]["message"]["content"] == "".join(CHUNKS)
+        assert list(iter_chat_deltas(events)) == CHUNKS
+
+
+class TestAIServiceHTTP:
+    """AI服务通过桩服务器调用的测试类"""
+
+    def _service(self, server, stream):
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "ai.api_key": "test-key",
+            "ai.api_endpoint": _url(server),
+            "ai.model": "test-model",
+            "ai.stream": stream,
+        }.get(key, default)
+        service = AIService(config)
+        service._load_config()
+        return service
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_call_api(self, server, stream):
+        """测试完整响应和流式响应得到相同内容"""
+        service = self._service(server, stream)
+        deltas = []
+
+        content = service._call_api("prompt", on_delta=deltas.append)
+
+        assert content == "".join(CHUNKS)
+        assert deltas == (CHUNKS if stream else ["".join(CHUNKS)])
+        assert server.requests[-1]["model"] == "test-model"
+        assert server.requests[-1].get("stream", False) is stream
+        service.close()
+
+    def test_acall_api_stream(self, server):
+        """测试异步流式调用"""
+        service = self._service(server, True)
+
+        async def run():
+            try:
+                return await service._acall_api("prompt")
+            finally:
+                await service.aclose()
+
+        assert asyncio.run(run()) == "".join(CHUNKS)
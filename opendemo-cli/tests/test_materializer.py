@@ -0,0 +1,109 @@
+"""
+Demo目录物化测试
+"""
+
+import os
+import stat
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from core import materializer
+from core.materializer import materialize_tree
+
+
+def _make_source(root: Path) -> Path:
+    """创建源demo目录"""
+    source = root / "source"
+    (source / "code").mkdir(parents=True)
+    (source / "metadata.json").write_text('{"name": "demo"}', encoding="utf-8")
+    (source / "README.md").write_text("# demo", encoding="utf-8")
+    (source / "code" / "main.py").write_text("print('hi')", encoding="utf-8")
+    return source
+
+
+def _snapshot(root: Path) -> dict:
+    """目录内容快照: 相对路径 -> 内容"""
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+class TestMaterializeTree:
+    """目录物化测试类"""
+
+    @pytest.mark.parametrize("strategy", ["auto", "reflink", "hardlink", "copy"])
+    def test_matches_copytree(self, tmp_path, strategy):
+        """测试各策略的结果与复制一致"""
+        source = _make_source(tmp_path)
+        target = tmp_path / "target"
+
+        stats = materialize_tree(source, target, strategy)
+
+        assert _snapshot(target) == _snapshot(source)
+        assert stats["cloned"] + stats["linked"] + stats["copied"] == 3
+
+    def test_skips_unchanged_and_syncs_changes(self, tmp_path):
+        """测试重复物化跳过未变文件，并同步修改和删除"""
+        source = _make_source(tmp_path)
+        target = tmp_path / "target"
+        materialize_tree(source, target, "copy")
+
+        stats = materialize_tree(source, target, "copy")
+        assert stats["skipped"] == 3
+        assert stats["copied"] == 0
+
+        (target / "README.md").write_text("# edit", encoding="utf-8")
+        (target / "extra.txt").write_text("x", encoding="utf-8")
+        (target / "stale").mkdir()
+        stats = materialize_tree(source, target, "copy")
+
+        assert stats == {"cloned": 0, "linked": 0, "copied": 1, "skipped": 2, "removed": 2}
+        assert _snapshot(target) == _snapshot(source)
+
+    def test_hardlink_only_read_only_files(self, tmp_path):
+        """测试只硬链接只读文件，替换目标时不修改源文件"""
+        source = _make_source(tmp_path)
+        readonly = source / "README.md"
+        readonly.chmod(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        target = tmp_path / "target"
+
+        stats = materialize_tree(source, target, "hardlink")
+
+        assert stats["linked"] == 1
+        assert stats["copied"] == 2
+        assert os.path.samefile(readonly, target / "README.md")
+        assert not os.path.samefile(source / "metadata.json", target / "metadata.json")
+
+    def test_reflink_fallback(self, tmp_path):
+        """测试文件系统不支持 reflink 时回退到复制"""
+        source = _make_source(tmp_path)
+        target = tmp_path / "target"
+
+        def unsupported(src, dst):
+            raise OSError(materializer.errno.EOPNOTSUPP, "not supported")
+
+        with patch.object(materializer, "_reflink", side_effect=unsupported):
+            materializer._reflink_unsupported.clear()
+            stats = materialize_tree(source, target, "reflink")
+        materializer._reflink_unsupported.clear()
+
+        assert stats["copied"] == 3
+        assert _snapshot(target) == _snapshot(source)
+
+    def test_unknown_strategy(self, tmp_path):
+        """测试未知策略"""
+        with pytest.raises(ValueError):
+            materialize_tree(_make_source(tmp_path), tmp_path / "target", "symlink")
+
+    def test_reflink_probe(self, tmp_path):
+        """测试 reflink 检测结果且不留下临时文件"""
+        def unsupported(src, dst):
+            raise OSError(materializer.errno.EOPNOTSUPP, "not supported")
+
+        with patch.object(materializer, "_reflink", side_effect=unsupported):
+            assert materializer.reflink_supported(tmp_path / "probe") is False
+        with patch.object(materializer, "_reflink"):
+            assert materializer.reflink_supported(tmp_path / "probe") is True
+        assert list((tmp_path / "probe").iterdir()) == []
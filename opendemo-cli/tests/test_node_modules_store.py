@@ -0,0 +1,152 @@
+"""
+node_modules 共享存储测试
+"""
+
+import hashlib
+import io
+import json
+import shutil
+import tarfile
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+from core.config_service import ConfigService
+from core.demo_verifier import DemoVerifier
+from core.node_modules_store import dependency_spec
+
+requires_node = pytest.mark.skipif(
+    shutil.which("node") is None or shutil.which("npm") is None, reason="Node.js is not installed"
+)
+
+
+def _tarball():
+    """greet@1.0.0 的包文件"""
+    files = {
+        "package/package.json": json.dumps({"name": "greet", "version": "1.0.0", "main": "index.js"}),
+        "package/index.js": "module.exports = (name) => `hello ${name}`;\n",
+    }
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, text in files.items():
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def registry():
+    """本地npm仓库替身，记录请求路径"""
+    tarball = _tarball()
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            base = f"http://127.0.0.1:{self.server.server_port}"
+            if self.path == "/greet":
+                body = json.dumps(
+                    {
+                        "name": "greet",
+                        "dist-tags": {"latest": "1.0.0"},
+                        "versions": {
+                            "1.0.0": {
+                                "name": "greet",
+                                "version": "1.0.0",
+                                "dist": {
+                                    "tarball": f"{base}/greet/-/greet-1.0.0.tgz",
+                                    "shasum": hashlib.sha1(tarball).hexdigest(),
+                                },
+                            }
+                        },
+                    }
+                ).encode("utf-8")
+                content_type = "application/json"
+            elif self.path == "/greet/-/greet-1.0.0.tgz":
+                body, content_type = tarball, "application/octet-stream"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/", requests
+    server.shutdown()
+
+
+@pytest.fixture
+def verifier(tmp_path, registry):
+    url, requests = registry
+    requests.clear()
+    config = Mock(spec=ConfigService)
+    config.get.side_effect = lambda key, default=None: {
+        "cache_directory": str(tmp_path / "cache"),
+        "verification_npm_registry": url,
+        "verification_cache": False,
+        "verification_timeout": 60,
+    }.get(key, default)
+    return DemoVerifier(config)
+
+
+def _demo(tmp_path, name, dependencies):
+    demo = tmp_path / name
+    (demo / "code").mkdir(parents=True)
+    (demo / "package.json").write_text(json.dumps({"name": name, "dependencies": dependencies}))
+    script = "console.log(require('greet')('node'));" if dependencies else "console.log('plain');"
+    (demo / "code" / "main.js").write_text(script + "\n")
+    return demo
+
+
+@requires_node
+class TestNodeModulesStore:
+    """node_modules 共享存储测试类"""
+
+    def test_shared_install(self, verifier, tmp_path, registry):
+        """测试相同依赖只安装一次，其他demo直接链接"""
+        _, requests = registry
+        first = verifier.verify(_demo(tmp_path, "a", {"greet": "^1.0.0"}), "nodejs", force=True)
+        assert first["verified"], first
+        assert "Installed dependencies into shared node_modules store" in first["steps"]
+        assert "hello node" in first["outputs"][0]
+        assert requests
+
+        second = verifier.verify(_demo(tmp_path, "b", {"greet": "1.x"}), "nodejs", force=True)
+        third = verifier.verify(_demo(tmp_path, "c", {"greet": "^1.0.0"}), "nodejs", force=True)
+        assert second["verified"] and third["verified"]
+        assert "Linked shared node_modules" in third["steps"]
+        # 第二个demo依赖写法不同需要单独安装，但包文件来自共享的npm缓存
+        assert requests.count("/greet/-/greet-1.0.0.tgz") == 1
+
+    def test_no_dependencies_skips_install(self, verifier, tmp_path, registry):
+        """测试没有声明依赖时跳过安装"""
+        _, requests = registry
+        result = verifier.verify(_demo(tmp_path, "plain", {}), "nodejs", force=True)
+        assert result["verified"], result
+        assert "No dependencies declared, skipped npm install" in result["steps"]
+        assert requests == []
+
+
+def test_dependency_spec():
+    """测试依赖声明的提取"""
+    assert dependency_spec({"name": "x", "scripts": {"start": "node ."}}) == {}
+    assert dependency_spec({"devDependencies": {"jest": "^29"}}) == {
+        "devDependencies": {"jest": "^29"}
+    }
+    assert dependency_spec({"dependencies": {"lodash": "~4.17.21"}}) == {
+        "dependencies": {"lodash": "~4.17.21"}
+    }
+    assert dependency_spec({"dependencies": {"lib": "file:../lib"}}) is None
+    assert dependency_spec({"dependencies": {"lib": "../lib"}}) is None
+    assert dependency_spec({"dependencies": {"lib": "~/src/lib"}}) is None
+    assert dependency_spec({"workspaces": ["packages/*"]}) is None
@@ -0,0 +1,47 @@
+"""
+并行IO测试
+"""
+
+import threading
+from core.parallel_io import map_ordered, read_files, resolve_workers, DEFAULT_IO_WORKERS
+
+
+class TestParallelIO:
+    """并行IO测试类"""
+
+    def test_preserves_order(self):
+        """测试结果顺序与输入一致"""
+        items = list(range(100))
+        assert map_ordered(lambda x: x * 2, items, workers=4) == [x * 2 for x in items]
+
+    def test_uses_threads(self):
+        """测试任务较多时使用线程池"""
+        names = map_ordered(lambda _: threading.current_thread().name, range(64), workers=4)
+        assert all(name.startswith("opendemo-io") for name in names)
+
+    def test_sequential_fallback(self):
+        """测试单线程或任务较少时顺序执行"""
+        main = threading.current_thread().name
+        assert set(map_ordered(lambda _: threading.current_thread().name, range(64), workers=1)) == {main}
+        assert set(map_ordered(lambda _: threading.current_thread().name, range(3), workers=8)) == {main}
+        assert map_ordered(str, [], workers=8) == []
+
+    def test_resolve_workers(self):
+        """测试线程数配置"""
+        assert resolve_workers(None) == DEFAULT_IO_WORKERS
+        assert resolve_workers(0) == 1
+        assert resolve_workers("4") == 4
+
+    def test_read_files(self, tmp_path):
+        """测试并行读取文件，缺失的文件返回None"""
+        paths = []
+        for i in range(20):
+            path = tmp_path / f"{i}.json"
+            path.write_bytes(str(i).encode())
+            paths.append(str(path))
+        paths.insert(5, str(tmp_path / "missing.json"))
+
+        contents = list(read_files(paths, workers=4))
+
+        assert contents[5] is None
+        assert [int(c) for c in contents if c is not None] == list(range(20))
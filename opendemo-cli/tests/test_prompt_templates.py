@@ -0,0 +1,86 @@
+"""
+Prompt模板测试
+"""
+
+from unittest.mock import Mock
+from core.ai_service import AIService
+from core.config_service import ConfigService
+from core.prompt_templates import (
+    MAX_TOPIC_TOKENS,
+    MIN_OUTPUT_TOKENS,
+    estimate_tokens,
+    get_demo_template,
+    output_budget,
+    plan_demo_prompt,
+)
+
+
+class TestPromptTemplates:
+    """Prompt模板测试类"""
+
+    def test_render(self):
+        """测试按语言填入固定字段、每次请求填入主题和难度"""
+        prompt = get_demo_template("java").render(topic="线程池", difficulty="advanced")
+        assert '为"线程池"主题生成' in prompt
+        assert "Google Java Style Guide" in prompt
+        assert '"path": "pom.xml"' in prompt
+        assert '"difficulty": "advanced"' in prompt
+        assert "$" not in prompt
+        assert get_demo_template("java") is get_demo_template("java")
+
+    def test_estimate_matches_render(self):
+        """测试不拼接的估算与渲染结果一致"""
+        template = get_demo_template("python")
+        for optional in (True, False):
+            prompt = template.render(optional, topic="装饰器", difficulty="beginner")
+            estimate = template.estimate(optional, topic="装饰器", difficulty="beginner")
+            # 分段估算时每段各自向上取整
+            assert 0 <= estimate - estimate_tokens(prompt) <= 10
+
+    def test_output_budget(self):
+        """测试输出预算随难度和文件数增长"""
+        assert output_budget("beginner") < output_budget("intermediate") < output_budget("advanced")
+        assert output_budget("advanced", code_files=1) < output_budget("advanced")
+
+    def test_plan_within_limits(self):
+        """测试预算不超过 max_tokens，窗口充足时不精简"""
+        plan = plan_demo_prompt("python", "logging", "advanced", max_tokens=2000, context_window=32768)
+        assert plan["max_tokens"] == 2000
+        assert not plan["trimmed"]
+        assert "常见问题解答" in plan["prompt"]
+
+    def test_plan_trims_for_small_window(self):
+        """测试上下文窗口不足时省略可选段落"""
+        full = plan_demo_prompt("python", "logging", "advanced")
+        plan = plan_demo_prompt("python", "logging", "advanced", context_window=4096)
+        assert plan["trimmed"]
+        assert plan["prompt_tokens"] < full["prompt_tokens"]
+        assert "常见问题解答" not in plan["prompt"]
+        assert MIN_OUTPUT_TOKENS <= plan["max_tokens"] < full["max_tokens"]
+        assert plan["prompt_tokens"] + plan["max_tokens"] <= 4096
+
+    def test_long_topic_truncated(self):
+        """测试过长的主题被截短"""
+        plan = plan_demo_prompt("python", "主题" * 500, "beginner")
+        assert plan["trimmed"]
+        assert estimate_tokens(plan["prompt"].split('"')[1]) <= MAX_TOPIC_TOKENS
+
+
+class TestAIServicePrompt:
+    """AI服务请求预算测试类"""
+
+    def test_request_uses_budget(self):
+        """测试请求体使用按难度估算的 max_tokens"""
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "ai.api_key": "test-key",
+            "ai.max_tokens": 8000,
+            "ai.context_window": 128000,
+        }.get(key, default)
+        service = AIService(config)
+
+        plan = service._plan_prompt("python", "logging", "beginner")
+        request = service._build_request(plan["prompt"], plan["max_tokens"])
+
+        assert request["max_tokens"] == output_budget("beginner")
+        assert service._build_request(plan["prompt"])["max_tokens"] == 8000
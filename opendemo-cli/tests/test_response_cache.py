@@ -0,0 +1,115 @@
+"""
+AI响应缓存测试
+"""
+
+import json
+import pytest
+from unittest.mock import Mock, patch
+from core import response_cache as response_cache_module
+from core.ai_service import AIService
+from core.config_service import ConfigService
+from core.response_cache import ResponseCache, cache_key
+
+
+class TestResponseCache:
+    """响应缓存测试类"""
+
+    def test_get_put(self, tmp_path):
+        """测试写入后可读取，并在重新打开后保留"""
+        cache = ResponseCache(tmp_path / "responses.db")
+        assert cache.get("k") is None
+        cache.put("k", "value")
+        assert cache.get("k") == "value"
+        cache.close()
+
+        assert ResponseCache(tmp_path / "responses.db").get("k") == "value"
+
+    def test_ttl(self, tmp_path):
+        """测试过期条目失效"""
+        cache = ResponseCache(tmp_path / "responses.db", ttl=10)
+        with patch.object(response_cache_module.time, "time", return_value=1000.0):
+            cache.put("k", "value")
+        with patch.object(response_cache_module.time, "time", return_value=1005.0):
+            assert cache.get("k") == "value"
+        with patch.object(response_cache_module.time, "time", return_value=1011.0):
+            assert cache.get("k") is None
+
+    def test_lru_eviction(self, tmp_path):
+        """测试超出上限时淘汰最久未访问的条目"""
+        cache = ResponseCache(tmp_path / "responses.db", ttl=None, max_entries=2)
+        clock = iter(range(100, 10000, 100))
+        with patch.object(response_cache_module.time, "time", side_effect=lambda: next(clock)):
+            cache.put("a", "1")
+            cache.put("b", "2")
+            cache.get("a")
+            cache.put("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+
+    def test_key_ignores_stream(self):
+        """测试流式开关不影响缓存键"""
+        request = {"model": "m", "temperature": 0.7, "messages": [{"content": "p"}]}
+        assert cache_key(request) == cache_key(dict(request, stream=True))
+        assert cache_key(request) != cache_key(dict(request, temperature=0.1))
+
+
+class TestAIServiceCache:
+    """AI服务使用响应缓存的测试类"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "ai.api_key": "test-key",
+            "ai.model": "test-model",
+            "ai.cache": True,
+            "cache_directory": str(tmp_path),
+        }.get(key, default)
+        service = AIService(config)
+        yield service
+        service.close()
+
+    def _reply(self, content):
+        return {"choices": [{"message": {"content": content}}]}
+
+    def test_classify_keyword_cached(self, service):
+        """测试重复分类同一关键字只请求一次接口"""
+        content = json.dumps({"is_library": True, "confidence": 0.9, "library_name": "numpy"})
+        with patch.object(service.http, "post_json", return_value=self._reply(content)) as post:
+            first = service.classify_keyword("python", "numpy")
+            second = service.classify_keyword("python", "numpy")
+
+        assert first == second
+        assert first["library_name"] == "numpy"
+        assert post.call_count == 1
+
+    def test_generate_demo_cached(self, service):
+        """测试解析失败的响应不缓存，成功的响应再次生成时直接使用"""
+        demo = json.dumps(
+            {"metadata": {"name": "demo"}, "files": [{"path": "README.md", "content": "# demo"}]}
+        )
+        replies = [self._reply("not json"), self._reply(demo)]
+        with patch.object(service.http, "post_json", side_effect=replies) as post:
+            assert service.generate_demo("python", "logging") is not None
+            assert service.generate_demo("python", "logging")["metadata"]["name"] == "demo"
+
+        assert post.call_count == 2
+
+    def test_generate_demo_bypass_cache(self, service):
+        """测试强制重新生成时不使用缓存，但新的响应仍会写入缓存"""
+        first = json.dumps(
+            {"metadata": {"name": "first"}, "files": [{"path": "README.md", "content": "# 1"}]}
+        )
+        second = json.dumps(
+            {"metadata": {"name": "second"}, "files": [{"path": "README.md", "content": "# 2"}]}
+        )
+        replies = [self._reply(first), self._reply(second)]
+        with patch.object(service.http, "post_json", side_effect=replies) as post:
+            assert service.generate_demo("python", "logging")["metadata"]["name"] == "first"
+            fresh = service.generate_demo("python", "logging", use_cache=False)
+            assert fresh["metadata"]["name"] == "second"
+            assert service.generate_demo("python", "logging")["metadata"]["name"] == "second"
+
+        assert post.call_count == 2
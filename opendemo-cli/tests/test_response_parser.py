@@ -0,0 +1,124 @@
+"""
+AI响应增量解析测试
+"""
+
+import json
+import pytest
+from unittest.mock import Mock, patch
+from core.ai_service import AIService
+from core.config_service import ConfigService
+from core.response_parser import DemoResponseParser
+
+FILES = [
+    {"path": "README.md", "content": "# Demo\n\n```python\nprint('{}')\n```"},
+    {"path": "code/example1.py", "content": 'print("a \\"quoted\\" } value")'},
+    {"path": "requirements.txt", "content": "requests\n"},
+]
+METADATA = {"name": "python-demo", "keywords": ["demo", "{braces}"]}
+RESPONSE = json.dumps({"metadata": METADATA, "files": FILES}, ensure_ascii=False)
+
+
+def _feed(text, size=7):
+    parser = DemoResponseParser()
+    for i in range(0, len(text), size):
+        parser.feed(text[i : i + size])
+    return parser
+
+
+class TestDemoResponseParser:
+    """增量解析器测试类"""
+
+    @pytest.mark.parametrize("size", [1, 7, len(RESPONSE)])
+    def test_chunked(self, size):
+        """测试任意切分的输入得到相同结果"""
+        parser = _feed(RESPONSE, size)
+        assert parser.intact
+        assert parser.metadata == METADATA
+        assert parser.files == FILES
+
+    def test_files_available_before_end(self):
+        """测试文件闭合后立即可用"""
+        end = RESPONSE.index("requirements.txt")
+        parser = _feed(RESPONSE[:end])
+        assert parser.metadata == METADATA
+        assert [info["path"] for info in parser.files] == ["README.md", "code/example1.py"]
+        assert not parser.complete
+        assert parser.missing_paths == []
+
+    def test_code_fence_and_raw_newlines(self):
+        """测试忽略代码块标记，允许字符串中未转义的换行"""
+        text = '好的:\n```json\n{"metadata": {"name": "x"}, "files": [{"path": "a.py", "content": "1\n2"}]}\n```'
+        parser = _feed(text)
+        assert parser.intact
+        assert parser.files == [{"path": "a.py", "content": "1\n2"}]
+
+    def test_malformed_and_truncated(self):
+        """测试跳过格式错误的文件，并给出缺失文件的路径"""
+        text = (
+            '{"metadata": {"name": "x"}, "files": ['
+            '{"path": "a.py", "content": "ok"}, '
+            '{"path": "b.py", "content": "bad \\q escape"}, '
+            '{"path": "c.py", "content": "trunc'
+        )
+        parser = _feed(text)
+        assert [info["path"] for info in parser.files] == ["a.py"]
+        assert parser.broken == ["b.py"]
+        assert parser.missing_paths == ["b.py", "c.py"]
+        assert not parser.intact
+
+
+class TestAIServiceSalvage:
+    """AI服务补救不完整响应的测试类"""
+
+    @pytest.fixture
+    def service(self):
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "ai.api_key": "test-key",
+            "ai.retry_times": 3,
+        }.get(key, default)
+        return AIService(config)
+
+    def test_rerequest_missing_files(self, service):
+        """测试截断的响应只补请求缺失的文件"""
+        truncated = RESPONSE[: RESPONSE.index("requirements.txt") + 30]
+        repair = json.dumps({"files": [FILES[1], FILES[2]]})
+        replies = iter([truncated, repair])
+        prompts = []
+
+        def fake_call_api(prompt, on_delta=None, max_tokens=None):
+            prompts.append(prompt)
+            reply = next(replies)
+            on_delta(reply)
+            return reply
+
+        with patch.object(service, "_call_api", side_effect=fake_call_api):
+            demo_data = service.generate_demo("python", "demo")
+
+        assert demo_data["files"] == FILES
+        assert demo_data["metadata"]["folder_name"] == "demo"
+        assert len(prompts) == 2
+        assert "requirements.txt" in prompts[1].split("补充说明")[1]
+
+    def test_unusable_repair_falls_back_to_retry(self, service):
+        """测试补充的响应不可用时不返回残缺的demo，整体重试且不缓存残缺结果"""
+        broken = (
+            '{"metadata": {"name": "x"}, "files": ['
+            '{"path": "a.py", "content": "ok"}, '
+            '{"path": "b.py", "content": "bad \\q escape"}]}'
+        )
+        replies = iter([broken, "抱歉，无法生成", RESPONSE])
+
+        def fake_call_api(prompt, on_delta=None, max_tokens=None):
+            reply = next(replies)
+            on_delta(reply)
+            return reply
+
+        with patch.object(service, "_call_api", side_effect=fake_call_api), patch.object(
+            service, "_store_response"
+        ) as store, patch("core.ai_service.time.sleep"):
+            demo_data = service.generate_demo("python", "demo")
+
+        assert demo_data["files"] == FILES
+        store.assert_called_once()
+        assert json.loads(store.call_args[0][1])["files"] == FILES
@@ -0,0 +1,126 @@
+"""
+重试策略测试
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from core import retry_policy as retry_policy_module
+from core.ai_service import AIService
+from core.config_service import ConfigService
+from core.http_client import HTTPError
+from core.retry_policy import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitOpenError,
+    RetryPolicy,
+)
+
+
+class TestRetryPolicy:
+    """重试策略测试类"""
+
+    def test_backoff_with_jitter(self):
+        """测试指数退避、抖动范围和上限"""
+        policy = RetryPolicy(base_delay=1, max_delay=6)
+        error = ConnectionError("reset")
+
+        for attempt, (low, high) in enumerate([(0.5, 1), (1, 2), (2, 4), (3, 6), (3, 6)], 1):
+            assert low <= policy.delay(attempt, error) <= high
+
+    def test_retry_after_and_parse_failure(self):
+        """测试 Retry-After 优先，解析失败立即重试"""
+        policy = RetryPolicy(base_delay=1)
+        assert policy.delay(1, HTTPError(429, retry_after=12)) == 12
+        assert policy.delay(1) == 0
+
+    def test_retry_after_capped(self):
+        """测试过长的 Retry-After 不等待，直接放弃"""
+        policy = RetryPolicy(max_delay=60)
+        error = HTTPError(429, retry_after=86400)
+        assert policy.delay(1, error) == 60
+        assert not policy.should_retry(1, error)
+        assert policy.should_retry(1, HTTPError(429, retry_after=60))
+
+    def test_should_retry(self):
+        """测试只重试可恢复的错误且不超过次数"""
+        policy = RetryPolicy(max_attempts=3)
+        assert policy.should_retry(1, HTTPError(503))
+        assert policy.should_retry(1, HTTPError(429))
+        assert policy.should_retry(1, TimeoutError())
+        assert not policy.should_retry(1, HTTPError(401))
+        assert not policy.should_retry(3, HTTPError(503))
+        assert policy.stats()["retries"] == 3
+
+    def test_circuit_breaker(self):
+        """测试连续失败后熔断，超时后放行一次试探请求"""
+        policy = RetryPolicy(failure_threshold=2, reset_timeout=10)
+        clock = [100.0]
+
+        with patch.object(retry_policy_module.time, "monotonic", side_effect=lambda: clock[0]):
+            for _ in range(2):
+                policy.before_call()
+                policy.record_failure(HTTPError(503))
+            assert policy.state == STATE_OPEN
+            with pytest.raises(CircuitOpenError):
+                policy.before_call()
+
+            clock[0] += 10
+            assert policy.state == STATE_HALF_OPEN
+            policy.before_call()
+            # 试探请求返回前其他请求仍被拒绝
+            with pytest.raises(CircuitOpenError):
+                policy.before_call()
+            policy.record_success()
+
+        stats = policy.stats()
+        assert stats["state"] == STATE_CLOSED
+        assert stats["circuit_opened"] == 1
+        assert stats["rejected"] == 2
+        assert stats["failures"] == 2
+
+    def test_client_errors_do_not_trip(self):
+        """测试客户端错误不计入熔断"""
+        policy = RetryPolicy(failure_threshold=1)
+        policy.record_failure(HTTPError(401))
+        assert policy.state == STATE_CLOSED
+
+
+class TestAIServiceRetry:
+    """AI服务重试测试类"""
+
+    @pytest.fixture
+    def service(self):
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "ai.api_key": "test-key",
+            "ai.retry_times": 3,
+            "ai.retry_interval": 0.01,
+        }.get(key, default)
+        return AIService(config)
+
+    def test_generate_demo_retries(self, service):
+        """测试服务端错误退避重试，解析失败立即重试"""
+        demo = '{"metadata": {"name": "demo"}, "files": [{"path": "a.py", "content": ""}]}'
+        replies = iter([HTTPError(503), "not json", demo])
+
+        def fake_call_api(prompt, on_delta=None, max_tokens=None):
+            reply = next(replies)
+            if isinstance(reply, Exception):
+                raise reply
+            on_delta(reply)
+            return reply
+
+        with patch.object(service, "_call_api", side_effect=fake_call_api) as call_api:
+            with patch.object(retry_policy_module.random, "uniform", return_value=0):
+                assert service.generate_demo("python", "logging")["metadata"]["name"] == "demo"
+
+        assert call_api.call_count == 3
+        stats = service.retry_policy.stats()
+        assert stats["failures"] == 1 and stats["successes"] == 2
+
+    def test_generate_demo_client_error(self, service):
+        """测试客户端错误不重试"""
+        with patch.object(service, "_call_api", side_effect=HTTPError(401)) as call_api:
+            assert service.generate_demo("python", "logging") is None
+        assert call_api.call_count == 1
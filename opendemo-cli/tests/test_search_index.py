@@ -0,0 +1,141 @@
+"""
+Demo搜索索引测试
+"""
+
+import pytest
+from core.search_index import (
+    SearchIndex,
+    FIELD_NAME,
+    FIELD_KEYWORDS,
+    FIELD_DESCRIPTION,
+    FIELD_TITLE,
+    FIELD_TEXT,
+    tokenize,
+)
+
+
+RECORDS = [
+    {
+        "key": "python/logging",
+        "name": "python-logging",
+        "title": "日志记录",
+        "keywords": ["logging", "日志"],
+        "description": "Python logging basics",
+        "difficulty": "beginner",
+    },
+    {
+        "key": "python/asyncio",
+        "name": "asyncio-tasks",
+        "title": "异步任务",
+        "keywords": ["async", "协程"],
+        "description": "Run coroutines concurrently",
+        "difficulty": "intermediate",
+    },
+    {
+        "key": "go/goroutine",
+        "name": "go-goroutine",
+        "title": "",
+        "keywords": ["concurrency"],
+        "description": "Goroutines and channels",
+        "difficulty": "Intermediate",
+    },
+]
+
+
+class TestTokenize:
+    """检索词项切分测试类"""
+
+    def test_ascii_words(self):
+        """测试ASCII按单词切分"""
+        assert tokenize("Python-Logging list_ops, 2D") == ["python", "logging", "list", "ops", "2d"]
+
+    def test_cjk_bigrams(self):
+        """测试中文按bigram切分"""
+        assert tokenize("列表操作") == ["列表", "表操", "操作"]
+        assert tokenize("python列表 表") == ["python", "列表", "表"]
+
+
+class TestSearchIndex:
+    """Demo搜索索引测试类"""
+
+    @pytest.fixture
+    def index(self):
+        """构建测试索引"""
+        return SearchIndex.build(RECORDS, generation=1)
+
+    def test_lookup_field_mask(self, index):
+        """测试查询返回命中的字段"""
+        hits = index.lookup("LOGGING")
+        assert list(hits) == [0]
+        assert hits[0] == FIELD_NAME | FIELD_KEYWORDS | FIELD_DESCRIPTION | FIELD_TEXT
+
+    def test_lookup_substring(self, index):
+        """测试保持包含匹配语义"""
+        assert sorted(index.lookup("rout")) == [1, 2]
+        assert index.lookup("concurren") == {1: FIELD_DESCRIPTION | FIELD_TEXT, 2: FIELD_KEYWORDS | FIELD_TEXT}
+
+    def test_lookup_title_and_cjk(self, index):
+        """测试标题和中文匹配"""
+        assert index.lookup("异步") == {1: FIELD_TITLE}
+        assert index.lookup("日志")[0] & FIELD_KEYWORDS
+
+    def test_keyword_match_does_not_span_keywords(self, index):
+        """测试关键字匹配不会跨越两个关键字"""
+        assert 1 not in index.lookup("async协程")
+
+    def test_lookup_miss(self, index):
+        """测试无匹配"""
+        assert index.lookup("kubernetes") == {}
+
+    def test_find_name_and_difficulty(self, index):
+        """测试名称精确查找与难度过滤"""
+        assert index.find_name("Go-Goroutine") == [2]
+        assert index.find_name("go") == []
+        assert index.with_difficulty("INTERMEDIATE") == 0b110
+
+    def test_save_and_load(self, index, tmp_path):
+        """测试索引持久化"""
+        path = tmp_path / "index" / "demos.pickle"
+        index.save(path)
+
+        loaded = SearchIndex.load(path)
+
+        assert loaded.generation == 1
+        assert loaded.keys == index.keys
+        assert loaded.lookup("corout") == index.lookup("corout")
+
+    def test_load_invalid_file(self, tmp_path):
+        """测试加载损坏的索引文件"""
+        path = tmp_path / "broken.pickle"
+        path.write_bytes(b"not a pickle")
+        assert SearchIndex.load(path) is None
+        assert SearchIndex.load(tmp_path / "missing.pickle") is None
+
+    def test_score_prefers_name_field(self, index):
+        """测试名称字段权重高于描述"""
+        scores = index.score("logging goroutines")
+        assert set(scores) == {0, 2}
+        assert scores[0] > 0
+
+        records = [
+            {"key": "a", "name": "misc", "description": "threading helpers"},
+            {"key": "b", "name": "threading", "description": "helpers"},
+        ]
+        scores = SearchIndex.build(records).score("threading")
+        assert scores[1] > scores[0]
+
+    def test_score_cjk_query(self, index):
+        """测试中文查询按bigram打分"""
+        assert list(index.score("日志记录")) == [0]
+        assert list(index.score("异步任务")) == [1]
+
+    def test_rare_terms_weigh_more(self):
+        """测试IDF：少见词项分数更高"""
+        records = [
+            {"key": str(i), "name": f"demo-{i}", "keywords": ["python"] + (["numpy"] if i == 0 else [])}
+            for i in range(5)
+        ]
+        index = SearchIndex.build(records)
+        assert index.idf["numpy"] > index.idf["python"]
+        scores = index.score("python numpy")
+        assert max(scores, key=scores.get) == 0
@@ -2,10 +2,13 @@
 存储服务测试
 """
 
+import os
+import subprocess
+import sys
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
-from core.storage_service import StorageService
+from core.storage_service import StorageService, _process_alive
 from core.config_service import ConfigService
 
 
@@ -133,3 +136,120 @@ class TestStorageService:
 
         result = self.storage._ensure_directory(Path('test-dir'))
         assert result is True
+
+
+class TestSaveDemo:
+    """demo原子保存测试类"""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        """基于临时目录的存储服务"""
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            'output_directory': str(tmp_path / 'output'),
+            'cache_directory': str(tmp_path / 'cache'),
+        }.get(key, default)
+        return StorageService(config)
+
+    @staticmethod
+    def _demo(content):
+        return {
+            'metadata': {'name': 'demo'},
+            'files': [{'path': 'code/main.py', 'content': content}],
+        }
+
+    def test_save_and_replace(self, storage, tmp_path):
+        """测试保存demo并整体替换已有demo"""
+        target = tmp_path / 'output' / 'python' / 'demo'
+        assert storage.save_demo(self._demo('v1'), target) is True
+        (target / 'stale.txt').write_text('old', encoding='utf-8')
+
+        assert storage.save_demo(self._demo('v2'), target) is True
+
+        assert (target / 'code' / 'main.py').read_text(encoding='utf-8') == 'v2'
+        assert not (target / 'stale.txt').exists()
+        assert sorted(p.name for p in target.parent.iterdir()) == ['demo']
+
+    def test_replace_without_exchange(self, storage, tmp_path):
+        """测试不支持原子交换时两步替换，完成后不留下备份和日志"""
+        target = tmp_path / 'output' / 'python' / 'demo'
+        storage.save_demo(self._demo('v1'), target)
+
+        with patch('core.storage_service._exchange_dirs', return_value=False):
+            assert storage.save_demo(self._demo('v2'), target) is True
+
+        assert (target / 'code' / 'main.py').read_text(encoding='utf-8') == 'v2'
+        assert sorted(p.name for p in target.parent.iterdir()) == ['demo']
+        assert list(storage.replace_journal_path.iterdir()) == []
+
+    def test_interrupted_replace_recovered(self, storage, tmp_path):
+        """测试两次重命名之间中断后，下次启动时移回旧demo"""
+        target = tmp_path / 'output' / 'python' / 'demo'
+        storage.save_demo(self._demo('v1'), target)
+
+        real_rename = os.rename
+        calls = []
+
+        def crash_after_first(src, dst):
+            # 第一次重命名照常执行，之后进程"中断"，来不及回滚
+            calls.append(src)
+            if len(calls) > 1:
+                raise KeyboardInterrupt
+            real_rename(src, dst)
+
+        with patch('core.storage_service._exchange_dirs', return_value=False), patch(
+            'core.storage_service.os.rename', side_effect=crash_after_first
+        ):
+            with pytest.raises(KeyboardInterrupt):
+                storage.save_demo(self._demo('v2'), target)
+        assert not target.exists()
+
+        # 所属进程仍在运行时可能正处于两次重命名之间，不恢复
+        StorageService(storage.config)
+        assert not target.exists()
+        assert len(list(storage.replace_journal_path.iterdir())) == 1
+
+        with patch('core.storage_service._process_alive', return_value=False):
+            StorageService(storage.config)
+
+        assert (target / 'code' / 'main.py').read_text(encoding='utf-8') == 'v1'
+        assert list(storage.replace_journal_path.iterdir()) == []
+
+    def test_process_alive(self):
+        """测试进程存活检测"""
+        child = subprocess.Popen([sys.executable, '-c', 'pass'])
+        child.wait()
+        assert _process_alive(os.getpid())
+        assert not _process_alive(child.pid)
+
+    def test_failed_write_leaves_nothing(self, storage, tmp_path):
+        """测试写入中途失败不留下不完整的demo"""
+        target = tmp_path / 'output' / 'python' / 'demo'
+        demo = self._demo('v1')
+        demo['files'].append({'path': 'broken.py'})
+
+        assert storage.save_demo(demo, target) is False
+        assert list(target.parent.iterdir()) == []
+
+    def test_path_escape_rejected(self, storage, tmp_path):
+        """测试拒绝写出demo目录的文件路径"""
+        target = tmp_path / 'output' / 'python' / 'demo'
+        demo = self._demo('v1')
+        demo['files'].append({'path': '../evil.py', 'content': 'x'})
+
+        assert storage.save_demo(demo, target) is False
+        assert list(target.parent.iterdir()) == []
+
+    def test_save_demos_bulk(self, storage, tmp_path):
+        """测试批量保存返回每个demo的结果"""
+        base = tmp_path / 'output' / 'python'
+        bad = self._demo('x')
+        bad['files'][0]['path'] = '/abs.py'
+
+        results = storage.save_demos(
+            [(self._demo('a'), base / 'a'), (bad, base / 'b'), (self._demo('c'), base / 'c')]
+        )
+
+        assert results == [True, False, True]
+        assert sorted(p.name for p in base.iterdir()) == ['a', 'c']
+        assert (base / 'c' / 'code' / 'main.py').read_text(encoding='utf-8') == 'c'
@@ -0,0 +1,155 @@
+"""
+虚拟环境池测试
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from core import venv_pool as venv_pool_module
+from core.config_service import ConfigService
+from core.demo_verifier import DemoVerifier
+from core.venv_pool import VenvPool, normalize_requirements, pool_key
+
+
+def _fake_run(args, **kwargs):
+    """代替 venv/pip 子进程：创建环境骨架，pip install 写入一个包目录"""
+    if args[1:3] == ["-m", "venv"]:
+        venv = venv_pool_module.Path(args[3])
+        venv_pool_module.venv_python(venv).parent.mkdir(parents=True)
+        venv_pool_module.venv_python(venv).write_text("")
+        (venv / "lib" / "python3" / "site-packages").mkdir(parents=True)
+        (venv / "lib" / "python3" / "site-packages" / "pip").mkdir()
+    else:
+        venv = venv_pool_module.Path(args[0]).parent.parent
+        (venv / "lib" / "python3" / "site-packages" / "requests").mkdir()
+        (venv / "lib" / "python3" / "site-packages" / "requests" / "x.py").write_text("x" * 4096)
+    return Mock(returncode=0, stdout="installed", stderr="")
+
+
+@pytest.fixture
+def fake_venv():
+    with patch.object(venv_pool_module.subprocess, "run", side_effect=_fake_run) as run:
+        yield run
+
+
+def _requirements(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+class TestNormalize:
+    """依赖规范化测试类"""
+
+    def test_equivalent_spellings(self):
+        """测试写法不同的等价依赖得到相同的键"""
+        a = normalize_requirements("Flask_SQLAlchemy >= 3.0\n# comment\nrequests\n")
+        b = normalize_requirements("requests  # http\n\nflask-sqlalchemy>=3.0\nrequests\n")
+        assert a == b == ["flask-sqlalchemy>=3.0", "requests"]
+        assert pool_key(a) == pool_key(b)
+        assert pool_key(a) != pool_key(["requests"])
+
+    def test_unshareable(self):
+        """测试引用demo目录内容的声明不参与共享"""
+        assert normalize_requirements("-r base.txt") is None
+        assert normalize_requirements("./libs/local_pkg") is None
+        assert normalize_requirements("") == []
+
+
+class TestVenvPool:
+    """虚拟环境池测试类"""
+
+    def test_reuse(self, tmp_path, fake_venv):
+        """测试同一组依赖只构建一次，进程重启后仍可复用"""
+        requirements = _requirements(tmp_path, "a.txt", "requests\n")
+        pool = VenvPool(tmp_path / "venvs")
+
+        with pool.lease(requirements) as (first, output, reused):
+            assert output == "installed" and not reused
+        with pool.lease(_requirements(tmp_path, "b.txt", "Requests")) as (second, output, reused):
+            assert second == first and reused
+
+        with VenvPool(tmp_path / "venvs").lease(requirements) as (third, _, reused):
+            assert third == first and reused
+        # venv + pip 各一次
+        assert fake_venv.call_count == 2
+
+    def test_concurrent_leases(self, tmp_path, fake_venv):
+        """测试已被租用的环境不会同时租给其他验证"""
+        pool = VenvPool(tmp_path / "venvs")
+        with pool.lease(None) as (first, _, _):
+            with pool.lease(None) as (second, _, reused):
+                assert second != first and not reused
+        assert pool.stats()["environments"] == 2
+
+    def test_shared_directory_across_processes(self, tmp_path, fake_venv):
+        """测试共用目录的另一个环境池不会租用或淘汰正在使用的环境"""
+        requirements = _requirements(tmp_path, "a.txt", "requests\n")
+        pool = VenvPool(tmp_path / "venvs")
+        with pool.lease(requirements):
+            pass
+
+        other = VenvPool(tmp_path / "venvs", budget_mb=1 / 1024)
+        with pool.lease(requirements) as (first, _, reused):
+            assert reused
+            with other.lease(requirements) as (second, _, reused):
+                assert second != first and not reused
+            # 另一个环境池超出预算时不会淘汰正被使用的环境
+            other._evict()
+            assert first.exists() and not second.exists()
+        assert other.stats()["evicted"] == 1
+
+    def test_modified_env_discarded(self, tmp_path, fake_venv):
+        """测试demo改动了 site-packages 的环境归还时被丢弃"""
+        pool = VenvPool(tmp_path / "venvs")
+        with pool.lease(None) as (venv, _, _):
+            (venv / "lib" / "python3" / "site-packages" / "extra").mkdir()
+        assert not venv.exists()
+        assert pool.stats()["discarded"] == 1
+
+        with pool.lease(None) as (_, _, reused):
+            assert not reused
+
+    def test_lru_eviction(self, tmp_path, fake_venv):
+        """测试超出磁盘预算时淘汰最久未用的空闲环境"""
+        pool = VenvPool(tmp_path / "venvs", budget_mb=10 / 1024)
+        paths = []
+        for i in range(3):
+            with pool.lease(_requirements(tmp_path, f"{i}.txt", f"pkg{i}\n")) as (venv, _, _):
+                paths.append(venv)
+
+        assert [path.exists() for path in paths] == [False, True, True]
+        assert pool.stats()["evicted"] == 1
+
+    def test_unshareable_is_private(self, tmp_path, fake_venv):
+        """测试无法共享的依赖只为本次验证构建"""
+        pool = VenvPool(tmp_path / "venvs")
+        with pool.lease(_requirements(tmp_path, "r.txt", "-r base.txt\n")) as (venv, _, reused):
+            assert venv.exists() and not reused
+        assert not venv.exists()
+        assert pool.stats()["environments"] == 0
+
+
+class TestVerifierPool:
+    """Python验证使用环境池的测试类"""
+
+    def test_second_verification_reuses_venv(self, tmp_path):
+        """测试第二次验证复用虚拟环境"""
+        config = Mock(spec=ConfigService)
+        config.get.side_effect = lambda key, default=None: {
+            "enable_verification": True,
+            "cache_directory": str(tmp_path / "cache"),
+            "verification_timeout": 30,
+            "verification_cache": False,
+        }.get(key, default)
+        demo = tmp_path / "demo"
+        (demo / "code").mkdir(parents=True)
+        (demo / "code" / "hello.py").write_text("print('hello')\n")
+
+        verifier = DemoVerifier(config)
+        first = verifier.verify(demo, "python")
+        second = verifier.verify(demo, "python")
+
+        assert first["verified"] and second["verified"], (first, second)
+        assert "Created virtual environment" in first["steps"]
+        assert "Reused pooled virtual environment" in second["steps"]
+        assert "=== hello.py ===\nhello\n" in second["outputs"]
@@ -8,7 +8,6 @@ from typing import List, Dict, Any
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.markdown import Markdown
 from rich import box
 
 
@@ -171,6 +170,9 @@ def print_markdown(content: str):
     Args:
         content: markdown文本
     """
+    # rich.markdown 依赖 markdown-it，导入较慢，只在需要时导入
+    from rich.markdown import Markdown
+
     md = Markdown(content)
     console.print(md)
 
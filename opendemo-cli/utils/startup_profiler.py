@@ -0,0 +1,118 @@
+"""
+启动耗时分析模块
+
+以 `python -X importtime` 重新运行当前命令，汇总各模块的导入耗时，
+用于发现拖慢CLI启动的导入。
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# -X importtime 输出行: "import time: self [us] | cumulative | imported package"
+_IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(output: str) -> List[Dict[str, object]]:
+    """
+    解析 -X importtime 的输出
+
+    Args:
+        output: 标准错误输出文本
+
+    Returns:
+        导入记录列表，每项包含 module/self_us/cumulative_us/depth
+    """
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(
+            {
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                # 输出中每层嵌套缩进两个空格
+                "depth": (len(indent) - 1) // 2,
+            }
+        )
+    return records
+
+
+def format_report(records: List[Dict[str, object]], wall_ms: float, top: int = 25) -> str:
+    """
+    生成启动耗时报告
+
+    Args:
+        records: 导入记录
+        wall_ms: 命令总耗时（毫秒）
+        top: 显示累计耗时最高的模块数量
+
+    Returns:
+        报告文本
+    """
+    # 顶层导入的累计耗时之和即总导入耗时
+    total_us = sum(r["cumulative_us"] for r in records if r["depth"] == 0)
+
+    lines = [
+        "",
+        f"启动耗时: 总计 {wall_ms:.1f} ms, 模块导入 {total_us / 1000:.1f} ms, "
+        f"共导入 {len(records)} 个模块",
+        f"{'累计(ms)':>10} {'自身(ms)':>10}  模块",
+    ]
+    for record in sorted(records, key=lambda r: r["cumulative_us"], reverse=True)[:top]:
+        lines.append(
+            f"{record['cumulative_us'] / 1000:>10.1f} {record['self_us'] / 1000:>10.1f}  "
+            f"{'  ' * record['depth']}{record['module']}"
+        )
+    return "\n".join(lines)
+
+
+def profile_startup(args: List[str], top: int = 25) -> int:
+    """
+    以 -X importtime 重新运行CLI命令并输出导入耗时报告
+
+    命令本身的输出照常显示，报告输出到标准错误。
+
+    Args:
+        args: 传给CLI的参数（不含 --profile-startup）
+        top: 显示累计耗时最高的模块数量
+
+    Returns:
+        命令的退出码
+    """
+    cli_dir = Path(__file__).parent.parent
+    code = (
+        "import sys; "
+        f"sys.path.insert(0, {str(cli_dir)!r}); "
+        f"sys.argv = ['opendemo'] + {list(args)!r}; "
+        "import cli; cli.main()"
+    )
+
+    env = dict(os.environ)
+    env.pop("PYTHONIMPORTTIME", None)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    # 原样输出命令自身的错误信息，再输出报告
+    other_lines = [
+        line for line in result.stderr.splitlines() if not line.startswith("import time:")
+    ]
+    if other_lines:
+        print("\n".join(other_lines), file=sys.stderr)
+    print(format_report(parse_importtime(result.stderr), wall_ms, top), file=sys.stderr)
+
+    return result.returncode